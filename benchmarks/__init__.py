@@ -0,0 +1,5 @@
+"""Benchmarks for the hot paths of the trivia game.
+
+Run ``python -m benchmarks run --output results.json`` to time every scenario and
+``python -m benchmarks compare baseline.json results.json`` to flag regressions.
+"""
@@ -0,0 +1,76 @@
+"""Command line entry point: ``python -m benchmarks run|compare``."""
+
+import argparse
+import sys
+from collections.abc import Sequence
+
+from benchmarks import scenarios  # noqa: F401  registers the scenarios
+from benchmarks.runner import (
+    SCENARIOS,
+    compare_reports,
+    format_seconds,
+    load_report,
+    regressions,
+    run_scenarios,
+    save_report,
+)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run or compare benchmarks from the command line
+
+    Args:
+        argv (Sequence[str] | None, optional): Command line arguments. Defaults to sys.argv.
+
+    Returns:
+        int: The exit code, 1 if compare found a regression
+    """
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Trivia game benchmarks.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run benchmark scenarios")
+    run_parser.add_argument("scenarios", nargs="*", help="Scenarios to run (default: all)")
+    run_parser.add_argument("--output", "-o", help="Write the JSON report to this file")
+    run_parser.add_argument("--rounds", type=int, default=5, help="Timed rounds per scenario (default: 5)")
+    run_parser.add_argument("--min-time", type=float, default=0.2, help="Minimum seconds per round (default: 0.2)")
+    run_parser.add_argument("--list", action="store_true", help="List the scenarios and exit")
+
+    compare_parser = commands.add_parser("compare", help="Compare two JSON reports")
+    compare_parser.add_argument("baseline", help="Report of the reference run")
+    compare_parser.add_argument("current", help="Report of the run to check")
+    compare_parser.add_argument(
+        "--threshold", type=float, default=0.1, help="Allowed slowdown of the median, 0.1 is 10%% (default: 0.1)"
+    )
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        if args.list:
+            print("\n".join(sorted(SCENARIOS)))
+            return 0
+
+        unknown: list[str] = [name for name in args.scenarios if name not in SCENARIOS]
+        if unknown:
+            names: str = ", ".join(unknown)
+            parser.error(f"unknown scenarios: {names}")
+
+        report = run_scenarios(args.scenarios or None, args.rounds, args.min_time)
+        if args.output:
+            save_report(report, args.output)
+        return 0
+
+    comparisons = compare_reports(load_report(args.baseline), load_report(args.current))
+    slower = regressions(comparisons, args.threshold)
+
+    for comparison in comparisons:
+        flag: str = "REGRESSION" if comparison in slower else ""
+        print(
+            f"{comparison.name:45} {format_seconds(comparison.baseline):>10} -> "
+            f"{format_seconds(comparison.current):>10} {comparison.ratio:6.2f}x {flag}"
+        )
+
+    return 1 if slower else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
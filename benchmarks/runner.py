@@ -0,0 +1,229 @@
+"""Timing harness, result files and regression checks for the benchmarks."""
+
+import json
+import platform
+import statistics
+import time
+from collections.abc import Callable
+from contextlib import AbstractContextManager
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+Scenario = Callable[[], AbstractContextManager[Callable[[], object]]]
+
+SCENARIOS: dict[str, Scenario] = {}
+
+
+class ScenarioSkipped(Exception):
+    """Raised by a scenario that cannot run in the current environment"""
+
+
+def scenario(name: str) -> Callable[[Scenario], Scenario]:
+    """Register a benchmark scenario
+
+    A scenario is a context manager factory. Entering it does the setup and yields
+    the callable to time, exiting it cleans up.
+
+    Args:
+        name (str): The unique name of the scenario in result files
+
+    Returns:
+        Callable[[Scenario], Scenario]: The decorator registering the scenario
+    """
+
+    def register(factory: Scenario) -> Scenario:
+        SCENARIOS[name] = factory
+        return factory
+
+    return register
+
+
+@dataclass
+class Timing:
+    """Timing of one scenario, all times in seconds per call."""
+
+    min: float
+    median: float
+    mean: float
+    stdev: float
+    rounds: int
+    number: int
+
+
+@dataclass
+class Comparison:
+    """Change of one scenario between two runs."""
+
+    name: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        """Get the current median relative to the baseline median
+
+        Returns:
+            float: The ratio, above 1 when the scenario got slower
+        """
+        return self.current / self.baseline if self.baseline else float("inf")
+
+
+def time_callable(func: Callable[[], object], rounds: int = 5, min_time: float = 0.2) -> Timing:
+    """Time a callable, calibrating the number of calls per round
+
+    Args:
+        func (Callable[[], object]): The code to time
+        rounds (int, optional): Number of timed rounds. Defaults to 5.
+        min_time (float, optional): Minimum duration of a round in seconds. Defaults to 0.2.
+
+    Returns:
+        Timing: Per-call statistics over the rounds
+    """
+    number: int = 1
+    while True:
+        elapsed: float = _time_round(func, number)
+        if elapsed >= min_time or number >= 1_000_000:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+
+    samples: list[float] = [_time_round(func, number) / number for _ in range(rounds)]
+    return Timing(
+        min=min(samples),
+        median=statistics.median(samples),
+        mean=statistics.fmean(samples),
+        stdev=statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        rounds=rounds,
+        number=number,
+    )
+
+
+def _time_round(func: Callable[[], object], number: int) -> float:
+    """Call a function repeatedly and measure the total time
+
+    Args:
+        func (Callable[[], object]): The code to time
+        number (int): Number of calls
+
+    Returns:
+        float: The elapsed time in seconds
+    """
+    start: float = time.perf_counter()
+    for _ in range(number):
+        func()
+    return time.perf_counter() - start
+
+
+def run_scenarios(
+    names: list[str] | None = None, rounds: int = 5, min_time: float = 0.2, log: Callable[[str], None] = print
+) -> dict[str, Any]:
+    """Run benchmark scenarios
+
+    Args:
+        names (list[str] | None, optional): Scenarios to run. Defaults to all registered scenarios.
+        rounds (int, optional): Number of timed rounds per scenario. Defaults to 5.
+        min_time (float, optional): Minimum duration of a round in seconds. Defaults to 0.2.
+        log (Callable[[str], None], optional): Receives a progress line per scenario. Defaults to print.
+
+    Raises:
+        KeyError: If a scenario name is unknown
+
+    Returns:
+        dict[str, Any]: The machine-readable report
+    """
+    results: dict[str, dict[str, Any]] = {}
+    skipped: dict[str, str] = {}
+
+    for name in names or sorted(SCENARIOS):
+        factory: Scenario = SCENARIOS[name]
+        try:
+            with factory() as func:
+                timing: Timing = time_callable(func, rounds, min_time)
+        except ScenarioSkipped as e:
+            skipped[name] = str(e)
+            log(f"{name}: skipped ({e})")
+            continue
+
+        results[name] = asdict(timing)
+        log(f"{name}: {format_seconds(timing.median)} per call ({timing.number} calls x {rounds} rounds)")
+
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+        "skipped": skipped,
+    }
+
+
+def save_report(report: dict[str, Any], path: Path | str) -> None:
+    """Write a report to a JSON file
+
+    Args:
+        report (dict[str, Any]): The report from run_scenarios
+        path (Path | str): The output file
+
+    Returns:
+        None
+    """
+    with Path(path).open("w") as f:
+        json.dump(report, f, indent=2)
+
+
+def load_report(path: Path | str) -> dict[str, Any]:
+    """Read a report from a JSON file
+
+    Args:
+        path (Path | str): The report file
+
+    Returns:
+        dict[str, Any]: The report
+    """
+    with Path(path).open() as f:
+        report: dict[str, Any] = json.load(f)
+    return report
+
+
+def compare_reports(baseline: dict[str, Any], current: dict[str, Any]) -> list[Comparison]:
+    """Compare the medians of the scenarios present in both reports
+
+    Args:
+        baseline (dict[str, Any]): The reference report
+        current (dict[str, Any]): The report to check
+
+    Returns:
+        list[Comparison]: One comparison per shared scenario, sorted by name
+    """
+    return [
+        Comparison(name, baseline["results"][name]["median"], current["results"][name]["median"])
+        for name in sorted(baseline["results"].keys() & current["results"].keys())
+    ]
+
+
+def regressions(comparisons: list[Comparison], threshold: float = 0.1) -> list[Comparison]:
+    """Find scenarios that got slower by more than the threshold
+
+    Args:
+        comparisons (list[Comparison]): The comparisons from compare_reports
+        threshold (float, optional): Allowed slowdown, 0.1 allows 10%. Defaults to 0.1.
+
+    Returns:
+        list[Comparison]: Every comparison over the threshold
+    """
+    return [comparison for comparison in comparisons if comparison.ratio > 1 + threshold]
+
+
+def format_seconds(seconds: float) -> str:
+    """Format a duration with a readable unit
+
+    Args:
+        seconds (float): The duration in seconds
+
+    Returns:
+        str: The duration, e.g. "12.3 us"
+    """
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g} {unit}"
+    return f"{seconds / 1e-9:.3g} ns"
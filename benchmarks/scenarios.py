@@ -0,0 +1,388 @@
+"""Benchmark scenarios for the API client, the question pipeline, the game server and scoreboard I/O.
+
+Every scenario runs offline. Network scenarios use trivia_game.local_server, and
+file scenarios run in a temporary working directory.
+"""
+
+import asyncio
+import contextlib
+import http.client
+import io
+import json
+import os
+import tempfile
+import threading
+from collections.abc import Callable, Iterator
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from benchmarks.runner import ScenarioSkipped, scenario
+from trivia_game import text_decoding
+from trivia_game.base_types import TriviaGameProtocol
+from trivia_game.engine import GameEngine
+from trivia_game.local_server import LocalTriviaServer, generate_corpus
+from trivia_game.models import Question, ScoreboardEntry
+from trivia_game.question_bank import QuestionBank
+from trivia_game.question_cache import QuestionCache
+from trivia_game.question_source import QuestionSource
+from trivia_game.quiz_brain import QuizBrain
+from trivia_game.server import GameServer
+from trivia_game.trivia_api import TriviaAPIClient
+
+FORMAT_BATCH_SIZE: int = 1000
+QUEUE_LENGTH: int = 10_000
+BANK_SIZE: int = 100_000
+SCOREBOARD_SIZES: tuple[int, ...] = (10, 10_000)
+
+
+class NullController:
+    """Application controller that ignores every call, so QuizBrain runs without a window."""
+
+    quiz_brain: TriviaGameProtocol
+
+    def show_frame(self, frame_class: Any) -> None:
+        """Ignore the frame change"""
+
+    def quit(self) -> None:
+        """Ignore the quit request"""
+
+    def show_error(self, message: str) -> None:
+        """Ignore the error"""
+
+    def after(self, ms: int, func: Callable[..., object], *args: object) -> str:
+        """Run the callback right away instead of on a Tk event loop
+
+        Returns:
+            str: A placeholder callback ID
+        """
+        func(*args)
+        return "after#0"
+
+
+def encoded_results(size: int, encoding: str | None = None) -> list[dict[str, Any]]:
+    """Build a questions response body the way the API encodes it
+
+    Args:
+        size (int): Number of questions
+        encoding (str | None, optional): The `encode` mode. Defaults to None.
+
+    Returns:
+        list[dict[str, Any]]: The raw question data
+    """
+    return [LocalTriviaServer._encode_question(question, encoding) for question in generate_corpus(size)]
+
+
+def scoreboard_json(size: int) -> bytes:
+    """Build the contents of a scores.json file
+
+    Args:
+        size (int): Number of entries
+
+    Returns:
+        bytes: The encoded file
+    """
+    scores: list[dict[str, Any]] = [
+        {"player": f"Player {index}", "score": index * 100, "date": datetime(2024, 1, 1).isoformat()}
+        for index in range(size)
+    ]
+    return json.dumps(scores, indent=2).encode()
+
+
+@contextlib.contextmanager
+def working_directory() -> Iterator[Path]:
+    """Run the block in a fresh temporary working directory
+
+    Yields:
+        Path: The temporary directory
+    """
+    previous: Path = Path.cwd()
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            yield Path(directory)
+        finally:
+            os.chdir(previous)
+
+
+@contextlib.contextmanager
+def offline_quiz_brain() -> Iterator[QuizBrain]:
+    """Create a QuizBrain talking to a local server from a temporary directory
+
+    Yields:
+        QuizBrain: The quiz brain
+    """
+    with LocalTriviaServer() as server, working_directory():
+        previous_url: str | None = os.environ.get("TRIVIA_API_BASE_URL")
+        os.environ["TRIVIA_API_BASE_URL"] = server.base_url
+        try:
+            controller = NullController()
+            brain = QuizBrain(controller, prefetch_depth=0)
+            controller.quiz_brain = brain
+            with brain.api_client:
+                yield brain
+        finally:
+            if previous_url is None:
+                del os.environ["TRIVIA_API_BASE_URL"]
+            else:
+                os.environ["TRIVIA_API_BASE_URL"] = previous_url
+
+
+def _cold(func: Callable[[], object]) -> Callable[[], object]:
+    """Clear the decode memo before every call, so memoized strings do not hide decoding costs
+
+    Args:
+        func (Callable[[], object]): The code to time
+
+    Returns:
+        Callable[[], object]: The wrapped code
+    """
+
+    def run() -> object:
+        text_decoding._decode_default.cache_clear()
+        text_decoding._decode_url3986.cache_clear()
+        return func()
+
+    return run
+
+
+@scenario(f"api.format_question.{FORMAT_BATCH_SIZE}")
+@contextlib.contextmanager
+def format_question() -> Iterator[Callable[[], object]]:
+    """Format a large response one question at a time"""
+    raw: list[dict[str, Any]] = encoded_results(FORMAT_BATCH_SIZE)
+    with TriviaAPIClient() as client:
+        yield _cold(lambda: [client._format_question(data) for data in raw])
+
+
+@scenario(f"api.format_questions.{FORMAT_BATCH_SIZE}")
+@contextlib.contextmanager
+def format_questions() -> Iterator[Callable[[], object]]:
+    """Format a large response in one batch"""
+    raw: list[dict[str, Any]] = encoded_results(FORMAT_BATCH_SIZE)
+    with TriviaAPIClient() as client:
+        yield _cold(lambda: client._format_questions(raw))
+
+
+@scenario(f"api.format_questions.url3986.{FORMAT_BATCH_SIZE}")
+@contextlib.contextmanager
+def format_questions_url3986() -> Iterator[Callable[[], object]]:
+    """Format a large url3986-encoded response in one batch"""
+    raw: list[dict[str, Any]] = encoded_results(FORMAT_BATCH_SIZE, "url3986")
+    with TriviaAPIClient(encoding="url3986") as client:
+        yield _cold(lambda: client._format_questions(raw))
+
+
+def _store_in_new_cache(store: Callable[[QuestionCache], object]) -> None:
+    """Store questions in an empty in-memory cache, so every call inserts them all
+
+    Args:
+        store (Callable[[QuestionCache], object]): Stores the questions in the cache
+    """
+    with QuestionCache() as cache:
+        store(cache)
+
+
+@scenario(f"cache.store_decoded.{FORMAT_BATCH_SIZE}")
+@contextlib.contextmanager
+def store_decoded() -> Iterator[Callable[[], object]]:
+    """Decode a large response and store the questions, as ingest did before add_encoded"""
+    raw: list[dict[str, Any]] = encoded_results(FORMAT_BATCH_SIZE)
+    with TriviaAPIClient() as client:
+        yield _cold(lambda: _store_in_new_cache(lambda cache: cache.add_questions(client._format_questions(raw))))
+
+
+@scenario(f"cache.store_encoded.{FORMAT_BATCH_SIZE}")
+@contextlib.contextmanager
+def store_encoded() -> Iterator[Callable[[], object]]:
+    """Store a large response as it was sent, the way the harvester and cache top-ups do"""
+    raw: list[dict[str, Any]] = encoded_results(FORMAT_BATCH_SIZE)
+    yield _cold(lambda: _store_in_new_cache(lambda cache: cache.add_encoded(raw)))
+
+
+@scenario("api.fetch_questions.local_server")
+@contextlib.contextmanager
+def fetch_questions() -> Iterator[Callable[[], object]]:
+    """Fetch 50 questions from the local server, including token resets"""
+    with LocalTriviaServer(corpus=generate_corpus(2000)) as server, TriviaAPIClient(base_url=server.base_url) as client:
+        yield lambda: client.fetch_questions(amount=50, use_cache=False)
+
+
+@scenario(f"bank.indices.{BANK_SIZE}")
+@contextlib.contextmanager
+def bank_indices() -> Iterator[Callable[[], object]]:
+    """Filter a large question bank on all three columns, without the memoized indices"""
+    bank = QuestionBank(generate_corpus(BANK_SIZE))
+
+    def run() -> object:
+        bank._indices.clear()
+        return bank.indices("History", "easy", "multiple")
+
+    yield run
+
+
+@scenario(f"bank.sample.{BANK_SIZE}")
+@contextlib.contextmanager
+def bank_sample() -> Iterator[Callable[[], object]]:
+    """Build a game from a large question bank"""
+    bank = QuestionBank(generate_corpus(BANK_SIZE))
+    yield lambda: bank.sample(10, "History", "easy", "multiple")
+
+
+@scenario(f"quiz.show_next_question.{QUEUE_LENGTH}")
+@contextlib.contextmanager
+def show_next_question() -> Iterator[Callable[[], object]]:
+    """Play through a long question queue"""
+    queue: list[Question] = generate_corpus(QUEUE_LENGTH)
+
+    with offline_quiz_brain() as brain:
+
+        def run() -> None:
+            brain.questions = QuestionSource(queue)
+            for _ in range(QUEUE_LENGTH):
+                brain.show_next_question()
+
+        yield run
+
+
+def _save_to_json_scenario(size: int) -> None:
+    """Register a scenario saving a score next to an existing scoreboard
+
+    Args:
+        size (int): Number of entries already in scores.json
+
+    Returns:
+        None
+    """
+
+    @scenario(f"quiz.save_to_json.{size}")
+    @contextlib.contextmanager
+    def save_to_json() -> Iterator[Callable[[], object]]:
+        contents: bytes = scoreboard_json(size)
+        entry = ScoreboardEntry("Benchmark", 1000, date=datetime(2024, 1, 2))
+
+        with offline_quiz_brain() as brain:
+
+            def run() -> None:
+                Path("scores.json").write_bytes(contents)
+                with contextlib.redirect_stdout(io.StringIO()):
+                    brain._save_to_json(entry)
+
+            yield run
+
+
+for _size in SCOREBOARD_SIZES:
+    _save_to_json_scenario(_size)
+
+
+@scenario("view.scoreboard.load_scores")
+@contextlib.contextmanager
+def load_scores() -> Iterator[Callable[[], object]]:
+    """Load and render a full scoreboard, needs a display"""
+    import customtkinter as ctk  # type: ignore[import-untyped]
+
+    from trivia_game.view.frames.score_board import ScoreboardFrame
+
+    with working_directory() as directory:
+        (directory / "scores.json").write_bytes(scoreboard_json(10))
+        try:
+            root = ctk.CTk()
+        except Exception as e:
+            msg: str = f"no display: {e}"
+            raise ScenarioSkipped(msg) from e
+
+        frame = ScoreboardFrame(root, NullController())
+        yield frame.load_scores
+        root.destroy()
+
+
+@contextlib.contextmanager
+def running_game_server(client: TriviaAPIClient, directory: Path) -> Iterator[tuple[GameServer, Callable[[str], Any]]]:
+    """Run a game server on a loop in a thread of this process, with one keep-alive connection to it
+
+    Args:
+        client (TriviaAPIClient): The API client of the server's engine
+        directory (Path): The directory of the scoreboard file
+
+    Yields:
+        tuple[GameServer, Callable[[str], Any]]: The server, and a function POSTing to a path and
+            returning the decoded response
+    """
+    game_server = GameServer(GameEngine(client), scores_path=directory / "scores.json")
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, name="game-server", daemon=True)
+    thread.start()
+    asyncio.run_coroutine_threadsafe(game_server.start(), loop).result()
+    connection = http.client.HTTPConnection(game_server.host, int(game_server.base_url.rsplit(":", 1)[1]))
+
+    def post(path: str) -> Any:
+        connection.request("POST", path)
+        return json.loads(connection.getresponse().read())
+
+    try:
+        yield game_server, post
+    finally:
+        connection.close()
+        asyncio.run_coroutine_threadsafe(game_server.stop(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+
+@scenario("server.next_question.keep_alive")
+@contextlib.contextmanager
+def server_next_question() -> Iterator[Callable[[], object]]:
+    """Draw a question from the game server over a keep-alive connection
+
+    The server loop runs in a thread of this process, so one over the median is the
+    requests per second of one core, including the client.
+    """
+    queue: list[Question] = generate_corpus(QUEUE_LENGTH)
+
+    with (
+        LocalTriviaServer() as upstream,
+        working_directory() as directory,
+        TriviaAPIClient(base_url=upstream.base_url, cache=QuestionCache()) as client,
+        running_game_server(client, directory) as (game_server, post),
+    ):
+        session_id: str = post("/sessions")["session"]
+        post(f"/sessions/{session_id}/game")
+
+        def run() -> None:
+            session = game_server.engine.get_session(session_id)
+            if not len(session.questions):
+                session.questions = QuestionSource(queue)
+            post(f"/sessions/{session_id}/next")
+
+        yield run
+
+
+@scenario("server.start_game.cached")
+@contextlib.contextmanager
+def server_start_game_cached() -> Iterator[Callable[[], object]]:
+    """Start a game on the game server with every game served from a warm question cache
+
+    The cache lets questions be served again right away, so it never runs short and no
+    call reaches the upstream server. One over the median is the game starts per second
+    of one core, including the client.
+    """
+    cache = QuestionCache(reuse_after=0)
+    cache.add_questions(generate_corpus(QUEUE_LENGTH))
+
+    with (
+        LocalTriviaServer() as upstream,
+        working_directory() as directory,
+        TriviaAPIClient(base_url=upstream.base_url, cache=cache) as client,
+        running_game_server(client, directory) as (_, post),
+    ):
+        session_id: str = post("/sessions")["session"]
+        requests_before: int = upstream.requests["api.php"]
+
+        def run() -> None:
+            post(f"/sessions/{session_id}/game")
+
+        yield run
+
+        if upstream.requests["api.php"] != requests_before:
+            msg: str = "games were not served from the cache"
+            raise RuntimeError(msg)
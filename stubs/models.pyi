@@ -17,4 +17,4 @@ class Question(TypedDict):
     category: str
     question: str
     correct_answer: str
-    incorrect_answers: list[str]
+    incorrect_answers: tuple[str, ...]
@@ -1,20 +1,44 @@
+from pathlib import Path
 from typing import ClassVar, Literal
 
 from trivia_game.base_types import AppControllerProtocol
+from trivia_game.engine import GameEngine, GameEvent, GameSession
+from trivia_game.metrics import MetricsRegistry
+from trivia_game.metrics_export import MetricsServer, TextfileWriter
 from trivia_game.models import Question, ScoreboardEntry
+from trivia_game.prefetch import QuestionPrefetcher
+from trivia_game.question_counts import QuestionCountIndex
+from trivia_game.question_source import QuestionSource
 from trivia_game.trivia_api import TriviaAPIClient
 
 class QuizBrain:
     controller: AppControllerProtocol
+    metrics: MetricsRegistry
+    exporters: list[MetricsServer | TextfileWriter]
+    engine: GameEngine
+    session: GameSession
     api_client: TriviaAPIClient
+    prefetcher: QuestionPrefetcher
+    count_index: QuestionCountIndex
     categories: dict[str, str]
     current_question: Question | None
-    questions: list[Question]
+    questions: QuestionSource
     score: int
+    endless: bool
+    misses_in_a_row: int
     TYPE_MAPPING: ClassVar[dict[str, str | None]]
     DIFFICULTY_MULTIPLIER: ClassVar[dict[str, int]]
+    QUESTIONS_PER_GAME: ClassVar[int]
+    SLOW_REQUEST_SECONDS: ClassVar[float]
+    ENDLESS_MISS_LIMIT: ClassVar[int]
 
-    def __init__(self, controller: AppControllerProtocol) -> None: ...
+    def __init__(
+        self,
+        controller: AppControllerProtocol,
+        prefetch_depth: int = 2,
+        data_dir: Path = ...,
+        api_client: TriviaAPIClient | None = None,
+    ) -> None: ...
     def _load_categories(self) -> None: ...
     def get_available_categories(self) -> list[str]: ...
     def get_category_id(self, category_name: str) -> str | None: ...
@@ -22,15 +46,25 @@ class QuizBrain:
     def get_difficulty_value(self, difficulty_name: str) -> Literal["easy", "medium", "hard"] | None: ...
     def get_available_question_types(self) -> list[str]: ...
     def get_question_type_value(self, question_type: str) -> str | None: ...
+    def get_question_limit(
+        self,
+        category: str | None,
+        difficulty: Literal["easy", "medium", "hard"] | None,
+        question_type: Literal["multiple", "boolean"] | None,
+    ) -> int | None: ...
+    def request_question_counts(self, category: str | None) -> None: ...
     def load_questions(
         self,
         category: str | None,
         difficulty: Literal["easy", "medium", "hard"] | None,
         question_type: Literal["multiple", "boolean"] | None,
+        endless: bool = False,
     ) -> None: ...
     def show_next_question(self) -> None: ...
     def check_answer(self, selected_answer: str) -> bool: ...
     def _calculate_score(self, difficulty: str) -> int: ...
+    def _on_event(self, event: GameEvent) -> None: ...
+    def close(self) -> None: ...
     def end_game(self) -> None: ...
     def save_score(self, player_name: str) -> None: ...
     def _save_to_json(self, entry: ScoreboardEntry) -> None: ...
@@ -1,25 +1,71 @@
+import threading
 import types
 from typing import Any, ClassVar
 
 import requests
 
+from trivia_game.circuit_breaker import CircuitBreaker
+from trivia_game.metrics import MetricsRegistry
+from trivia_game.models import EncodingType
+from trivia_game.question_cache import QuestionCache
+from trivia_game.rate_limiter import RateLimiter
+from trivia_game.token_store import TokenStore
+from trivia_game.transport import Transport
+
 class TriviaAPIClient:
     QUESTIONS_API_URL: ClassVar[str]
     SESSION_TOKEN_API_URL: ClassVar[str]
     CATEGORIES_API_URL: ClassVar[str]
+    COUNT_API_URL: ClassVar[str]
 
     ERROR_MESSAGES: ClassVar[dict[int, str]]
 
     HTTP_ERROR_MAPPING: ClassVar[dict[int, tuple[type[Exception], str]]]
     REQUEST_ERROR_MAPPING: ClassVar[dict[int, tuple[type[Exception], str]]]
 
-    def __init__(self, timeout: int = 10, retries: int = 3) -> None: ...
+    cache: QuestionCache | None
+    token_store: TokenStore | None
+    rate_limiter: RateLimiter | None
+    encoding: EncodingType | None
+    base_url: str | None
+    transport: Transport | None
+    metrics: MetricsRegistry
+    circuit_breaker: CircuitBreaker | None
+    @property
+    def session(self) -> requests.Session: ...
+    RATE_LIMITED_URLS: ClassVar[tuple[str, ...]]
+    COALESCED_URLS: ClassVar[tuple[str, ...]]
+    ENDPOINT_NAMES: ClassVar[dict[str, str]]
+    DEFAULT_RETRIES: ClassVar[int]
+    CIRCUIT_FAILURE_STATUSES: ClassVar[tuple[int, ...]]
+
+    def __init__(
+        self,
+        timeout: int = 10,
+        retries: int | None = None,
+        cache: QuestionCache | None = None,
+        token_store: TokenStore | None = None,
+        rate_limiter: RateLimiter | None = None,
+        encoding: EncodingType | None = None,
+        base_url: str | None = None,
+        transport: Transport | None = None,
+        metrics: MetricsRegistry | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+    ) -> None: ...
     def _create_session(self, retries: int) -> requests.Session: ...
     def _handle_response_code(self, data: dict[str, Any]) -> None: ...
+    def _resolve_url(self, url: str) -> str: ...
     def _make_request(self, url: str, params: dict[str, Any] | None = None) -> dict[str, Any]: ...
+    def _send_request(self, url: str, params: dict[str, Any] | None = None) -> dict[str, Any]: ...
+    def next_request_delay(self) -> float: ...
     def request_session_token(self) -> str: ...
-    def reset_session_token(self) -> str: ...
+    def _ensure_session_token(self) -> str: ...
+    def prefetch_session_token(self) -> threading.Thread: ...
+    def _request_and_store_token(self) -> str: ...
+    def renew_session_token(self) -> str: ...
+    def reset_session_token(self, token: str | None = None) -> str: ...
     def fetch_categories(self) -> dict[str, str]: ...
+    def fetch_question_count(self, category: str) -> dict[str, int]: ...
     def fetch_questions(
         self,
         amount: int = 10,
@@ -27,10 +73,29 @@ class TriviaAPIClient:
         difficulty: str | None = None,
         question_type: str | None = None,
         max_retries: int = 3,
+        use_cache: bool = True,
+        token: str | None = None,
     ) -> list[Any]: ...
+    def fetch_encoded(
+        self,
+        amount: int = 10,
+        category: str | None = None,
+        difficulty: str | None = None,
+        question_type: str | None = None,
+        max_retries: int = 3,
+        token: str | None = None,
+    ) -> list[dict[str, Any]]: ...
+    def top_up_cache(
+        self,
+        amount: int,
+        category: str | None = None,
+        difficulty: str | None = None,
+        question_type: str | None = None,
+    ) -> threading.Thread | None: ...
     @staticmethod
     def _decode_text(text: str) -> str: ...
     def _format_question(self, data: dict[str, Any]) -> Any: ...
+    def _format_questions(self, results: list[dict[str, Any]]) -> list[Any]: ...
     def _validate_token(self, data: dict[str, Any]) -> None: ...
     def __enter__(self) -> TriviaAPIClient: ...
     def __exit__(
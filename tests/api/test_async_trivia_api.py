@@ -0,0 +1,225 @@
+import asyncio
+import contextlib
+import json
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from trivia_game.async_trivia_api import AsyncTriviaAPIClient
+from trivia_game.exceptions import (
+    CategoryError,
+    NoResultsError,
+    ProtocolError,
+    RateLimitError,
+    TokenError,
+    TriviaAPIError,
+)
+from trivia_game.models import Question, TriviaResponseCode
+
+
+@pytest.fixture
+def async_client():
+    """Fixture for AsyncTriviaAPIClient without retries"""
+    return AsyncTriviaAPIClient(retries=0)
+
+
+def json_body(data):
+    return json.dumps(data).encode()
+
+
+QUESTION_DATA = {
+    "type": "multiple",
+    "difficulty": "medium",
+    "category": "Entertainment%3A%20Video%20Games",
+    "question": "What&apos;s the name%3F",
+    "correct_answer": "Mario",
+    "incorrect_answers": ["Bowser", "Peach", "Wario"],
+}
+
+
+class TestHttpGet:
+    def test_http_get_reads_response(self, async_client):
+        """Test the stream-based HTTP GET against a local server"""
+        received = []
+
+        async def handle(reader, writer):
+            received.append(await reader.readline())
+            while await reader.readline() not in (b"\r\n", b""):
+                pass
+            body = b'{"response_code": 0}'
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body))
+            await writer.drain()
+            writer.close()
+
+        async def run():
+            server = await asyncio.start_server(handle, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            async with server:
+                return await async_client._http_get(f"http://127.0.0.1:{port}/api.php", {"amount": "1", "token": None})
+
+        status_code, body = asyncio.run(run())
+
+        assert status_code == 200
+        assert json.loads(body) == {"response_code": 0}
+        assert received == [b"GET /api.php?amount=1 HTTP/1.1\r\n"]
+
+    @pytest.mark.parametrize("response", [b"HTTP/1.1 200 OK\r\n\r\n{}", b"garbage\r\n"])
+    def test_http_get_waits_for_the_connection_to_close(self, async_client, monkeypatch, response):
+        """Test the connection is closed and awaited, also when the response is invalid"""
+        writer = Mock(drain=AsyncMock(), wait_closed=AsyncMock())
+
+        async def open_connection(*args, **kwargs):
+            reader = asyncio.StreamReader()
+            reader.feed_data(response)
+            reader.feed_eof()
+            return reader, writer
+
+        monkeypatch.setattr(asyncio, "open_connection", open_connection)
+
+        with contextlib.suppress(ValueError):
+            asyncio.run(async_client._http_get("http://127.0.0.1/api.php"))
+
+        writer.close.assert_called_once_with()
+        writer.wait_closed.assert_awaited_once_with()
+
+    def test_read_chunked(self):
+        """Test decoding of a chunked body"""
+
+        async def run():
+            reader = asyncio.StreamReader()
+            reader.feed_data(b"4\r\nWiki\r\n5\r\npedia\r\n0\r\n\r\n")
+            reader.feed_eof()
+            return await AsyncTriviaAPIClient._read_chunked(reader)
+
+        assert asyncio.run(run()) == b"Wikipedia"
+
+
+class TestAsyncMakeRequest:
+    def test_successful_request(self, async_client):
+        async_client._http_get = AsyncMock(return_value=(200, json_body({"some": "data"})))
+        assert asyncio.run(async_client._make_request("http://test.url")) == {"some": "data"}
+
+    @pytest.mark.parametrize(
+        "status_code,expected_exception,expected_error",
+        [
+            (404, TriviaAPIError, "Request failed: Resource not found"),
+            (429, RateLimitError, "Request failed: Rate limit exceeded"),
+            (418, TriviaAPIError, "Request failed: HTTP 418"),
+        ],
+    )
+    def test_http_error_codes(self, async_client, status_code, expected_exception, expected_error):
+        async_client._http_get = AsyncMock(return_value=(status_code, b""))
+        with pytest.raises(expected_exception, match=expected_error):
+            asyncio.run(async_client._make_request("http://test.url"))
+
+    @pytest.mark.parametrize(
+        "error,expected_error",
+        [
+            (TimeoutError(), "Request failed: Request timed out"),
+            (ConnectionRefusedError(), "Request failed: Connection error"),
+        ],
+    )
+    def test_request_exceptions(self, async_client, error, expected_error):
+        async_client._http_get = AsyncMock(side_effect=error)
+        with pytest.raises(TriviaAPIError, match=expected_error):
+            asyncio.run(async_client._make_request("http://test.url"))
+
+    def test_invalid_http_is_not_retried(self):
+        client = AsyncTriviaAPIClient(retries=2)
+        client._http_get = AsyncMock(side_effect=ValueError("Invalid status line: b'garbage'"))
+
+        with pytest.raises(ProtocolError, match="Request failed: Invalid HTTP response"):
+            asyncio.run(client._make_request("http://test.url"))
+        assert client._http_get.await_count == 1
+
+    def test_retries_status_forcelist(self):
+        client = AsyncTriviaAPIClient(retries=1)
+        client._http_get = AsyncMock(side_effect=[(503, b""), (200, json_body({"ok": True}))])
+
+        assert asyncio.run(client._make_request("http://test.url")) == {"ok": True}
+        assert client._http_get.await_count == 2
+
+    def test_invalid_json(self, async_client):
+        async_client._http_get = AsyncMock(return_value=(200, b"not json"))
+        with pytest.raises(TriviaAPIError, match="Invalid JSON response"):
+            asyncio.run(async_client._make_request("http://test.url"))
+
+    def test_response_code_error(self, async_client):
+        async_client._http_get = AsyncMock(return_value=(200, json_body({"response_code": 1})))
+        with pytest.raises(NoResultsError, match="Not enough questions available for your query"):
+            asyncio.run(async_client._make_request("http://test.url"))
+
+
+class TestAsyncFetch:
+    def test_fetch_categories(self, async_client):
+        body = json_body({"trivia_categories": [{"id": 9, "name": "General Knowledge"}]})
+        async_client._http_get = AsyncMock(return_value=(200, body))
+
+        assert asyncio.run(async_client.fetch_categories()) == {"General Knowledge": "9"}
+
+    def test_fetch_categories_error(self, async_client):
+        async_client._http_get = AsyncMock(return_value=(200, json_body({"trivia_categories": []})))
+        with pytest.raises(CategoryError, match="No categories found in API response"):
+            asyncio.run(async_client.fetch_categories())
+
+    def test_fetch_questions_requests_token_once(self, async_client):
+        token_body = json_body({"response_code": 0, "token": "abc123"})
+        questions_body = json_body({"response_code": 0, "results": [QUESTION_DATA]})
+
+        async def fake_get(url, params=None):
+            return (200, token_body) if url == async_client.SESSION_TOKEN_API_URL else (200, questions_body)
+
+        async_client._http_get = AsyncMock(side_effect=fake_get)
+
+        async def run():
+            return await asyncio.gather(*(async_client.fetch_questions(amount=1) for _ in range(5)))
+
+        results = asyncio.run(run())
+
+        token_calls = [call for call in async_client._http_get.await_args_list if call.args[0].endswith("token.php")]
+        assert len(token_calls) == 1
+        assert all(isinstance(questions[0], Question) for questions in results)
+        assert results[0][0].question == "What's the name?"
+        assert results[0][0].category == "Entertainment: Video Games"
+
+    def test_fetch_questions_token_empty_auto_reset(self, async_client):
+        async_client._session_token = "initial_token"
+        async_client._http_get = AsyncMock(
+            side_effect=[
+                (200, json_body({"response_code": TriviaResponseCode.TOKEN_EMPTY})),
+                (200, json_body({"response_code": 0, "token": "initial_token"})),
+                (200, json_body({"response_code": 0, "results": [QUESTION_DATA]})),
+            ]
+        )
+
+        questions = asyncio.run(async_client.fetch_questions(amount=1))
+
+        assert len(questions) == 1
+        assert async_client._http_get.await_count == 3
+
+    def test_reset_token_without_session(self, async_client):
+        with pytest.raises(TokenError, match="Cannot reset: No active session token"):
+            asyncio.run(async_client.reset_session_token())
+
+    def test_reset_token_argument(self, async_client):
+        async_client._http_get = AsyncMock(return_value=(200, json_body({"response_code": 0, "token": "other"})))
+
+        assert asyncio.run(async_client.reset_session_token("other")) == "other"
+        assert async_client._http_get.await_args.args[1] == {"command": "reset", "token": "other"}
+
+    def test_fetch_questions_token_not_found_renews_token(self, async_client):
+        async_client._session_token = "expired_token"
+        async_client._http_get = AsyncMock(
+            side_effect=[
+                (200, json_body({"response_code": TriviaResponseCode.TOKEN_NOT_FOUND})),
+                (200, json_body({"response_code": 0, "token": "new_token"})),
+                (200, json_body({"response_code": 0, "results": [QUESTION_DATA]})),
+            ]
+        )
+
+        questions = asyncio.run(async_client.fetch_questions(amount=1))
+
+        assert len(questions) == 1
+        assert async_client._session_token == "new_token"
+        assert async_client._http_get.await_args_list[1].args[1] == {"command": "request"}
+        assert async_client._http_get.await_args.args[1]["token"] == "new_token"
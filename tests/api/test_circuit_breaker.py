@@ -0,0 +1,180 @@
+import threading
+
+import pytest
+
+from trivia_game.circuit_breaker import CircuitBreaker
+from trivia_game.exceptions import CategoryError, CircuitOpenError, NoResultsError, TriviaAPIError
+from trivia_game.local_server import LocalTriviaServer, generate_corpus
+from trivia_game.question_cache import QuestionCache
+from trivia_game.trivia_api import TriviaAPIClient
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock)
+
+
+@pytest.fixture
+def server():
+    with LocalTriviaServer(corpus=generate_corpus(20)) as local_server:
+        yield local_server
+
+
+class TestCircuitBreaker:
+    def test_opens_after_consecutive_failures(self, breaker):
+        breaker.record_failure()
+        assert breaker.state == "closed"
+
+        breaker.record_failure()
+
+        assert breaker.state == "open"
+        assert not breaker.allow_request()
+        assert breaker.retry_after() == 10
+
+    def test_success_resets_failures(self, breaker):
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+
+        assert breaker.state == "closed"
+
+    def test_slow_calls_count_as_failures(self, clock):
+        breaker = CircuitBreaker(failure_threshold=1, slow_call_threshold=1.0, clock=clock)
+
+        breaker.record_success(0.5)
+        assert breaker.state == "closed"
+
+        breaker.record_success(2.0)
+        assert breaker.state == "open"
+
+    def test_half_open_allows_one_trial(self, breaker, clock):
+        breaker.record_failure()
+        breaker.record_failure()
+        clock.now = 10
+
+        assert breaker.state == "half_open"
+        assert breaker.allow_request()
+        assert not breaker.allow_request()
+
+        breaker.record_success()
+        assert breaker.state == "closed"
+
+    def test_failed_trial_reopens(self, breaker, clock):
+        breaker.record_failure()
+        breaker.record_failure()
+        clock.now = 10
+        breaker.allow_request()
+
+        breaker.record_failure()
+
+        assert breaker.state == "open"
+        assert breaker.retry_after() == 10
+
+    def test_probe_closes_circuit_in_background(self):
+        calls = []
+        recovered = threading.Event()
+
+        def probe():
+            calls.append(1)
+            if len(calls) < 2:
+                raise ConnectionError
+            recovered.set()
+
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01, probe=probe)
+        breaker.record_failure()
+        assert not breaker.allow_request()
+
+        assert recovered.wait(timeout=2)
+        breaker._probe_thread.join(timeout=2)
+        assert breaker.state == "closed"
+        assert len(calls) == 2
+
+    def test_reset_stops_probing(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60, probe=lambda: None)
+        breaker.record_failure()
+
+        breaker.reset()
+
+        assert breaker.state == "closed"
+        assert breaker._probe_thread is None
+
+
+class TestClientCircuitBreaker:
+    def test_open_circuit_refuses_requests(self, server, breaker):
+        server.error_rate = 1.0
+
+        with TriviaAPIClient(retries=0, base_url=server.base_url, circuit_breaker=breaker) as client:
+            for _ in range(2):
+                with pytest.raises(TriviaAPIError):
+                    client.fetch_categories()
+            with pytest.raises(CategoryError) as error:
+                client.fetch_categories()
+
+        assert isinstance(error.value.__cause__, CircuitOpenError)
+        assert server.requests["api_category.php"] == 2
+        assert client.metrics.counter("trivia_api_requests_total", endpoint="categories", outcome="CircuitOpenError")
+
+    def test_api_errors_do_not_open_circuit(self, server, breaker):
+        with TriviaAPIClient(retries=0, base_url=server.base_url, circuit_breaker=breaker) as client:
+            for _ in range(2):
+                with pytest.raises(NoResultsError):
+                    client.fetch_questions(amount=50, use_cache=False)
+
+        assert breaker.state == "closed"
+
+    @pytest.mark.parametrize("retries", [0, 1])
+    def test_rate_limiting_does_not_open_circuit(self, server, breaker, retries):
+        server.rate_limit_interval = 60.0
+
+        with TriviaAPIClient(retries=retries, base_url=server.base_url, circuit_breaker=breaker) as client:
+            client.fetch_questions(amount=1, use_cache=False)
+            for _ in range(2):
+                with pytest.raises(TriviaAPIError):
+                    client.fetch_questions(amount=1, use_cache=False)
+
+        assert breaker.state == "closed"
+        assert server.requests["api.php"] == 3 + 2 * retries
+
+    def test_client_installs_probe(self, server, breaker):
+        with TriviaAPIClient(retries=0, base_url=server.base_url, circuit_breaker=breaker) as client:
+            breaker.probe()
+
+        assert breaker.probe == client._probe
+        assert server.requests["api_category.php"] == 1
+
+    def test_open_circuit_serves_cached_questions(self, server, breaker):
+        cache = QuestionCache()
+        client = TriviaAPIClient(retries=0, base_url=server.base_url, cache=cache, circuit_breaker=breaker)
+        client.fetch_questions(amount=5, use_cache=False)
+        server.error_rate = 1.0
+
+        with client:
+            batches = [client.fetch_questions(amount=10) for _ in range(3)]
+
+        assert breaker.state == "open"
+        assert [len(questions) for questions in batches] == [5, 5, 5]
+        assert client.metrics.counter("trivia_api_fallbacks_total") == 3
+
+    def test_open_circuit_without_cached_questions(self, server, breaker):
+        server.error_rate = 1.0
+
+        client = TriviaAPIClient(retries=0, base_url=server.base_url, cache=QuestionCache(), circuit_breaker=breaker)
+        with client:
+            for _ in range(2):
+                with pytest.raises(TriviaAPIError):
+                    client.fetch_questions(amount=10)
+            with pytest.raises(CircuitOpenError):
+                client.fetch_questions(amount=10)
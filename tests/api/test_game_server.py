@@ -0,0 +1,216 @@
+import asyncio
+import json
+import threading
+from unittest.mock import Mock
+
+import pytest
+
+from trivia_game.engine import GameEngine
+from trivia_game.local_server import LocalTriviaServer, generate_corpus
+from trivia_game.metrics import MetricsRegistry
+from trivia_game.question_cache import QuestionCache
+from trivia_game.server import GameServer
+from trivia_game.trivia_api import TriviaAPIClient
+
+
+@pytest.fixture
+def upstream():
+    with LocalTriviaServer(corpus=generate_corpus(600)) as local_server:
+        yield local_server
+
+
+@pytest.fixture
+def engine(upstream):
+    with TriviaAPIClient(
+        retries=0, base_url=upstream.base_url, cache=QuestionCache(), metrics=MetricsRegistry()
+    ) as api_client:
+        yield GameEngine(api_client)
+
+
+@pytest.fixture
+def game_server(engine, tmp_path):
+    return GameServer(engine, scores_path=tmp_path / "scores.json")
+
+
+class Connection:
+    """Keep-alive HTTP connection to the game server"""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    async def request(self, method, path, payload=None):
+        body = b"" if payload is None else json.dumps(payload).encode()
+        head = f"{method} {path} HTTP/1.1\r\nHost: test\r\nContent-Length: {len(body)}\r\n\r\n"
+        self.writer.write(head.encode() + body)
+        status = int((await self.reader.readline()).split()[1])
+        headers = {}
+        while (line := await self.reader.readline()) != b"\r\n":
+            name, _, value = line.decode().partition(":")
+            headers[name.lower()] = value.strip()
+        return status, json.loads(await self.reader.readexactly(int(headers["content-length"])))
+
+
+def run_with_server(game_server, play):
+    async def run():
+        await game_server.start()
+        reader, writer = await asyncio.open_connection(game_server.host, int(game_server.base_url.rsplit(":", 1)[1]))
+        try:
+            return await play(Connection(reader, writer))
+        finally:
+            writer.close()
+            await game_server.stop()
+
+    return asyncio.run(run())
+
+
+def event(payload, name):
+    return next(item for item in payload["events"] if item["event"] == name)
+
+
+class TestGameServer:
+    def test_plays_a_game_over_one_connection(self, game_server, upstream):
+        async def play(connection):
+            status, categories = await connection.request("GET", "/categories")
+            assert status == 200
+            assert "History" in categories["categories"]
+
+            status, created = await connection.request("POST", "/sessions")
+            assert status == 201
+            session_id = created["session"]
+            session = f"/sessions/{session_id}"
+
+            _, state = await connection.request("POST", f"{session}/game", {"category": "History", "type": "multiple"})
+            shown = event(state, "question_shown")
+            assert "correct_answer" not in shown
+            assert shown["category"] == "History"
+
+            answered = 0
+            while state["active"]:
+                correct = next(q for q in upstream.corpus if q.question == shown["question"]).correct_answer
+                status, state = await connection.request("POST", f"{session}/answer", {"answer": correct})
+                assert status == 200
+                assert event(state, "answer_checked")["correct"]
+                answered += 1
+                _, state = await connection.request("POST", f"{session}/next")
+                if state["active"]:
+                    shown = event(state, "question_shown")
+
+            assert event(state, "game_over") == {"event": "game_over", "score": state["score"], "answered": answered}
+            status, saved = await connection.request("POST", f"{session}/score", {"player": "Kiosk 1"})
+            assert status == 200
+            assert saved["scores"][0]["player"] == "Kiosk 1"
+            assert (await connection.request("POST", f"{session}/score", {"player": "Kiosk 1"}))[0] == 409
+
+            _, scores = await connection.request("GET", "/scores")
+            assert scores["scores"] == saved["scores"]
+            assert (await connection.request("DELETE", session))[0] == 200
+            assert (await connection.request("POST", f"{session}/next"))[0] == 404
+
+        run_with_server(game_server, play)
+        assert game_server.connections == 1
+
+    def test_rejects_invalid_requests(self, game_server):
+        async def play(connection):
+            _, created = await connection.request("POST", "/sessions")
+            session_id = created["session"]
+            session = f"/sessions/{session_id}"
+
+            assert (await connection.request("GET", "/missing"))[0] == 404
+            assert (await connection.request("GET", "/sessions"))[0] == 405
+            assert (await connection.request("POST", f"{session}/game", {"difficulty": "extreme"}))[0] == 400
+            assert (await connection.request("POST", f"{session}/answer", {"answer": "A"}))[0] == 409
+            assert (await connection.request("POST", f"{session}/answer", ["A"]))[0] == 400
+            assert (await connection.request("POST", f"{session}/score", {"player": "Idle"}))[0] == 409
+
+            await connection.request("POST", f"{session}/game")
+            assert (await connection.request("POST", f"{session}/score", {"player": "Early"}))[0] == 409
+            await connection.request("POST", f"{session}/answer", {"answer": "A"})
+            assert (await connection.request("POST", f"{session}/answer", {"answer": "A"}))[0] == 409
+
+        run_with_server(game_server, play)
+
+    def test_requests_of_a_session_wait_for_each_other(self, game_server, upstream):
+        upstream.latency = 0.2
+
+        async def play(connection):
+            _, created = await connection.request("POST", "/sessions")
+            session_id = created["session"]
+            session = f"/sessions/{session_id}"
+            answer = json.dumps({"answer": "A"}).encode()
+
+            (_, started), (_, answered) = await asyncio.gather(
+                game_server.handle("POST", f"{session}/game"), game_server.handle("POST", f"{session}/answer", answer)
+            )
+            assert started[0] == 200
+            assert event(started[1], "question_shown")
+            assert answered[0] == 200
+            assert event(answered[1], "answer_checked")
+
+            (_, restarted), (_, closed), (_, after_close) = await asyncio.gather(
+                game_server.handle("POST", f"{session}/game"),
+                game_server.handle("DELETE", session),
+                game_server.handle("POST", f"{session}/next"),
+            )
+            assert event(restarted[1], "question_shown")
+            assert closed[0] == 200
+            assert after_close == (404, {"error": "Unknown session"})
+
+        run_with_server(game_server, play)
+
+    def test_sessions_share_the_api_client(self, game_server, engine, upstream):
+        async def play(connection):
+            sessions = [(await connection.request("POST", "/sessions"))[1]["session"] for _ in range(20)]
+            for session in sessions:
+                await connection.request("POST", f"/sessions/{session}/game", {"category": "Science & Nature"})
+            return sessions
+
+        sessions = run_with_server(game_server, play)
+
+        assert len(set(sessions)) == 20
+        lookups = [engine.api_client.metrics.counter("trivia_cache_lookups_total", result=r) for r in ("hit", "miss")]
+        assert len(upstream._tokens) == 1
+        assert sum(lookups) == 20
+        assert upstream.requests["api.php"] >= lookups[1]
+        histograms = engine.metrics.snapshot()["histograms"]["trivia_game_server_request_duration_seconds"]
+        assert any(series["labels"] == {"route": "/sessions/{id}/game", "status": "200"} for series in histograms)
+
+    def test_unexpected_errors_are_answered_with_500(self, game_server, engine):
+        async def play(connection):
+            _, created = await connection.request("POST", "/sessions")
+            session_id = created["session"]
+            await connection.request("POST", f"/sessions/{session_id}/game", {"endless": True})
+            engine.get_session(session_id).next_question = Mock(side_effect=RuntimeError("boom"))
+
+            status, payload = await connection.request("POST", f"/sessions/{session_id}/next")
+            assert (status, payload) == (500, {"error": "Internal server error"})
+            assert (await connection.request("GET", "/categories"))[0] == 200
+
+        run_with_server(game_server, play)
+
+    def test_blocking_calls_run_in_the_server_executor(self, game_server, engine):
+        threads = []
+
+        async def play(connection):
+            _, created = await connection.request("POST", "/sessions")
+            session = engine.get_session(created["session"])
+            session.start = Mock(side_effect=lambda *args: threads.append(threading.current_thread().name))
+            await connection.request("POST", f"/sessions/{session.id}/game")
+
+        run_with_server(game_server, play)
+
+        assert threads[0].startswith("game-server")
+
+    def test_idle_sessions_are_evicted(self, game_server, engine):
+        async def play(connection):
+            idle, active = [(await connection.request("POST", "/sessions"))[1]["session"] for _ in range(2)]
+            await connection.request("POST", f"/sessions/{idle}/game", {"endless": True})
+            questions = engine.get_session(idle).questions
+            game_server._sessions[idle].last_seen -= game_server.session_ttl
+
+            assert game_server.evict_idle_sessions() == 1
+            assert questions._stopped
+            assert (await connection.request("POST", f"/sessions/{idle}/next"))[0] == 404
+            assert (await connection.request("POST", f"/sessions/{active}/next"))[0] == 200
+
+        run_with_server(game_server, play)
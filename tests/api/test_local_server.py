@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+
+from trivia_game.async_trivia_api import AsyncTriviaAPIClient
+from trivia_game.exceptions import NoResultsError, TokenError, TriviaAPIError
+from trivia_game.local_server import LocalTriviaServer, generate_corpus
+from trivia_game.models import Question
+from trivia_game.trivia_api import TriviaAPIClient
+
+
+def make_question(index: int, category: str = "General Knowledge") -> Question:
+    return Question(
+        type="multiple",
+        difficulty="easy",
+        category=category,
+        question=f'Is "{index}" & more < less?',
+        correct_answer=f"Answer {index}",
+        incorrect_answers=["A", "B", "C"],
+    )
+
+
+@pytest.fixture
+def server():
+    with LocalTriviaServer(corpus=[make_question(index) for index in range(6)]) as local_server:
+        yield local_server
+
+
+@pytest.fixture
+def client(server):
+    with TriviaAPIClient(retries=0, base_url=server.base_url) as api_client:
+        yield api_client
+
+
+class TestLocalTriviaServer:
+    def test_generate_corpus_is_reproducible(self):
+        assert generate_corpus(20, seed=1) == generate_corpus(20, seed=1)
+        assert generate_corpus(20, seed=1) != generate_corpus(20, seed=2)
+
+    def test_fetch_categories(self, client):
+        assert client.fetch_categories() == {"General Knowledge": "9", "Science & Nature": "17", "History": "23"}
+
+    @pytest.mark.parametrize("encoding", [None, "url3986"])
+    def test_fetch_questions_round_trip(self, server, encoding):
+        with TriviaAPIClient(base_url=server.base_url, encoding=encoding) as api_client:
+            questions = api_client.fetch_questions(amount=6, category="9")
+
+        assert sorted(questions, key=lambda question: question.question) == server.corpus
+        assert server.requests["api_token.php"] == 1
+
+    def test_token_exhaustion_resets_token(self, client, server):
+        client.fetch_questions(amount=4)
+        client.fetch_questions(amount=4)
+
+        assert server.requests["api_token.php"] == 2
+        assert server.requests["api.php"] == 3
+        assert server.connections == 1
+
+    def test_not_enough_questions(self, client):
+        with pytest.raises(NoResultsError):
+            client.fetch_questions(amount=7)
+
+    def test_not_enough_questions_left_for_token(self, client):
+        token = client.request_session_token()
+        client.fetch_questions(amount=4, token=token)
+
+        with pytest.raises(TokenError, match="Token has returned all possible questions"):
+            client.fetch_questions(amount=4, token=token)
+        assert len(client.fetch_questions(amount=2, token=token)) == 2
+
+    def test_fetch_question_count(self, client):
+        assert client.fetch_question_count("9") == {"total": 6, "easy": 6, "medium": 0, "hard": 0}
+
+    def test_rate_limit(self, server):
+        server.rate_limit_interval = 60.0
+
+        assert server.handle("/api.php", {"amount": "1"}, "client")[0] == 200
+        status, payload = server.handle("/api.php", {"amount": "1"}, "client")
+
+        assert status == 429
+        assert payload["response_code"] == 5
+        assert server.handle("/api.php", {"amount": "1"}, "other client")[0] == 200
+
+    def test_injected_errors(self, client, server):
+        server.error_rate = 1.0
+
+        with pytest.raises(TriviaAPIError, match="Request failed"):
+            client.fetch_categories()
+        assert server.responses[503] == 1
+
+    def test_unknown_token(self, server):
+        status, payload = server.handle("/api.php", {"amount": "1", "token": "unknown"}, "client")
+
+        assert (status, payload["response_code"]) == (200, 3)
+
+    def test_async_client(self, server):
+        async def fetch():
+            async with AsyncTriviaAPIClient(base_url=server.base_url) as api_client:
+                return await asyncio.gather(*(api_client.fetch_questions(amount=3) for _ in range(2)))
+
+        first, second = asyncio.run(fetch())
+
+        assert len({question.question for question in first + second}) == 6
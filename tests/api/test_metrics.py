@@ -0,0 +1,160 @@
+import json
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from trivia_game.exceptions import NoResultsError, TriviaAPIError
+from trivia_game.local_server import LocalTriviaServer, generate_corpus
+from trivia_game.metrics import Histogram, MetricsRegistry
+from trivia_game.question_cache import QuestionCache
+from trivia_game.trivia_api import TriviaAPIClient
+
+
+def count_errors(metrics, endpoint, error, cause):
+    return metrics.counter("trivia_api_errors_total", endpoint=endpoint, error=error, cause=cause)
+
+
+@pytest.fixture
+def server():
+    with LocalTriviaServer(corpus=generate_corpus(20)) as local_server:
+        yield local_server
+
+
+@pytest.fixture
+def client(server):
+    with TriviaAPIClient(retries=0, base_url=server.base_url) as api_client:
+        yield api_client
+
+
+class TestHistogram:
+    def test_observe_fills_cumulative_buckets(self):
+        histogram = Histogram((0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value)
+
+        assert histogram.cumulative() == {"0.1": 2, "1.0": 3, "+Inf": 4}
+        assert histogram.count == 4
+        assert histogram.sum == pytest.approx(3.65)
+
+
+class TestMetricsRegistry:
+    def test_counters_are_keyed_by_labels(self):
+        registry = MetricsRegistry()
+        registry.increment("requests", endpoint="questions")
+        registry.increment("requests", 2, endpoint="questions")
+        registry.increment("requests", endpoint="token")
+
+        assert registry.counter("requests", endpoint="questions") == 3
+        assert registry.counter("requests", endpoint="token") == 1
+        assert registry.counter("requests", endpoint="categories") == 0
+
+    def test_snapshot_is_json_serializable(self):
+        registry = MetricsRegistry(buckets=(1.0,))
+        registry.increment("requests", endpoint="questions", outcome="ok")
+        registry.observe("duration", 0.5, endpoint="questions")
+
+        snapshot = json.loads(json.dumps(registry.snapshot()))
+
+        assert snapshot["counters"]["requests"] == [{"labels": {"endpoint": "questions", "outcome": "ok"}, "value": 1}]
+        assert snapshot["histograms"]["duration"] == [
+            {"labels": {"endpoint": "questions"}, "count": 1, "sum": 0.5, "buckets": {"1.0": 1, "+Inf": 1}}
+        ]
+
+    def test_concurrent_increments(self):
+        registry = MetricsRegistry()
+
+        def work():
+            for _ in range(1000):
+                registry.increment("requests")
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert registry.counter("requests") == 4000
+
+    def test_reset(self):
+        registry = MetricsRegistry()
+        registry.increment("requests")
+        registry.reset()
+
+        assert registry.snapshot() == {"counters": {}, "histograms": {}}
+
+
+class TestClientMetrics:
+    def test_successful_requests_per_endpoint(self, client):
+        client.fetch_categories()
+        client.fetch_questions(amount=5, use_cache=False)
+
+        metrics = client.metrics
+        assert metrics.counter("trivia_api_requests_total", endpoint="categories", outcome="ok") == 1
+        assert metrics.counter("trivia_api_requests_total", endpoint="token", outcome="ok") == 1
+        assert metrics.counter("trivia_api_requests_total", endpoint="questions", outcome="ok") == 1
+        assert metrics.counter("trivia_api_response_codes_total", endpoint="questions", code="SUCCESS") == 1
+
+        durations = {
+            series["labels"]["endpoint"]: series
+            for series in metrics.snapshot()["histograms"]["trivia_api_request_duration_seconds"]
+        }
+        assert set(durations) == {"categories", "token", "questions"}
+        assert durations["questions"]["count"] == 1
+        assert durations["questions"]["sum"] > 0
+
+    def test_response_code_errors_are_tagged(self, client):
+        with pytest.raises(NoResultsError):
+            client.fetch_questions(amount=50, use_cache=False)
+
+        metrics = client.metrics
+        assert metrics.counter("trivia_api_response_codes_total", endpoint="questions", code="NO_RESULTS") == 1
+        assert metrics.counter("trivia_api_requests_total", endpoint="questions", outcome="NoResultsError") == 1
+        assert count_errors(metrics, "questions", "NoResultsError", "NO_RESULTS") == 1
+
+    def test_http_errors_are_tagged(self, server, client):
+        server.error_rate = 1.0
+        server.error_status = 404
+
+        with pytest.raises(TriviaAPIError):
+            client.fetch_categories()
+
+        assert count_errors(client.metrics, "categories", "TriviaAPIError", "HTTP 404") == 1
+
+    def test_connection_errors_are_tagged(self):
+        with TriviaAPIClient(retries=0, base_url="http://127.0.0.1:9") as client, pytest.raises(TriviaAPIError):
+            client.fetch_categories()
+
+        assert count_errors(client.metrics, "categories", "TriviaAPIError", "ConnectionError") == 1
+
+    def test_exhausted_retries_are_counted(self, server):
+        server.error_rate = 1.0
+
+        with TriviaAPIClient(retries=1, base_url=server.base_url) as client, pytest.raises(TriviaAPIError):
+            client.fetch_categories()
+
+        assert client.metrics.counter("trivia_api_retries_total", endpoint="categories") == 1
+        assert count_errors(client.metrics, "categories", "TriviaAPIError", "RetryError") == 1
+        assert server.requests["api_category.php"] == 2
+
+    def test_cache_lookups(self, server, tmp_path):
+        cache = QuestionCache(tmp_path / "questions.db")
+        with TriviaAPIClient(retries=0, base_url=server.base_url, cache=cache) as client:
+            client.fetch_categories()
+            client.top_up_cache(5, category="9").join(timeout=5)
+            with patch.object(client, "top_up_cache"):
+                client.fetch_questions(amount=5, category="9")
+                client.fetch_questions(amount=5, category="9")
+                server.error_rate = 1.0
+                with pytest.raises(TriviaAPIError):
+                    client.fetch_questions(amount=5, category="17")
+
+        assert client.metrics.counter("trivia_cache_lookups_total", result="hit") == 1
+        assert client.metrics.counter("trivia_cache_lookups_total", result="miss") == 2
+
+    def test_shared_registry(self, server):
+        registry = MetricsRegistry()
+        with TriviaAPIClient(retries=0, base_url=server.base_url, metrics=registry) as client:
+            client.fetch_categories()
+
+        assert registry.counter("trivia_api_requests_total", endpoint="categories", outcome="ok") == 1
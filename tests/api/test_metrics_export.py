@@ -0,0 +1,115 @@
+import time
+import urllib.request
+from unittest.mock import Mock
+
+import pytest
+
+from trivia_game.metrics import MetricsRegistry
+from trivia_game.metrics_export import MetricsServer, TextfileWriter, render, start_exporters
+
+
+@pytest.fixture
+def registry():
+    metrics = MetricsRegistry(buckets=(0.1, 1.0))
+    metrics.increment("trivia_api_requests_total", 3, endpoint="questions", outcome="ok")
+    metrics.observe("trivia_api_request_duration_seconds", 0.25, endpoint="questions")
+    return metrics
+
+
+class TestRender:
+    def test_openmetrics(self, registry):
+        assert render(registry) == (
+            "# TYPE trivia_api_requests counter\n"
+            'trivia_api_requests_total{endpoint="questions",outcome="ok"} 3\n'
+            "# TYPE trivia_api_request_duration_seconds histogram\n"
+            'trivia_api_request_duration_seconds_bucket{endpoint="questions",le="0.1"} 0\n'
+            'trivia_api_request_duration_seconds_bucket{endpoint="questions",le="1.0"} 1\n'
+            'trivia_api_request_duration_seconds_bucket{endpoint="questions",le="+Inf"} 1\n'
+            'trivia_api_request_duration_seconds_count{endpoint="questions"} 1\n'
+            'trivia_api_request_duration_seconds_sum{endpoint="questions"} 0.25\n'
+            "# EOF\n"
+        )
+
+    def test_prometheus_text(self, registry):
+        text = render(registry, openmetrics=False)
+
+        assert "# TYPE trivia_api_requests_total counter\n" in text
+        assert "# EOF" not in text
+
+    def test_label_values_are_escaped(self):
+        registry = MetricsRegistry()
+        registry.increment("errors_total", cause='say "hi"\\\n')
+
+        assert 'errors_total{cause="say \\"hi\\"\\\\\\n"} 1' in render(registry)
+
+    def test_empty_registry(self):
+        assert render(MetricsRegistry()) == "# EOF\n"
+
+
+class TestMetricsServer:
+    def test_serves_openmetrics_when_accepted(self, registry):
+        with MetricsServer(registry, port=0) as server:
+            headers = {"Accept": "application/openmetrics-text"}
+            request = urllib.request.Request(server.url, headers=headers)  # noqa: S310
+            with urllib.request.urlopen(request, timeout=5) as response:  # noqa: S310
+                body = response.read().decode()
+                content_type = response.headers["Content-Type"]
+
+        assert content_type.startswith("application/openmetrics-text")
+        assert body == render(registry)
+
+    def test_serves_prometheus_text_by_default(self, registry):
+        with (
+            MetricsServer(registry, port=0) as server,
+            urllib.request.urlopen(server.url, timeout=5) as response,  # noqa: S310
+        ):
+            assert response.headers["Content-Type"].startswith("text/plain")
+            assert response.read().decode() == render(registry, openmetrics=False)
+
+    def test_unknown_path(self, registry):
+        with MetricsServer(registry, port=0) as server, pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(server.url.replace("/metrics", "/other"), timeout=5)  # noqa: S310
+
+        assert error.value.code == 404
+
+
+class TestTextfileWriter:
+    def test_writes_on_start_and_stop(self, registry, tmp_path):
+        path = tmp_path / "textfile" / "trivia.prom"
+
+        with TextfileWriter(registry, path, interval=60):
+            assert path.read_text() == render(registry, openmetrics=False)
+            registry.increment("trivia_api_requests_total", endpoint="questions", outcome="ok")
+
+        assert 'trivia_api_requests_total{endpoint="questions",outcome="ok"} 4' in path.read_text()
+        assert list(path.parent.iterdir()) == [path]
+
+    def test_failed_write_is_logged(self, registry, tmp_path, caplog):
+        writer = TextfileWriter(registry, tmp_path / "trivia.prom", interval=0.01)
+        with writer:
+            writer.write = Mock(side_effect=OSError("No space left on device"))
+            while writer.write.call_count < 2:
+                time.sleep(0.01)
+            del writer.write
+
+        assert "Writing metrics to" in caplog.text
+        assert "No space left on device" in caplog.text
+
+
+class TestStartExporters:
+    def test_nothing_configured(self, registry):
+        assert start_exporters(registry, {}) == []
+
+    def test_from_environment(self, registry, tmp_path):
+        path = tmp_path / "trivia.prom"
+        environ = {"TRIVIA_METRICS_PORT": "0", "TRIVIA_METRICS_TEXTFILE": str(path), "TRIVIA_METRICS_INTERVAL": "60"}
+        exporters = start_exporters(registry, environ)
+        try:
+            server, writer = exporters
+            assert isinstance(server, MetricsServer)
+            assert server.port != 0
+            assert isinstance(writer, TextfileWriter)
+            assert path.exists()
+        finally:
+            for exporter in exporters:
+                exporter.stop()
@@ -0,0 +1,67 @@
+import threading
+
+import pytest
+
+from trivia_game.rate_limiter import RateLimiter
+
+
+class FakeClock:
+    """Manually advanced clock whose sleep moves time forward"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def limiter(clock):
+    return RateLimiter(interval=5.0, clock=clock, sleep=clock.sleep)
+
+
+class TestRateLimiter:
+    def test_first_request_does_not_wait(self, limiter):
+        assert limiter.wait_time("opentdb.com") == 0
+        assert limiter.acquire("opentdb.com") == 0
+
+    def test_requests_are_spaced(self, limiter, clock):
+        limiter.acquire("opentdb.com")
+        clock.now += 2
+
+        assert limiter.wait_time("opentdb.com") == pytest.approx(3.0)
+        assert limiter.acquire("opentdb.com") == pytest.approx(3.0)
+        assert clock.sleeps == [pytest.approx(3.0)]
+
+    def test_hosts_are_independent(self, limiter):
+        limiter.acquire("opentdb.com")
+        assert limiter.wait_time("localhost:8000") == 0
+
+    def test_burst(self, clock):
+        limiter = RateLimiter(interval=5.0, burst=2, clock=clock, sleep=clock.sleep)
+
+        assert limiter.acquire("opentdb.com") == 0
+        assert limiter.acquire("opentdb.com") == 0
+        assert limiter.wait_time("opentdb.com") == pytest.approx(5.0)
+
+    def test_concurrent_callers_queue_in_order(self):
+        sleeps = []
+        limiter = RateLimiter(interval=5.0, clock=lambda: 0.0, sleep=sleeps.append)
+
+        threads = [threading.Thread(target=limiter.acquire, args=("opentdb.com",)) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sorted(sleeps) == [pytest.approx(5.0), pytest.approx(10.0)]
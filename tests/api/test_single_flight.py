@@ -0,0 +1,71 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from trivia_game.single_flight import SingleFlight
+
+CALLERS = 5
+
+
+def run_concurrently(flight, key, func, release):
+    """Start CALLERS calls for the same key while the first one is blocked, then release it"""
+    with ThreadPoolExecutor(CALLERS) as executor:
+        futures = [executor.submit(flight.do, key, func)]
+        while not flight._calls:
+            pass
+        futures += [executor.submit(flight.do, key, func) for _ in range(CALLERS - 1)]
+        while flight.shared < CALLERS - 1:
+            pass
+        release.set()
+        return futures
+
+
+class TestSingleFlight:
+    def test_concurrent_calls_share_one_result(self):
+        flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def func():
+            calls.append(1)
+            release.wait(timeout=2)
+            return {"value": 1}
+
+        futures = run_concurrently(flight, "key", func, release)
+        results = [future.result(timeout=2) for future in futures]
+
+        assert len(calls) == 1
+        assert all(result is results[0] for result in results)
+        assert flight.shared == CALLERS - 1
+
+    def test_error_is_shared(self):
+        flight = SingleFlight()
+        release = threading.Event()
+
+        def func():
+            release.wait(timeout=2)
+            raise ValueError("boom")
+
+        futures = run_concurrently(flight, "key", func, release)
+
+        for future in futures:
+            with pytest.raises(ValueError, match="boom"):
+                future.result(timeout=2)
+
+    def test_sequential_calls_are_not_merged(self):
+        flight = SingleFlight()
+        calls = []
+
+        for value in range(3):
+            assert flight.do("key", lambda value=value: calls.append(value) or value) == value
+
+        assert calls == [0, 1, 2]
+        assert flight.shared == 0
+        assert not flight._calls
+
+    def test_different_keys_run_separately(self):
+        flight = SingleFlight()
+
+        assert flight.do("a", lambda: 1) == 1
+        assert flight.do("b", lambda: 2) == 2
@@ -0,0 +1,56 @@
+import pytest
+
+from trivia_game.text_decoding import _decode_default, decode_text, decoder
+
+
+class TestDecodeText:
+    @pytest.mark.parametrize(
+        "encoded,expected",
+        [
+            ("Hello%20World", "Hello World"),
+            ("&quot;Hello&quot;", '"Hello"'),
+            ("Test%20&amp;%20More", "Test & More"),
+            ("Don&#039;t stop", "Don't stop"),
+        ],
+    )
+    def test_default_encoding(self, encoded, expected):
+        assert decode_text(encoded) == expected
+
+    def test_fast_path_returns_same_object(self):
+        text = "Which planet is closest to the Sun?"
+        assert decode_text(text) is text
+
+    def test_fast_path_skips_decoder(self):
+        _decode_default.cache_clear()
+
+        decode_text("True")
+
+        assert _decode_default.cache_info().currsize == 0
+
+    def test_repeated_values_are_memoized(self):
+        _decode_default.cache_clear()
+
+        for _ in range(3):
+            decode_text("Entertainment: Film &amp; TV")
+
+        info = _decode_default.cache_info()
+        assert (info.hits, info.misses) == (2, 1)
+
+    @pytest.mark.parametrize(
+        "encoded,expected",
+        [
+            ("Science%20%26%20Nature", "Science & Nature"),
+            ("%26amp%3B", "&amp;"),
+            ("True", "True"),
+        ],
+    )
+    def test_url3986_encoding(self, encoded, expected):
+        """Entities are not unescaped, the mode only percent-encodes"""
+        assert decode_text(encoded, "url3986") == expected
+
+
+@pytest.mark.parametrize("encoding", [None, "url3986"])
+def test_decoder_matches_decode_text(encoding):
+    texts = ["A%20B", "&lt;C&gt;", "%26lt%3B", "D"]
+
+    assert [decoder(encoding)(text) for text in texts] == [decode_text(text, encoding) for text in texts]
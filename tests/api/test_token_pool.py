@@ -0,0 +1,125 @@
+import threading
+
+import pytest
+
+from trivia_game.exceptions import TokenError
+from trivia_game.local_server import LocalTriviaServer, generate_corpus
+from trivia_game.token_pool import TokenPool
+from trivia_game.trivia_api import TriviaAPIClient
+
+
+@pytest.fixture
+def server():
+    with LocalTriviaServer(corpus=generate_corpus(60)) as local_server:
+        yield local_server
+
+
+@pytest.fixture
+def client(server):
+    with TriviaAPIClient(retries=0, base_url=server.base_url) as api_client:
+        yield api_client
+
+
+class TestTokenPool:
+    def test_keys_get_their_own_tokens(self, client):
+        pool = TokenPool(client, size=2)
+
+        with pool.lease("9") as first, pool.lease("17") as second:
+            pass
+        with pool.lease("9") as again:
+            pass
+
+        assert first == again
+        assert first != second
+        assert pool.tokens == [first, second]
+
+    def test_full_pool_shares_least_used_token(self, client):
+        pool = TokenPool(client, size=1)
+
+        with pool.lease("9") as first:
+            pass
+        with pool.lease("17") as second:
+            pass
+
+        assert first == second
+        assert len(pool.tokens) == 1
+
+    def test_parallel_fetch_without_duplicates(self, client):
+        pool = TokenPool(client, size=3)
+        results = {}
+
+        def harvest(category):
+            results[category] = pool.fetch_questions(category, amount=20, category=category)
+
+        threads = [threading.Thread(target=harvest, args=(category,)) for category in ("9", "17", "23")]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        questions = [question.question for batch in results.values() for question in batch]
+        assert len(questions) == len(set(questions)) == 60
+
+    def test_drained_filter_is_tracked_and_reset(self, client):
+        pool = TokenPool(client, size=2)
+        pool.fetch_questions("9", amount=20, category="9")
+
+        with pytest.raises(TokenError, match="Token has returned all possible questions"):
+            pool.fetch_questions("9", amount=1, category="9")
+
+        assert pool.is_drained("9", category="9")
+        assert not pool.is_drained("17", category="17")
+
+        pool.reset("9")
+
+        assert not pool.is_drained("9", category="9")
+        assert len(pool.fetch_questions("9", amount=20, category="9")) == 20
+
+    def test_unknown_token_is_renewed(self, client, server):
+        pool = TokenPool(client, size=1)
+        with pool.lease("9") as token:
+            pass
+        server._tokens.pop(token)
+
+        assert len(pool.fetch_questions("9", amount=5, category="9")) == 5
+        assert pool.tokens != [token]
+
+    def test_token_requests_do_not_hold_the_pool_lock(self, client, server, monkeypatch):
+        pool = TokenPool(client, size=1)
+        request_session_token = client.request_session_token
+        locked_during_request = []
+
+        def record_lock():
+            locked_during_request.append(pool._lock.locked())
+            return request_session_token()
+
+        monkeypatch.setattr(client, "request_session_token", record_lock)
+        with pool.lease("9") as token:
+            pass
+        server._tokens.pop(token)
+        pool.fetch_questions("9", amount=1, category="9")
+
+        assert locked_during_request == [False, False]
+
+    def test_release_frees_token(self, client):
+        pool = TokenPool(client, size=1)
+        pool.fetch_questions("9", amount=1, category="9")
+        pool.release("9")
+
+        assert not pool.is_drained("9", category="9")
+        assert pool._tokens[0].keys == set()
+
+    def test_fetch_encoded_shares_the_token_of_a_key(self, client):
+        pool = TokenPool(client, size=2)
+        questions = pool.fetch_questions("9", amount=10, category="9")
+        results = pool.fetch_encoded("9", amount=10, category="9")
+
+        assert len(pool.tokens) == 1
+        assert len(results) == 10
+        assert not {question.question for question in questions} & {
+            client._format_question(r).question for r in results
+        }
+
+        with pytest.raises(TokenError, match="Token has returned all possible questions"):
+            pool.fetch_encoded("9", amount=1, category="9")
+        assert pool.is_drained("9", category="9")
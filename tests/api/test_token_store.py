@@ -0,0 +1,40 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from trivia_game.models import SessionToken
+from trivia_game.token_store import TokenStore
+
+
+@pytest.fixture
+def token_store(tmp_path):
+    """Fixture for a token store in a temporary directory"""
+    return TokenStore(tmp_path / "session_token.json")
+
+
+class TestTokenStore:
+    def test_load_missing_file(self, token_store):
+        assert token_store.load() is None
+
+    def test_save_and_load(self, token_store):
+        issued_at = datetime(2024, 12, 15, 10, 0)
+        token_store.save("abc123", issued_at=issued_at)
+
+        assert token_store.load(now=issued_at + timedelta(hours=1)) == SessionToken("abc123", issued_at)
+
+    def test_load_expired_token(self, token_store):
+        issued_at = datetime(2024, 12, 15, 10, 0)
+        token_store.save("abc123", issued_at=issued_at)
+
+        assert token_store.load(now=issued_at + TokenStore.TOKEN_LIFETIME) is None
+
+    def test_load_corrupt_file(self, token_store):
+        token_store.path.write_text("not json")
+        assert token_store.load() is None
+
+    def test_clear(self, token_store):
+        token_store.save("abc123")
+        token_store.clear()
+
+        assert not token_store.path.exists()
+        token_store.clear()  # Should not raise when the file is missing
@@ -0,0 +1,95 @@
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from trivia_game.local_server import LocalTriviaServer
+from trivia_game.transport import Transport
+from trivia_game.trivia_api import TriviaAPIClient
+
+
+@pytest.fixture
+def transport():
+    with Transport(retries=0, pool_connections=2, pool_maxsize=3) as shared_transport:
+        yield shared_transport
+
+
+@pytest.fixture
+def server():
+    with LocalTriviaServer() as local_server:
+        yield local_server
+
+
+class TestTransport:
+    def test_pool_configuration(self, transport):
+        assert transport.adapter._pool_connections == 2
+        assert transport.adapter._pool_maxsize == 3
+        assert transport.adapter._pool_block is False
+        assert transport.adapter.max_retries.total == 0
+
+    def test_threads_get_own_sessions_on_shared_adapter(self, transport):
+        sessions = []
+        thread = threading.Thread(target=lambda: sessions.append(transport.session))
+        thread.start()
+        thread.join()
+
+        assert transport.session is transport.session
+        assert sessions[0] is not transport.session
+        assert sessions[0].get_adapter("https://") is transport.session.get_adapter("https://") is transport.adapter
+
+    def test_shared_is_a_singleton(self):
+        assert Transport.shared() is Transport.shared()
+
+    def test_connections_are_reused_across_threads(self, transport, server):
+        url = f"{server.base_url}/api_category.php"
+
+        def fetch():
+            for _ in range(5):
+                transport.get(url, timeout=5).json()
+
+        threads = [threading.Thread(target=fetch) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        assert server.requests["api_category.php"] == 15
+        assert server.connections <= 3
+
+    def test_warmup_skips_unreachable_hosts(self, transport, server):
+        with LocalTriviaServer() as stopped:
+            unreachable = stopped.base_url
+
+        connected = transport.warmup([f"{server.base_url}/api.php", f"{server.base_url}/api_token.php", unreachable])
+
+        assert connected == [server.base_url]
+
+
+class TestClientTransport:
+    def test_client_uses_transport_session(self, transport):
+        client = TriviaAPIClient(transport=transport)
+
+        assert client.session is transport.session
+        assert client._session is None
+
+    def test_exit_leaves_shared_transport_open(self, transport):
+        with patch.object(transport.session, "close") as close, TriviaAPIClient(transport=transport):
+            pass
+
+        close.assert_not_called()
+
+    def test_rejects_retries_with_transport(self, transport):
+        with pytest.raises(ValueError, match="retries on the transport"):
+            TriviaAPIClient(retries=0, transport=transport)
+
+    def test_client_shares_retry_settings(self):
+        assert TriviaAPIClient.RETRY_STATUS_FORCELIST is Transport.RETRY_STATUS_FORCELIST
+        assert TriviaAPIClient.RETRY_BACKOFF_FACTOR == Transport.RETRY_BACKOFF_FACTOR
+
+    def test_clients_share_connections(self, transport, server):
+        clients = [TriviaAPIClient(transport=transport, base_url=server.base_url) for _ in range(3)]
+
+        for client in clients:
+            client.fetch_categories()
+
+        assert server.connections == 1
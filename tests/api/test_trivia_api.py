@@ -1,3 +1,5 @@
+import threading
+from typing import ClassVar
 from unittest.mock import Mock, patch
 
 import pytest
@@ -13,6 +15,9 @@ from trivia_game.exceptions import (
     TriviaAPIError,
 )
 from trivia_game.models import Question, TriviaResponseCode
+from trivia_game.question_cache import QuestionCache
+from trivia_game.token_store import TokenStore
+from trivia_game.trivia_api import TriviaAPIClient
 
 
 class TestCreateSession:
@@ -26,7 +31,7 @@ class TestCreateSession:
         retry = session.get_adapter("http://").max_retries
         assert retry.total == 3
         assert retry.backoff_factor == 5
-        assert retry.status_forcelist == [429, 500, 502, 503, 504]
+        assert retry.status_forcelist == (429, 500, 502, 503, 504)
         assert retry.allowed_methods == ["GET"]
 
 
@@ -407,7 +412,7 @@ class TestFormatQuestion:
 
         assert question.type == "boolean"
         assert question.correct_answer == "False"
-        assert question.incorrect_answers == ["True"]
+        assert question.incorrect_answers == ("True",)
 
     def test_format_question_special_characters(self, trivia_client):
         """Test handling of various special characters and HTML entities"""
@@ -571,3 +576,374 @@ class TestValidateToken:
 
         with pytest.raises(TokenError, match="Invalid token received"):
             trivia_client._validate_token(data)
+
+
+class TestQuestionCacheIntegration:
+    @pytest.fixture
+    def cache_client(self, trivia_client):
+        """Client backed by an in-memory question cache"""
+        trivia_client.cache = QuestionCache()
+        trivia_client.categories = {"Science": "17"}
+        yield trivia_client
+        trivia_client.cache.close()
+
+    @pytest.fixture
+    def cached_client(self, cache_client):
+        """Client backed by an in-memory question cache, without background top-ups"""
+        with patch.object(cache_client, "top_up_cache", return_value=None):
+            yield cache_client
+
+    @staticmethod
+    def _question(text, category="Science"):
+        return Question(
+            type="boolean",
+            difficulty="easy",
+            category=category,
+            question=text,
+            correct_answer="True",
+            incorrect_answers=["False"],
+        )
+
+    def test_fetch_questions_serves_from_cache(self, cached_client):
+        """Test a game is served from the cache when it holds enough fresh questions"""
+        cached_client.cache.add_questions([self._question(f"Q{i}?") for i in range(3)])
+
+        with patch("requests.Session.get") as mock_get:
+            questions = cached_client.fetch_questions(amount=2, category="17", difficulty="easy")
+
+        mock_get.assert_not_called()
+        assert len(questions) == 2
+        assert cached_client.cache.count(fresh_only=True) == 1
+        assert cached_client.metrics.counter("trivia_cache_lookups_total", result="hit") == 1
+        cached_client.top_up_cache.assert_called_once_with(2, "17", "easy", None)
+
+    def test_fetch_questions_skips_served_questions(self, cached_client, mock_questions_success):
+        """Test the API is asked once the cache holds too few questions that were not served"""
+        cached_client.cache.add_questions([self._question(f"Q{i}?") for i in range(3)])
+
+        with patch("requests.Session.get", return_value=mock_questions_success) as mock_get:
+            first = cached_client.fetch_questions(amount=2, category="17", difficulty="easy")
+            second = cached_client.fetch_questions(amount=2, category="17", difficulty="easy")
+
+        mock_get.assert_called_once()
+        assert "Is Python a programming language?" in [question.question for question in second]
+        assert not {question.question for question in first} & {question.question for question in second}
+        assert cached_client.metrics.counter("trivia_cache_lookups_total", result="miss") == 1
+
+    def test_fetch_questions_falls_back_to_cache_when_offline(self, cached_client):
+        """Test cached questions are served when the API cannot be reached"""
+        cached_client.cache.add_questions([self._question(f"Q{i}?") for i in range(3)])
+
+        with patch("requests.Session.get", side_effect=requests.exceptions.ConnectionError):
+            questions = cached_client.fetch_questions(amount=5, category="17", difficulty="easy")
+
+        assert len(questions) == 3
+        assert cached_client.metrics.counter("trivia_api_fallbacks_total") == 1
+
+    def test_fetch_questions_does_not_fall_back_on_api_answers(self, cached_client):
+        """Test errors about the request itself are raised even with cached questions"""
+        cached_client.cache.add_questions([self._question(f"Q{i}?") for i in range(3)])
+        response = Mock()
+        response.json.return_value = {"response_code": TriviaResponseCode.NO_RESULTS, "results": []}
+
+        with patch("requests.Session.get", return_value=response), pytest.raises(NoResultsError):
+            cached_client.fetch_questions(amount=5, category="17")
+
+    def test_fetch_questions_stores_api_questions_as_served(self, cached_client, mock_questions_success):
+        """Test questions fetched from the API are stored, but not served again from the cache"""
+        with patch("requests.Session.get", return_value=mock_questions_success) as mock_get:
+            questions = cached_client.fetch_questions(amount=2)
+
+        mock_get.assert_called_once()
+        assert len(questions) == 2
+        assert cached_client.cache.count() == 2
+        assert cached_client.cache.count(fresh_only=True) == 0
+        encodings = cached_client.cache._connection.execute("SELECT DISTINCT encoding FROM questions").fetchall()
+        assert encodings == [(QuestionCache.API_DEFAULT_ENCODING,)]
+        cached_client.top_up_cache.assert_called_once_with(2, None, None, None)
+
+    def test_fetch_encoded(self, cached_client, mock_questions_success):
+        """Test questions can be fetched as the API sent them, without caching them"""
+        with patch("requests.Session.get", return_value=mock_questions_success) as mock_get:
+            results = cached_client.fetch_encoded(amount=2, category="17")
+
+        assert results == mock_questions_success.json.return_value["results"]
+        assert mock_get.call_args.kwargs["params"]["category"] == "17"
+        assert cached_client.cache.count() == 0
+
+    def test_fetch_questions_unknown_category_skips_cache(self, cached_client, mock_questions_success):
+        """Test the API is used when the category ID cannot be mapped to a cached name"""
+        cached_client.cache.add_questions([self._question(f"Q{i}?") for i in range(3)])
+
+        with patch("requests.Session.get", return_value=mock_questions_success) as mock_get:
+            cached_client.fetch_questions(amount=2, category="99")
+
+        mock_get.assert_called_once()
+
+    def test_fetch_questions_with_token_skips_cache(self, cached_client, mock_questions_success):
+        """Test a caller's own session token always goes to the API"""
+        cached_client.cache.add_questions([self._question(f"Q{i}?") for i in range(3)])
+        token = cached_client._session_token
+
+        with patch("requests.Session.get", return_value=mock_questions_success) as mock_get:
+            cached_client.fetch_questions(amount=2, token=token)
+
+        mock_get.assert_called_once()
+        cached_client.top_up_cache.assert_not_called()
+
+    def test_fetch_questions_use_cache_false(self, cached_client):
+        """Test use_cache=False raises instead of serving cached questions"""
+        cached_client.cache.add_questions([self._question(f"Q{i}?") for i in range(3)])
+
+        with (
+            patch("requests.Session.get", side_effect=requests.exceptions.ConnectionError),
+            pytest.raises(TriviaAPIError),
+        ):
+            cached_client.fetch_questions(amount=2, use_cache=False)
+
+    def test_top_up_cache(self, cache_client, mock_questions_success):
+        """Test a top-up stores fresh questions in the background"""
+        with patch("requests.Session.get", return_value=mock_questions_success) as mock_get:
+            cache_client.top_up_cache(2).join(timeout=5)
+
+        mock_get.assert_called_once()
+        assert mock_get.call_args.kwargs["params"]["amount"] == "2"
+        assert cache_client.cache.count(fresh_only=True) == 2
+        assert len(cache_client.cache.take_questions(2, fresh_only=True)) == 2
+        assert not cache_client._top_ups
+
+    def test_top_up_cache_skipped(self, cache_client):
+        """Test no top-up starts when enough fresh questions are cached, or one is running"""
+        cache_client.cache.add_questions([self._question(f"Q{i}?") for i in range(3)])
+        assert cache_client.top_up_cache(3, category="17") is None
+        assert cache_client.top_up_cache(3, category="99") is None
+
+        cache_client._top_ups.add(("17", None, None))
+        assert cache_client.top_up_cache(5, category="17") is None
+
+    def test_top_up_cache_ignores_errors(self, cache_client):
+        """Test a failed top-up leaves the cache to be topped up by the next game"""
+        with patch("requests.Session.get", side_effect=requests.exceptions.ConnectionError):
+            cache_client.top_up_cache(2).join(timeout=5)
+
+        assert cache_client.cache.count() == 0
+        assert not cache_client._top_ups
+
+
+class TestLazySessionToken:
+    def test_init_does_not_request_token(self):
+        """Test creating the client sends no request"""
+        with patch("requests.Session.get") as mock_get:
+            client = TriviaAPIClient()
+
+        mock_get.assert_not_called()
+        assert client._session_token is None
+        client.session.close()
+
+    def test_fetch_questions_requests_token_on_first_use(self, trivia_client, mock_questions_success):
+        """Test the token is requested once, before the first questions request"""
+        trivia_client._session_token = None
+        token_response = Mock()
+        token_response.json.return_value = {"response_code": 0, "token": "lazy_token"}
+
+        with patch("requests.Session.get") as mock_get:
+            mock_get.side_effect = [token_response, mock_questions_success, mock_questions_success]
+            trivia_client.fetch_questions(amount=2)
+            trivia_client.fetch_questions(amount=2)
+
+        assert mock_get.call_count == 3
+        assert mock_get.call_args_list[0].args[0] == trivia_client.SESSION_TOKEN_API_URL
+        assert mock_get.call_args_list[2].kwargs["params"]["token"] == "lazy_token"
+
+    def test_prefetch_session_token(self, trivia_client):
+        """Test the token can be fetched in the background"""
+        trivia_client._session_token = None
+
+        with patch.object(trivia_client, "request_session_token", return_value="background_token"):
+            trivia_client.prefetch_session_token().join(timeout=5)
+
+        assert trivia_client._session_token == "background_token"
+
+    def test_prefetch_session_token_ignores_errors(self, trivia_client):
+        """Test a failed background fetch leaves the token to be requested later"""
+        trivia_client._session_token = None
+
+        with patch.object(trivia_client, "request_session_token", side_effect=TriviaAPIError("offline")):
+            trivia_client.prefetch_session_token().join(timeout=5)
+
+        assert trivia_client._session_token is None
+
+
+class TestSessionTokenPersistence:
+    @pytest.fixture
+    def stored_client(self, trivia_client, tmp_path):
+        """Client with an empty token and a temporary token store"""
+        trivia_client._session_token = None
+        trivia_client.token_store = TokenStore(tmp_path / "session_token.json")
+        return trivia_client
+
+    def test_stored_token_is_reused(self, stored_client, mock_questions_success):
+        """Test a valid stored token saves the token request"""
+        stored_client.token_store.save("stored_token")
+
+        with patch("requests.Session.get", return_value=mock_questions_success) as mock_get:
+            stored_client.fetch_questions(amount=2)
+
+        mock_get.assert_called_once()
+        assert mock_get.call_args.kwargs["params"]["token"] == "stored_token"
+
+    def test_requested_token_is_stored(self, stored_client, mock_questions_success):
+        """Test a newly requested token is written to the store"""
+        token_response = Mock()
+        token_response.json.return_value = {"response_code": 0, "token": "new_token"}
+
+        with patch("requests.Session.get", side_effect=[token_response, mock_questions_success]):
+            stored_client.fetch_questions(amount=2)
+
+        assert stored_client.token_store.load().token == "new_token"
+
+    def test_token_not_found_renews_token(self, stored_client, mock_questions_success):
+        """Test an unknown token is replaced transparently"""
+        stored_client.token_store.save("expired_token")
+        not_found_response = Mock()
+        not_found_response.json.return_value = {"response_code": TriviaResponseCode.TOKEN_NOT_FOUND}
+        token_response = Mock()
+        token_response.json.return_value = {"response_code": 0, "token": "fresh_token"}
+
+        with patch("requests.Session.get") as mock_get:
+            mock_get.side_effect = [not_found_response, token_response, mock_questions_success]
+            questions = stored_client.fetch_questions(amount=2)
+
+        assert len(questions) == 2
+        assert mock_get.call_args.kwargs["params"]["token"] == "fresh_token"
+        assert stored_client._session_token == "fresh_token"
+        assert stored_client.token_store.load().token == "fresh_token"
+
+
+class TestRateLimiting:
+    def test_questions_request_goes_through_limiter(self, trivia_client, mock_questions_success):
+        """Test questions requests acquire a slot for the API host"""
+        trivia_client.rate_limiter = Mock(**{"acquire.return_value": 0.0})
+
+        with patch("requests.Session.get", return_value=mock_questions_success):
+            trivia_client.fetch_questions(amount=2)
+
+        trivia_client.rate_limiter.acquire.assert_called_once_with("opentdb.com")
+
+    def test_other_requests_skip_limiter(self, trivia_client, mock_categories_response):
+        """Test categories requests are not delayed"""
+        trivia_client.rate_limiter = Mock()
+
+        with patch("requests.Session.get", return_value=mock_categories_response):
+            trivia_client.fetch_categories()
+
+        trivia_client.rate_limiter.acquire.assert_not_called()
+
+    def test_next_request_delay(self, trivia_client):
+        """Test the pending wait is exposed"""
+        assert trivia_client.next_request_delay() == 0.0
+
+        trivia_client.rate_limiter = Mock()
+        trivia_client.rate_limiter.wait_time.return_value = 2.5
+
+        assert trivia_client.next_request_delay() == 2.5
+        trivia_client.rate_limiter.wait_time.assert_called_once_with("opentdb.com")
+
+
+class TestQuestionCount:
+    def test_fetch_question_count(self, trivia_client, mock_response):
+        """Test parsing of the category question count"""
+        mock_response.json.return_value = {
+            "category_id": 9,
+            "category_question_count": {
+                "total_question_count": 300,
+                "total_easy_question_count": 120,
+                "total_medium_question_count": 110,
+                "total_hard_question_count": 70,
+            },
+        }
+
+        with patch("requests.Session.get", return_value=mock_response) as mock_get:
+            counts = trivia_client.fetch_question_count("9")
+
+        assert counts == {"total": 300, "easy": 120, "medium": 110, "hard": 70}
+        mock_get.assert_called_once_with(
+            trivia_client.COUNT_API_URL, params={"category": "9"}, timeout=trivia_client.timeout
+        )
+
+    def test_fetch_question_count_missing(self, trivia_client, mock_response):
+        """Test a response without counts"""
+        mock_response.json.return_value = {"category_id": 9}
+
+        with patch("requests.Session.get", return_value=mock_response):
+            with pytest.raises(TriviaAPIError, match="No question count found in API response"):
+                trivia_client.fetch_question_count("9")
+
+
+class TestResponseEncoding:
+    RESULT: ClassVar[dict[str, object]] = {
+        "type": "boolean",
+        "difficulty": "easy",
+        "category": "Science%20%26%20Nature",
+        "question": "Is%20%26quot%3B%20a%20literal%3F",
+        "correct_answer": "True",
+        "incorrect_answers": ["False"],
+    }
+
+    def test_encode_param_is_sent(self, mock_response):
+        """Test the encode mode is added to questions requests"""
+        client = TriviaAPIClient(encoding="url3986")
+        client._session_token = "test_session_token"
+        mock_response.json.return_value = {"response_code": 0, "results": [self.RESULT]}
+
+        with patch("requests.Session.get", return_value=mock_response) as mock_get:
+            questions = client.fetch_questions(amount=1)
+
+        assert mock_get.call_args.kwargs["params"]["encode"] == "url3986"
+        assert questions[0].category == "Science & Nature"
+        assert questions[0].question == "Is &quot; a literal?"
+
+    def test_format_questions_batch(self, trivia_client):
+        """Test a whole response is formatted at once"""
+        results = [{**self.RESULT, "category": "Science &amp; Nature", "question": f"Question {i}"} for i in range(3)]
+
+        questions = trivia_client._format_questions(results)
+
+        assert [question.question for question in questions] == ["Question 0", "Question 1", "Question 2"]
+        assert {question.category for question in questions} == {"Science & Nature"}
+
+
+class TestRequestCoalescing:
+    def test_concurrent_category_requests_share_one_call(self, trivia_client, mock_response):
+        """Test identical concurrent requests are sent once"""
+        release = threading.Event()
+        mock_response.json.return_value = {"trivia_categories": [{"id": 9, "name": "General Knowledge"}]}
+
+        def slow_get(*args, **kwargs):
+            release.wait(timeout=2)
+            return mock_response
+
+        with patch("requests.Session.get", side_effect=slow_get) as mock_get:
+            threads = [threading.Thread(target=trivia_client.fetch_categories) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            while trivia_client._in_flight.shared < 3:
+                pass
+            release.set()
+            for thread in threads:
+                thread.join(timeout=2)
+
+        assert mock_get.call_count == 1
+        assert trivia_client.categories == {"General Knowledge": "9"}
+
+    @pytest.mark.parametrize("url", [TriviaAPIClient.SESSION_TOKEN_API_URL, TriviaAPIClient.QUESTIONS_API_URL])
+    def test_token_and_question_requests_are_not_coalesced(self, trivia_client, url):
+        """Test endpoints outside COALESCED_URLS skip the in-flight group"""
+        with (
+            patch.object(trivia_client, "_send_request", return_value={"token": "abc"}) as send,
+            patch.object(trivia_client._in_flight, "do") as do,
+        ):
+            trivia_client._make_request(url, {"amount": 10})
+
+        send.assert_called_once()
+        do.assert_not_called()
@@ -1,7 +1,10 @@
 from unittest.mock import MagicMock, Mock
 
 import pytest
+import requests
 
+from trivia_game.question_cache import QuestionCache
+from trivia_game.token_store import TokenStore
 from trivia_game.trivia_api import TriviaAPIClient
 from trivia_game.view.frames import MainMenuFrame
 from trivia_game.view.frames.base_frame import BaseFrame
@@ -15,10 +18,36 @@ collect_ignore = ["in_progress/"]
 def trivia_client():
     """Fixture for TriviaAPIClient instance"""
     client = TriviaAPIClient()
+    client._session_token = "test_session_token"
     yield client
     client.session.close()
 
 
+@pytest.fixture
+def offline_api_client(tmp_path):
+    """Fixture for a TriviaAPIClient with its files in tmp_path and a stubbed network
+
+    Only the categories request is answered, every other request fails to connect.
+    """
+    categories = Mock()
+    categories.json.return_value = {"trivia_categories": [{"id": 9, "name": "General Knowledge"}]}
+
+    def get(url, **_kwargs):
+        if url == TriviaAPIClient.CATEGORIES_API_URL:
+            return categories
+        msg = f"No network in tests: {url}"
+        raise requests.exceptions.ConnectionError(msg)
+
+    client = TriviaAPIClient(
+        cache=QuestionCache(tmp_path / "questions.db"), token_store=TokenStore(tmp_path / "session_token.json")
+    )
+    client._session_token = "test_session_token"
+    client.session.get = Mock(side_effect=get)
+    yield client
+    client.cache.close()
+    client.session.close()
+
+
 @pytest.fixture
 def mock_response():
     """Fixture for mocked response"""
@@ -166,14 +195,15 @@ def multiple_choice_frame(mock_controller):
 
 
 @pytest.fixture
-def quiz_brain(mock_controller):
+def quiz_brain(mock_controller, offline_api_client, tmp_path):
     """Create a QuizBrain instance with mock controller"""
+    from trivia_game.question_source import QuestionSource
     from trivia_game.quiz_brain import QuizBrain
 
-    brain = QuizBrain(mock_controller)
+    brain = QuizBrain(mock_controller, prefetch_depth=0, data_dir=tmp_path, api_client=offline_api_client)
     brain.score = 0
     brain.current_question = None
-    brain.questions = []
+    brain.questions = QuestionSource()
 
     return brain
 
@@ -9,18 +9,20 @@ def mock_controller():
     controller = Mock()
     controller.quiz_brain = Mock()
     controller.quiz_brain.current_question = None
+    controller.after.side_effect = lambda _ms, func, *args: func(*args)
     return controller
 
 
 @pytest.fixture
-def quiz_brain(mock_controller):
+def quiz_brain(mock_controller, offline_api_client, tmp_path):
     """Create a QuizBrain instance with mock controller"""
+    from trivia_game.question_source import QuestionSource
     from trivia_game.quiz_brain import QuizBrain
 
-    brain = QuizBrain(mock_controller)
+    brain = QuizBrain(mock_controller, prefetch_depth=0, data_dir=tmp_path, api_client=offline_api_client)
     brain.score = 0
     brain.current_question = None
-    brain.questions = []
+    brain.questions = QuestionSource()
     return brain
 
 
@@ -0,0 +1,57 @@
+import contextlib
+
+import pytest
+
+from benchmarks import runner
+from benchmarks.__main__ import main
+
+
+def report(**medians):
+    return {"results": {name: {"median": median} for name, median in medians.items()}}
+
+
+class TestRunner:
+    def test_time_callable_calibrates_calls(self):
+        timing = runner.time_callable(lambda: None, rounds=3, min_time=0.001)
+
+        assert timing.rounds == 3
+        assert timing.number > 1
+        assert 0 <= timing.min <= timing.median
+
+    def test_run_scenarios_reports_skipped(self, monkeypatch):
+        @contextlib.contextmanager
+        def ready():
+            yield lambda: None
+
+        @contextlib.contextmanager
+        def unavailable():
+            msg = "no display"
+            raise runner.ScenarioSkipped(msg)
+            yield
+
+        monkeypatch.setattr(runner, "SCENARIOS", {"ready": ready, "unavailable": unavailable})
+
+        result = runner.run_scenarios(rounds=2, min_time=0.001, log=lambda line: None)
+
+        assert set(result["results"]) == {"ready"}
+        assert result["skipped"] == {"unavailable": "no display"}
+
+    def test_compare_reports(self):
+        comparisons = runner.compare_reports(report(a=1.0, b=2.0, gone=1.0), report(a=1.05, b=3.0, new=1.0))
+
+        assert [comparison.name for comparison in comparisons] == ["a", "b"]
+        assert [comparison.name for comparison in runner.regressions(comparisons, 0.1)] == ["b"]
+
+    @pytest.mark.parametrize("seconds,expected", [(2.5, "2.5 s"), (0.0123, "12.3 ms"), (4e-7, "400 ns")])
+    def test_format_seconds(self, seconds, expected):
+        assert runner.format_seconds(seconds) == expected
+
+
+class TestCompareCommand:
+    @pytest.mark.parametrize("current,exit_code", [(1.05, 0), (1.5, 1)])
+    def test_exit_code(self, tmp_path, capsys, current, exit_code):
+        runner.save_report(report(scenario=1.0), tmp_path / "baseline.json")
+        runner.save_report(report(scenario=current), tmp_path / "current.json")
+
+        assert main(["compare", str(tmp_path / "baseline.json"), str(tmp_path / "current.json")]) == exit_code
+        assert ("REGRESSION" in capsys.readouterr().out) == bool(exit_code)
@@ -0,0 +1,91 @@
+import random
+
+import pytest
+
+from trivia_game.corpus_file import CorpusFile, main, write_corpus
+from trivia_game.exceptions import CorpusFormatError
+from trivia_game.local_server import generate_corpus
+from trivia_game.models import Question
+from trivia_game.question_cache import QuestionCache
+
+
+@pytest.fixture
+def corpus():
+    return generate_corpus(300)
+
+
+@pytest.fixture
+def corpus_path(tmp_path, corpus):
+    path = tmp_path / "corpus.tqc"
+    write_corpus(path, corpus)
+    return path
+
+
+class TestCorpusFile:
+    def test_round_trip(self, corpus_path, corpus):
+        with CorpusFile(corpus_path) as corpus_file:
+            assert len(corpus_file) == len(corpus)
+            assert list(corpus_file) == corpus
+            assert corpus_file[-1] == corpus[-1]
+            assert set(corpus_file.categories) == {question.category for question in corpus}
+
+    def test_random_access(self, corpus_path, corpus):
+        with CorpusFile(corpus_path) as corpus_file:
+            assert corpus_file[150] == corpus[150]
+            with pytest.raises(IndexError):
+                corpus_file[len(corpus)]
+
+    def test_indices(self, corpus_path, corpus):
+        expected = [
+            index
+            for index, question in enumerate(corpus)
+            if question.category == "History" and question.difficulty == "hard"
+        ]
+
+        with CorpusFile(corpus_path) as corpus_file:
+            assert list(corpus_file.indices("History", "hard")) == expected
+            assert len(corpus_file.indices(category="Unknown")) == 0
+
+    def test_sample(self, corpus_path):
+        with CorpusFile(corpus_path) as corpus_file:
+            questions = corpus_file.sample(10, question_type="boolean", rng=random.Random(3))  # noqa: S311
+            everything = corpus_file.sample(1000)
+
+        assert len(questions) == 10
+        assert all(question.type == "boolean" for question in questions)
+        assert len(everything) == 300
+
+    def test_empty_corpus(self, tmp_path):
+        path = tmp_path / "empty.tqc"
+        assert write_corpus(path, []) == 0
+
+        with CorpusFile(path) as corpus_file:
+            assert len(corpus_file) == 0
+            assert corpus_file.sample(10) == []
+
+    def test_unicode_and_empty_answers(self, tmp_path):
+        question = Question("boolean", "easy", "Kunst & Kultur", "Was ist „das“?", "Ja", ())
+        path = tmp_path / "unicode.tqc"
+        write_corpus(path, [question])
+
+        with CorpusFile(path) as corpus_file:
+            assert corpus_file[0] == question
+
+    @pytest.mark.parametrize("contents", [b"", b"not a corpus file at all"])
+    def test_rejects_other_files(self, tmp_path, contents):
+        path = tmp_path / "other.tqc"
+        path.write_bytes(contents)
+
+        with pytest.raises(CorpusFormatError):
+            CorpusFile(path)
+
+    def test_convert_harvested_corpus(self, tmp_path, corpus, capsys):
+        source = tmp_path / "questions.db"
+        with QuestionCache(source) as cache:
+            cache.add_questions(corpus)
+
+        assert main([str(source), str(tmp_path / "corpus.tqc")]) == 0
+
+        with CorpusFile(tmp_path / "corpus.tqc") as corpus_file:
+            assert len(corpus_file) == len(corpus)
+        assert "Wrote 300 questions" in capsys.readouterr().out
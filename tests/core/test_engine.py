@@ -0,0 +1,131 @@
+import threading
+from unittest.mock import Mock
+
+import pytest
+
+from trivia_game.engine import AnswerChecked, GameEngine, GameError, GameOver, QuestionShown
+from trivia_game.exceptions import TriviaAPIError
+from trivia_game.local_server import generate_corpus
+from trivia_game.metrics import MetricsRegistry
+from trivia_game.models import GameSettings
+
+
+@pytest.fixture
+def corpus():
+    return generate_corpus(40)
+
+
+@pytest.fixture
+def api_client(corpus):
+    client = Mock()
+    client.fetch_questions.side_effect = lambda amount, **kwargs: corpus[:amount]
+    return client
+
+
+@pytest.fixture
+def engine(api_client):
+    engine = GameEngine(api_client, metrics=MetricsRegistry())
+    engine.count_index = Mock()
+    engine.count_index.max_available.return_value = None
+    return engine
+
+
+class TestGameSession:
+    def test_game_sends_events(self, engine, corpus):
+        events = []
+        session = engine.create_session(events.append)
+
+        assert session.start(GameSettings("9", "easy", None))
+        first = corpus[0]
+        session.answer(first.correct_answer)
+        while session.next_question() is not None:
+            session.answer("wrong")
+
+        assert events[0] == QuestionShown(session.id, first, 1)
+        assert events[1] == AnswerChecked(session.id, True, first.correct_answer, engine.score_for(first.difficulty))
+        assert events[-1] == GameOver(session.id, session.score, 10)
+        assert sum(isinstance(event, QuestionShown) for event in events) == 10
+        assert not session.active
+
+    def test_only_the_first_answer_is_scored(self, engine, corpus):
+        events = []
+        session = engine.create_session(events.append)
+        session.start(GameSettings())
+
+        assert session.answer(corpus[0].correct_answer)
+        assert not session.answer(corpus[0].correct_answer)
+
+        assert session.score == engine.score_for(corpus[0].difficulty)
+        assert session.answered == 1
+        assert sum(isinstance(event, AnswerChecked) for event in events) == 1
+
+    def test_end_sends_game_over_once(self, engine):
+        events = []
+        session = engine.create_session(events.append)
+        session.start(GameSettings())
+
+        session.end()
+        session.end()
+
+        assert [event for event in events if isinstance(event, GameOver)] == [GameOver(session.id, 0, 0)]
+
+    def test_start_errors_are_sent(self, engine, api_client):
+        events = []
+        session = engine.create_session(events.append)
+        api_client.fetch_questions.side_effect = TriviaAPIError("down")
+
+        assert not session.start(GameSettings())
+        engine.count_index.max_available.return_value = 0
+        assert not session.start(GameSettings("9"))
+
+        assert events == [
+            GameError(session.id, "Error loading questions: down"),
+            GameError(session.id, "No questions available for the selected options. Please change them."),
+        ]
+
+    def test_endless_game_ends_after_misses(self, engine):
+        session = engine.create_session()
+        session.start(GameSettings(), endless=True)
+
+        for _ in range(engine.ENDLESS_MISS_LIMIT):
+            session.answer("wrong")
+            question = session.next_question()
+
+        assert question is None
+        assert not session.active
+
+
+class TestGameEngine:
+    def test_sessions_share_client_and_keep_own_state(self, engine, api_client, corpus):
+        sessions = [engine.create_session() for _ in range(1000)]
+
+        threads = [threading.Thread(target=session.start, args=(GameSettings(),)) for session in sessions[:50]]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        sessions[0].answer(corpus[0].correct_answer)
+
+        assert len(engine.sessions) == 1000
+        assert api_client.fetch_questions.call_count == 50
+        assert sessions[0].score == engine.score_for(corpus[0].difficulty)
+        assert {session.score for session in sessions[1:]} == {0}
+        assert engine.metrics.counter("trivia_game_prefetch_lookups_total", result="miss") == 50
+
+    def test_get_and_close_session(self, engine):
+        events = []
+        session = engine.create_session(events.append, session_id="player-1")
+        session.start(GameSettings())
+
+        assert engine.get_session("player-1") is session
+        engine.close_session("player-1")
+        engine.close_session("player-1")
+
+        assert isinstance(events[-1], GameOver)
+        with pytest.raises(KeyError):
+            engine.get_session("player-1")
+
+    def test_question_limit_is_capped(self, engine):
+        engine.count_index.max_available.return_value = 25
+
+        assert engine.question_limit(GameSettings("9")) == engine.QUESTIONS_PER_GAME
@@ -0,0 +1,142 @@
+import json
+from unittest.mock import Mock
+
+import pytest
+
+from trivia_game.exceptions import NoResultsError, TokenError, TriviaAPIError
+from trivia_game.harvest import Harvester
+from trivia_game.question_cache import QuestionCache
+
+
+def make_results(prefix, amount):
+    """Questions data the way the API encodes it with encode=url3986"""
+    return [
+        {
+            "type": "boolean",
+            "difficulty": "easy",
+            "category": "Science%20%26%20Nature",
+            "question": f"{prefix}{i}%3F",
+            "correct_answer": "True",
+            "incorrect_answers": ["False"],
+        }
+        for i in range(amount)
+    ]
+
+
+def token_empty_error():
+    error = TokenError("Maximum retry attempts reached for token reset")
+    error.__cause__ = TokenError("Token has returned all possible questions")
+    return error
+
+
+def exhausted_pages():
+    """TOKEN_EMPTY errors for every page size from 50 down to 1"""
+    return [token_empty_error() for _ in (50, 25, 12, 6, 3, 1)]
+
+
+@pytest.fixture
+def corpus():
+    with QuestionCache() as cache:
+        yield cache
+
+
+@pytest.fixture
+def harvester(corpus, tmp_path):
+    return Harvester(Mock(encoding="url3986"), corpus, tmp_path / "checkpoint.json")
+
+
+class TestHarvester:
+    def test_harvest_category_pages_until_token_empty(self, harvester, corpus):
+        harvester.api_client.fetch_encoded.side_effect = [
+            make_results("A", 50),
+            token_empty_error(),
+            make_results("B", 25),
+            token_empty_error(),
+            token_empty_error(),
+            make_results("C", 6),
+            token_empty_error(),
+            token_empty_error(),
+            token_empty_error(),
+        ]
+
+        assert harvester.harvest_category("9") == 81
+        assert corpus.count(category="Science & Nature") == 81
+        amounts = [call.kwargs["amount"] for call in harvester.api_client.fetch_encoded.call_args_list]
+        assert amounts == [50, 50, 25, 25, 12, 6, 6, 3, 1]
+        assert harvester.api_client.fetch_encoded.call_args.kwargs["max_retries"] == 0
+
+    def test_harvest_category_stops_when_nothing_left(self, harvester):
+        harvester.api_client.fetch_encoded.side_effect = NoResultsError("Not enough questions")
+
+        assert harvester.harvest_category("9") == 0
+        amounts = [call.kwargs["amount"] for call in harvester.api_client.fetch_encoded.call_args_list]
+        assert amounts == [50, 25, 12, 6, 3, 1]
+
+    def test_harvest_category_renews_unknown_token(self, harvester):
+        harvester.api_client.fetch_encoded.side_effect = [
+            TokenError("Session token not found"),
+            *exhausted_pages(),
+        ]
+
+        harvester.harvest_category("9")
+
+        harvester.api_client.renew_session_token.assert_called_once()
+
+    def test_harvest_category_propagates_errors(self, harvester):
+        harvester.api_client.fetch_encoded.side_effect = TriviaAPIError("Request failed: Connection error")
+
+        with pytest.raises(TriviaAPIError):
+            harvester.harvest_category("9")
+        assert "9" not in harvester.completed
+
+    def test_run_resumes_from_checkpoint(self, corpus, tmp_path):
+        checkpoint = tmp_path / "checkpoint.json"
+        checkpoint.write_text(json.dumps({"completed": ["9"]}))
+        api_client = Mock(encoding="url3986")
+        api_client.fetch_categories.return_value = {"General Knowledge": "9", "Books": "10"}
+        api_client.fetch_encoded.side_effect = [make_results("A", 10), *exhausted_pages()]
+
+        total = Harvester(api_client, corpus, checkpoint).run()
+
+        assert total == 10
+        assert {call.kwargs["category"] for call in api_client.fetch_encoded.call_args_list} == {"10"}
+        assert json.loads(checkpoint.read_text()) == {"completed": ["9", "10"]}
+
+    @pytest.mark.parametrize("content", ['{"completed": ["9"', '["9"]', "{}"])
+    def test_unreadable_checkpoint_starts_over(self, corpus, tmp_path, content):
+        checkpoint = tmp_path / "checkpoint.json"
+        checkpoint.write_text(content)
+
+        harvester = Harvester(Mock(encoding="url3986"), corpus, checkpoint)
+        harvester._complete("9")
+
+        assert harvester.completed == {"9"}
+        assert json.loads(checkpoint.read_text()) == {"completed": ["9"]}
+        assert list(tmp_path.glob(".checkpoint.json*")) == []
+
+
+class TestParallelHarvest:
+    def test_workers_need_token_pool(self, harvester):
+        with pytest.raises(ValueError, match="token pool"):
+            harvester.run(["9"], workers=2)
+
+    def test_parallel_harvest_with_token_pool(self, corpus, tmp_path):
+        from trivia_game.local_server import LocalTriviaServer, generate_corpus
+        from trivia_game.token_pool import TokenPool
+        from trivia_game.trivia_api import TriviaAPIClient
+
+        with (
+            LocalTriviaServer(corpus=generate_corpus(150)) as server,
+            TriviaAPIClient(retries=0, base_url=server.base_url) as api_client,
+        ):
+            pool = TokenPool(api_client, size=3)
+            harvester = Harvester(api_client, corpus, tmp_path / "checkpoint.json", pool)
+
+            assert harvester.run(workers=3) == 150
+
+        assert corpus.count() == 150
+        assert {question.question for question in corpus.get_questions(150)} == {
+            question.question for question in server.corpus
+        }
+        assert json.loads((tmp_path / "checkpoint.json").read_text()) == {"completed": ["9", "17", "23"]}
+        assert len(pool.tokens) == 3
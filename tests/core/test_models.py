@@ -0,0 +1,39 @@
+import dataclasses
+
+import pytest
+
+from trivia_game.models import Question
+
+
+def make_question(category="Science", incorrect_answers=("B", "C", "D")):
+    return Question(
+        type="multiple",
+        difficulty="easy",
+        category=category,
+        question="Q?",
+        correct_answer="A",
+        incorrect_answers=incorrect_answers,
+    )
+
+
+class TestQuestion:
+    def test_is_slotted_and_frozen(self):
+        question = make_question()
+
+        assert not hasattr(question, "__dict__")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            question.correct_answer = "B"
+
+    def test_answers_are_stored_as_tuple(self):
+        question = make_question(incorrect_answers=["B", "C", "D"])
+
+        assert question.incorrect_answers == ("B", "C", "D")
+        assert question.all_answers() == ["A", "B", "C", "D"]
+        assert question == make_question()
+        assert hash(question) == hash(make_question())
+
+    def test_repeated_strings_are_interned(self):
+        first = make_question(category="".join(["Sci", "ence"]))
+        second = make_question(category="".join(["Scie", "nce"]))
+
+        assert first.category is second.category
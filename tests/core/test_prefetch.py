@@ -0,0 +1,99 @@
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from trivia_game.exceptions import TriviaAPIError
+from trivia_game.models import GameSettings
+from trivia_game.prefetch import QuestionPrefetcher
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            pytest.fail("Condition not met in time")
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def api_client():
+    client = Mock()
+    client.fetch_questions.side_effect = lambda **kwargs: [f"question-{time.monotonic()}"]
+    client.next_request_delay.return_value = 0.0
+    return client
+
+
+@pytest.fixture
+def prefetcher(api_client):
+    prefetcher = QuestionPrefetcher(api_client, depth=2, batch_size=5, retry_delay=0.01)
+    yield prefetcher
+    prefetcher.stop()
+
+
+class TestQuestionPrefetcher:
+    def test_fills_buffer_up_to_depth(self, prefetcher, api_client):
+        settings = GameSettings(category="9", difficulty="easy")
+        prefetcher.prefetch(settings)
+
+        wait_for(lambda: prefetcher.ready == 2)
+        time.sleep(0.05)
+
+        assert api_client.fetch_questions.call_count == 2
+        api_client.fetch_questions.assert_called_with(amount=5, category="9", difficulty="easy", question_type=None)
+
+    def test_get_batch_refills(self, prefetcher, api_client):
+        settings = GameSettings()
+        prefetcher.prefetch(settings)
+        wait_for(lambda: prefetcher.ready == 2)
+
+        assert prefetcher.get_batch(settings) is not None
+        wait_for(lambda: api_client.fetch_questions.call_count == 3)
+
+    def test_get_batch_other_settings(self, prefetcher):
+        prefetcher.prefetch(GameSettings(difficulty="easy"))
+        wait_for(lambda: prefetcher.ready == 2)
+
+        assert prefetcher.get_batch(GameSettings(difficulty="hard")) is None
+
+    def test_new_settings_drop_buffer(self, prefetcher, api_client):
+        prefetcher.prefetch(GameSettings(difficulty="easy"))
+        wait_for(lambda: prefetcher.ready == 2)
+
+        prefetcher.prefetch(GameSettings(difficulty="hard"))
+
+        wait_for(lambda: prefetcher.ready == 2)
+        api_client.fetch_questions.assert_called_with(amount=5, category=None, difficulty="hard", question_type=None)
+
+    def test_disabled_with_zero_depth(self, api_client):
+        prefetcher = QuestionPrefetcher(api_client, depth=0)
+        prefetcher.prefetch(GameSettings())
+
+        assert prefetcher.get_batch(GameSettings()) is None
+        api_client.fetch_questions.assert_not_called()
+
+    def test_retries_after_api_error(self, prefetcher, api_client):
+        succeeded = threading.Event()
+
+        def fetch(**kwargs):
+            if api_client.fetch_questions.call_count == 1:
+                raise TriviaAPIError("offline")
+            succeeded.set()
+            return ["question"]
+
+        api_client.fetch_questions.side_effect = fetch
+        prefetcher.prefetch(GameSettings())
+
+        assert succeeded.wait(timeout=2)
+        wait_for(lambda: prefetcher.ready >= 1)
+
+    def test_waits_for_a_free_rate_limit_slot(self, prefetcher, api_client):
+        delays = iter([0.05, 0.05])
+        api_client.next_request_delay.side_effect = lambda: next(delays, 0.0)
+        prefetcher.prefetch(GameSettings())
+
+        wait_for(lambda: prefetcher.ready == 2)
+
+        assert api_client.next_request_delay.call_count == 4
+        assert api_client.fetch_questions.call_count == 2
@@ -0,0 +1,93 @@
+import random
+
+import pytest
+
+from trivia_game.local_server import generate_corpus
+from trivia_game.models import Question
+from trivia_game.question_bank import QuestionBank, TextColumn
+from trivia_game.question_cache import QuestionCache
+
+
+@pytest.fixture
+def corpus():
+    return generate_corpus(300)
+
+
+@pytest.fixture
+def bank(corpus):
+    return QuestionBank(corpus)
+
+
+class TestTextColumn:
+    def test_round_trip(self):
+        column = TextColumn(["plain", "", "Pokémon & co"])
+
+        assert len(column) == 3
+        assert [column[index] for index in range(3)] == ["plain", "", "Pokémon & co"]
+
+
+class TestQuestionBank:
+    def test_round_trip(self, bank, corpus):
+        assert len(bank) == len(corpus)
+        assert list(bank) == corpus
+        assert bank[-1] == corpus[-1]
+
+    def test_index_out_of_range(self, bank):
+        with pytest.raises(IndexError):
+            bank[len(bank)]
+
+    @pytest.mark.parametrize(
+        "category,difficulty,question_type",
+        [
+            (None, None, None),
+            ("Science & Nature", None, None),
+            (None, "hard", None),
+            (None, None, "boolean"),
+            ("History", "easy", "multiple"),
+        ],
+    )
+    def test_indices_match_a_scan(self, bank, corpus, category, difficulty, question_type):
+        expected = [
+            index
+            for index, question in enumerate(corpus)
+            if category in (None, question.category)
+            and difficulty in (None, question.difficulty)
+            and question_type in (None, question.type)
+        ]
+
+        assert list(bank.indices(category, difficulty, question_type)) == expected
+        assert bank.count(category, difficulty, question_type) == len(expected)
+
+    def test_unknown_filter_values_match_nothing(self, bank):
+        assert bank.count(category="Unknown") == 0
+        assert bank.count(difficulty="impossible") == 0
+
+    def test_sample(self, bank):
+        questions = bank.sample(10, category="History", difficulty="medium", rng=random.Random(1))  # noqa: S311
+
+        assert len(questions) == 10
+        assert len(set(questions)) == 10
+        assert all(q.category == "History" and q.difficulty == "medium" for q in questions)
+
+    def test_sample_returns_all_when_short(self, bank):
+        assert len(bank.sample(1000, question_type="boolean")) == bank.count(question_type="boolean")
+
+    def test_add_invalidates_indices(self, bank, corpus):
+        before = bank.count(category="History")
+
+        bank.add(corpus[2])
+
+        assert bank.count(category="History") == before + (corpus[2].category == "History")
+
+    def test_unsupported_difficulty(self):
+        question = Question("multiple", "extreme", "Science", "Q?", "A", ("B",))
+
+        with pytest.raises(ValueError, match="Unsupported"):
+            QuestionBank([question])
+
+    def test_from_cache(self, corpus):
+        with QuestionCache() as cache:
+            cache.add_questions(corpus)
+            bank = QuestionBank.from_cache(cache)
+
+        assert sorted(question.question for question in bank) == sorted(question.question for question in corpus)
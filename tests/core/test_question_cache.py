@@ -0,0 +1,159 @@
+import sqlite3
+
+import pytest
+
+from trivia_game.models import Question
+from trivia_game.question_cache import QuestionCache
+
+
+@pytest.fixture
+def cache():
+    """Create an in-memory question cache"""
+    with QuestionCache() as question_cache:
+        yield question_cache
+
+
+def make_question(text, category="Science", difficulty="easy", question_type="boolean"):
+    return Question(
+        type=question_type,
+        difficulty=difficulty,
+        category=category,
+        question=text,
+        correct_answer="True",
+        incorrect_answers=["False"],
+    )
+
+
+class TestQuestionCache:
+    def test_add_questions_returns_new_count(self, cache):
+        assert cache.add_questions([make_question("Q1?"), make_question("Q2?")]) == 2
+        assert cache.add_questions([make_question("Q1?"), make_question("Q3?")]) == 1
+        assert cache.count() == 3
+
+    def test_get_questions_round_trip(self, cache):
+        question = Question(
+            type="multiple",
+            difficulty="hard",
+            category="History",
+            question="Who?",
+            correct_answer="A",
+            incorrect_answers=["B", "C", "D"],
+        )
+        cache.add_questions([question])
+
+        assert cache.get_questions(1) == [question]
+
+    def test_get_questions_filters(self, cache):
+        cache.add_questions([
+            make_question("Q1?"),
+            make_question("Q2?", difficulty="hard"),
+            make_question("Q3?", category="History"),
+            make_question("Q4?", question_type="multiple"),
+        ])
+
+        questions = cache.get_questions(10, category="Science", difficulty="easy", question_type="boolean")
+
+        assert [question.question for question in questions] == ["Q1?"]
+        assert cache.count(category="Science") == 3
+        assert cache.count(difficulty="hard") == 1
+
+    def test_get_questions_limits_amount(self, cache):
+        cache.add_questions([make_question(f"Q{i}?") for i in range(5)])
+        assert len(cache.get_questions(3)) == 3
+
+    def test_persists_to_disk(self, tmp_path):
+        path = tmp_path / "questions.db"
+        with QuestionCache(path) as question_cache:
+            question_cache.add_questions([make_question("Q1?")])
+
+        with QuestionCache(path) as question_cache:
+            assert question_cache.count() == 1
+
+    def test_take_questions_marks_served(self, cache):
+        cache.add_questions([make_question(f"Q{i}?") for i in range(3)])
+
+        first = cache.take_questions(2)
+        second = cache.take_questions(2)
+
+        assert len(first) == 2
+        assert {question.question for question in first + second} == {"Q0?", "Q1?", "Q2?"}
+        assert cache.count(fresh_only=True) == 0
+
+    def test_take_questions_fresh_only(self, cache):
+        cache.add_questions([make_question(f"Q{i}?") for i in range(3)])
+        cache.add_questions([make_question("Q0?")], served=True)
+
+        assert cache.take_questions(3, fresh_only=True) == []
+        assert cache.count(fresh_only=True) == 2
+        assert cache.count(fresh_only=True, limit=1) == 1
+        assert {question.question for question in cache.take_questions(2, fresh_only=True)} == {"Q1?", "Q2?"}
+
+    def test_take_questions_reuse_after(self):
+        with QuestionCache(reuse_after=0) as question_cache:
+            question_cache.add_questions([make_question("Q1?")], served=True)
+            assert question_cache.take_questions(1, fresh_only=True) == [make_question("Q1?")]
+
+    def test_upgrades_old_database(self, tmp_path):
+        path = tmp_path / "questions.db"
+        with sqlite3.connect(path) as connection:
+            connection.execute(
+                "CREATE TABLE questions (id INTEGER PRIMARY KEY, category TEXT NOT NULL, difficulty TEXT NOT NULL, "
+                "type TEXT NOT NULL, question TEXT NOT NULL UNIQUE, correct_answer TEXT NOT NULL, "
+                "incorrect_answers TEXT NOT NULL)"
+            )
+            connection.execute(
+                "INSERT INTO questions VALUES (1, 'Science', 'easy', 'boolean', 'Q1?', 'True', '[\"False\"]')"
+            )
+        connection.close()
+
+        with QuestionCache(path) as question_cache:
+            assert question_cache.count(fresh_only=True) == 1
+            assert question_cache.take_questions(1, fresh_only=True) == [make_question("Q1?")]
+
+    def test_add_encoded_decodes_on_read(self, cache):
+        result = {
+            "type": "multiple",
+            "difficulty": "hard",
+            "category": "Science%20%26%20Nature",
+            "question": "Is%20%3Cb%3E%20bold%3F",
+            "correct_answer": "Yes",
+            "incorrect_answers": ["No", "Maybe%2C%20yes"],
+        }
+
+        assert cache.add_encoded([result], "url3986") == 1
+        assert cache.add_encoded([result], "url3986") == 0
+
+        stored = cache._connection.execute("SELECT question, encoding FROM questions").fetchone()
+        assert stored == ("Is%20%3Cb%3E%20bold%3F", "url3986")
+        assert cache.get_questions(1, category="Science & Nature", difficulty="hard") == [
+            Question(
+                type="multiple",
+                difficulty="hard",
+                category="Science & Nature",
+                question="Is <b> bold?",
+                correct_answer="Yes",
+                incorrect_answers=["No", "Maybe, yes"],
+            )
+        ]
+
+    def test_add_encoded_api_default_encoding(self, cache):
+        result = {
+            "type": "boolean",
+            "difficulty": "easy",
+            "category": "Science &amp; Nature",
+            "question": "Is &quot;this&quot; quoted?",
+            "correct_answer": "True",
+            "incorrect_answers": ["False"],
+        }
+
+        cache.add_encoded([result], served=True)
+
+        assert cache.count(fresh_only=True) == 0
+        assert cache.take_questions(1)[0].question == 'Is "this" quoted?'
+
+    def test_add_encoded_rejects_invalid_difficulty(self, cache):
+        result = {"type": "boolean", "difficulty": "extreme", "category": "Science"}
+
+        with pytest.raises(ValueError, match="extreme"):
+            cache.add_encoded([result])
+        assert cache.count() == 0
@@ -0,0 +1,87 @@
+from unittest.mock import Mock
+
+import pytest
+
+from trivia_game.exceptions import TriviaAPIError
+from trivia_game.models import GameSettings
+from trivia_game.question_counts import QuestionCountIndex
+
+COUNTS = {"total": 30, "easy": 12, "medium": 10, "hard": 8}
+
+
+@pytest.fixture
+def api_client():
+    client = Mock()
+    client.cache = None
+    client.fetch_question_count.return_value = COUNTS
+    return client
+
+
+@pytest.fixture
+def count_index(api_client, tmp_path):
+    return QuestionCountIndex(api_client, tmp_path / "question_counts.json")
+
+
+class TestQuestionCountIndex:
+    def test_unknown_counts(self, count_index, api_client):
+        assert count_index.max_available(GameSettings(category="9")) is None
+        assert count_index.max_available(GameSettings()) is None
+        api_client.fetch_question_count.assert_not_called()
+
+    @pytest.mark.parametrize("difficulty,expected", [(None, 30), ("easy", 12), ("hard", 8)])
+    def test_max_available_after_refresh(self, count_index, difficulty, expected):
+        count_index.refresh("9")
+        assert count_index.max_available(GameSettings(category="9", difficulty=difficulty)) == expected
+
+    def test_counts_are_persisted(self, count_index, api_client, tmp_path):
+        count_index.refresh("9")
+
+        reloaded = QuestionCountIndex(api_client, tmp_path / "question_counts.json")
+
+        assert reloaded.is_known("9")
+        assert reloaded.max_available(GameSettings(category="9", difficulty="medium")) == 10
+
+    def test_unknown_counts_fall_back_to_cache(self, count_index, api_client):
+        api_client.cache = Mock()
+        api_client.cache.count.return_value = 5
+        api_client.get_category_name.return_value = "Science"
+
+        assert count_index.max_available(GameSettings(category="17", difficulty="easy")) == 5
+        api_client.cache.count.assert_called_once_with("Science", "easy", None)
+
+    def test_empty_cache_leaves_counts_unknown(self, count_index, api_client):
+        api_client.cache = Mock()
+        api_client.cache.count.return_value = 0
+        api_client.get_category_name.return_value = "Science"
+
+        assert count_index.max_available(GameSettings(category="17")) is None
+
+    def test_known_counts_skip_cache(self, count_index, api_client):
+        api_client.cache = Mock()
+        count_index.refresh("9")
+
+        assert count_index.max_available(GameSettings(category="9", difficulty="easy")) == 12
+        api_client.cache.count.assert_not_called()
+
+    def test_refresh_in_background(self, count_index, api_client):
+        count_index.refresh_in_background("9").join(timeout=2)
+
+        assert count_index.is_known("9")
+        assert count_index.refresh_in_background("9") is None
+        api_client.fetch_question_count.assert_called_once_with("9")
+
+    def test_refresh_in_background_ignores_errors(self, count_index, api_client):
+        api_client.fetch_question_count.side_effect = TriviaAPIError("offline")
+        on_done = Mock()
+
+        count_index.refresh_in_background("9", on_done).join(timeout=2)
+
+        assert not count_index.is_known("9")
+        on_done.assert_called_once_with()
+
+    def test_refresh_in_background_calls_back_after_refresh(self, count_index):
+        known_when_done = []
+
+        count_index.refresh_in_background("9", lambda: known_when_done.append(count_index.is_known("9"))).join(2)
+
+        assert known_when_done == [True]
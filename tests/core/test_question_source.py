@@ -0,0 +1,126 @@
+import asyncio
+import time
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from trivia_game.exceptions import NoResultsError, TriviaAPIError
+from trivia_game.local_server import generate_corpus
+from trivia_game.models import GameSettings
+from trivia_game.question_bank import QuestionBank
+from trivia_game.question_cache import QuestionCache
+from trivia_game.question_source import AsyncQuestionSource, BackgroundQuestionSource, QuestionSource
+
+
+@pytest.fixture
+def corpus():
+    return generate_corpus(30)
+
+
+class TestQuestionSource:
+    def test_serves_initial_questions_in_order(self, corpus):
+        source = QuestionSource(corpus[:3])
+
+        assert len(source) == 3
+        assert list(source) == corpus[:3]
+        assert source.exhausted
+        assert next(source, None) is None
+
+    def test_refills_when_drained(self, corpus):
+        refill = Mock(side_effect=[corpus[2:5], corpus[5:6], []])
+        source = QuestionSource(corpus[:2], refill, batch_size=3)
+
+        assert list(source) == corpus[:6]
+        assert [call.args for call in refill.call_args_list] == [(3,), (3,), (3,)]
+
+    def test_limit_caps_refills(self, corpus):
+        refill = Mock(side_effect=lambda amount: corpus[:amount])
+        source = QuestionSource(refill=refill, limit=5, batch_size=3)
+
+        assert len(list(source)) == 5
+        assert [call.args for call in refill.call_args_list] == [(3,), (2,)]
+        assert source.served == 5
+
+    def test_refill_errors_are_raised(self):
+        source = QuestionSource(refill=Mock(side_effect=TriviaAPIError("down")))
+
+        with pytest.raises(TriviaAPIError):
+            next(source)
+
+    def test_from_api_ends_without_results(self, corpus):
+        api_client = Mock()
+        api_client.fetch_questions.side_effect = [corpus[:2], NoResultsError("empty")]
+        source = QuestionSource.from_api(api_client, GameSettings("9", "easy", None), batch_size=2)
+
+        assert list(source) == corpus[:2]
+        api_client.fetch_questions.assert_called_with(
+            amount=2, category="9", difficulty="easy", question_type=None, use_cache=True
+        )
+
+    def test_from_cache_and_corpus(self, corpus):
+        with QuestionCache() as cache:
+            cache.add_questions(corpus)
+            sources = [
+                QuestionSource.from_cache(cache, question_type="boolean", limit=25),
+                QuestionSource.from_corpus(QuestionBank(corpus), question_type="boolean", limit=25),
+            ]
+
+            for source in sources:
+                questions = list(source)
+                assert len(questions) == 25
+                assert {question.type for question in questions} == {"boolean"}
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+class TestBackgroundQuestionSource:
+    def test_refills_ahead_of_demand(self, corpus):
+        refill = Mock(side_effect=lambda amount: corpus[:amount])
+        source = BackgroundQuestionSource(corpus[:2], refill, batch_size=3, low_water=2)
+
+        source.start()
+        wait_for(lambda: len(source) == 5)
+        refill.assert_called_once_with(3)
+        assert next(source) == corpus[0]
+        source.stop()
+
+    def test_respects_limit(self, corpus):
+        source = BackgroundQuestionSource(refill=lambda amount: corpus[:amount], limit=7, batch_size=3)
+
+        assert len(list(source)) == 7
+        source.stop()
+
+    def test_refill_error_is_raised_when_empty(self, corpus):
+        refill = Mock(side_effect=[TriviaAPIError("down"), corpus[:2], []])
+        source = BackgroundQuestionSource(refill=refill, retry_delay=0.01)
+
+        with pytest.raises(TriviaAPIError):
+            next(source)
+        assert list(source) == corpus[:2]
+
+    def test_stop_ends_iteration(self, corpus):
+        source = BackgroundQuestionSource(corpus[:5], lambda amount: corpus[:amount])
+        source.start()
+
+        source.stop()
+
+        assert next(source, None) is None
+        wait_for(lambda: not source._worker.is_alive())
+
+
+class TestAsyncQuestionSource:
+    def test_refills_from_api(self, corpus):
+        api_client = Mock()
+        api_client.fetch_questions = AsyncMock(side_effect=[corpus[:2], corpus[2:3], NoResultsError("empty")])
+        source = AsyncQuestionSource.from_api(api_client, GameSettings(), batch_size=2)
+
+        async def run():
+            return [question async for question in source]
+
+        assert asyncio.run(run()) == corpus[:3]
+        assert api_client.fetch_questions.await_count == 3
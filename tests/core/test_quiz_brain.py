@@ -1,23 +1,54 @@
 import json
+import threading
 from datetime import datetime
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 import pytest
+import requests
 
-from trivia_game.exceptions import CategoryError
-from trivia_game.models import Question, ScoreboardEntry
+from trivia_game.exceptions import CategoryError, TriviaAPIError
+from trivia_game.local_server import generate_corpus
+from trivia_game.models import GameSettings, Question, ScoreboardEntry
+from trivia_game.question_source import BackgroundQuestionSource, QuestionSource
 from trivia_game.quiz_brain import QuizBrain
 from trivia_game.trivia_api import TriviaAPIClient
 
 
 class TestQuizBrainInitialization:
-    def test_init(self, mock_controller):
-        quiz_brain = QuizBrain(mock_controller)
+    def test_init(self, mock_controller, offline_api_client, tmp_path):
+        quiz_brain = QuizBrain(mock_controller, data_dir=tmp_path, api_client=offline_api_client)
         assert quiz_brain.controller == mock_controller
         assert quiz_brain.score == 0
         assert quiz_brain.current_question is None
-        assert quiz_brain.questions == []
+        assert len(quiz_brain.questions) == 0
+        assert quiz_brain.api_client is offline_api_client
+        assert quiz_brain.categories == {"General Knowledge": "9"}
+        assert quiz_brain.count_index.path == tmp_path / "question_counts.json"
+
+    def test_init_data_dir(self, mock_controller, tmp_path):
+        with (
+            patch("requests.Session.get", side_effect=requests.exceptions.ConnectionError),
+            patch.object(TriviaAPIClient, "prefetch_session_token") as prefetch_session_token,
+        ):
+            quiz_brain = QuizBrain(mock_controller, prefetch_depth=0, data_dir=tmp_path)
+
+        prefetch_session_token.assert_called_once()
+
         assert isinstance(quiz_brain.api_client, TriviaAPIClient)
+        assert quiz_brain.api_client.cache.path == tmp_path / "questions.db"
+        assert quiz_brain.api_client.token_store.path == tmp_path / "session_token.json"
+        mock_controller.show_error.assert_called_once()
+
+    def test_close_stops_exporters(self, quiz_brain):
+        exporters = [Mock(), Mock()]
+        quiz_brain.exporters = list(exporters)
+
+        quiz_brain.close()
+        quiz_brain.close()
+
+        for exporter in exporters:
+            exporter.stop.assert_called_once_with()
+        assert quiz_brain.exporters == []
 
 
 class TestQuizBrainCategories:
@@ -107,11 +138,13 @@ class TestQuizBrainQuestions:
         quiz_brain.api_client.fetch_questions = Mock(return_value=expected_questions)
 
         quiz_brain.load_questions(category="9", difficulty="easy", question_type="multiple")
+        quiz_brain._start_thread.join()
 
-        assert quiz_brain.questions == expected_questions
+        assert quiz_brain.current_question == expected_questions[0]
+        assert quiz_brain.questions.exhausted
         assert quiz_brain.score == 0
         quiz_brain.api_client.fetch_questions.assert_called_once_with(
-            category="9", difficulty="easy", question_type="multiple"
+            amount=10, category="9", difficulty="easy", question_type="multiple"
         )
 
     def test_load_questions_handles_error(self, quiz_brain):
@@ -119,9 +152,25 @@ class TestQuizBrainQuestions:
         quiz_brain.api_client.fetch_questions = Mock(side_effect=Exception(error_message))
 
         quiz_brain.load_questions(None, None, None)
+        quiz_brain._start_thread.join()
 
         quiz_brain.controller.show_error.assert_called_once_with(f"Error loading questions: {error_message}")
 
+    def test_load_questions_runs_off_the_ui_thread(self, quiz_brain, mock_question):
+        release = threading.Event()
+        quiz_brain.api_client.fetch_questions = Mock(side_effect=lambda **_: release.wait() and [mock_question])
+
+        quiz_brain.load_questions(None, None, None)
+        starting = quiz_brain._start_thread
+        quiz_brain.load_questions(None, None, None)
+
+        assert quiz_brain._start_thread is starting
+        assert quiz_brain.current_question is None
+        release.set()
+        starting.join()
+        assert quiz_brain.current_question == mock_question
+        quiz_brain.api_client.fetch_questions.assert_called_once()
+
     def test_show_next_question_with_questions(self, quiz_brain):
         test_questions = [
             Question(
@@ -141,7 +190,7 @@ class TestQuizBrainQuestions:
                 incorrect_answers=["B", "C", "D"],
             ),
         ]
-        quiz_brain.questions = test_questions.copy()
+        quiz_brain.questions = QuestionSource(test_questions)
 
         quiz_brain.show_next_question()
 
@@ -150,7 +199,7 @@ class TestQuizBrainQuestions:
         quiz_brain.controller.show_frame.assert_called_once_with("TrueFalseQuizFrame")
 
     def test_show_next_question_empty_questions(self, quiz_brain):
-        quiz_brain.questions = []
+        quiz_brain.questions = QuestionSource()
         quiz_brain.end_game = Mock()
 
         quiz_brain.show_next_question()
@@ -160,7 +209,8 @@ class TestQuizBrainQuestions:
 
 class TestQuizBrainScoring:
     def test_check_answer_correct(self, quiz_brain, mock_question):
-        quiz_brain.current_question = mock_question
+        quiz_brain.questions = QuestionSource([mock_question])
+        quiz_brain.show_next_question()
         quiz_brain.score = 0
         mock_question.correct_answer = "True"
         mock_question.difficulty = "medium"
@@ -171,7 +221,8 @@ class TestQuizBrainScoring:
         assert quiz_brain.score == 200
 
     def test_check_answer_incorrect(self, quiz_brain, mock_question):
-        quiz_brain.current_question = mock_question
+        quiz_brain.questions = QuestionSource([mock_question])
+        quiz_brain.show_next_question()
         quiz_brain.score = 0
         mock_question.correct_answer = "True"
         mock_question.difficulty = "medium"
@@ -244,3 +295,139 @@ class TestQuizBrainGameFlow:
         assert scores[0]["player"] == "Player1"
         assert scores[0]["score"] == 500
         assert scores[0]["date"] == "2024-12-15T16:57:00"
+
+
+class TestQuizBrainPrefetch:
+    def test_load_questions_uses_prefetched_batch(self, quiz_brain, mock_question):
+        quiz_brain.prefetcher = Mock()
+        quiz_brain.prefetcher.get_batch.return_value = [mock_question]
+        quiz_brain.api_client.fetch_questions = Mock()
+
+        quiz_brain.load_questions(category="9", difficulty="easy", question_type="multiple")
+        quiz_brain._start_thread.join()
+
+        quiz_brain.api_client.fetch_questions.assert_not_called()
+        assert quiz_brain.current_question == mock_question
+        settings = GameSettings(category="9", difficulty="easy", question_type="multiple")
+        quiz_brain.prefetcher.get_batch.assert_called_once_with(settings)
+        quiz_brain.prefetcher.prefetch.assert_called_once_with(settings)
+
+    def test_load_questions_falls_back_to_api(self, quiz_brain, mock_question):
+        quiz_brain.prefetcher = Mock()
+        quiz_brain.prefetcher.get_batch.return_value = None
+        quiz_brain.api_client.fetch_questions = Mock(return_value=[mock_question])
+
+        quiz_brain.load_questions(category=None, difficulty=None, question_type=None)
+        quiz_brain._start_thread.join()
+
+        quiz_brain.api_client.fetch_questions.assert_called_once_with(
+            amount=10, category=None, difficulty=None, question_type=None
+        )
+        assert quiz_brain.current_question == mock_question
+
+
+class TestQuizBrainEndless:
+    def test_load_questions_starts_background_refill(self, quiz_brain):
+        corpus = generate_corpus(30)
+        quiz_brain.prefetcher = Mock()
+        quiz_brain.prefetcher.get_batch.return_value = None
+        quiz_brain.api_client.fetch_questions = Mock(side_effect=[corpus[:10], corpus[10:20], corpus[20:]])
+
+        quiz_brain.load_questions(category=None, difficulty=None, question_type=None, endless=True)
+        quiz_brain._start_thread.join()
+
+        assert isinstance(quiz_brain.questions, BackgroundQuestionSource)
+        assert quiz_brain.endless
+        assert [next(quiz_brain.questions) for _ in range(12)] == corpus[1:13]
+        quiz_brain.api_client.fetch_questions.assert_called_with(
+            amount=10, category=None, difficulty=None, question_type=None, use_cache=False
+        )
+        quiz_brain.prefetcher.prefetch.assert_not_called()
+        quiz_brain.questions.stop()
+
+    def test_misses_in_a_row_end_the_game(self, quiz_brain):
+        corpus = generate_corpus(10)
+        quiz_brain.endless = True
+        quiz_brain.questions = QuestionSource(corpus)
+        quiz_brain.end_game = Mock()
+
+        for answer in ("wrong", "correct", "wrong", "wrong", "wrong"):
+            quiz_brain.show_next_question()
+            quiz_brain.check_answer(quiz_brain.current_question.correct_answer if answer == "correct" else "?")
+        quiz_brain.show_next_question()
+
+        assert quiz_brain.misses_in_a_row == quiz_brain.ENDLESS_MISS_LIMIT
+        quiz_brain.end_game.assert_called_once()
+
+    def test_refill_error_ends_the_game(self, quiz_brain):
+        quiz_brain.endless = True
+        quiz_brain.questions = QuestionSource(refill=Mock(side_effect=TriviaAPIError("down")))
+        quiz_brain.end_game = Mock()
+
+        quiz_brain.show_next_question()
+
+        quiz_brain.controller.show_error.assert_called_once_with("Error loading questions: down")
+        quiz_brain.end_game.assert_called_once()
+
+
+class TestQuizBrainQuestionLimit:
+    def test_load_questions_rejects_empty_selection(self, quiz_brain):
+        quiz_brain.count_index = Mock()
+        quiz_brain.count_index.max_available.return_value = 0
+        quiz_brain.api_client.fetch_questions = Mock()
+
+        quiz_brain.load_questions(category="9", difficulty="hard", question_type=None)
+        quiz_brain._start_thread.join()
+
+        quiz_brain.api_client.fetch_questions.assert_not_called()
+        quiz_brain.controller.show_error.assert_called_with(
+            "No questions available for the selected options. Please change them."
+        )
+
+    def test_load_questions_resizes_game(self, quiz_brain, mock_question):
+        quiz_brain.count_index = Mock()
+        quiz_brain.count_index.max_available.return_value = 4
+        quiz_brain.prefetcher = Mock()
+        quiz_brain.prefetcher.get_batch.return_value = None
+        quiz_brain.api_client.fetch_questions = Mock(return_value=[mock_question])
+
+        quiz_brain.load_questions(category="9", difficulty="hard", question_type=None)
+        quiz_brain._start_thread.join()
+
+        assert quiz_brain.api_client.fetch_questions.call_args.kwargs["amount"] == 4
+        quiz_brain.prefetcher.prefetch.assert_not_called()
+
+    @pytest.mark.parametrize("available,expected", [(None, None), (3, 3), (250, 10)])
+    def test_get_question_limit(self, quiz_brain, available, expected):
+        quiz_brain.count_index = Mock()
+        quiz_brain.count_index.max_available.return_value = available
+
+        assert quiz_brain.get_question_limit("9", "easy", None) == expected
+        quiz_brain.count_index.max_available.assert_called_once_with(GameSettings("9", "easy", None))
+
+
+class TestQuizBrainMetrics:
+    def test_answer_latency(self, quiz_brain, mock_question):
+        quiz_brain.questions = QuestionSource([mock_question])
+        quiz_brain.show_next_question()
+        mock_question.correct_answer = "A"
+
+        quiz_brain.check_answer("A")
+        quiz_brain.check_answer("A")
+
+        histograms = quiz_brain.metrics.snapshot()["histograms"]
+        assert histograms["trivia_game_answer_latency_seconds"][0]["labels"] == {"correct": "true"}
+        assert histograms["trivia_game_answer_latency_seconds"][0]["count"] == 1
+
+    def test_time_to_first_question(self, quiz_brain, mock_question):
+        quiz_brain.prefetcher.get_batch = Mock(return_value=[mock_question])
+
+        quiz_brain.load_questions(None, None, None)
+        quiz_brain._start_thread.join()
+
+        assert quiz_brain.metrics.counter("trivia_game_prefetch_lookups_total", result="hit") == 1
+        histograms = quiz_brain.metrics.snapshot()["histograms"]
+        assert histograms["trivia_game_time_to_first_question_seconds"][0]["count"] == 1
+
+    def test_api_client_shares_registry(self, quiz_brain):
+        assert quiz_brain.api_client.metrics is quiz_brain.metrics
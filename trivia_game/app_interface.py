@@ -74,3 +74,8 @@ class AppInterface(ctk.CTk, AppControllerProtocol):
     def quit(self) -> None:
         """Quit the application"""
         self.destroy()
+
+    def destroy(self) -> None:
+        """Stop the quiz brain's background work and close the window"""
+        self.quiz_brain.close()
+        super().destroy()
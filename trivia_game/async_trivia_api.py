@@ -0,0 +1,399 @@
+"""Module for interacting with the trivia API from asyncio code."""
+
+import asyncio
+import contextlib
+import json
+import ssl
+import types
+from typing import Any, ClassVar, cast
+from urllib.parse import urlencode, urlsplit
+
+from trivia_game.exceptions import CategoryError, ProtocolError, TokenError, TriviaAPIError
+from trivia_game.models import DifficultyType, EncodingType, Question, QuestionType, TriviaResponseCode
+from trivia_game.trivia_api import BaseTriviaAPIClient
+
+
+class AsyncTriviaAPIClient(BaseTriviaAPIClient):
+    """asyncio client for handling Trivia API interactions
+
+    Mirrors TriviaAPIClient, but every request is a coroutine running on the event loop,
+    so many fetches can be in flight at once without a thread per request. HTTP is spoken
+    directly over asyncio streams, one connection per request. The session token is
+    requested on the first fetch_questions call, since a constructor cannot await.
+
+    Attributes:
+        REQUEST_ERROR_MAPPING (ClassVar[dict[type[Exception], tuple[type[Exception], str]]]): Exceptions for
+            transport errors, checked in order. All but ProtocolError are retried, a server that does
+            not speak HTTP will not start to on the next attempt.
+
+    Args:
+        timeout (int, optional): Timeout for requests. Defaults to 10.
+        retries (int, optional): Number of retries for failed requests. Defaults to 3.
+        max_connections (int, optional): Maximum number of requests in flight. Defaults to 100.
+        encoding (EncodingType | None, optional): The `encode` mode for questions requests. Defaults to None.
+        base_url (str | None, optional): Scheme and host to send requests to instead of opentdb.com. Defaults to None.
+
+    Raises:
+        TriviaAPIError: If an unknown error occurs
+        ProtocolError: If a response is not valid HTTP
+        NoResultsError: If there are not enough questions available
+        InvalidParameterError: If invalid parameters are provided
+        TokenError: If a session token is not found or is empty
+        RateLimitError: If the rate limit is exceeded
+    """
+
+    REQUEST_ERROR_MAPPING: ClassVar[dict[type[Exception], tuple[type[Exception], str]]] = {
+        asyncio.TimeoutError: (TriviaAPIError, "Request timed out"),
+        asyncio.IncompleteReadError: (TriviaAPIError, "Connection error"),
+        ConnectionError: (TriviaAPIError, "Connection error"),
+        OSError: (TriviaAPIError, "Connection error"),
+        ValueError: (ProtocolError, "Invalid HTTP response"),
+    }
+
+    def __init__(
+        self,
+        timeout: int = 10,
+        retries: int = 3,
+        max_connections: int = 100,
+        encoding: EncodingType | None = None,
+        base_url: str | None = None,
+    ) -> None:
+        """Initialize the AsyncTriviaAPIClient
+
+        Args:
+            timeout (int, optional): Timeout for requests. Defaults to 10.
+            retries (int, optional): Number of retries for failed requests. Defaults to 3.
+            max_connections (int, optional): Maximum number of requests in flight. Defaults to 100.
+            encoding (EncodingType | None, optional): The `encode` mode for questions requests. Defaults to None.
+            base_url (str | None, optional): Scheme and host to send requests to instead of opentdb.com.
+                Defaults to None.
+
+        Returns:
+            None
+        """
+        self.timeout = timeout
+        self.retries = retries
+        self._session_token: str | None = None
+        self._semaphore: asyncio.Semaphore = asyncio.Semaphore(max_connections)
+        self._token_lock: asyncio.Lock = asyncio.Lock()
+        self._ssl_context: ssl.SSLContext = ssl.create_default_context()
+        self.categories: dict[str, str] = {}
+        self.encoding = encoding
+        self.base_url = base_url
+
+    async def _http_get(self, url: str, params: dict[str, Any] | None = None) -> tuple[int, bytes]:
+        """Send a single HTTP GET request
+
+        Args:
+            url (str): The URL to request
+            params (dict[str, Any] | None, optional): Query parameters, None values are dropped. Defaults to None.
+
+        Raises:
+            ValueError: If the response is not valid HTTP
+
+        Returns:
+            tuple[int, bytes]: The status code and the response body
+        """
+        parts = urlsplit(url)
+        is_https: bool = parts.scheme == "https"
+        host: str = parts.hostname or ""
+        port: int = parts.port or (443 if is_https else 80)
+
+        query: str = urlencode({key: value for key, value in (params or {}).items() if value is not None})
+        path: str = parts.path or "/"
+        target: str = f"{path}?{query}" if query else path
+
+        reader, writer = await asyncio.open_connection(
+            host, port, ssl=self._ssl_context if is_https else None, server_hostname=host if is_https else None
+        )
+        try:
+            writer.write(
+                f"GET {target} HTTP/1.1\r\nHost: {parts.netloc}\r\nAccept: application/json\r\n"
+                "Connection: close\r\n\r\n".encode("ascii")
+            )
+            await writer.drain()
+
+            status_line: bytes = await reader.readline()
+            try:
+                status_code: int = int(status_line.split()[1])
+            except (IndexError, ValueError) as e:
+                status_err_msg: str = f"Invalid status line: {status_line!r}"
+                raise ValueError(status_err_msg) from e
+
+            headers: dict[str, str] = {}
+            while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            if headers.get("transfer-encoding", "").lower() == "chunked":
+                body: bytes = await self._read_chunked(reader)
+            elif "content-length" in headers:
+                body = await reader.readexactly(int(headers["content-length"]))
+            else:
+                body = await reader.read()
+        finally:
+            writer.close()
+            with contextlib.suppress(OSError):
+                await writer.wait_closed()
+
+        return status_code, body
+
+    @staticmethod
+    async def _read_chunked(reader: asyncio.StreamReader) -> bytes:
+        """Read a chunked transfer-encoded body
+
+        Args:
+            reader (asyncio.StreamReader): The connection reader positioned after the headers
+
+        Returns:
+            bytes: The decoded body
+        """
+        chunks: list[bytes] = []
+        while size := int((await reader.readline()).split(b";")[0].strip() or b"0", 16):
+            chunks.append(await reader.readexactly(size))
+            await reader.readline()
+        await reader.readline()
+        return b"".join(chunks)
+
+    def _map_request_error(self, error: Exception) -> tuple[type[Exception], str]:
+        """Find the exception class and message for a transport error
+
+        Args:
+            error (Exception): The transport error
+
+        Returns:
+            tuple[type[Exception], str]: The exception class and message
+        """
+        return next(
+            (mapping for error_type, mapping in self.REQUEST_ERROR_MAPPING.items() if isinstance(error, error_type)),
+            (TriviaAPIError, "Generic error"),
+        )
+
+    async def _make_request(self, url: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+        """Make HTTP request with retries and error handling"""
+
+        attempt: int = 0
+        while True:
+            try:
+                async with self._semaphore:
+                    status_code, body = await asyncio.wait_for(
+                        self._http_get(self._resolve_url(url), params), self.timeout
+                    )
+
+            except tuple(self.REQUEST_ERROR_MAPPING.keys()) as e:
+                error_class, error_msg = self._map_request_error(e)
+                if attempt < self.retries and error_class is not ProtocolError:
+                    attempt += 1
+                    await self._backoff(attempt)
+                    continue
+                request_err_msg: str = f"Request failed: {error_msg}"
+                raise error_class(request_err_msg) from e
+
+            if status_code in self.RETRY_STATUS_FORCELIST and attempt < self.retries:
+                attempt += 1
+                await self._backoff(attempt)
+                continue
+
+            if status_code >= 400:
+                error_class, error_msg = self.HTTP_ERROR_MAPPING.get(
+                    status_code, (TriviaAPIError, f"HTTP {status_code}")
+                )
+                http_err_msg: str = f"Request failed: {error_msg}"
+                raise error_class(http_err_msg)
+
+            return self._parse_and_validate_body(body)
+
+    async def _backoff(self, attempt: int) -> None:
+        """Sleep before a retry, following the urllib3 backoff schedule
+
+        Args:
+            attempt (int): The number of the upcoming retry, starting at 1
+
+        Returns:
+            None
+        """
+        if attempt > 1:
+            await asyncio.sleep(self.RETRY_BACKOFF_FACTOR * 2 ** (attempt - 1))
+
+    def _parse_and_validate_body(self, body: bytes) -> dict[str, Any]:
+        """Parse and validate JSON response body from API
+
+        Args:
+            body (bytes): The HTTP response body
+
+        Raises:
+            TriviaAPIError: If the JSON response is invalid
+
+        Returns:
+            dict[str, Any]: The JSON response data
+        """
+        try:
+            data: dict[str, Any] = json.loads(body)
+
+        except ValueError as e:
+            error_msg: str = f"Invalid JSON response: {e!s}"
+            raise TriviaAPIError(error_msg) from e
+
+        return self._validate_response_data(data)
+
+    async def request_session_token(self) -> str:
+        """Request a session token from the API
+
+        Raises:
+            TriviaAPIError: If the request fails
+
+        Returns:
+            str: The session token value
+        """
+        params: dict[str, str] = {"command": "request"}
+        data: dict[str, Any] = await self._make_request(self.SESSION_TOKEN_API_URL, params=params)
+        return cast(str, data["token"])
+
+    async def renew_session_token(self) -> str:
+        """Replace the current session token with a new one
+
+        Use this when the API no longer knows the token, e.g. after it expired.
+
+        Raises:
+            TriviaAPIError: If the token request fails
+
+        Returns:
+            str: The new session token value
+        """
+        async with self._token_lock:
+            self._session_token = await self.request_session_token()
+            return self._session_token
+
+    async def reset_session_token(self, token: str | None = None) -> str:
+        """Reset the current session token.
+
+        This will wipe all progress/question history for the current token
+        but return the same token value.
+
+        Args:
+            token (str | None, optional): Another token to reset instead of the current one. Defaults to None.
+
+        Raises:
+            TokenError: If no active session token exists
+            TriviaAPIError: If the reset request fails
+
+        Returns:
+            str: The same token value, but with progress wiped
+        """
+        token = token or self._session_token
+        if not token:
+            msg: str = "Cannot reset: No active session token"
+            raise TokenError(msg)
+
+        params: dict[str, str] = {"command": "reset", "token": token}
+        data: dict[str, Any] = await self._make_request(self.SESSION_TOKEN_API_URL, params=params)
+        return cast(str, data["token"])
+
+    async def _ensure_session_token(self) -> str | None:
+        """Request a session token on first use, sharing one request between concurrent callers
+
+        Returns:
+            str | None: The session token
+        """
+        async with self._token_lock:
+            if self._session_token is None:
+                self._session_token = await self.request_session_token()
+        return self._session_token
+
+    async def fetch_categories(self) -> dict[str, str]:
+        """Fetch trivia categories from the API
+
+        Raises:
+            CategoryError: If the request fails or no categories are found
+
+        Returns:
+            dict[str, str]: The categories as a dict of name: id
+        """
+        try:
+            data = await self._make_request(self.CATEGORIES_API_URL)
+            self.categories = self._parse_categories(data)
+
+        except TriviaAPIError as e:
+            error_msg: str = f"Failed to fetch categories: {e!s}"
+            raise CategoryError(error_msg) from e
+
+        else:
+            return self.categories
+
+    async def fetch_questions(
+        self,
+        amount: int = 10,
+        category: str | None = None,
+        difficulty: DifficultyType | None = None,
+        question_type: QuestionType | None = None,
+        max_retries: int = 3,
+    ) -> list[Question]:
+        """Fetch trivia questions from the API.
+
+        Args:
+            amount (int, optional): The number of questions to fetch. Defaults to 10.
+            category (str, optional): The category to fetch questions from. Defaults to None.
+            difficulty (str, optional): The difficulty level of the questions. Defaults to None.
+            question_type (str, optional): The type of questions to fetch. Defaults to None.
+            max_retries (int, optional): The maximum number of retries for token reset or renewal. Defaults to 3.
+
+        Raises:
+            InvalidParameterError: If invalid parameters are provided
+            TokenError: If the session token is not found or is empty
+            NoResultsError: If there are not enough questions available
+            RateLimitError: If the rate limit is exceeded
+
+        Returns:
+            list[Question]: The list of formatted question objects
+        """
+        params: dict[str, str | None] = self._build_question_params(
+            amount, self._session_token, category, difficulty, question_type, self.encoding
+        )
+        params["token"] = await self._ensure_session_token()
+
+        retry_count: int = 0
+        retry_count_err_msg: str = "Maximum retry attempts reached for token reset"
+
+        while retry_count <= max_retries:
+            try:
+                data: dict[str, Any] = await self._make_request(self.QUESTIONS_API_URL, params=params)
+
+            except TokenError as e:
+                token_not_found: bool = self.ERROR_MESSAGES[TriviaResponseCode.TOKEN_NOT_FOUND] in str(e)
+                if not token_not_found and "Token has returned all possible questions" not in str(e):
+                    raise
+                if retry_count >= max_retries:
+                    raise TokenError(retry_count_err_msg) from e
+                if token_not_found:
+                    params["token"] = await self.renew_session_token()
+                else:
+                    self._session_token = await self.reset_session_token()
+                retry_count += 1
+            else:
+                return self._format_questions(data["results"])
+
+        raise TokenError(retry_count_err_msg)
+
+    async def __aenter__(self) -> "AsyncTriviaAPIClient":
+        """Enter async context manager
+
+        Returns:
+            AsyncTriviaAPIClient: The client instance
+        """
+        return self
+
+    async def __aexit__(
+        self, exc_type: type[BaseException] | None, exc_val: BaseException | None, exc_tb: types.TracebackType | None
+    ) -> None:
+        """Exit the async context manager.
+
+        Connections are closed after every request, so there is nothing to release.
+
+        Args:
+            exc_type: The type of the exception that was raised
+            exc_val: The instance of the exception that was raised
+            exc_tb: The traceback of the exception that was raised
+
+        Returns:
+            None
+        """
@@ -1,8 +1,10 @@
+from collections.abc import Callable
 from typing import Literal, Protocol
 
 import customtkinter as ctk  # type: ignore[import-untyped]
 
 from trivia_game.models import Question
+from trivia_game.question_source import QuestionSource
 
 
 class AppControllerProtocol(Protocol):
@@ -11,13 +13,15 @@ class AppControllerProtocol(Protocol):
     def show_frame(self, frame_class: type[ctk.CTkFrame] | str) -> None: ...
     def quit(self) -> None: ...
     def show_error(self, message: str) -> None: ...
+    def after(self, ms: int, func: Callable[..., object], *args: object) -> str: ...
 
 
 class TriviaGameProtocol(Protocol):
     categories: dict[str, str]
     current_question: Question | None
-    questions: list[Question]
+    questions: QuestionSource
     score: int
+    endless: bool
 
     def _load_categories(self) -> None: ...
     def get_available_categories(self) -> list[str]: ...
@@ -26,12 +30,21 @@ class TriviaGameProtocol(Protocol):
     def get_difficulty_value(self, difficulty_name: str) -> str | None: ...
     def get_available_question_types(self) -> list[str]: ...
     def get_question_type_value(self, question_type: str) -> str | None: ...
+    def get_question_limit(
+        self,
+        category: str | None,
+        difficulty: Literal["easy", "medium", "hard"] | None,
+        question_type: Literal["multiple", "boolean"] | None,
+    ) -> int | None: ...
+    def request_question_counts(self, category: str | None, on_loaded: Callable[[], None] | None = None) -> None: ...
 
     def load_questions(
         self,
         category: str | None,
         difficulty: Literal["easy", "medium", "hard"] | None,
         question_type: Literal["multiple", "boolean"] | None,
+        endless: bool = False,
     ) -> None: ...
     def show_next_question(self) -> None: ...
     def check_answer(self, selected_answer: str) -> bool: ...
+    def end_game(self) -> None: ...
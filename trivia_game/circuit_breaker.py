@@ -0,0 +1,199 @@
+"""Module for failing fast while the Trivia API is unavailable."""
+
+import threading
+import time
+from collections.abc import Callable
+from typing import ClassVar, Literal
+
+CircuitState = Literal["closed", "open", "half_open"]
+
+
+class CircuitBreaker:
+    """Stops sending requests after repeated failures, until the API is back
+
+    The circuit is closed while requests succeed. `failure_threshold` consecutive
+    failures open it, and requests are then refused without touching the network, so
+    callers can fall back to local questions immediately. Calls slower than
+    `slow_call_threshold` count as failures too.
+
+    With a probe, a background thread calls it every `reset_timeout` seconds while
+    the circuit is open and closes the circuit once it succeeds, so no caller waits
+    for a trial request. Without one, the circuit turns half open after
+    `reset_timeout` and lets a single trial request through.
+
+    Attributes:
+        DEFAULT_FAILURE_THRESHOLD (ClassVar[int]): Consecutive failures that open the circuit
+        DEFAULT_RESET_TIMEOUT (ClassVar[float]): Seconds between recovery attempts
+
+    Args:
+        failure_threshold (int, optional): Consecutive failures that open the circuit.
+            Defaults to DEFAULT_FAILURE_THRESHOLD.
+        reset_timeout (float, optional): Seconds between recovery attempts. Defaults to DEFAULT_RESET_TIMEOUT.
+        slow_call_threshold (float | None, optional): Seconds after which a successful call counts as a
+            failure, None disables it. Defaults to None.
+        probe (Callable[[], object] | None, optional): Checks whether the API is reachable, raising if it
+            is not. Defaults to None.
+        clock (Callable[[], float], optional): Monotonic clock. Defaults to time.monotonic.
+    """
+
+    DEFAULT_FAILURE_THRESHOLD: ClassVar[int] = 3
+    DEFAULT_RESET_TIMEOUT: ClassVar[float] = 30.0
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        reset_timeout: float = DEFAULT_RESET_TIMEOUT,
+        slow_call_threshold: float | None = None,
+        probe: Callable[[], object] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Create a closed circuit breaker
+
+        Args:
+            failure_threshold (int, optional): Consecutive failures that open the circuit.
+                Defaults to DEFAULT_FAILURE_THRESHOLD.
+            reset_timeout (float, optional): Seconds between recovery attempts. Defaults to DEFAULT_RESET_TIMEOUT.
+            slow_call_threshold (float | None, optional): Seconds after which a successful call counts as a
+                failure. Defaults to None.
+            probe (Callable[[], object] | None, optional): Checks whether the API is reachable. Defaults to None.
+            clock (Callable[[], float], optional): Monotonic clock. Defaults to time.monotonic.
+
+        Returns:
+            None
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.slow_call_threshold = slow_call_threshold
+        self.probe = probe
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state: CircuitState = "closed"
+        self._failures: int = 0
+        self._opened_at: float = 0.0
+        self._trial_in_flight: bool = False
+        self._stop_probing = threading.Event()
+        self._probe_thread: threading.Thread | None = None
+
+    @property
+    def state(self) -> CircuitState:
+        """Get the current state of the circuit
+
+        Returns:
+            CircuitState: "closed", "open" or "half_open"
+        """
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> CircuitState:
+        """Get the state, turning an expired open circuit half open. The lock must be held.
+
+        Returns:
+            CircuitState: The current state
+        """
+        if self._state == "open" and self.probe is None and self._clock() - self._opened_at >= self.reset_timeout:
+            self._state = "half_open"
+            self._trial_in_flight = False
+        return self._state
+
+    def retry_after(self) -> float:
+        """Get how long the circuit stays open at least
+
+        Returns:
+            float: Seconds until the next recovery attempt, 0 if the circuit is not open
+        """
+        with self._lock:
+            if self._current_state() != "open":
+                return 0.0
+            return max(0.0, self._opened_at + self.reset_timeout - self._clock())
+
+    def allow_request(self) -> bool:
+        """Check whether a request may be sent now
+
+        Returns:
+            bool: True while closed, and for the single trial request of a half open circuit
+        """
+        with self._lock:
+            state: CircuitState = self._current_state()
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self, duration: float = 0.0) -> None:
+        """Record a call that reached the API
+
+        Args:
+            duration (float, optional): How long the call took in seconds. Defaults to 0.0.
+
+        Returns:
+            None
+        """
+        if self.slow_call_threshold is not None and duration > self.slow_call_threshold:
+            self.record_failure()
+            return
+
+        with self._lock:
+            self._failures = 0
+            self._state = "closed"
+
+    def record_failure(self) -> None:
+        """Record a call that failed or timed out, opening the circuit at the threshold
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._failures += 1
+            if self._current_state() == "half_open" or self._failures >= self.failure_threshold:
+                self._open()
+
+    def _open(self) -> None:
+        """Open the circuit and start probing if there is a probe. The lock must be held."""
+        self._state = "open"
+        self._opened_at = self._clock()
+
+        if self.probe is not None and (self._probe_thread is None or not self._probe_thread.is_alive()):
+            self._stop_probing.clear()
+            self._probe_thread = threading.Thread(
+                target=self._probe_until_closed, args=(self.probe,), name="api-probe", daemon=True
+            )
+            self._probe_thread.start()
+
+    def _probe_until_closed(self, probe: Callable[[], object]) -> None:
+        """Call the probe every reset_timeout until it succeeds or probing is stopped
+
+        Args:
+            probe (Callable[[], object]): The probe
+
+        Returns:
+            None
+        """
+        while not self._stop_probing.wait(self.reset_timeout):
+            try:
+                probe()
+            except Exception:
+                with self._lock:
+                    self._opened_at = self._clock()
+                continue
+
+            with self._lock:
+                self._failures = 0
+                self._state = "closed"
+            return
+
+    def reset(self) -> None:
+        """Close the circuit and stop probing
+
+        Returns:
+            None
+        """
+        self._stop_probing.set()
+        if self._probe_thread is not None:
+            self._probe_thread.join()
+            self._probe_thread = None
+
+        with self._lock:
+            self._failures = 0
+            self._state = "closed"
@@ -0,0 +1,335 @@
+"""Module for the memory-mapped binary question corpus."""
+
+import argparse
+import mmap
+import os
+import random
+import struct
+import sys
+import types
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from pathlib import Path
+from typing import ClassVar
+
+from trivia_game.exceptions import CorpusFormatError
+from trivia_game.models import DifficultyType, Question, QuestionType
+from trivia_game.question_bank import QuestionBank, QuestionFilter, matching_rows
+from trivia_game.question_cache import QuestionCache
+
+
+class CorpusFile:
+    """Read-only question corpus opened with mmap
+
+    Opening a corpus reads the header and the category names only. Every other read
+    goes through the mapping, so the operating system pages in what is touched and
+    startup time and memory do not grow with the corpus.
+
+    Layout, all integers little-endian:
+
+    - header: magic, version, question count, category count
+    - category names: u32 length and UTF-8 bytes each
+    - code columns: one byte per question for category, difficulty and type, with the
+      codes of QuestionBank
+    - per text field (question, correct answer, incorrect answers joined by
+      QuestionBank.ANSWER_SEPARATOR): count + 1 u64 offsets, then the UTF-8 string table
+
+    Question i is read in O(1) from offsets i and i + 1 of each string table.
+
+    Attributes:
+        MAGIC (ClassVar[bytes]): Identifies corpus files
+        VERSION (ClassVar[int]): The layout version written and read
+        HEADER (ClassVar[struct.Struct]): Magic, version, question count and category count
+        TEXT_FIELDS (ClassVar[int]): Number of string tables
+
+    Args:
+        path (Path | str): The corpus file
+    """
+
+    MAGIC: ClassVar[bytes] = b"TQCF"
+    VERSION: ClassVar[int] = 1
+    HEADER: ClassVar[struct.Struct] = struct.Struct("<4sHxxII")
+    TEXT_FIELDS: ClassVar[int] = 3
+
+    _LENGTH: ClassVar[struct.Struct] = struct.Struct("<I")
+    _OFFSET: ClassVar[struct.Struct] = struct.Struct("<Q")
+    _SPAN: ClassVar[struct.Struct] = struct.Struct("<QQ")
+
+    def __init__(self, path: Path | str) -> None:
+        """Map the file and read its header
+
+        Args:
+            path (Path | str): The corpus file
+
+        Raises:
+            CorpusFormatError: If the file is not a corpus file of this version
+
+        Returns:
+            None
+        """
+        self.path = Path(path)
+        with self.path.open("rb") as f:
+            try:
+                self._map: mmap.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as e:
+                empty_msg: str = f"{self.path} is empty"
+                raise CorpusFormatError(empty_msg) from e
+
+        try:
+            magic, version, size, category_count = self.HEADER.unpack_from(self._map, 0)
+        except struct.error as e:
+            self._map.close()
+            msg: str = f"{self.path} is too short for a corpus file"
+            raise CorpusFormatError(msg) from e
+
+        if magic != self.MAGIC or version != self.VERSION:
+            self._map.close()
+            format_msg: str = f"{self.path} is not a version {self.VERSION} corpus file"
+            raise CorpusFormatError(format_msg)
+
+        self._size: int = size
+        position: int = self.HEADER.size
+        self.categories: list[str] = []
+        for _ in range(category_count):
+            (length,) = self._LENGTH.unpack_from(self._map, position)
+            position += self._LENGTH.size
+            self.categories.append(self._map[position : position + length].decode())
+            position += length
+
+        self._indices: dict[QuestionFilter, array[int]] = {}
+        self._columns_at: int = position
+        position += 3 * self._size
+        self._tables_at: list[int] = []
+        for _ in range(self.TEXT_FIELDS):
+            self._tables_at.append(position)
+            (table_size,) = self._OFFSET.unpack_from(self._map, position + self._size * self._OFFSET.size)
+            position += (self._size + 1) * self._OFFSET.size + table_size
+
+    def __len__(self) -> int:
+        """Get the number of questions
+
+        Returns:
+            int: The number of questions
+        """
+        return self._size
+
+    def _column(self, number: int) -> bytes:
+        """Read a code column
+
+        Args:
+            number (int): 0 for categories, 1 for difficulties, 2 for types
+
+        Returns:
+            bytes: One code per question
+        """
+        start: int = self._columns_at + number * self._size
+        return self._map[start : start + self._size]
+
+    def _text(self, field: int, index: int) -> str:
+        """Read one string of a string table
+
+        Args:
+            field (int): The table, in the order question, correct answer, incorrect answers
+            index (int): The question
+
+        Returns:
+            str: The string
+        """
+        table_at: int = self._tables_at[field]
+        start, end = self._SPAN.unpack_from(self._map, table_at + index * self._OFFSET.size)
+        data_at: int = table_at + (self._size + 1) * self._OFFSET.size
+        return self._map[data_at + start : data_at + end].decode()
+
+    def __getitem__(self, index: int) -> Question:
+        """Read the question at a position
+
+        Args:
+            index (int): The position, negative values count from the end
+
+        Raises:
+            IndexError: If there is no such question
+
+        Returns:
+            Question: The question
+        """
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            msg: str = "Question index out of range"
+            raise IndexError(msg)
+
+        codes_at: int = self._columns_at + index
+        incorrect: str = self._text(2, index)
+        return Question(
+            type=QuestionBank.QUESTION_TYPES[self._map[codes_at + 2 * self._size]],
+            difficulty=QuestionBank.DIFFICULTIES[self._map[codes_at + self._size]],
+            category=self.categories[self._map[codes_at]],
+            question=self._text(0, index),
+            correct_answer=self._text(1, index),
+            incorrect_answers=tuple(incorrect.split(QuestionBank.ANSWER_SEPARATOR)) if incorrect else (),
+        )
+
+    def __iter__(self) -> Iterator[Question]:
+        """Iterate over all questions in file order
+
+        Returns:
+            Iterator[Question]: The questions
+        """
+        return (self[index] for index in range(self._size))
+
+    def indices(
+        self,
+        category: str | None = None,
+        difficulty: DifficultyType | None = None,
+        question_type: QuestionType | None = None,
+    ) -> "array[int]":
+        """Get the positions of the questions matching the filters, reading only the code columns
+
+        The file is read-only, so the positions of every filter are computed once.
+
+        Args:
+            category (str | None, optional): The category name. Defaults to None.
+            difficulty (DifficultyType | None, optional): The difficulty. Defaults to None.
+            question_type (QuestionType | None, optional): The question type. Defaults to None.
+
+        Returns:
+            array[int]: The matching positions in ascending order
+        """
+        key: QuestionFilter = (category, difficulty, question_type)
+        if (cached := self._indices.get(key)) is not None:
+            return cached
+
+        filters: list[tuple[bytes, int]] = []
+        if category is not None:
+            filters.append((self._column(0), self.categories.index(category) if category in self.categories else -1))
+        if difficulty is not None:
+            known: bool = difficulty in QuestionBank.DIFFICULTIES
+            filters.append((self._column(1), QuestionBank.DIFFICULTIES.index(difficulty) if known else -1))
+        if question_type is not None:
+            known = question_type in QuestionBank.QUESTION_TYPES
+            filters.append((self._column(2), QuestionBank.QUESTION_TYPES.index(question_type) if known else -1))
+        rows: array[int] = matching_rows(filters, self._size)
+        self._indices[key] = rows
+        return rows
+
+    def sample(
+        self,
+        amount: int,
+        category: str | None = None,
+        difficulty: DifficultyType | None = None,
+        question_type: QuestionType | None = None,
+        rng: random.Random | None = None,
+    ) -> list[Question]:
+        """Get a random selection of questions matching the filters
+
+        Args:
+            amount (int): The maximum number of questions to return
+            category (str | None, optional): The category name. Defaults to None.
+            difficulty (DifficultyType | None, optional): The difficulty. Defaults to None.
+            question_type (QuestionType | None, optional): The question type. Defaults to None.
+            rng (random.Random | None, optional): Source of randomness. Defaults to the random module.
+
+        Returns:
+            list[Question]: Up to `amount` matching questions
+        """
+        rows: Sequence[int] = (
+            range(self._size)
+            if category is None and difficulty is None and question_type is None
+            else self.indices(category, difficulty, question_type)
+        )
+        sample = rng.sample if rng is not None else random.sample
+        return [self[index] for index in sample(rows, min(amount, len(rows)))]
+
+    def close(self) -> None:
+        """Unmap the file"""
+        self._map.close()
+
+    def __enter__(self) -> "CorpusFile":
+        """Enter context manager
+
+        Returns:
+            CorpusFile: The corpus instance
+        """
+        return self
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc_val: BaseException | None, exc_tb: types.TracebackType | None
+    ) -> None:
+        """Unmap the file when exiting the context manager.
+
+        Args:
+            exc_type: The type of the exception that was raised
+            exc_val: The instance of the exception that was raised
+            exc_tb: The traceback of the exception that was raised
+
+        Returns:
+            None
+        """
+        self.close()
+
+
+def write_corpus(path: Path | str, questions: Iterable[Question]) -> int:
+    """Write questions to a corpus file, replacing it atomically
+
+    The columns are built in memory with a QuestionBank, so writing needs memory in
+    proportion to the corpus, reading it back does not.
+
+    Args:
+        path (Path | str): The corpus file
+        questions (Iterable[Question]): The questions
+
+    Raises:
+        ValueError: If a question cannot be stored, see QuestionBank.add
+
+    Returns:
+        int: The number of questions written
+    """
+    bank: QuestionBank = QuestionBank(questions)
+    size: int = len(bank)
+    path = Path(path)
+    temporary: Path = path.with_name(f".{path.name}.tmp")
+
+    with temporary.open("wb") as f:
+        f.write(CorpusFile.HEADER.pack(CorpusFile.MAGIC, CorpusFile.VERSION, size, len(bank.categories)))
+        for category in bank.categories:
+            encoded: bytes = category.encode()
+            f.write(CorpusFile._LENGTH.pack(len(encoded)))
+            f.write(encoded)
+
+        for code_column in bank.code_columns():
+            f.write(code_column)
+
+        for text_column in bank.text_columns():
+            offsets: array[int] = array("Q", text_column.offsets)
+            if sys.byteorder != "little":
+                offsets.byteswap()
+            f.write(offsets.tobytes())
+            f.write(text_column.data)
+
+    os.replace(temporary, path)
+    return size
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Convert a harvested SQLite corpus into a corpus file
+
+    Args:
+        argv (Sequence[str] | None, optional): Command line arguments. Defaults to sys.argv.
+
+    Returns:
+        int: The exit code
+    """
+    parser = argparse.ArgumentParser(description="Convert a harvested question corpus into a memory-mapped file.")
+    parser.add_argument("source", help="SQLite corpus written by trivia_game.harvest")
+    parser.add_argument("output", help="Corpus file to write")
+    args = parser.parse_args(argv)
+
+    with QuestionCache(args.source) as cache:
+        written: int = write_corpus(args.output, cache.get_questions(cache.count()))
+
+    print(f"Wrote {written} questions to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,381 @@
+"""Module for the UI-independent game engine."""
+
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import ClassVar
+
+from trivia_game.exceptions import TriviaAPIError
+from trivia_game.metrics import MetricsRegistry
+from trivia_game.models import GameSettings, Question
+from trivia_game.prefetch import QuestionPrefetcher
+from trivia_game.question_counts import QuestionCountIndex
+from trivia_game.question_source import BackgroundQuestionSource, QuestionSource
+from trivia_game.trivia_api import TriviaAPIClient
+
+
+@dataclass(slots=True)
+class QuestionShown:
+    """Event sent when a question is waiting for an answer."""
+
+    session_id: str
+    question: Question
+    number: int
+
+
+@dataclass(slots=True)
+class AnswerChecked:
+    """Event sent when an answer was checked."""
+
+    session_id: str
+    correct: bool
+    correct_answer: str
+    score: int
+
+
+@dataclass(slots=True)
+class GameOver:
+    """Event sent once when a game ends."""
+
+    session_id: str
+    score: int
+    answered: int
+
+
+@dataclass(slots=True)
+class GameError:
+    """Event sent when a game cannot start or continue."""
+
+    session_id: str
+    message: str
+
+
+# Events are built for every question and answer, so they are slotted but not frozen,
+# which would route each field through object.__setattr__
+GameEvent = QuestionShown | AnswerChecked | GameOver | GameError
+EventListener = Callable[[GameEvent], None]
+
+
+class GameSession:
+    """State of one game, reported to its listeners as events
+
+    A session is driven by one player at a time: start() a game, answer() the shown
+    question and ask for the next_question() until the game is over. Nothing here
+    touches a UI, so sessions can run behind any front end.
+
+    Args:
+        engine (GameEngine): The engine providing the questions and the rules
+        session_id (str): Identifies the session in its events
+        listener (EventListener | None, optional): Called with every event. Defaults to None.
+    """
+
+    def __init__(self, engine: "GameEngine", session_id: str, listener: EventListener | None = None) -> None:
+        """Create an idle session
+
+        Args:
+            engine (GameEngine): The engine providing the questions and the rules
+            session_id (str): Identifies the session in its events
+            listener (EventListener | None, optional): Called with every event. Defaults to None.
+
+        Returns:
+            None
+        """
+        self.engine = engine
+        self.id = session_id
+        self.listeners: list[EventListener] = [] if listener is None else [listener]
+        self.questions: QuestionSource = QuestionSource()
+        self.current_question: Question | None = None
+        self.score: int = 0
+        self.endless: bool = False
+        self.misses_in_a_row: int = 0
+        self.answered: int = 0
+        self.active: bool = False
+        self._question_shown_at: float | None = None
+
+    @property
+    def waiting_for_answer(self) -> bool:
+        """Get whether the current question was shown and not answered yet
+
+        Returns:
+            bool: True until the current question is answered
+        """
+        return self._question_shown_at is not None
+
+    def _emit(self, event: GameEvent) -> None:
+        """Send an event to every listener
+
+        Args:
+            event (GameEvent): The event
+
+        Returns:
+            None
+        """
+        for listener in self.listeners:
+            listener(event)
+
+    def start(self, settings: GameSettings, endless: bool = False) -> bool:
+        """Start a game and show its first question
+
+        Options known to have too few questions shorten the game, or are rejected without a
+        request if there are none. A full game starts from a prefetched batch when there is
+        one, and the next game with the same settings is prefetched.
+
+        An endless game starts from the same first batch. A BackgroundQuestionSource then
+        keeps the next batch ready, fetched with the session token so questions do not
+        repeat, and the game lasts until the player misses ENDLESS_MISS_LIMIT in a row or
+        it is ended. The prefetcher stays idle, so its requests do not compete with the refills.
+
+        Args:
+            settings (GameSettings): The question filters, with a category ID
+            endless (bool, optional): Play until too many misses in a row instead of one batch. Defaults to False.
+
+        Returns:
+            bool: True if the game started, False if a GameError was sent
+        """
+        limit: int | None = self.engine.question_limit(settings)
+        if limit == 0:
+            self._emit(GameError(self.id, "No questions available for the selected options. Please change them."))
+            return False
+
+        amount: int = self.engine.QUESTIONS_PER_GAME if limit is None else limit
+        started: float = time.perf_counter()
+        try:
+            batch: list[Question] = self.engine.draw_batch(settings, amount)
+            self.questions.stop()
+            if endless:
+                self.questions = BackgroundQuestionSource.from_api(
+                    self.engine.api_client,
+                    settings,
+                    batch,
+                    batch_size=self.engine.QUESTIONS_PER_GAME,
+                    use_cache=False,
+                )
+                self.questions.start()
+            else:
+                self.questions = QuestionSource(batch)
+            self.score = 0
+            self.answered = 0
+            self.endless = endless
+            self.misses_in_a_row = 0
+            self.active = True
+            if amount == self.engine.QUESTIONS_PER_GAME and not endless:
+                self.engine.prefetcher.prefetch(settings)
+            self.next_question()
+            self.engine.metrics.observe("trivia_game_time_to_first_question_seconds", time.perf_counter() - started)
+        except Exception as e:
+            self._emit(GameError(self.id, f"Error loading questions: {e}"))
+            return False
+        return True
+
+    def next_question(self) -> Question | None:
+        """Show the next question, or end the game if there is none
+
+        An endless game also ends after ENDLESS_MISS_LIMIT wrong answers in a row, or when
+        its questions can no longer be fetched. The time spent waiting for a question is
+        recorded in `trivia_game_question_wait_seconds`.
+
+        Returns:
+            Question | None: The question, None if the game is over
+        """
+        question: Question | None = None
+        if not self.endless or self.misses_in_a_row < self.engine.ENDLESS_MISS_LIMIT:
+            started: float = time.perf_counter()
+            try:
+                question = next(self.questions, None)
+            except TriviaAPIError as e:
+                self._emit(GameError(self.id, f"Error loading questions: {e}"))
+            self.engine.metrics.observe("trivia_game_question_wait_seconds", time.perf_counter() - started)
+
+        if question is None:
+            self.end()
+            return None
+
+        self.current_question = question
+        self._question_shown_at = time.perf_counter()
+        self._emit(QuestionShown(self.id, question, self.answered + 1))
+        return question
+
+    def answer(self, selected_answer: str) -> bool:
+        """Check an answer to the current question and score it
+
+        Only the first answer to a shown question counts, later ones are ignored.
+
+        Args:
+            selected_answer (str): The selected answer
+
+        Returns:
+            bool: True if correct, False otherwise or without a question waiting for an answer
+        """
+        if not self.current_question or self._question_shown_at is None:
+            return False
+
+        is_correct: bool = selected_answer == self.current_question.correct_answer
+        latency: float = time.perf_counter() - self._question_shown_at
+        self.engine.metrics.observe("trivia_game_answer_latency_seconds", latency, correct=str(is_correct).lower())
+        self._question_shown_at = None
+        self.answered += 1
+
+        self.misses_in_a_row = 0 if is_correct else self.misses_in_a_row + 1
+        if is_correct:
+            self.score += self.engine.score_for(self.current_question.difficulty)
+        self._emit(AnswerChecked(self.id, is_correct, self.current_question.correct_answer, self.score))
+        return is_correct
+
+    def end(self) -> None:
+        """End the game, sending GameOver if it was running
+
+        Returns:
+            None
+        """
+        self.questions.stop()
+        if self.active:
+            self.active = False
+            self._emit(GameOver(self.id, self.score, self.answered))
+
+
+class GameEngine:
+    """Game rules and shared resources for any number of concurrent sessions
+
+    All sessions fetch through one API client, so they share its question cache, session
+    token, rate limiter and circuit breaker, and record into one metrics registry. A
+    session only holds its own questions and score, so one process can host thousands.
+
+    Attributes:
+        QUESTIONS_PER_GAME (ClassVar[int]): Number of questions in a game
+        DIFFICULTY_MULTIPLIER (ClassVar[dict[str, int]]): Difficulty level multipliers
+        ENDLESS_MISS_LIMIT (ClassVar[int]): Consecutive wrong answers that end an endless game
+
+    Args:
+        api_client (TriviaAPIClient): The client shared by all sessions
+        prefetcher (QuestionPrefetcher | None, optional): Prepares batches for the next game. Defaults to
+            a disabled prefetcher.
+        count_index (QuestionCountIndex | None, optional): Known number of questions per category and
+            difficulty. Defaults to an index without a file.
+        metrics (MetricsRegistry | None, optional): Game timings and counters. Defaults to the registry
+            of the API client.
+    """
+
+    QUESTIONS_PER_GAME: ClassVar[int] = 10
+    DIFFICULTY_MULTIPLIER: ClassVar[dict[str, int]] = {"easy": 1, "medium": 2, "hard": 3}
+    ENDLESS_MISS_LIMIT: ClassVar[int] = 3
+
+    def __init__(
+        self,
+        api_client: TriviaAPIClient,
+        prefetcher: QuestionPrefetcher | None = None,
+        count_index: QuestionCountIndex | None = None,
+        metrics: MetricsRegistry | None = None,
+    ) -> None:
+        """Create the engine without sessions
+
+        Args:
+            api_client (TriviaAPIClient): The client shared by all sessions
+            prefetcher (QuestionPrefetcher | None, optional): Prepares batches for the next game.
+                Defaults to a disabled prefetcher.
+            count_index (QuestionCountIndex | None, optional): Known number of questions per category
+                and difficulty. Defaults to an index without a file.
+            metrics (MetricsRegistry | None, optional): Game timings and counters. Defaults to the
+                registry of the API client.
+
+        Returns:
+            None
+        """
+        self.api_client = api_client
+        self.prefetcher: QuestionPrefetcher = prefetcher or QuestionPrefetcher(
+            api_client, depth=0, batch_size=self.QUESTIONS_PER_GAME
+        )
+        self.count_index: QuestionCountIndex = count_index or QuestionCountIndex(api_client)
+        self.metrics: MetricsRegistry = metrics or api_client.metrics
+        self.sessions: dict[str, GameSession] = {}
+        self._lock = threading.Lock()
+
+    def create_session(self, listener: EventListener | None = None, session_id: str | None = None) -> GameSession:
+        """Create and register a session
+
+        Args:
+            listener (EventListener | None, optional): Called with every event of the session. Defaults to None.
+            session_id (str | None, optional): The session ID. Defaults to a random one.
+
+        Returns:
+            GameSession: The idle session
+        """
+        session: GameSession = GameSession(self, session_id or uuid.uuid4().hex, listener)
+        with self._lock:
+            self.sessions[session.id] = session
+        return session
+
+    def get_session(self, session_id: str) -> GameSession:
+        """Get a registered session
+
+        Args:
+            session_id (str): The session ID
+
+        Raises:
+            KeyError: If there is no such session
+
+        Returns:
+            GameSession: The session
+        """
+        with self._lock:
+            return self.sessions[session_id]
+
+    def close_session(self, session_id: str) -> None:
+        """End the game of a session and forget it
+
+        Args:
+            session_id (str): The session ID, unknown IDs are ignored
+
+        Returns:
+            None
+        """
+        with self._lock:
+            session: GameSession | None = self.sessions.pop(session_id, None)
+        if session is not None:
+            session.end()
+
+    def question_limit(self, settings: GameSettings) -> int | None:
+        """Get how many questions a game with the settings can have, without a request
+
+        Args:
+            settings (GameSettings): The question filters, with a category ID
+
+        Returns:
+            int | None: The number of questions, or None if not known yet
+        """
+        limit: int | None = self.count_index.max_available(settings)
+        return None if limit is None else min(limit, self.QUESTIONS_PER_GAME)
+
+    def draw_batch(self, settings: GameSettings, amount: int) -> list[Question]:
+        """Get the first batch of a game from the prefetcher or the API client
+
+        Args:
+            settings (GameSettings): The question filters, with a category ID
+            amount (int): The number of questions to fetch without a prefetched batch
+
+        Raises:
+            TriviaAPIError: If the questions cannot be fetched
+
+        Returns:
+            list[Question]: The questions
+        """
+        prefetched: list[Question] | None = self.prefetcher.get_batch(settings)
+        self.metrics.increment("trivia_game_prefetch_lookups_total", result="hit" if prefetched else "miss")
+        return prefetched or self.api_client.fetch_questions(
+            amount=amount,
+            category=settings.category,
+            difficulty=settings.difficulty,
+            question_type=settings.question_type,
+        )
+
+    def score_for(self, difficulty: str) -> int:
+        """Get the points of a correct answer
+
+        Args:
+            difficulty (str): The difficulty level
+
+        Returns:
+            int: Calculated score
+        """
+        return 100 * self.DIFFICULTY_MULTIPLIER[difficulty]
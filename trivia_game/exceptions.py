@@ -35,3 +35,21 @@ class CategoryError(TriviaAPIError):
     """Exception for category-related errors"""
 
     pass
+
+
+class CircuitOpenError(TriviaAPIError):
+    """Requests are refused while the API is considered unavailable"""
+
+    pass
+
+
+class ProtocolError(TriviaAPIError):
+    """Response is not valid HTTP"""
+
+    pass
+
+
+class CorpusFormatError(ValueError):
+    """File is not a corpus file this version can read"""
+
+    pass
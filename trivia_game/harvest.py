@@ -0,0 +1,291 @@
+"""Bulk harvester building a local question corpus from the Trivia API.
+
+Run it with ``python -m trivia_game.harvest``. Every category is paged through
+50 questions at a time with one session token until the token has returned all
+questions of the category. Completed categories are checkpointed and the token
+is kept on disk, so an interrupted run resumes where it stopped. With several
+workers, several categories are in progress at once, each with a token of a
+TokenPool. The workers share the client's RateLimiter, which allows one request
+per interval for the whole process, so more workers add no throughput.
+
+Questions are stored as the API encoded them, see QuestionCache.add_encoded, so
+harvesting decodes nothing but the category, difficulty and type. The texts are
+decoded when the corpus is read. The harvester requests the API's default
+encoding, like the game clients, so a question harvested into the game's cache
+and the same question fetched by a game are stored alike and kept once.
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, ClassVar
+
+from trivia_game.exceptions import NoResultsError, RateLimitError, TokenError
+from trivia_game.models import TriviaResponseCode
+from trivia_game.question_cache import QuestionCache
+from trivia_game.rate_limiter import RateLimiter
+from trivia_game.token_pool import TokenPool
+from trivia_game.token_store import TokenStore
+from trivia_game.transport import Transport
+from trivia_game.trivia_api import TriviaAPIClient
+
+
+class Harvester:
+    """Pages through every category and stores the questions in a corpus
+
+    The server remembers which questions the session token has returned, so resuming
+    with the same token continues a category where it stopped. The checkpoint only has
+    to record which categories are complete.
+
+    With a token pool, every category is fetched with a token of its own, so several
+    categories can be harvested at once. Pool tokens are not stored, a resumed run
+    pages through unfinished categories again and the corpus drops the duplicates.
+
+    Attributes:
+        PAGE_SIZE (ClassVar[int]): Largest amount the API returns in one request
+
+    Args:
+        api_client (TriviaAPIClient): The client used to fetch questions, ideally with a token store
+        corpus (QuestionCache): The store the questions are written to
+        checkpoint_path (Path | str): JSON file recording completed categories
+        token_pool (TokenPool | None, optional): Tokens for parallel workers. Defaults to None.
+    """
+
+    PAGE_SIZE: ClassVar[int] = 50
+
+    def __init__(
+        self,
+        api_client: TriviaAPIClient,
+        corpus: QuestionCache,
+        checkpoint_path: Path | str,
+        token_pool: TokenPool | None = None,
+    ) -> None:
+        """Create the harvester
+
+        Args:
+            api_client (TriviaAPIClient): The client used to fetch questions, ideally with a token store
+            corpus (QuestionCache): The store the questions are written to
+            checkpoint_path (Path | str): JSON file recording completed categories
+            token_pool (TokenPool | None, optional): Tokens for parallel workers. Defaults to None.
+
+        Returns:
+            None
+        """
+        self.api_client = api_client
+        self.corpus = corpus
+        self.checkpoint_path: Path = Path(checkpoint_path)
+        self.token_pool = token_pool
+        self._checkpoint_lock = threading.Lock()
+        self.completed: set[str] = self._load_checkpoint()
+
+    def _load_checkpoint(self) -> set[str]:
+        """Load the completed categories from the checkpoint file
+
+        Returns:
+            set[str]: The IDs of completed categories, empty if the file is missing or unreadable
+        """
+        try:
+            with self.checkpoint_path.open() as f:
+                return {str(category) for category in json.load(f)["completed"]}
+        except (OSError, ValueError, KeyError, TypeError):
+            return set()
+
+    def _save_checkpoint(self) -> None:
+        """Write the completed categories to the checkpoint file
+
+        The file is written next to the checkpoint and moved over it, so an interrupted
+        write leaves the previous checkpoint intact.
+        """
+        temporary: Path = self.checkpoint_path.with_name(f".{self.checkpoint_path.name}.tmp")
+        with temporary.open("w") as f:
+            json.dump({"completed": sorted(self.completed, key=int)}, f, indent=2)
+
+        os.replace(temporary, self.checkpoint_path)
+
+    def _complete(self, category: str) -> None:
+        """Record a finished category and free its pool token
+
+        Args:
+            category (str): The category ID
+
+        Returns:
+            None
+        """
+        with self._checkpoint_lock:
+            self.completed.add(category)
+            self._save_checkpoint()
+
+        if self.token_pool is not None:
+            self.token_pool.release(category)
+
+    def _fetch_page(self, category: str, amount: int) -> list[dict[str, Any]]:
+        """Fetch the next page of a category with the pool token or the client's token
+
+        Args:
+            category (str): The category ID
+            amount (int): The page size
+
+        Returns:
+            list[dict[str, Any]]: The question data, still encoded
+        """
+        if self.token_pool is not None:
+            return self.token_pool.fetch_encoded(category, amount=amount, category=category)
+        return self.api_client.fetch_encoded(amount=amount, category=category, max_retries=0)
+
+    @staticmethod
+    def _token_error_is(error: TokenError, response_code: TriviaResponseCode) -> bool:
+        """Check whether a token error was caused by the given API response code
+
+        fetch_encoded wraps the API error when it gives up retrying, so the cause is checked too.
+
+        Args:
+            error (TokenError): The error raised by fetch_encoded
+            response_code (TriviaResponseCode): The response code to check for
+
+        Returns:
+            bool: True if the error comes from the response code
+        """
+        message: str = TriviaAPIClient.ERROR_MESSAGES[response_code]
+        return message in str(error) or message in str(error.__cause__)
+
+    def harvest_category(self, category: str) -> int:
+        """Fetch every remaining question of a category
+
+        Args:
+            category (str): The category ID
+
+        Raises:
+            TriviaAPIError: If a request fails for a reason other than exhaustion
+
+        Returns:
+            int: The number of new questions written to the corpus
+        """
+        added: int = 0
+        amount: int = self.PAGE_SIZE
+
+        while True:
+            try:
+                results = self._fetch_page(category, amount)
+
+            except NoResultsError:
+                # The category holds fewer questions than requested
+                if amount == 1:
+                    break
+                amount //= 2
+                continue
+
+            except RateLimitError:
+                time.sleep(RateLimiter.OPENTDB_INTERVAL)
+                continue
+
+            except TokenError as e:
+                if self._token_error_is(e, TriviaResponseCode.TOKEN_NOT_FOUND) and self.token_pool is None:
+                    self.api_client.renew_session_token()
+                    continue
+                if not self._token_error_is(e, TriviaResponseCode.TOKEN_EMPTY):
+                    raise
+                # The token has fewer questions left than requested, narrow the page down to the remainder
+                if amount == 1:
+                    break
+                amount //= 2
+                continue
+
+            added += self.corpus.add_encoded(results, self.api_client.encoding)
+
+        self._complete(category)
+        return added
+
+    def _harvest_and_report(self, category: str) -> int:
+        """Harvest a category and print its result
+
+        Args:
+            category (str): The category ID
+
+        Returns:
+            int: The number of new questions written to the corpus
+        """
+        added: int = self.harvest_category(category)
+        print(f"Category {category}: {added} new questions")
+        return added
+
+    def run(self, categories: Sequence[str] | None = None, workers: int = 1) -> int:
+        """Harvest the given categories, or every category from the API
+
+        Args:
+            categories (Sequence[str] | None, optional): Category IDs to harvest. Defaults to None.
+            workers (int, optional): Categories harvested at once, more than 1 needs a token pool. Defaults to 1.
+
+        Raises:
+            ValueError: If several workers are requested without a token pool
+
+        Returns:
+            int: The number of new questions written to the corpus
+        """
+        if workers > 1 and self.token_pool is None:
+            msg: str = "Harvesting with several workers needs a token pool"
+            raise ValueError(msg)
+
+        if categories is None:
+            categories = list(self.api_client.fetch_categories().values())
+
+        pending: list[str] = [category for category in categories if category not in self.completed]
+
+        if workers == 1:
+            return sum(self._harvest_and_report(category) for category in pending)
+
+        with ThreadPoolExecutor(workers, thread_name_prefix="harvest") as executor:
+            return sum(executor.map(self._harvest_and_report, pending))
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the harvester from the command line
+
+    Args:
+        argv (Sequence[str] | None, optional): Command line arguments. Defaults to sys.argv.
+
+    Returns:
+        int: The exit code
+    """
+    parser = argparse.ArgumentParser(description="Harvest Trivia API questions into a local corpus.")
+    parser.add_argument("--corpus", default="questions.db", help="SQLite corpus file (default: questions.db)")
+    parser.add_argument(
+        "--checkpoint", default="harvest_checkpoint.json", help="Checkpoint file (default: harvest_checkpoint.json)"
+    )
+    parser.add_argument(
+        "--token-file", default="harvest_token.json", help="Session token file (default: harvest_token.json)"
+    )
+    parser.add_argument("--base-url", help="Send requests to this server instead of opentdb.com")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Categories in progress at once, one token each; they share the rate limit (default: 1)",
+    )
+    parser.add_argument("--category", action="append", dest="categories", help="Category ID, may be repeated")
+    args = parser.parse_args(argv)
+
+    with (
+        Transport(pool_maxsize=max(args.workers, Transport.DEFAULT_POOL_MAXSIZE)) as transport,
+        QuestionCache(args.corpus) as corpus,
+        TriviaAPIClient(
+            token_store=TokenStore(args.token_file),
+            rate_limiter=RateLimiter(),
+            base_url=args.base_url,
+            transport=transport,
+        ) as api_client,
+    ):
+        token_pool: TokenPool | None = TokenPool(api_client, size=args.workers) if args.workers > 1 else None
+        harvester = Harvester(api_client, corpus, args.checkpoint, token_pool)
+        total: int = harvester.run(args.categories, workers=args.workers)
+        print(f"Harvest complete: {total} new questions, {corpus.count()} in corpus")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
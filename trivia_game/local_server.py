@@ -0,0 +1,538 @@
+"""Local stand-in for the OpenTDB API, for offline load and retry testing.
+
+Run it with ``python -m trivia_game.local_server`` and point a client at it with
+``TriviaAPIClient(base_url="http://127.0.0.1:8000")``. The server implements the
+questions, session token, category and count endpoints over a seeded corpus, and
+can add latency, rate limiting and server errors to every request.
+"""
+
+import argparse
+import contextlib
+import html
+import json
+import random
+import threading
+import time
+import types
+from collections import Counter
+from collections.abc import Sequence
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, cast
+from urllib.parse import parse_qs, quote, urlsplit
+
+from trivia_game.models import DifficultyType, Question, QuestionType, TriviaResponseCode
+
+DEFAULT_CATEGORIES: dict[int, str] = {
+    9: "General Knowledge",
+    17: "Science & Nature",
+    23: "History",
+}
+
+
+@dataclass
+class _QuestionQuery:
+    """Validated parameters of a questions request."""
+
+    amount: int
+    category: str | None
+    difficulty: str | None
+    question_type: str | None
+    encoding: str | None
+
+
+def generate_corpus(size: int = 300, seed: int = 0, categories: dict[int, str] | None = None) -> list[Question]:
+    """Generate a reproducible corpus of synthetic questions
+
+    Some questions contain characters the API escapes, so clients decode real work.
+
+    Args:
+        size (int, optional): Number of questions. Defaults to 300.
+        seed (int, optional): Seed of the generator. Defaults to 0.
+        categories (dict[int, str] | None, optional): Category names by ID. Defaults to DEFAULT_CATEGORIES.
+
+    Returns:
+        list[Question]: The generated questions
+    """
+    rng = random.Random(seed)  # noqa: S311
+    names: list[str] = list((categories or DEFAULT_CATEGORIES).values())
+    difficulties: tuple[DifficultyType, ...] = ("easy", "medium", "hard")
+    corpus: list[Question] = []
+
+    for index in range(size):
+        category: str = names[index % len(names)]
+        question_type: QuestionType = "boolean" if rng.random() < 0.3 else "multiple"
+        text: str = f'Question {index} about {category}: is "{rng.randint(0, 999)}" the answer?'
+
+        if question_type == "boolean":
+            correct: str = rng.choice(("True", "False"))
+            incorrect: tuple[str, ...] = ("False" if correct == "True" else "True",)
+        else:
+            correct = f"Answer {index} & co"
+            incorrect = tuple(f"Wrong {index}.{option}" for option in range(3))
+
+        corpus.append(
+            Question(
+                type=question_type,
+                difficulty=rng.choice(difficulties),
+                category=category,
+                question=text,
+                correct_answer=correct,
+                incorrect_answers=incorrect,
+            )
+        )
+
+    return corpus
+
+
+class LocalTriviaServer:
+    """In-process HTTP server mimicking the OpenTDB endpoints
+
+    Session tokens remember the questions they returned, so a token runs out with
+    TOKEN_EMPTY like on the real API. Faults are drawn from a seeded generator, so a
+    run with the same settings sees the same sequence of errors.
+
+    Attributes:
+        requests (Counter[str]): Number of requests received per endpoint
+        responses (Counter[int]): Number of responses sent per HTTP status
+        connections (int): Number of client connections accepted, lower than the requests with keep-alive
+
+    Args:
+        corpus (Sequence[Question] | None, optional): The questions to serve. Defaults to generate_corpus().
+        categories (dict[int, str] | None, optional): Category names by ID. Defaults to DEFAULT_CATEGORIES.
+        host (str, optional): Interface to listen on. Defaults to "127.0.0.1".
+        port (int, optional): Port to listen on, 0 picks a free one. Defaults to 0.
+        latency (float, optional): Seconds added to every response. Defaults to 0.0.
+        rate_limit_interval (float, optional): Seconds a client must wait between questions
+            requests, 0 disables rate limiting. Defaults to 0.0.
+        error_rate (float, optional): Share of requests answered with error_status. Defaults to 0.0.
+        error_status (int, optional): HTTP status of injected errors. Defaults to 503.
+        seed (int, optional): Seed for tokens, question selection and faults. Defaults to 0.
+    """
+
+    def __init__(
+        self,
+        corpus: Sequence[Question] | None = None,
+        categories: dict[int, str] | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        rate_limit_interval: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        seed: int = 0,
+    ) -> None:
+        """Create the server, it starts listening on start()
+
+        Args:
+            corpus (Sequence[Question] | None, optional): The questions to serve. Defaults to generate_corpus().
+            categories (dict[int, str] | None, optional): Category names by ID. Defaults to DEFAULT_CATEGORIES.
+            host (str, optional): Interface to listen on. Defaults to "127.0.0.1".
+            port (int, optional): Port to listen on, 0 picks a free one. Defaults to 0.
+            latency (float, optional): Seconds added to every response. Defaults to 0.0.
+            rate_limit_interval (float, optional): Seconds a client must wait between questions
+                requests, 0 disables rate limiting. Defaults to 0.0.
+            error_rate (float, optional): Share of requests answered with error_status. Defaults to 0.0.
+            error_status (int, optional): HTTP status of injected errors. Defaults to 503.
+            seed (int, optional): Seed for tokens, question selection and faults. Defaults to 0.
+
+        Returns:
+            None
+        """
+        self.categories: dict[int, str] = categories or DEFAULT_CATEGORIES
+        self.corpus: list[Question] = list(corpus) if corpus is not None else generate_corpus(seed=seed)
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.rate_limit_interval = rate_limit_interval
+        self.error_rate = error_rate
+        self.error_status = error_status
+
+        self.requests: Counter[str] = Counter()
+        self.responses: Counter[int] = Counter()
+        self.connections: int = 0
+
+        self._random = random.Random(seed)  # noqa: S311
+        self._lock = threading.Lock()
+        self._tokens: dict[str, set[int]] = {}
+        self._last_request: dict[str, float] = {}
+        self._httpd: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        """Get the URL clients use as base_url
+
+        Returns:
+            str: The base URL, with the bound port once started
+        """
+        port: int = self._httpd.server_address[1] if self._httpd is not None else self.port
+        return f"http://{self.host}:{port}"
+
+    def start(self) -> str:
+        """Start serving requests in a background thread
+
+        Returns:
+            str: The base URL of the server
+        """
+        self._httpd = ThreadingHTTPServer((self.host, self.port), _RequestHandler)
+        self._httpd.daemon_threads = True
+        cast(Any, self._httpd).app = self
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, kwargs={"poll_interval": 0.05}, name="local-trivia-server", daemon=True
+        )
+        self._thread.start()
+        return self.base_url
+
+    def stop(self) -> None:
+        """Stop the server and wait for the serving thread"""
+        if self._httpd is None:
+            return
+
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+        self._httpd = None
+        self._thread = None
+
+    def handle(self, path: str, query: dict[str, str], client: str) -> tuple[int, dict[str, Any]]:
+        """Answer a request to one of the endpoints
+
+        Args:
+            path (str): The request path
+            query (dict[str, str]): The query parameters
+            client (str): The client address, used for rate limiting
+
+        Returns:
+            tuple[int, dict[str, Any]]: The HTTP status and the JSON body
+        """
+        endpoint: str = path.rsplit("/", 1)[-1]
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        with self._lock:
+            self.requests[endpoint] += 1
+            status, payload = self._dispatch(endpoint, query, client)
+            self.responses[status] += 1
+
+        return status, payload
+
+    def _dispatch(self, endpoint: str, query: dict[str, str], client: str) -> tuple[int, dict[str, Any]]:
+        """Route a request to its endpoint, or answer it with an injected error
+
+        Args:
+            endpoint (str): The file name of the endpoint
+            query (dict[str, str]): The query parameters
+            client (str): The client address
+
+        Returns:
+            tuple[int, dict[str, Any]]: The HTTP status and the JSON body
+        """
+        if self.error_rate and self._random.random() < self.error_rate:
+            return self.error_status, {"error": "Injected server error"}
+
+        if endpoint == "api.php":
+            return self._questions(query, client)
+        if endpoint == "api_token.php":
+            return self._token(query)
+        if endpoint == "api_category.php":
+            return 200, {"trivia_categories": [{"id": key, "name": name} for key, name in self.categories.items()]}
+        if endpoint == "api_count.php":
+            return self._count(query)
+
+        return 404, {"error": "Not found"}
+
+    @staticmethod
+    def _response_code(code: TriviaResponseCode) -> tuple[int, dict[str, Any]]:
+        """Build a response carrying only an API response code
+
+        Args:
+            code (TriviaResponseCode): The response code
+
+        Returns:
+            tuple[int, dict[str, Any]]: The HTTP status and the JSON body
+        """
+        status: int = 429 if code == TriviaResponseCode.RATE_LIMIT else 200
+        return status, {"response_code": int(code), "results": []}
+
+    def _rate_limited(self, client: str) -> bool:
+        """Check whether a questions request came too soon after the previous one
+
+        Args:
+            client (str): The client address
+
+        Returns:
+            bool: True if the request must be answered with RATE_LIMIT
+        """
+        if not self.rate_limit_interval:
+            return False
+
+        now: float = time.monotonic()
+        if now - self._last_request.get(client, -self.rate_limit_interval) < self.rate_limit_interval:
+            return True
+        self._last_request[client] = now
+        return False
+
+    def _parse_question_query(self, query: dict[str, str]) -> _QuestionQuery | None:
+        """Validate the parameters of a questions request
+
+        Args:
+            query (dict[str, str]): The query parameters
+
+        Returns:
+            _QuestionQuery | None: The parameters, None if any of them is invalid
+        """
+        try:
+            amount: int = int(query.get("amount", ""))
+        except ValueError:
+            return None
+
+        category_id: str | None = query.get("category")
+        difficulty: str | None = query.get("difficulty")
+        question_type: str | None = query.get("type")
+        encoding: str | None = query.get("encode")
+
+        if (
+            not 1 <= amount <= 50
+            or (category_id is not None and (not category_id.isdigit() or int(category_id) not in self.categories))
+            or difficulty not in (None, "easy", "medium", "hard")
+            or question_type not in (None, "multiple", "boolean")
+            or encoding not in (None, "url3986")
+        ):
+            return None
+
+        category: str | None = self.categories[int(category_id)] if category_id is not None else None
+        return _QuestionQuery(amount, category, difficulty, question_type, encoding)
+
+    def _matching(self, request: _QuestionQuery) -> list[int]:
+        """Find the corpus indexes of the questions matching a request
+
+        Args:
+            request (_QuestionQuery): The parameters of the request
+
+        Returns:
+            list[int]: The matching indexes
+        """
+        return [
+            index
+            for index, question in enumerate(self.corpus)
+            if (request.category is None or question.category == request.category)
+            and (request.difficulty is None or question.difficulty == request.difficulty)
+            and (request.question_type is None or question.type == request.question_type)
+        ]
+
+    def _questions(self, query: dict[str, str], client: str) -> tuple[int, dict[str, Any]]:
+        """Answer a questions request
+
+        Args:
+            query (dict[str, str]): The query parameters
+            client (str): The client address
+
+        Returns:
+            tuple[int, dict[str, Any]]: The HTTP status and the JSON body
+        """
+        if self._rate_limited(client):
+            return self._response_code(TriviaResponseCode.RATE_LIMIT)
+
+        request: _QuestionQuery | None = self._parse_question_query(query)
+        if request is None:
+            return self._response_code(TriviaResponseCode.INVALID_PARAMETER)
+
+        token: str | None = query.get("token")
+        if token is not None and token not in self._tokens:
+            return self._response_code(TriviaResponseCode.TOKEN_NOT_FOUND)
+
+        matching: list[int] = self._matching(request)
+        if len(matching) < request.amount:
+            return self._response_code(TriviaResponseCode.NO_RESULTS)
+
+        if token is not None:
+            seen: set[int] = self._tokens[token]
+            matching = [index for index in matching if index not in seen]
+            if len(matching) < request.amount:
+                return self._response_code(TriviaResponseCode.TOKEN_EMPTY)
+
+        selected: list[int] = self._random.sample(matching, request.amount)
+        if token is not None:
+            self._tokens[token].update(selected)
+
+        return 200, {
+            "response_code": int(TriviaResponseCode.SUCCESS),
+            "results": [self._encode_question(self.corpus[index], request.encoding) for index in selected],
+        }
+
+    def _token(self, query: dict[str, str]) -> tuple[int, dict[str, Any]]:
+        """Answer a session token request
+
+        Args:
+            query (dict[str, str]): The query parameters
+
+        Returns:
+            tuple[int, dict[str, Any]]: The HTTP status and the JSON body
+        """
+        command: str | None = query.get("command")
+
+        if command == "request":
+            token: str = f"{self._random.getrandbits(256):064x}"
+            self._tokens[token] = set()
+            return 200, {"response_code": 0, "response_message": "Token Generated Successfully!", "token": token}
+
+        if command == "reset":
+            token = query.get("token", "")
+            if token not in self._tokens:
+                return self._response_code(TriviaResponseCode.TOKEN_NOT_FOUND)
+            self._tokens[token].clear()
+            return 200, {"response_code": 0, "token": token}
+
+        return self._response_code(TriviaResponseCode.INVALID_PARAMETER)
+
+    def _count(self, query: dict[str, str]) -> tuple[int, dict[str, Any]]:
+        """Answer a question count request
+
+        Args:
+            query (dict[str, str]): The query parameters
+
+        Returns:
+            tuple[int, dict[str, Any]]: The HTTP status and the JSON body
+        """
+        category_id: str = query.get("category", "")
+        if not category_id.isdigit() or int(category_id) not in self.categories:
+            return self._response_code(TriviaResponseCode.INVALID_PARAMETER)
+
+        category: str = self.categories[int(category_id)]
+        difficulties: Counter[str] = Counter(
+            question.difficulty for question in self.corpus if question.category == category
+        )
+        return 200, {
+            "category_id": int(category_id),
+            "category_question_count": {
+                "total_question_count": sum(difficulties.values()),
+                "total_easy_question_count": difficulties["easy"],
+                "total_medium_question_count": difficulties["medium"],
+                "total_hard_question_count": difficulties["hard"],
+            },
+        }
+
+    @staticmethod
+    def _encode_question(question: Question, encoding: str | None) -> dict[str, Any]:
+        """Encode a question the way the API sends it
+
+        Args:
+            question (Question): The question
+            encoding (str | None): The requested `encode` mode, None for HTML entities
+
+        Returns:
+            dict[str, Any]: The question as JSON data
+        """
+
+        def encode(text: str) -> str:
+            return quote(text, safe="") if encoding == "url3986" else html.escape(text)
+
+        return {
+            "type": encode(question.type),
+            "difficulty": encode(question.difficulty),
+            "category": encode(question.category),
+            "question": encode(question.question),
+            "correct_answer": encode(question.correct_answer),
+            "incorrect_answers": [encode(answer) for answer in question.incorrect_answers],
+        }
+
+    def __enter__(self) -> "LocalTriviaServer":
+        """Start the server when entering the context manager
+
+        Returns:
+            LocalTriviaServer: The running server
+        """
+        self.start()
+        return self
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc_val: BaseException | None, exc_tb: types.TracebackType | None
+    ) -> None:
+        """Stop the server when exiting the context manager.
+
+        Args:
+            exc_type: The type of the exception that was raised
+            exc_val: The instance of the exception that was raised
+            exc_tb: The traceback of the exception that was raised
+
+        Returns:
+            None
+        """
+        self.stop()
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """Passes GET requests to the LocalTriviaServer owning the HTTP server."""
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self) -> None:
+        """Count the accepted connection"""
+        super().setup()
+        app: LocalTriviaServer = cast(Any, self.server).app
+        with app._lock:
+            app.connections += 1
+
+    def do_GET(self) -> None:
+        """Answer a GET request with JSON"""
+        app: LocalTriviaServer = cast(Any, self.server).app
+        parts = urlsplit(self.path)
+        query: dict[str, str] = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+
+        status, payload = app.handle(parts.path, query, self.client_address[0])
+        body: bytes = json.dumps(payload).encode()
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        """Keep request logging off the console"""
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the local server from the command line until interrupted
+
+    Args:
+        argv (Sequence[str] | None, optional): Command line arguments. Defaults to sys.argv.
+
+    Returns:
+        int: The exit code
+    """
+    parser = argparse.ArgumentParser(description="Serve a local stand-in for the OpenTDB API.")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8000, help="Port to listen on (default: 8000)")
+    parser.add_argument("--corpus-size", type=int, default=300, help="Number of generated questions (default: 300)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Seconds between questions requests per client")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with an error")
+    parser.add_argument("--error-status", type=int, default=503, help="HTTP status of injected errors (default: 503)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the corpus and injected faults (default: 0)")
+    args = parser.parse_args(argv)
+
+    server = LocalTriviaServer(
+        corpus=generate_corpus(args.corpus_size, args.seed),
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        rate_limit_interval=args.rate_limit,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        seed=args.seed,
+    )
+
+    with server:
+        print(f"Serving a local Trivia API at {server.base_url}, press Ctrl+C to stop")
+        with contextlib.suppress(KeyboardInterrupt):
+            threading.Event().wait()
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
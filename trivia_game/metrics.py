@@ -0,0 +1,181 @@
+"""Module for in-process counters and latency histograms."""
+
+import bisect
+import threading
+from typing import Any, ClassVar
+
+Labels = tuple[tuple[str, str], ...]
+
+
+class Histogram:
+    """Distribution of observed values over fixed upper bounds
+
+    Attributes:
+        DEFAULT_BUCKETS (ClassVar[tuple[float, ...]]): Upper bounds in seconds, suited to HTTP latencies
+
+    Args:
+        buckets (tuple[float, ...], optional): Sorted upper bounds, +Inf is added. Defaults to DEFAULT_BUCKETS.
+    """
+
+    DEFAULT_BUCKETS: ClassVar[tuple[float, ...]] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        """Create an empty histogram
+
+        Args:
+            buckets (tuple[float, ...], optional): Sorted upper bounds, +Inf is added. Defaults to DEFAULT_BUCKETS.
+
+        Returns:
+            None
+        """
+        self.buckets: tuple[float, ...] = (*buckets, float("inf"))
+        self.counts: list[int] = [0] * len(self.buckets)
+        self.count: int = 0
+        self.sum: float = 0.0
+
+    def observe(self, value: float) -> None:
+        """Add a value to the bucket of the smallest upper bound not below it
+
+        Args:
+            value (float): The observed value
+
+        Returns:
+            None
+        """
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> dict[str, int]:
+        """Get the number of values at or below every upper bound
+
+        Returns:
+            dict[str, int]: Counts keyed by upper bound, e.g. {"0.005": 2, ..., "+Inf": 7}
+        """
+        total: int = 0
+        result: dict[str, int] = {}
+        for bound, count in zip(self.buckets, self.counts, strict=True):
+            total += count
+            result["+Inf" if bound == float("inf") else repr(bound)] = total
+        return result
+
+
+class MetricsRegistry:
+    """Thread-safe store of labelled counters and histograms
+
+    Series are created on first use, so callers only name a metric and its labels.
+
+    Args:
+        buckets (tuple[float, ...], optional): Upper bounds of new histograms. Defaults to Histogram.DEFAULT_BUCKETS.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = Histogram.DEFAULT_BUCKETS) -> None:
+        """Create an empty registry
+
+        Args:
+            buckets (tuple[float, ...], optional): Upper bounds of new histograms.
+                Defaults to Histogram.DEFAULT_BUCKETS.
+
+        Returns:
+            None
+        """
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._counters: dict[str, dict[Labels, float]] = {}
+        self._histograms: dict[str, dict[Labels, Histogram]] = {}
+
+    @staticmethod
+    def _labels(labels: dict[str, object]) -> Labels:
+        """Turn keyword labels into a hashable series key
+
+        Args:
+            labels (dict[str, object]): The label values
+
+        Returns:
+            Labels: The labels sorted by name, values as strings
+        """
+        return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+    def increment(self, name: str, amount: float = 1, **labels: object) -> None:
+        """Add to a counter
+
+        Args:
+            name (str): The metric name
+            amount (float, optional): The increment. Defaults to 1.
+            **labels (object): The label values of the series
+
+        Returns:
+            None
+        """
+        key: Labels = self._labels(labels)
+        with self._lock:
+            series: dict[Labels, float] = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    def observe(self, name: str, value: float, **labels: object) -> None:
+        """Record a value in a histogram
+
+        Args:
+            name (str): The metric name
+            value (float): The observed value, e.g. a duration in seconds
+            **labels (object): The label values of the series
+
+        Returns:
+            None
+        """
+        key: Labels = self._labels(labels)
+        with self._lock:
+            series: dict[Labels, Histogram] = self._histograms.setdefault(name, {})
+            if (histogram := series.get(key)) is None:
+                histogram = series[key] = Histogram(self.buckets)
+            histogram.observe(value)
+
+    def counter(self, name: str, **labels: object) -> float:
+        """Get the value of a counter
+
+        Args:
+            name (str): The metric name
+            **labels (object): The label values of the series
+
+        Returns:
+            float: The value, 0 if nothing was counted
+        """
+        with self._lock:
+            return self._counters.get(name, {}).get(self._labels(labels), 0)
+
+    def reset(self) -> None:
+        """Drop all series
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def snapshot(self) -> dict[str, Any]:
+        """Get a consistent copy of every series, ready for json.dumps
+
+        Returns:
+            dict[str, Any]: {"counters": {name: [{"labels", "value"}]},
+                "histograms": {name: [{"labels", "count", "sum", "buckets"}]}}
+        """
+        with self._lock:
+            return {
+                "counters": {
+                    name: [{"labels": dict(labels), "value": value} for labels, value in sorted(series.items())]
+                    for name, series in sorted(self._counters.items())
+                },
+                "histograms": {
+                    name: [
+                        {
+                            "labels": dict(labels),
+                            "count": histogram.count,
+                            "sum": histogram.sum,
+                            "buckets": histogram.cumulative(),
+                        }
+                        for labels, histogram in sorted(series.items(), key=lambda item: item[0])
+                    ]
+                    for name, series in sorted(self._histograms.items())
+                },
+            }
@@ -0,0 +1,358 @@
+"""Module for exporting metrics in the OpenMetrics and Prometheus text formats."""
+
+import logging
+import os
+import tempfile
+import threading
+import types
+from collections.abc import Mapping
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, ClassVar, cast
+
+from trivia_game.metrics import MetricsRegistry
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+OPENMETRICS_CONTENT_TYPE: str = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+PROMETHEUS_CONTENT_TYPE: str = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the text formats
+
+    Args:
+        value (str): The label value
+
+    Returns:
+        str: The value with backslashes, quotes and newlines escaped
+    """
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Mapping[str, str], **extra: str) -> str:
+    """Format the labels of a sample
+
+    Args:
+        labels (Mapping[str, str]): The series labels
+        **extra (str): Labels added after the series labels, e.g. le
+
+    Returns:
+        str: The label set including braces, or an empty string without labels
+    """
+    pairs: list[str] = [f'{name}="{_escape(value)}"' for name, value in {**labels, **extra}.items()]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value
+
+    Args:
+        value (float): The value
+
+    Returns:
+        str: Integers without a fraction, other values in repr form
+    """
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def render(registry: MetricsRegistry, openmetrics: bool = True) -> str:
+    """Render every series of a registry for a scrape
+
+    Counter names end in `_total`. OpenMetrics declares the family without the suffix
+    and ends with `# EOF`, the Prometheus text format declares the full name.
+
+    Args:
+        registry (MetricsRegistry): The metrics to render
+        openmetrics (bool, optional): Use the OpenMetrics format instead of the Prometheus text
+            format 0.0.4. Defaults to True.
+
+    Returns:
+        str: The exposition text
+    """
+    snapshot: dict[str, Any] = registry.snapshot()
+    lines: list[str] = []
+
+    for name, series in snapshot["counters"].items():
+        family: str = name.removesuffix("_total") if openmetrics else name
+        sample: str = f"{family}_total" if openmetrics else name
+        lines.append(f"# TYPE {family} counter")
+        for counter in series:
+            counter_labels: str = _format_labels(counter["labels"])
+            value: str = _format_value(counter["value"])
+            lines.append(f"{sample}{counter_labels} {value}")
+
+    for name, series in snapshot["histograms"].items():
+        lines.append(f"# TYPE {name} histogram")
+        for item in series:
+            labels: dict[str, str] = item["labels"]
+            lines.extend(
+                f"{name}_bucket{_format_labels(labels, le=bound)} {count}" for bound, count in item["buckets"].items()
+            )
+            observations: int = item["count"]
+            total: str = _format_value(item["sum"])
+            lines.append(f"{name}_count{_format_labels(labels)} {observations}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {total}")
+
+    if openmetrics:
+        lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """HTTP endpoint serving a registry to Prometheus scrapes
+
+    GET /metrics answers in OpenMetrics when the scraper accepts it, in the Prometheus
+    text format otherwise. The server runs on a daemon thread.
+
+    Attributes:
+        DEFAULT_PORT (ClassVar[int]): Port used when none is given
+
+    Args:
+        registry (MetricsRegistry): The metrics to serve
+        host (str, optional): Interface to listen on. Defaults to "127.0.0.1".
+        port (int, optional): Port to listen on, 0 picks a free one. Defaults to DEFAULT_PORT.
+    """
+
+    DEFAULT_PORT: ClassVar[int] = 9464
+
+    def __init__(self, registry: MetricsRegistry, host: str = "127.0.0.1", port: int = DEFAULT_PORT) -> None:
+        """Create the server, it listens once started
+
+        Args:
+            registry (MetricsRegistry): The metrics to serve
+            host (str, optional): Interface to listen on. Defaults to "127.0.0.1".
+            port (int, optional): Port to listen on, 0 picks a free one. Defaults to DEFAULT_PORT.
+
+        Returns:
+            None
+        """
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._httpd: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        """Get the URL of the metrics endpoint
+
+        Returns:
+            str: The URL, e.g. "http://127.0.0.1:9464/metrics"
+        """
+        return f"http://{self.host}:{self.port}/metrics"
+
+    def start(self) -> str:
+        """Start listening in the background
+
+        Returns:
+            str: The URL of the metrics endpoint
+        """
+        self._httpd = ThreadingHTTPServer((self.host, self.port), _MetricsHandler)
+        self._httpd.daemon_threads = True
+        cast(Any, self._httpd).registry = self.registry
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, kwargs={"poll_interval": 0.05}, name="metrics-server", daemon=True
+        )
+        self._thread.start()
+        return self.url
+
+    def stop(self) -> None:
+        """Stop listening and wait for the server thread"""
+        if self._httpd is None:
+            return
+
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+        self._httpd = None
+        self._thread = None
+
+    def __enter__(self) -> "MetricsServer":
+        """Enter context manager
+
+        Returns:
+            MetricsServer: The started server
+        """
+        self.start()
+        return self
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc_val: BaseException | None, exc_tb: types.TracebackType | None
+    ) -> None:
+        """Stop the server when exiting the context manager.
+
+        Args:
+            exc_type: The type of the exception that was raised
+            exc_val: The instance of the exception that was raised
+            exc_tb: The traceback of the exception that was raised
+
+        Returns:
+            None
+        """
+        self.stop()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """Answers scrapes of the metrics endpoint."""
+
+    def do_GET(self) -> None:
+        """Send the rendered registry"""
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+
+        openmetrics: bool = "application/openmetrics-text" in self.headers.get("Accept", "")
+        registry: MetricsRegistry = cast(Any, self.server).registry
+        body: bytes = render(registry, openmetrics).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", OPENMETRICS_CONTENT_TYPE if openmetrics else PROMETHEUS_CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        """Keep scrapes out of stderr"""
+
+
+class TextfileWriter:
+    """Periodically writes a registry to a file for node_exporter's textfile collector
+
+    Files are written in the Prometheus text format, to a temporary file first and then
+    renamed, so the collector never reads a partial file.
+
+    Attributes:
+        DEFAULT_INTERVAL (ClassVar[float]): Seconds between writes used when none is given
+
+    Args:
+        registry (MetricsRegistry): The metrics to write
+        path (Path): The output file, usually ending in .prom
+        interval (float, optional): Seconds between writes. Defaults to DEFAULT_INTERVAL.
+    """
+
+    DEFAULT_INTERVAL: ClassVar[float] = 15.0
+
+    def __init__(self, registry: MetricsRegistry, path: Path, interval: float = DEFAULT_INTERVAL) -> None:
+        """Create the writer, it writes once started
+
+        Args:
+            registry (MetricsRegistry): The metrics to write
+            path (Path): The output file, usually ending in .prom
+            interval (float, optional): Seconds between writes. Defaults to DEFAULT_INTERVAL.
+
+        Returns:
+            None
+        """
+        self.registry = registry
+        self.path = path
+        self.interval = interval
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def write(self) -> None:
+        """Write the current metrics to the file
+
+        Returns:
+            None
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_name = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(render(self.registry, openmetrics=False))
+            os.replace(temp_name, self.path)
+        except BaseException:
+            Path(temp_name).unlink(missing_ok=True)
+            raise
+
+    def _run(self) -> None:
+        """Write every interval until stopped, a failed write is logged and retried next interval"""
+        while not self._stopped.wait(self.interval):
+            try:
+                self.write()
+            except OSError:
+                logger.exception("Writing metrics to %s failed", self.path)
+
+    def start(self) -> None:
+        """Write now and then every interval in the background
+
+        Returns:
+            None
+        """
+        self.write()
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="metrics-textfile", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background writes and write a final time
+
+        Returns:
+            None
+        """
+        if self._thread is not None:
+            self._stopped.set()
+            self._thread.join()
+            self._thread = None
+            self.write()
+
+    def __enter__(self) -> "TextfileWriter":
+        """Enter context manager
+
+        Returns:
+            TextfileWriter: The started writer
+        """
+        self.start()
+        return self
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc_val: BaseException | None, exc_tb: types.TracebackType | None
+    ) -> None:
+        """Stop the writer when exiting the context manager.
+
+        Args:
+            exc_type: The type of the exception that was raised
+            exc_val: The instance of the exception that was raised
+            exc_tb: The traceback of the exception that was raised
+
+        Returns:
+            None
+        """
+        self.stop()
+
+
+def start_exporters(
+    registry: MetricsRegistry, environ: Mapping[str, str] = os.environ
+) -> list[MetricsServer | TextfileWriter]:
+    """Start the exporters configured by environment variables
+
+    TRIVIA_METRICS_PORT serves /metrics on that port, TRIVIA_METRICS_HOST sets the
+    interface (default 127.0.0.1). TRIVIA_METRICS_TEXTFILE writes that file every
+    TRIVIA_METRICS_INTERVAL seconds (default 15).
+
+    Args:
+        registry (MetricsRegistry): The metrics to export
+        environ (Mapping[str, str], optional): The environment. Defaults to os.environ.
+
+    Raises:
+        ValueError: If a port or interval is not a number
+
+    Returns:
+        list[MetricsServer | TextfileWriter]: The started exporters, empty if none is configured
+    """
+    exporters: list[MetricsServer | TextfileWriter] = []
+
+    if port := environ.get("TRIVIA_METRICS_PORT"):
+        server = MetricsServer(registry, environ.get("TRIVIA_METRICS_HOST", "127.0.0.1"), int(port))
+        server.start()
+        exporters.append(server)
+
+    if textfile := environ.get("TRIVIA_METRICS_TEXTFILE"):
+        interval: float = float(environ.get("TRIVIA_METRICS_INTERVAL", TextfileWriter.DEFAULT_INTERVAL))
+        writer = TextfileWriter(registry, Path(textfile), interval)
+        writer.start()
+        exporters.append(writer)
+
+    return exporters
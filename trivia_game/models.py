@@ -1,5 +1,6 @@
 """Models for the trivia game."""
 
+import sys
 from dataclasses import dataclass
 from datetime import datetime
 from enum import IntEnum
@@ -8,6 +9,7 @@ from typing import Literal, TypeVar
 T = TypeVar("T")
 DifficultyType = Literal["easy", "medium", "hard"]
 QuestionType = Literal["multiple", "boolean"]
+EncodingType = Literal["url3986"]
 
 
 class TriviaResponseCode(IntEnum):
@@ -29,16 +31,34 @@ class Category:
     name: str
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Question:
-    """Dataclass for a trivia question."""
+    """Dataclass for a trivia question.
+
+    Questions are immutable and slotted, so a large corpus costs no per-instance
+    __dict__. Answers are stored as a tuple, lists are converted on creation. The
+    type, difficulty and category strings are interned, so every question of a
+    category shares one copy of them.
+    """
 
     type: QuestionType
     difficulty: DifficultyType
     category: str
     question: str
     correct_answer: str
-    incorrect_answers: list[str]
+    incorrect_answers: tuple[str, ...]
+
+    def __post_init__(self) -> None:
+        """Intern the repeated strings and store the answers as a tuple
+
+        Returns:
+            None
+        """
+        object.__setattr__(self, "type", sys.intern(self.type))
+        object.__setattr__(self, "difficulty", sys.intern(self.difficulty))
+        object.__setattr__(self, "category", sys.intern(self.category))
+        if not isinstance(self.incorrect_answers, tuple):
+            object.__setattr__(self, "incorrect_answers", tuple(self.incorrect_answers))
 
     def all_answers(self) -> list[str]:
         """Return all answers including correct and incorrect ones.
@@ -49,6 +69,23 @@ class Question:
         return [self.correct_answer, *self.incorrect_answers]
 
 
+@dataclass(frozen=True)
+class GameSettings:
+    """Dataclass for the question filters of a game."""
+
+    category: str | None = None
+    difficulty: DifficultyType | None = None
+    question_type: QuestionType | None = None
+
+
+@dataclass
+class SessionToken:
+    """Dataclass for a session token and the time it was issued."""
+
+    token: str
+    issued_at: datetime
+
+
 @dataclass
 class ScoreboardEntry:
     player_name: str
@@ -0,0 +1,144 @@
+"""Module for prefetching question batches in the background."""
+
+import threading
+from collections import deque
+from typing import cast
+
+from trivia_game.exceptions import NoResultsError, TriviaAPIError
+from trivia_game.models import GameSettings, Question
+from trivia_game.trivia_api import TriviaAPIClient
+
+
+class QuestionPrefetcher:
+    """Background worker keeping a bounded buffer of ready-to-play question batches
+
+    The buffer holds batches for one set of game settings at a time. While the player
+    answers, the worker tops it up so the next game with the same settings starts
+    without a request. All fetches go through the API client, so they respect its
+    rate limiter. The worker only fetches when the rate limiter has a free slot, so it
+    never holds one while a game start waits for it.
+
+    Args:
+        api_client (TriviaAPIClient): The client used to fetch questions
+        depth (int, optional): Number of batches to keep ready, 0 disables prefetching. Defaults to 2.
+        batch_size (int, optional): Number of questions in a batch. Defaults to 10.
+        retry_delay (float, optional): Seconds to wait after a failed fetch. Defaults to 5.0.
+    """
+
+    def __init__(
+        self, api_client: TriviaAPIClient, depth: int = 2, batch_size: int = 10, retry_delay: float = 5.0
+    ) -> None:
+        """Create the prefetcher, the worker thread starts with the first prefetch call
+
+        Args:
+            api_client (TriviaAPIClient): The client used to fetch questions
+            depth (int, optional): Number of batches to keep ready, 0 disables prefetching. Defaults to 2.
+            batch_size (int, optional): Number of questions in a batch. Defaults to 10.
+            retry_delay (float, optional): Seconds to wait after a failed fetch. Defaults to 5.0.
+
+        Returns:
+            None
+        """
+        self.api_client = api_client
+        self.depth = depth
+        self.batch_size = batch_size
+        self.retry_delay = retry_delay
+
+        self._settings: GameSettings | None = None
+        self._buffer: deque[list[Question]] = deque()
+        self._condition = threading.Condition()
+        self._stopped: bool = False
+        self._worker: threading.Thread | None = None
+
+    @property
+    def ready(self) -> int:
+        """Number of batches ready for the current settings"""
+        with self._condition:
+            return len(self._buffer)
+
+    def prefetch(self, settings: GameSettings) -> None:
+        """Start filling the buffer for the given settings
+
+        Batches buffered for different settings are dropped.
+
+        Args:
+            settings (GameSettings): The settings of the games to prepare
+
+        Returns:
+            None
+        """
+        if self.depth < 1:
+            return
+
+        with self._condition:
+            if settings != self._settings:
+                self._settings = settings
+                self._buffer.clear()
+            self._stopped = False
+            self._condition.notify_all()
+
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="question-prefetch", daemon=True)
+                self._worker.start()
+
+    def get_batch(self, settings: GameSettings) -> list[Question] | None:
+        """Take a ready batch for the given settings without blocking
+
+        Args:
+            settings (GameSettings): The settings of the game being started
+
+        Returns:
+            list[Question] | None: A batch of questions, or None if none is ready
+        """
+        with self._condition:
+            if settings != self._settings or not self._buffer:
+                return None
+
+            batch: list[Question] = self._buffer.popleft()
+            self._condition.notify_all()
+            return batch
+
+    def stop(self) -> None:
+        """Stop the worker thread and drop buffered batches"""
+        with self._condition:
+            self._stopped = True
+            self._buffer.clear()
+            self._condition.notify_all()
+
+    def _run(self) -> None:
+        """Worker loop fetching batches until the buffer is full or the prefetcher stops"""
+        while True:
+            with self._condition:
+                while not self._stopped and (self._settings is None or len(self._buffer) >= self.depth):
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                settings: GameSettings = cast(GameSettings, self._settings)
+
+            if (delay := self.api_client.next_request_delay()) > 0:
+                # Waiting inside the rate limiter would reserve the slot ahead of interactive requests
+                with self._condition:
+                    self._condition.wait(delay)
+                continue
+
+            try:
+                batch: list[Question] = self.api_client.fetch_questions(
+                    amount=self.batch_size,
+                    category=settings.category,
+                    difficulty=settings.difficulty,
+                    question_type=settings.question_type,
+                )
+            except NoResultsError:
+                # The settings cannot fill a batch, retrying would only waste requests
+                with self._condition:
+                    if settings == self._settings:
+                        self._settings = None
+                continue
+            except TriviaAPIError:
+                with self._condition:
+                    self._condition.wait(self.retry_delay)
+                continue
+
+            with self._condition:
+                if settings == self._settings and not self._stopped:
+                    self._buffer.append(batch)
@@ -0,0 +1,370 @@
+"""Module for the columnar in-memory question bank."""
+
+import random
+from array import array
+from collections.abc import Iterable, Iterator
+from itertools import compress
+from typing import ClassVar
+
+from trivia_game.models import DifficultyType, Question, QuestionType
+from trivia_game.question_cache import QuestionCache
+
+QuestionFilter = tuple[str | None, DifficultyType | None, QuestionType | None]
+
+
+def _mask(column: bytes | bytearray, code: int) -> int:
+    """Get the rows of a code column holding a code as the bytes of an integer
+
+    Args:
+        column (bytes | bytearray): One code byte per row
+        code (int): The code to match, -1 matches no row
+
+    Returns:
+        int: One byte per row, 1 where the code matches and 0 elsewhere
+    """
+    table: bytes = bytes(code == value for value in range(256))
+    return int.from_bytes(column.translate(table), "big")
+
+
+def matching_rows(filters: Iterable[tuple[bytes | bytearray, int]], size: int) -> "array[int]":
+    """Find the rows whose code columns all hold the wanted codes
+
+    Each column is mapped to a 0/1 mask with bytes.translate, the masks are combined
+    as integers and the rows are collected with itertools.compress, so the work per
+    row happens in C.
+
+    Args:
+        filters (Iterable[tuple[bytes | bytearray, int]]): Code columns of `size` bytes and the code each must hold
+        size (int): The number of rows
+
+    Returns:
+        array[int]: The matching rows in ascending order, all rows without filters
+    """
+    mask: int = int.from_bytes(b"\x01" * size, "big")
+    for column, code in filters:
+        mask &= _mask(column, code)
+    return array("I", compress(range(size), mask.to_bytes(size, "big")))
+
+
+class TextColumn:
+    """Strings stored back to back in one UTF-8 buffer, addressed by offsets
+
+    Args:
+        values (Iterable[str], optional): Initial strings. Defaults to ().
+    """
+
+    def __init__(self, values: Iterable[str] = ()) -> None:
+        """Create the column
+
+        Args:
+            values (Iterable[str], optional): Initial strings. Defaults to ().
+
+        Returns:
+            None
+        """
+        self.data: bytearray = bytearray()
+        self.offsets: array[int] = array("Q", [0])
+        for value in values:
+            self.append(value)
+
+    def append(self, value: str) -> None:
+        """Add a string at the end
+
+        Args:
+            value (str): The string
+
+        Returns:
+            None
+        """
+        self.data += value.encode()
+        self.offsets.append(len(self.data))
+
+    def __getitem__(self, index: int) -> str:
+        """Decode the string at an index
+
+        Args:
+            index (int): The row
+
+        Returns:
+            str: The string
+        """
+        return self.data[self.offsets[index] : self.offsets[index + 1]].decode()
+
+    def __len__(self) -> int:
+        """Get the number of strings
+
+        Returns:
+            int: The number of rows
+        """
+        return len(self.offsets) - 1
+
+
+class QuestionBank:
+    """Question store with one compact column per field, built for fast filtering
+
+    Category, difficulty and type are stored as one-byte codes in bytearrays, the
+    texts in TextColumn buffers. Filters run over the code columns with
+    matching_rows, so no Python code runs per question. The indices of a filter
+    are kept until the bank changes, and sampling a game only decodes the chosen
+    rows.
+
+    Attributes:
+        DIFFICULTIES (ClassVar[tuple[DifficultyType, ...]]): Difficulties by code
+        QUESTION_TYPES (ClassVar[tuple[QuestionType, ...]]): Question types by code
+        ANSWER_SEPARATOR (ClassVar[str]): Joins the incorrect answers of a question
+        MAX_CATEGORIES (ClassVar[int]): Number of category codes that fit in a byte
+
+    Args:
+        questions (Iterable[Question], optional): Initial questions. Defaults to ().
+    """
+
+    DIFFICULTIES: ClassVar[tuple[DifficultyType, ...]] = ("easy", "medium", "hard")
+    QUESTION_TYPES: ClassVar[tuple[QuestionType, ...]] = ("multiple", "boolean")
+    ANSWER_SEPARATOR: ClassVar[str] = "\x1f"
+    MAX_CATEGORIES: ClassVar[int] = 256
+
+    def __init__(self, questions: Iterable[Question] = ()) -> None:
+        """Create the bank
+
+        Args:
+            questions (Iterable[Question], optional): Initial questions. Defaults to ().
+
+        Returns:
+            None
+        """
+        self.categories: list[str] = []
+        self._category_codes: dict[str, int] = {}
+        self._category_column: bytearray = bytearray()
+        self._difficulty_column: bytearray = bytearray()
+        self._type_column: bytearray = bytearray()
+        self._questions: TextColumn = TextColumn()
+        self._correct_answers: TextColumn = TextColumn()
+        self._incorrect_answers: TextColumn = TextColumn()
+        self._indices: dict[QuestionFilter, array[int]] = {}
+        self.extend(questions)
+
+    @classmethod
+    def from_cache(cls, cache: QuestionCache) -> "QuestionBank":
+        """Load every question of a harvested corpus
+
+        Args:
+            cache (QuestionCache): The corpus
+
+        Returns:
+            QuestionBank: The bank holding all cached questions
+        """
+        return cls(cache.get_questions(cache.count()))
+
+    def _category_code(self, category: str) -> int:
+        """Get the code of a category, assigning one to a new category
+
+        Args:
+            category (str): The category name
+
+        Raises:
+            ValueError: If the bank already holds MAX_CATEGORIES categories
+
+        Returns:
+            int: The code
+        """
+        if (code := self._category_codes.get(category)) is not None:
+            return code
+
+        if len(self.categories) >= self.MAX_CATEGORIES:
+            msg: str = f"A question bank holds at most {self.MAX_CATEGORIES} categories"
+            raise ValueError(msg)
+
+        code = self._category_codes[category] = len(self.categories)
+        self.categories.append(category)
+        return code
+
+    def add(self, question: Question) -> None:
+        """Add a question
+
+        Args:
+            question (Question): The question
+
+        Raises:
+            ValueError: If the question has an unknown difficulty or type, or a category beyond MAX_CATEGORIES
+
+        Returns:
+            None
+        """
+        try:
+            difficulty: int = self.DIFFICULTIES.index(question.difficulty)
+            question_type: int = self.QUESTION_TYPES.index(question.type)
+        except ValueError as e:
+            msg: str = f"Unsupported difficulty or type: {question.difficulty}, {question.type}"
+            raise ValueError(msg) from e
+
+        self._category_column.append(self._category_code(question.category))
+        self._difficulty_column.append(difficulty)
+        self._type_column.append(question_type)
+        self._questions.append(question.question)
+        self._correct_answers.append(question.correct_answer)
+        self._incorrect_answers.append(self.ANSWER_SEPARATOR.join(question.incorrect_answers))
+        self._indices.clear()
+
+    def extend(self, questions: Iterable[Question]) -> None:
+        """Add several questions
+
+        Args:
+            questions (Iterable[Question]): The questions
+
+        Returns:
+            None
+        """
+        for question in questions:
+            self.add(question)
+
+    def code_columns(self) -> tuple[bytearray, bytearray, bytearray]:
+        """Get the code columns, e.g. to write them to a file
+
+        Returns:
+            tuple[bytearray, bytearray, bytearray]: The category, difficulty and type codes, one byte per question
+        """
+        return self._category_column, self._difficulty_column, self._type_column
+
+    def text_columns(self) -> tuple[TextColumn, TextColumn, TextColumn]:
+        """Get the text columns, e.g. to write them to a file
+
+        Returns:
+            tuple[TextColumn, TextColumn, TextColumn]: The questions, correct answers and incorrect answers joined
+                by ANSWER_SEPARATOR
+        """
+        return self._questions, self._correct_answers, self._incorrect_answers
+
+    def __len__(self) -> int:
+        """Get the number of questions
+
+        Returns:
+            int: The number of questions
+        """
+        return len(self._category_column)
+
+    def __getitem__(self, index: int) -> Question:
+        """Build the question stored at a row
+
+        Args:
+            index (int): The row, negative values count from the end
+
+        Raises:
+            IndexError: If there is no such row
+
+        Returns:
+            Question: The question
+        """
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            msg: str = "Question index out of range"
+            raise IndexError(msg)
+
+        incorrect: str = self._incorrect_answers[index]
+        return Question(
+            type=self.QUESTION_TYPES[self._type_column[index]],
+            difficulty=self.DIFFICULTIES[self._difficulty_column[index]],
+            category=self.categories[self._category_column[index]],
+            question=self._questions[index],
+            correct_answer=self._correct_answers[index],
+            incorrect_answers=tuple(incorrect.split(self.ANSWER_SEPARATOR)) if incorrect else (),
+        )
+
+    def __iter__(self) -> Iterator[Question]:
+        """Iterate over all questions in insertion order
+
+        Returns:
+            Iterator[Question]: The questions
+        """
+        return (self[index] for index in range(len(self)))
+
+    def _filter_codes(
+        self, category: str | None, difficulty: DifficultyType | None, question_type: QuestionType | None
+    ) -> list[tuple[bytearray, int]]:
+        """Get the code each filtered column must hold
+
+        Args:
+            category (str | None): The category name or None for any category
+            difficulty (DifficultyType | None): The difficulty or None for any difficulty
+            question_type (QuestionType | None): The question type or None for any type
+
+        Returns:
+            list[tuple[bytearray, int]]: The columns and codes, -1 for a value the bank does not hold
+        """
+        codes: list[tuple[bytearray, int]] = []
+        if category is not None:
+            codes.append((self._category_column, self._category_codes.get(category, -1)))
+        if difficulty is not None:
+            known: bool = difficulty in self.DIFFICULTIES
+            codes.append((self._difficulty_column, self.DIFFICULTIES.index(difficulty) if known else -1))
+        if question_type is not None:
+            known = question_type in self.QUESTION_TYPES
+            codes.append((self._type_column, self.QUESTION_TYPES.index(question_type) if known else -1))
+        return codes
+
+    def indices(
+        self,
+        category: str | None = None,
+        difficulty: DifficultyType | None = None,
+        question_type: QuestionType | None = None,
+    ) -> "array[int]":
+        """Get the rows matching the filters
+
+        Args:
+            category (str | None, optional): The category name. Defaults to None.
+            difficulty (DifficultyType | None, optional): The difficulty. Defaults to None.
+            question_type (QuestionType | None, optional): The question type. Defaults to None.
+
+        Returns:
+            array[int]: The matching rows in ascending order, shared until the bank changes
+        """
+        key: QuestionFilter = (category, difficulty, question_type)
+        if (cached := self._indices.get(key)) is not None:
+            return cached
+
+        rows: array[int] = matching_rows(self._filter_codes(category, difficulty, question_type), len(self))
+        self._indices[key] = rows
+        return rows
+
+    def count(
+        self,
+        category: str | None = None,
+        difficulty: DifficultyType | None = None,
+        question_type: QuestionType | None = None,
+    ) -> int:
+        """Count the questions matching the filters
+
+        Args:
+            category (str | None, optional): The category name. Defaults to None.
+            difficulty (DifficultyType | None, optional): The difficulty. Defaults to None.
+            question_type (QuestionType | None, optional): The question type. Defaults to None.
+
+        Returns:
+            int: The number of matching questions
+        """
+        return len(self.indices(category, difficulty, question_type))
+
+    def sample(
+        self,
+        amount: int,
+        category: str | None = None,
+        difficulty: DifficultyType | None = None,
+        question_type: QuestionType | None = None,
+        rng: random.Random | None = None,
+    ) -> list[Question]:
+        """Get a random selection of questions matching the filters, like QuestionCache.get_questions
+
+        Args:
+            amount (int): The maximum number of questions to return
+            category (str | None, optional): The category name. Defaults to None.
+            difficulty (DifficultyType | None, optional): The difficulty. Defaults to None.
+            question_type (QuestionType | None, optional): The question type. Defaults to None.
+            rng (random.Random | None, optional): Source of randomness. Defaults to the random module.
+
+        Returns:
+            list[Question]: Up to `amount` matching questions
+        """
+        rows: array[int] = self.indices(category, difficulty, question_type)
+        sample = rng.sample if rng is not None else random.sample
+        chosen: list[int] = sample(rows, min(amount, len(rows)))
+        return [self[index] for index in chosen]
@@ -0,0 +1,362 @@
+"""Module for the persistent question cache."""
+
+import json
+import random
+import sqlite3
+import threading
+import time
+import types
+from pathlib import Path
+from typing import Any, ClassVar, cast, get_args
+
+from trivia_game.models import DifficultyType, EncodingType, Question, QuestionType
+from trivia_game.text_decoding import decoder
+
+
+class QuestionCache:
+    """Disk-backed store of trivia questions
+
+    Questions are kept in a SQLite database and indexed on category, difficulty
+    and type, so a game can be served with a single indexed read. The network is
+    then only needed to top the store up.
+
+    Questions from an API response can be stored as the API encoded them, see
+    add_encoded. Their texts are decoded when they are read, so questions that are
+    stored in bulk and never read are never decoded.
+
+    Every question records when it was last served, indexed as well. Games take the
+    questions that were never served, or served longest ago, so a store that is topped
+    up keeps serving new questions instead of repeating a few.
+
+    Attributes:
+        SCHEMA (ClassVar[str]): The SQL statements creating the questions table and its index
+        DEFAULT_REUSE_AFTER (ClassVar[float]): Seconds after which a served question counts as fresh again
+        API_DEFAULT_ENCODING (ClassVar[str]): The stored encoding of texts the API sent without an encode mode
+
+    Args:
+        path (Path | str, optional): The database file. Defaults to ":memory:".
+        reuse_after (float, optional): Seconds after which a served question counts as fresh again.
+            Defaults to DEFAULT_REUSE_AFTER.
+    """
+
+    SCHEMA: ClassVar[str] = """
+        CREATE TABLE IF NOT EXISTS questions (
+            id INTEGER PRIMARY KEY,
+            category TEXT NOT NULL,
+            difficulty TEXT NOT NULL,
+            type TEXT NOT NULL,
+            question TEXT NOT NULL UNIQUE,
+            correct_answer TEXT NOT NULL,
+            incorrect_answers TEXT NOT NULL,
+            last_served REAL,
+            encoding TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_questions_filter ON questions (category, difficulty, type);
+    """
+    DEFAULT_REUSE_AFTER: ClassVar[float] = 24 * 60 * 60
+    API_DEFAULT_ENCODING: ClassVar[str] = "default"
+
+    _COLUMNS: ClassVar[str] = "category, difficulty, type, question, correct_answer, incorrect_answers, encoding"
+
+    def __init__(self, path: Path | str = ":memory:", reuse_after: float = DEFAULT_REUSE_AFTER) -> None:
+        """Open the cache database and create the schema if needed
+
+        Databases written before questions recorded when they were served, or how their texts
+        are encoded, are upgraded in place.
+
+        Args:
+            path (Path | str, optional): The database file. Defaults to ":memory:".
+            reuse_after (float, optional): Seconds after which a served question counts as fresh again.
+                Defaults to DEFAULT_REUSE_AFTER.
+
+        Returns:
+            None
+        """
+        self.path = path
+        self.reuse_after = reuse_after
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection = sqlite3.connect(str(path), check_same_thread=False)
+        self._connection.executescript(self.SCHEMA)
+        columns: set[str] = {row[1] for row in self._connection.execute("PRAGMA table_info(questions)")}
+        with self._connection:
+            for column, column_type in (("last_served", "REAL"), ("encoding", "TEXT")):
+                if column not in columns:
+                    self._connection.execute(f"ALTER TABLE questions ADD COLUMN {column} {column_type}")
+            self._connection.execute("CREATE INDEX IF NOT EXISTS idx_questions_served ON questions (last_served)")
+
+    @staticmethod
+    def _build_filter(
+        category: str | None,
+        difficulty: DifficultyType | None,
+        question_type: QuestionType | None,
+        served_before: float | None = None,
+    ) -> tuple[str, list[str | float]]:
+        """Build the WHERE clause for the given filters
+
+        Args:
+            category (str | None): The category name or None for any category
+            difficulty (DifficultyType | None): The difficulty or None for any difficulty
+            question_type (QuestionType | None): The question type or None for any type
+            served_before (float | None, optional): Only match questions never served or last served
+                before this time. Defaults to None.
+
+        Returns:
+            tuple[str, list[str | float]]: The WHERE clause and its parameters
+        """
+        conditions: list[str] = []
+        params: list[str | float] = []
+
+        for column, value in (("category", category), ("difficulty", difficulty), ("type", question_type)):
+            if value:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+
+        if served_before is not None:
+            conditions.append("(last_served IS NULL OR last_served < ?)")
+            params.append(served_before)
+
+        where: str = "WHERE " + " AND ".join(conditions) if conditions else ""
+        return where, params
+
+    @staticmethod
+    def _row_to_question(row: tuple[Any, ...]) -> Question:
+        """Convert a database row to a question, decoding texts stored as the API encoded them
+
+        Args:
+            row (tuple[Any, ...]): The row as (category, difficulty, type, question, correct, incorrect, encoding)
+
+        Returns:
+            Question: The question object
+        """
+        category, difficulty, question_type, question, correct_answer, incorrect_answers, encoding = row
+        answers: list[str] = json.loads(incorrect_answers)
+        if encoding is not None:
+            decode = decoder(None if encoding == QuestionCache.API_DEFAULT_ENCODING else encoding)
+            question, correct_answer, answers = decode(question), decode(correct_answer), list(map(decode, answers))
+        return Question(
+            type=cast(QuestionType, question_type),
+            difficulty=cast(DifficultyType, difficulty),
+            category=category,
+            question=question,
+            correct_answer=correct_answer,
+            incorrect_answers=tuple(answers),
+        )
+
+    def _insert(self, rows: list[tuple[str | None, ...]], served: bool) -> int:
+        """Store rows, ignoring questions that are already cached
+
+        Args:
+            rows (list[tuple[str | None, ...]]): The rows as (category, difficulty, type, question,
+                correct, incorrect, encoding)
+            served (bool): Whether the questions are being served right now
+
+        Returns:
+            int: The number of newly stored questions
+        """
+        with self._lock, self._connection:
+            before: int = self._connection.total_changes
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO questions "
+                "(category, difficulty, type, question, correct_answer, incorrect_answers, encoding) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            added: int = self._connection.total_changes - before
+            if served:
+                now: float = time.time()
+                self._connection.executemany(
+                    "UPDATE questions SET last_served = ? WHERE question = ?", [(now, row[3]) for row in rows]
+                )
+            return added
+
+    def add_questions(self, questions: list[Question], served: bool = False) -> int:
+        """Store questions, ignoring ones that are already cached
+
+        Args:
+            questions (list[Question]): The questions to store
+            served (bool, optional): Whether the questions are being served right now, so games
+                taking fresh questions skip them. Defaults to False.
+
+        Returns:
+            int: The number of newly stored questions
+        """
+        rows: list[tuple[str | None, ...]] = [
+            (
+                question.category,
+                question.difficulty,
+                question.type,
+                question.question,
+                question.correct_answer,
+                json.dumps(list(question.incorrect_answers)),
+                None,
+            )
+            for question in questions
+        ]
+        return self._insert(rows, served)
+
+    def add_encoded(
+        self, results: list[dict[str, Any]], encoding: EncodingType | None = None, served: bool = False
+    ) -> int:
+        """Store questions of an API response without decoding their texts
+
+        Only the category, difficulty and type are decoded, so they can be filtered on. The
+        other texts are decoded when the questions are read. A question is only recognised
+        as already cached if it was stored with the same encoding.
+
+        Args:
+            results (list[dict[str, Any]]): The question data from the API
+            encoding (EncodingType | None, optional): The `encode` mode of the request. Defaults to None.
+            served (bool, optional): Whether the questions are being served right now, so games
+                taking fresh questions skip them. Defaults to False.
+
+        Raises:
+            ValueError: If a question has an invalid difficulty
+
+        Returns:
+            int: The number of newly stored questions
+        """
+        decode = decoder(encoding)
+        stored_encoding: str = encoding or self.API_DEFAULT_ENCODING
+        rows: list[tuple[str | None, ...]] = []
+        for data in results:
+            if (difficulty := decode(data["difficulty"])) not in get_args(DifficultyType):
+                msg: str = f"Invalid difficulty value: {difficulty}"
+                raise ValueError(msg)
+            rows.append((
+                decode(data["category"]),
+                difficulty,
+                decode(data["type"]),
+                data["question"],
+                data["correct_answer"],
+                json.dumps(data["incorrect_answers"]),
+                stored_encoding,
+            ))
+        return self._insert(rows, served)
+
+    def get_questions(
+        self,
+        amount: int,
+        category: str | None = None,
+        difficulty: DifficultyType | None = None,
+        question_type: QuestionType | None = None,
+    ) -> list[Question]:
+        """Get a random selection of cached questions matching the filters
+
+        The questions are not marked as served, see take_questions for serving a game.
+
+        Args:
+            amount (int): The maximum number of questions to return
+            category (str | None, optional): The category name. Defaults to None.
+            difficulty (DifficultyType | None, optional): The difficulty. Defaults to None.
+            question_type (QuestionType | None, optional): The question type. Defaults to None.
+
+        Returns:
+            list[Question]: Up to `amount` matching questions
+        """
+        where, params = self._build_filter(category, difficulty, question_type)
+        query: str = f"SELECT {self._COLUMNS} FROM questions {where} ORDER BY RANDOM() LIMIT ?"  # noqa: S608
+
+        with self._lock:
+            rows = self._connection.execute(query, [*params, amount]).fetchall()
+
+        return [self._row_to_question(row) for row in rows]
+
+    def take_questions(
+        self,
+        amount: int,
+        category: str | None = None,
+        difficulty: DifficultyType | None = None,
+        question_type: QuestionType | None = None,
+        fresh_only: bool = False,
+    ) -> list[Question]:
+        """Take the least recently served questions matching the filters and mark them served
+
+        Questions never served come first, in the order they were stored, then the ones served
+        longest ago. The taken questions are returned in random order.
+
+        Args:
+            amount (int): The number of questions to take
+            category (str | None, optional): The category name. Defaults to None.
+            difficulty (DifficultyType | None, optional): The difficulty. Defaults to None.
+            question_type (QuestionType | None, optional): The question type. Defaults to None.
+            fresh_only (bool, optional): Only take questions not served within reuse_after, and none
+                unless there are `amount` of them. Defaults to False.
+
+        Returns:
+            list[Question]: Up to `amount` matching questions
+        """
+        now: float = time.time()
+        served_before: float | None = now - self.reuse_after if fresh_only else None
+        where, params = self._build_filter(category, difficulty, question_type, served_before)
+        query: str = f"SELECT id, {self._COLUMNS} FROM questions {where} ORDER BY last_served LIMIT ?"  # noqa: S608
+
+        with self._lock, self._connection:
+            rows = self._connection.execute(query, [*params, amount]).fetchall()
+            if fresh_only and len(rows) < amount:
+                return []
+            self._connection.executemany(
+                "UPDATE questions SET last_served = ? WHERE id = ?", [(now, row[0]) for row in rows]
+            )
+
+        random.shuffle(rows)
+        return [self._row_to_question(row[1:]) for row in rows]
+
+    def count(
+        self,
+        category: str | None = None,
+        difficulty: DifficultyType | None = None,
+        question_type: QuestionType | None = None,
+        fresh_only: bool = False,
+        limit: int | None = None,
+    ) -> int:
+        """Count cached questions matching the filters
+
+        Args:
+            category (str | None, optional): The category name. Defaults to None.
+            difficulty (DifficultyType | None, optional): The difficulty. Defaults to None.
+            question_type (QuestionType | None, optional): The question type. Defaults to None.
+            fresh_only (bool, optional): Only count questions not served within reuse_after. Defaults to False.
+            limit (int | None, optional): Stop counting at this number, which is cheaper than counting
+                every match. Defaults to None.
+
+        Returns:
+            int: The number of matching questions, at most `limit`
+        """
+        served_before: float | None = time.time() - self.reuse_after if fresh_only else None
+        where, params = self._build_filter(category, difficulty, question_type, served_before)
+        query: str = f"SELECT COUNT(*) FROM questions {where}"  # noqa: S608
+        if limit is not None:
+            query = f"SELECT COUNT(*) FROM (SELECT 1 FROM questions {where} LIMIT ?)"  # noqa: S608
+            params.append(limit)
+
+        with self._lock:
+            row = self._connection.execute(query, params).fetchone()
+
+        return cast(int, row[0])
+
+    def close(self) -> None:
+        """Close the database connection"""
+        self._connection.close()
+
+    def __enter__(self) -> "QuestionCache":
+        """Enter context manager
+
+        Returns:
+            QuestionCache: The cache instance
+        """
+        return self
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc_val: BaseException | None, exc_tb: types.TracebackType | None
+    ) -> None:
+        """Close the database when exiting the context manager.
+
+        Args:
+            exc_type: The type of the exception that was raised
+            exc_val: The instance of the exception that was raised
+            exc_tb: The traceback of the exception that was raised
+
+        Returns:
+            None
+        """
+        self.close()
@@ -0,0 +1,161 @@
+"""Module for the cached index of available question counts."""
+
+import contextlib
+import json
+import threading
+from collections.abc import Callable
+from pathlib import Path
+
+from trivia_game.exceptions import TriviaAPIError
+from trivia_game.models import GameSettings
+from trivia_game.trivia_api import TriviaAPIClient
+
+
+class QuestionCountIndex:
+    """Cached number of questions per category and difficulty
+
+    Counts come from the API count endpoint and are kept in a JSON file, so a selection
+    that cannot fill a game is known before any questions request is sent. Lookups never
+    touch the network, unknown counts are reported as None.
+
+    Args:
+        api_client (TriviaAPIClient): The client used to fetch counts and to read its cache
+        path (Path | str | None, optional): JSON file the counts are kept in. Defaults to None.
+    """
+
+    def __init__(self, api_client: TriviaAPIClient, path: Path | str | None = None) -> None:
+        """Create the index and load previously stored counts
+
+        Args:
+            api_client (TriviaAPIClient): The client used to fetch counts and to read its cache
+            path (Path | str | None, optional): JSON file the counts are kept in. Defaults to None.
+
+        Returns:
+            None
+        """
+        self.api_client = api_client
+        self.path: Path | None = Path(path) if path is not None else None
+        self._lock = threading.Lock()
+        self._counts: dict[str, dict[str, int]] = self._load()
+
+    def _load(self) -> dict[str, dict[str, int]]:
+        """Load stored counts from the JSON file
+
+        Returns:
+            dict[str, dict[str, int]]: The counts keyed by category ID
+        """
+        if self.path is None or not self.path.exists():
+            return {}
+
+        try:
+            with self.path.open() as f:
+                return dict(json.load(f))
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self) -> None:
+        """Write the counts to the JSON file"""
+        if self.path is None:
+            return
+
+        with self.path.open("w") as f:
+            json.dump(self._counts, f, indent=2)
+
+    def is_known(self, category: str) -> bool:
+        """Check whether the counts of a category are in the index
+
+        Args:
+            category (str): The category ID
+
+        Returns:
+            bool: True if the counts are known
+        """
+        with self._lock:
+            return category in self._counts
+
+    def refresh(self, category: str) -> dict[str, int]:
+        """Fetch the counts of a category from the API and store them
+
+        Args:
+            category (str): The category ID
+
+        Raises:
+            TriviaAPIError: If the request fails
+
+        Returns:
+            dict[str, int]: The counts keyed by "total", "easy", "medium" and "hard"
+        """
+        counts: dict[str, int] = self.api_client.fetch_question_count(category)
+
+        with self._lock:
+            self._counts[category] = counts
+            self._save()
+
+        return counts
+
+    def refresh_in_background(
+        self, category: str, on_done: Callable[[], None] | None = None
+    ) -> threading.Thread | None:
+        """Fetch the counts of a category in a background thread unless they are known
+
+        Args:
+            category (str): The category ID
+            on_done (Callable[[], None] | None, optional): Called from the thread once the request
+                finished, whether it succeeded or not. Defaults to None.
+
+        Returns:
+            threading.Thread | None: The started daemon thread, or None if the counts are known
+        """
+        if self.is_known(category):
+            return None
+
+        def refresh() -> None:
+            with contextlib.suppress(TriviaAPIError):
+                self.refresh(category)
+            if on_done is not None:
+                on_done()
+
+        thread: threading.Thread = threading.Thread(target=refresh, name="question-count-refresh", daemon=True)
+        thread.start()
+        return thread
+
+    def max_available(self, settings: GameSettings) -> int | None:
+        """Get how many questions can be served for the settings
+
+        The API count does not distinguish question types, so with a type selected it is
+        an upper bound. Until the API count of the category is known, the questions in the
+        local cache are used instead, since those can always be served.
+
+        Args:
+            settings (GameSettings): The question filters
+
+        Returns:
+            int | None: The number of available questions, or None if unknown
+        """
+        if settings.category is None:
+            return None
+
+        with self._lock:
+            counts: dict[str, int] | None = self._counts.get(settings.category)
+
+        key: str = settings.difficulty or "total"
+        if counts is not None and key in counts:
+            return counts[key]
+
+        return self._cached_count(settings) or None
+
+    def _cached_count(self, settings: GameSettings) -> int:
+        """Count the cached questions matching the settings
+
+        Args:
+            settings (GameSettings): The question filters, with a category ID
+
+        Returns:
+            int: The number of cached questions, 0 without a cache or a known category name
+        """
+        cache = self.api_client.cache
+        category_name: str | None = self.api_client.get_category_name(settings.category)
+        if cache is None or category_name is None:
+            return 0
+
+        return cache.count(category_name, settings.difficulty, settings.question_type)
@@ -0,0 +1,524 @@
+"""Module for streaming the questions of a game."""
+
+import threading
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Iterable
+from typing import TYPE_CHECKING, Self, cast
+
+from trivia_game.corpus_file import CorpusFile
+from trivia_game.exceptions import NoResultsError
+from trivia_game.models import DifficultyType, GameSettings, Question, QuestionType
+from trivia_game.question_bank import QuestionBank
+from trivia_game.question_cache import QuestionCache
+from trivia_game.trivia_api import TriviaAPIClient
+
+if TYPE_CHECKING:
+    from trivia_game.async_trivia_api import AsyncTriviaAPIClient
+
+
+class _BufferedSource:
+    """Deque of questions shared by the blocking and the asyncio source
+
+    Args:
+        questions (Iterable[Question], optional): Questions served before the first refill. Defaults to ().
+        limit (int | None, optional): Number of questions to serve in total, None for no limit.
+            Defaults to None.
+        batch_size (int, optional): Number of questions requested per refill. Defaults to 10.
+    """
+
+    def __init__(self, questions: Iterable[Question] = (), limit: int | None = None, batch_size: int = 10) -> None:
+        """Create the source
+
+        Args:
+            questions (Iterable[Question], optional): Questions served before the first refill. Defaults to ().
+            limit (int | None, optional): Number of questions to serve in total, None for no limit.
+                Defaults to None.
+            batch_size (int, optional): Number of questions requested per refill. Defaults to 10.
+
+        Returns:
+            None
+        """
+        self.limit = limit
+        self.batch_size = batch_size
+        self.served: int = 0
+        self._buffer: deque[Question] = deque(questions)
+        self._drained: bool = False
+
+    def __len__(self) -> int:
+        """Get the number of questions ready without a refill
+
+        Returns:
+            int: The number of buffered questions, capped by the limit
+        """
+        return len(self._buffer) if self.limit is None else min(len(self._buffer), self.limit - self.served)
+
+    @property
+    def exhausted(self) -> bool:
+        """Check whether the source will serve no more questions
+
+        Returns:
+            bool: True once the limit is reached, or the buffer is empty and the last refill came back empty
+        """
+        return (self.limit is not None and self.served >= self.limit) or (self._drained and not self._buffer)
+
+    def extend(self, questions: Iterable[Question]) -> None:
+        """Add questions after the buffered ones
+
+        Args:
+            questions (Iterable[Question]): The questions
+
+        Returns:
+            None
+        """
+        self._buffer.extend(questions)
+
+    def stop(self) -> None:
+        """Stop serving questions and drop the buffered ones
+
+        Returns:
+            None
+        """
+        self._drained = True
+        self._buffer.clear()
+
+    def _refill_amount(self) -> int:
+        """Get how many questions the next refill should request
+
+        Returns:
+            int: The batch size, or fewer when the limit is closer
+        """
+        return self.batch_size if self.limit is None else min(self.batch_size, self.limit - self.served)
+
+    def _store_refill(self, batch: list[Question]) -> None:
+        """Buffer a refilled batch, an empty batch marks the source as drained
+
+        Args:
+            batch (list[Question]): The questions returned by the refill
+
+        Returns:
+            None
+        """
+        self._drained = not batch
+        self._buffer.extend(batch)
+
+    def _take(self) -> Question:
+        """Serve the next buffered question, the buffer must not be empty
+
+        Returns:
+            Question: The question
+        """
+        self.served += 1
+        return self._buffer.popleft()
+
+
+class QuestionSource(_BufferedSource):
+    """Iterator over the questions of a game, refilled in batches as it drains
+
+    Questions are taken from the left of a deque, so serving one is O(1). When the
+    buffer runs empty the source calls `refill` with the number of questions it
+    wants, so a long or endless game only holds one batch at a time. The iterator
+    stops when `limit` questions were served, or when a refill returns no questions.
+    Refill errors are raised from next().
+
+    Args:
+        questions (Iterable[Question], optional): Questions served before the first refill. Defaults to ().
+        refill (Callable[[int], list[Question]] | None, optional): Returns up to the given number of
+            questions, None serves the initial questions only. Defaults to None.
+        limit (int | None, optional): Number of questions to serve in total, None for no limit.
+            Defaults to None.
+        batch_size (int, optional): Number of questions requested per refill. Defaults to 10.
+    """
+
+    def __init__(
+        self,
+        questions: Iterable[Question] = (),
+        refill: Callable[[int], list[Question]] | None = None,
+        limit: int | None = None,
+        batch_size: int = 10,
+    ) -> None:
+        """Create the source
+
+        Args:
+            questions (Iterable[Question], optional): Questions served before the first refill. Defaults to ().
+            refill (Callable[[int], list[Question]] | None, optional): Returns up to the given number of
+                questions. Defaults to None.
+            limit (int | None, optional): Number of questions to serve in total, None for no limit.
+                Defaults to None.
+            batch_size (int, optional): Number of questions requested per refill. Defaults to 10.
+
+        Returns:
+            None
+        """
+        super().__init__(questions, limit, batch_size)
+        self.refill = refill
+        self._drained = refill is None
+
+    @classmethod
+    def from_api(
+        cls,
+        api_client: TriviaAPIClient,
+        settings: GameSettings,
+        questions: Iterable[Question] = (),
+        limit: int | None = None,
+        batch_size: int = 10,
+        use_cache: bool = True,
+    ) -> Self:
+        """Create a source fetching its batches with an API client
+
+        Batches go through the client, so they respect its rate limiter and are taken
+        from its cache when it holds enough questions that were not served recently,
+        with the API topping it up in the background. Without the cache every batch is
+        fetched with the client's session token, so no question repeats until the API
+        has none left. The source ends when the settings have no questions left.
+
+        Args:
+            api_client (TriviaAPIClient): The client used to fetch questions
+            settings (GameSettings): The filters of the game, with a category ID
+            questions (Iterable[Question], optional): Questions served before the first refill. Defaults to ().
+            limit (int | None, optional): Number of questions to serve in total. Defaults to None.
+            batch_size (int, optional): Number of questions requested per refill. Defaults to 10.
+            use_cache (bool, optional): Whether cached questions may be served. Defaults to True.
+
+        Returns:
+            Self: The source
+        """
+
+        def refill(amount: int) -> list[Question]:
+            try:
+                return api_client.fetch_questions(
+                    amount=amount,
+                    category=settings.category,
+                    difficulty=settings.difficulty,
+                    question_type=settings.question_type,
+                    use_cache=use_cache,
+                )
+            except NoResultsError:
+                return []
+
+        return cls(questions, refill, limit, batch_size)
+
+    @classmethod
+    def from_cache(
+        cls,
+        cache: QuestionCache,
+        category: str | None = None,
+        difficulty: DifficultyType | None = None,
+        question_type: QuestionType | None = None,
+        limit: int | None = None,
+        batch_size: int = 10,
+    ) -> Self:
+        """Create a source drawing random batches from a question cache
+
+        Args:
+            cache (QuestionCache): The cache or harvested corpus
+            category (str | None, optional): The category name. Defaults to None.
+            difficulty (DifficultyType | None, optional): The difficulty. Defaults to None.
+            question_type (QuestionType | None, optional): The question type. Defaults to None.
+            limit (int | None, optional): Number of questions to serve in total. Defaults to None.
+            batch_size (int, optional): Number of questions requested per refill. Defaults to 10.
+
+        Returns:
+            Self: The source, batches may repeat questions of earlier ones
+        """
+        return cls(
+            refill=lambda amount: cache.get_questions(amount, category, difficulty, question_type),
+            limit=limit,
+            batch_size=batch_size,
+        )
+
+    @classmethod
+    def from_corpus(
+        cls,
+        corpus: QuestionBank | CorpusFile,
+        category: str | None = None,
+        difficulty: DifficultyType | None = None,
+        question_type: QuestionType | None = None,
+        limit: int | None = None,
+        batch_size: int = 10,
+    ) -> Self:
+        """Create a source drawing random batches from an in-memory or memory-mapped corpus
+
+        Args:
+            corpus (QuestionBank | CorpusFile): The corpus
+            category (str | None, optional): The category name. Defaults to None.
+            difficulty (DifficultyType | None, optional): The difficulty. Defaults to None.
+            question_type (QuestionType | None, optional): The question type. Defaults to None.
+            limit (int | None, optional): Number of questions to serve in total. Defaults to None.
+            batch_size (int, optional): Number of questions requested per refill. Defaults to 10.
+
+        Returns:
+            Self: The source, batches may repeat questions of earlier ones
+        """
+        return cls(
+            refill=lambda amount: corpus.sample(amount, category, difficulty, question_type),
+            limit=limit,
+            batch_size=batch_size,
+        )
+
+    def __iter__(self) -> Self:
+        """Get the iterator
+
+        Returns:
+            Self: The source itself
+        """
+        return self
+
+    def __next__(self) -> Question:
+        """Serve the next question, refilling the buffer if it is empty
+
+        Raises:
+            StopIteration: If the limit is reached or the source has no questions left
+
+        Returns:
+            Question: The question
+        """
+        if self.limit is not None and self.served >= self.limit:
+            raise StopIteration
+        if not self._buffer and not self._drained and self.refill is not None:
+            self._store_refill(self.refill(self._refill_amount()))
+        if not self._buffer:
+            raise StopIteration
+        return self._take()
+
+
+class BackgroundQuestionSource(QuestionSource):
+    """QuestionSource refilled on a worker thread ahead of demand
+
+    Once started, the worker keeps more than `low_water` questions buffered, so the
+    next question is ready when it is asked for and a game does not stall between
+    questions. next() only waits when the player outpaces the refills. If the buffer
+    runs empty after a failed refill, the error is raised from next(), and the worker
+    retries after `retry_delay` seconds.
+
+    Args:
+        questions (Iterable[Question], optional): Questions served before the first refill. Defaults to ().
+        refill (Callable[[int], list[Question]] | None, optional): Returns up to the given number of
+            questions, it is only called on the worker thread. Defaults to None.
+        limit (int | None, optional): Number of questions to serve in total, None for no limit.
+            Defaults to None.
+        batch_size (int, optional): Number of questions requested per refill. Defaults to 10.
+        low_water (int | None, optional): Buffered questions at or below which the worker refills.
+            Defaults to batch_size.
+        retry_delay (float, optional): Seconds to wait after a failed refill. Defaults to 5.0.
+    """
+
+    def __init__(
+        self,
+        questions: Iterable[Question] = (),
+        refill: Callable[[int], list[Question]] | None = None,
+        limit: int | None = None,
+        batch_size: int = 10,
+        low_water: int | None = None,
+        retry_delay: float = 5.0,
+    ) -> None:
+        """Create the source, the worker starts with start() or the first next() call
+
+        Args:
+            questions (Iterable[Question], optional): Questions served before the first refill. Defaults to ().
+            refill (Callable[[int], list[Question]] | None, optional): Returns up to the given number of
+                questions. Defaults to None.
+            limit (int | None, optional): Number of questions to serve in total, None for no limit.
+                Defaults to None.
+            batch_size (int, optional): Number of questions requested per refill. Defaults to 10.
+            low_water (int | None, optional): Buffered questions at or below which the worker refills.
+                Defaults to batch_size.
+            retry_delay (float, optional): Seconds to wait after a failed refill. Defaults to 5.0.
+
+        Returns:
+            None
+        """
+        super().__init__(questions, refill, limit, batch_size)
+        self.low_water: int = batch_size if low_water is None else low_water
+        self.retry_delay = retry_delay
+        self.wait_seconds: float = 0.0
+        self._condition = threading.Condition()
+        self._stopped: bool = False
+        self._error: Exception | None = None
+        self._worker: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Start topping up the buffer in the background
+
+        Returns:
+            None
+        """
+        with self._condition:
+            if not self._stopped and (self._worker is None or not self._worker.is_alive()):
+                self._worker = threading.Thread(target=self._run, name="question-refill", daemon=True)
+                self._worker.start()
+
+    def stop(self) -> None:
+        """Stop the worker and drop the buffered questions
+
+        Returns:
+            None
+        """
+        with self._condition:
+            self._stopped = True
+            super().stop()
+            self._condition.notify_all()
+
+    def _wanted(self) -> int:
+        """Get how many questions the worker should request now. The lock must be held.
+
+        Returns:
+            int: The number of questions, 0 while the buffer is above the low-water mark
+        """
+        if self._stopped or self._drained or self.refill is None or len(self._buffer) > self.low_water:
+            return 0
+        if self.limit is None:
+            return self.batch_size
+        return max(0, min(self.batch_size, self.limit - self.served - len(self._buffer)))
+
+    def _run(self) -> None:
+        """Worker loop refilling the buffer until the source stops or drains"""
+        while True:
+            with self._condition:
+                while not self._stopped and (amount := self._wanted()) == 0:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                refill: Callable[[int], list[Question]] = cast(Callable[[int], list[Question]], self.refill)
+
+            try:
+                batch: list[Question] = refill(amount)
+            except Exception as e:
+                with self._condition:
+                    self._error = e
+                    self._condition.notify_all()
+                    self._condition.wait(self.retry_delay)
+                continue
+
+            with self._condition:
+                if not self._stopped:
+                    self._error = None
+                    self._store_refill(batch)
+                    self._condition.notify_all()
+
+    def __next__(self) -> Question:
+        """Serve the next question, waiting for the worker if the buffer is empty
+
+        Raises:
+            StopIteration: If the limit is reached or the source has no questions left
+            TriviaAPIError: The error of the last refill, if it left the buffer empty
+
+        Returns:
+            Question: The question
+        """
+        self.start()
+        with self._condition:
+            if self.limit is not None and self.served >= self.limit:
+                raise StopIteration
+
+            started: float = time.perf_counter()
+            while not self._buffer and not self._drained and self._error is None:
+                self._condition.wait()
+            self.wait_seconds += time.perf_counter() - started
+
+            if not self._buffer:
+                if (error := self._error) is not None:
+                    self._error = None
+                    raise error
+                raise StopIteration
+
+            question: Question = self._take()
+            self._condition.notify_all()
+            return question
+
+
+class AsyncQuestionSource(_BufferedSource):
+    """Async iterator over the questions of a game, see QuestionSource
+
+    Args:
+        questions (Iterable[Question], optional): Questions served before the first refill. Defaults to ().
+        refill (Callable[[int], Awaitable[list[Question]]] | None, optional): Returns up to the given number
+            of questions, None serves the initial questions only. Defaults to None.
+        limit (int | None, optional): Number of questions to serve in total, None for no limit.
+            Defaults to None.
+        batch_size (int, optional): Number of questions requested per refill. Defaults to 10.
+    """
+
+    def __init__(
+        self,
+        questions: Iterable[Question] = (),
+        refill: Callable[[int], Awaitable[list[Question]]] | None = None,
+        limit: int | None = None,
+        batch_size: int = 10,
+    ) -> None:
+        """Create the source
+
+        Args:
+            questions (Iterable[Question], optional): Questions served before the first refill. Defaults to ().
+            refill (Callable[[int], Awaitable[list[Question]]] | None, optional): Returns up to the given
+                number of questions. Defaults to None.
+            limit (int | None, optional): Number of questions to serve in total, None for no limit.
+                Defaults to None.
+            batch_size (int, optional): Number of questions requested per refill. Defaults to 10.
+
+        Returns:
+            None
+        """
+        super().__init__(questions, limit, batch_size)
+        self.refill = refill
+        self._drained = refill is None
+
+    @classmethod
+    def from_api(
+        cls,
+        api_client: "AsyncTriviaAPIClient",
+        settings: GameSettings,
+        questions: Iterable[Question] = (),
+        limit: int | None = None,
+        batch_size: int = 10,
+    ) -> "AsyncQuestionSource":
+        """Create a source fetching its batches with an asyncio API client
+
+        Args:
+            api_client (AsyncTriviaAPIClient): The client used to fetch questions
+            settings (GameSettings): The filters of the game, with a category ID
+            questions (Iterable[Question], optional): Questions served before the first refill. Defaults to ().
+            limit (int | None, optional): Number of questions to serve in total. Defaults to None.
+            batch_size (int, optional): Number of questions requested per refill. Defaults to 10.
+
+        Returns:
+            AsyncQuestionSource: The source, it ends when the settings have no questions left
+        """
+
+        async def refill(amount: int) -> list[Question]:
+            try:
+                return await api_client.fetch_questions(
+                    amount=amount,
+                    category=settings.category,
+                    difficulty=settings.difficulty,
+                    question_type=settings.question_type,
+                )
+            except NoResultsError:
+                return []
+
+        return cls(questions, refill, limit, batch_size)
+
+    def __aiter__(self) -> "AsyncQuestionSource":
+        """Get the async iterator
+
+        Returns:
+            AsyncQuestionSource: The source itself
+        """
+        return self
+
+    async def __anext__(self) -> Question:
+        """Serve the next question, refilling the buffer if it is empty
+
+        Raises:
+            StopAsyncIteration: If the limit is reached or the source has no questions left
+
+        Returns:
+            Question: The question
+        """
+        if self.limit is not None and self.served >= self.limit:
+            raise StopAsyncIteration
+        if not self._buffer and not self._drained and self.refill is not None:
+            self._store_refill(await self.refill(self._refill_amount()))
+        if not self._buffer:
+            raise StopAsyncIteration
+        return self._take()
@@ -1,11 +1,26 @@
-import json
+import os
+import threading
+import time
+from collections.abc import Callable
 from datetime import datetime
 from pathlib import Path
 from typing import ClassVar, Literal
 
 from trivia_game.base_types import AppControllerProtocol, TriviaGameProtocol
+from trivia_game.circuit_breaker import CircuitBreaker
+from trivia_game.engine import GameEngine, GameError, GameEvent, GameSession, QuestionShown
 from trivia_game.exceptions import CategoryError
-from trivia_game.models import Question, ScoreboardEntry
+from trivia_game.metrics import MetricsRegistry
+from trivia_game.metrics_export import MetricsServer, TextfileWriter, start_exporters
+from trivia_game.models import GameSettings, Question, ScoreboardEntry
+from trivia_game.prefetch import QuestionPrefetcher
+from trivia_game.question_cache import QuestionCache
+from trivia_game.question_counts import QuestionCountIndex
+from trivia_game.question_source import QuestionSource
+from trivia_game.rate_limiter import RateLimiter
+from trivia_game.scoreboard import add_score
+from trivia_game.token_store import TokenStore
+from trivia_game.transport import Transport
 from trivia_game.trivia_api import TriviaAPIClient
 from trivia_game.view.dialogs.score_dialog import ScoreDialog
 
@@ -18,35 +33,233 @@ class QuizBrain(TriviaGameProtocol):
         "True / False": "boolean",
     }
 
-    DIFFICULTY_MULTIPLIER: ClassVar[dict[str, int]] = {"easy": 1, "medium": 2, "hard": 3}
+    DIFFICULTY_MULTIPLIER: ClassVar[dict[str, int]] = GameEngine.DIFFICULTY_MULTIPLIER
 
-    def __init__(self, controller: AppControllerProtocol) -> None:
+    QUESTIONS_PER_GAME: ClassVar[int] = GameEngine.QUESTIONS_PER_GAME
+
+    SLOW_REQUEST_SECONDS: ClassVar[float] = 5.0
+
+    ENDLESS_MISS_LIMIT: ClassVar[int] = GameEngine.ENDLESS_MISS_LIMIT
+
+    def __init__(
+        self,
+        controller: AppControllerProtocol,
+        prefetch_depth: int = 2,
+        data_dir: Path = Path(),
+        api_client: TriviaAPIClient | None = None,
+    ) -> None:
         """Create the quiz brain object
 
+        The game itself runs in a GameSession of a GameEngine, the quiz brain turns its
+        events into frames and error messages and keeps the scoreboard.
+
         Args:
             controller (AppControllerProtocol): The main application controller
+            prefetch_depth (int, optional): Question batches to prepare for the next game, 0 disables
+                prefetching. Defaults to 2.
+            data_dir (Path, optional): Directory of the question cache, session token and question
+                count files. Defaults to the working directory.
+            api_client (TriviaAPIClient | None, optional): The API client to use instead of one backed
+                by the files in `data_dir`, the game records its metrics in the client's registry.
+                Defaults to None.
 
         Attributes:
         controller (AppControllerProtocol): The main application controller
-        api_client (TriviaAPIClient): The API client
+        metrics (MetricsRegistry): Game and API timings and counters, exported when TRIVIA_METRICS_PORT
+            or TRIVIA_METRICS_TEXTFILE is set, see trivia_game.metrics_export.start_exporters
+        exporters (list[MetricsServer | TextfileWriter]): The running metrics exporters
+        engine (GameEngine): The game engine, holding the API client, prefetcher and count index
+        session (GameSession): The game session shown by the app
+        api_client (TriviaAPIClient): The API client, backed by the local question cache. Set
+            TRIVIA_API_BASE_URL to send its requests to another server, e.g. trivia_game.local_server.
+            Three failed or slow requests in a row open its circuit breaker, games are then served
+            from the cache while the API is probed in the background.
+        prefetcher (QuestionPrefetcher): Prepares question batches for the next game in the background
+        count_index (QuestionCountIndex): Cached number of questions per category and difficulty
         categories (dict[str, str]): The trivia categories
-        current_question (Question | None): The current question
-        questions (list[Question]): The list of questions for the current game
-        score (int): The current score
+        current_question (Question | None): The current question of the session
+        questions (QuestionSource): The remaining questions of the session
+        score (int): The score of the session
+        endless (bool): Whether the session runs until the player misses ENDLESS_MISS_LIMIT in a row
+        misses_in_a_row (int): Consecutive wrong answers in the session
         TYPE_MAPPING (ClassVar[dict[str, str | None]]): Mapping of question types to API-compatible values
         DIFFICULTY_MULTIPLIER (ClassVar[dict[str, int]]): Difficulty level multipliers
+        QUESTIONS_PER_GAME (ClassVar[int]): Number of questions in a game
+        SLOW_REQUEST_SECONDS (ClassVar[float]): API response time treated as a failure by the circuit breaker
+        ENDLESS_MISS_LIMIT (ClassVar[int]): Consecutive wrong answers that end an endless game
         """
 
         self.controller: AppControllerProtocol = controller
-        self.api_client: TriviaAPIClient = TriviaAPIClient()
+        self.metrics: MetricsRegistry = api_client.metrics if api_client is not None else MetricsRegistry()
+        self.exporters: list[MetricsServer | TextfileWriter] = start_exporters(self.metrics)
+        if api_client is None:
+            api_client = TriviaAPIClient(
+                cache=QuestionCache(data_dir / "questions.db"),
+                token_store=TokenStore(data_dir / "session_token.json"),
+                rate_limiter=RateLimiter(),
+                base_url=os.environ.get("TRIVIA_API_BASE_URL"),
+                transport=Transport.shared(),
+                metrics=self.metrics,
+                circuit_breaker=CircuitBreaker(slow_call_threshold=self.SLOW_REQUEST_SECONDS),
+            )
+        api_client.prefetch_session_token()
+        self.engine: GameEngine = GameEngine(
+            api_client,
+            prefetcher=QuestionPrefetcher(api_client, depth=prefetch_depth, batch_size=self.QUESTIONS_PER_GAME),
+            count_index=QuestionCountIndex(api_client, data_dir / "question_counts.json"),
+            metrics=self.metrics,
+        )
+        self.session: GameSession = self.engine.create_session(self._on_event)
+        self._start_thread: threading.Thread | None = None
 
         self.categories: dict[str, str] = {}
-        self.current_question: Question | None = None
-        self.questions: list[Question] = []
-        self.score: int = 0
 
         self._load_categories()
 
+    @property
+    def api_client(self) -> TriviaAPIClient:
+        """Get the API client shared with the engine
+
+        Returns:
+            TriviaAPIClient: The API client shared with the engine
+        """
+        return self.engine.api_client
+
+    @api_client.setter
+    def api_client(self, value: TriviaAPIClient) -> None:
+        """Set the API client shared with the engine
+
+        Args:
+            value (TriviaAPIClient): The API client shared with the engine
+        """
+        self.engine.api_client = value
+
+    @property
+    def prefetcher(self) -> QuestionPrefetcher:
+        """Get the prefetcher of the engine
+
+        Returns:
+            QuestionPrefetcher: The prefetcher of the engine
+        """
+        return self.engine.prefetcher
+
+    @prefetcher.setter
+    def prefetcher(self, value: QuestionPrefetcher) -> None:
+        """Set the prefetcher of the engine
+
+        Args:
+            value (QuestionPrefetcher): The prefetcher of the engine
+        """
+        self.engine.prefetcher = value
+
+    @property
+    def count_index(self) -> QuestionCountIndex:
+        """Get the question count index of the engine
+
+        Returns:
+            QuestionCountIndex: The question count index of the engine
+        """
+        return self.engine.count_index
+
+    @count_index.setter
+    def count_index(self, value: QuestionCountIndex) -> None:
+        """Set the question count index of the engine
+
+        Args:
+            value (QuestionCountIndex): The question count index of the engine
+        """
+        self.engine.count_index = value
+
+    @property
+    def current_question(self) -> Question | None:
+        """Get the current question of the session
+
+        Returns:
+            Question | None: The current question of the session
+        """
+        return self.session.current_question
+
+    @current_question.setter
+    def current_question(self, value: Question | None) -> None:
+        """Set the current question of the session
+
+        Args:
+            value (Question | None): The current question of the session
+        """
+        self.session.current_question = value
+
+    @property
+    def questions(self) -> QuestionSource:
+        """Get the remaining questions of the session
+
+        Returns:
+            QuestionSource: The remaining questions of the session
+        """
+        return self.session.questions
+
+    @questions.setter
+    def questions(self, value: QuestionSource) -> None:
+        """Set the remaining questions of the session
+
+        Args:
+            value (QuestionSource): The remaining questions of the session
+        """
+        self.session.questions = value
+
+    @property
+    def score(self) -> int:
+        """Get the score of the session
+
+        Returns:
+            int: The score of the session
+        """
+        return self.session.score
+
+    @score.setter
+    def score(self, value: int) -> None:
+        """Set the score of the session
+
+        Args:
+            value (int): The score of the session
+        """
+        self.session.score = value
+
+    @property
+    def endless(self) -> bool:
+        """Get whether the session is an endless game
+
+        Returns:
+            bool: Whether the session is an endless game
+        """
+        return self.session.endless
+
+    @endless.setter
+    def endless(self, value: bool) -> None:
+        """Set whether the session is an endless game
+
+        Args:
+            value (bool): Whether the session is an endless game
+        """
+        self.session.endless = value
+
+    @property
+    def misses_in_a_row(self) -> int:
+        """Get consecutive wrong answers in the session
+
+        Returns:
+            int: Consecutive wrong answers in the session
+        """
+        return self.session.misses_in_a_row
+
+    @misses_in_a_row.setter
+    def misses_in_a_row(self, value: int) -> None:
+        """Set consecutive wrong answers in the session
+
+        Args:
+            value (int): Consecutive wrong answers in the session
+        """
+        self.session.misses_in_a_row = value
+
     def _load_categories(self) -> None:
         """Load trivia categories from the API"""
         try:
@@ -118,40 +331,78 @@ class QuizBrain(TriviaGameProtocol):
         """
         return self.TYPE_MAPPING[question_type]
 
+    def get_question_limit(
+        self,
+        category: str | None,
+        difficulty: Literal["easy", "medium", "hard"] | None,
+        question_type: Literal["multiple", "boolean"] | None,
+    ) -> int | None:
+        """Get how many questions a game with the selected options can have, without a request
+
+        Args:
+            category (str | None): The category ID or None for 'Any Category'
+            difficulty (Literal["easy", "medium", "hard"] | None): The difficulty level or None for 'Any Difficulty'
+            question_type (Literal["multiple", "boolean"] | None): The question type or None for 'Any Type'
+
+        Returns:
+            int | None: The number of questions, or None if not known yet
+        """
+        return self.engine.question_limit(GameSettings(category, difficulty, question_type))
+
+    def request_question_counts(self, category: str | None, on_loaded: Callable[[], None] | None = None) -> None:
+        """Fetch the question counts of a category in the background if they are not known
+
+        Args:
+            category (str | None): The category ID or None for 'Any Category'
+            on_loaded (Callable[[], None] | None, optional): Called from the background thread once the
+                counts were fetched, not called if they are known already. Defaults to None.
+        """
+        if category:
+            self.count_index.refresh_in_background(category, on_loaded)
+
     def load_questions(
         self,
         category: str | None,
         difficulty: Literal["easy", "medium", "hard"] | None,
         question_type: Literal["multiple", "boolean"] | None,
+        endless: bool = False,
     ) -> None:
-        """Load questions from the API
+        """Start a game with the selected options in a background thread, see GameSession.start
+
+        Fetching the first batch can wait seconds for the rate limiter or the API, so it does
+        not run on the Tk thread. The first question is shown once it arrives, and clicks
+        while a game is starting are ignored.
 
         Args:
             category (str | None): The category ID or None for 'Any Category'
             difficulty (Literal["easy", "medium", "hard"] | None): The difficulty level or None for 'Any Difficulty'
             question_type (Literal["multiple", "boolean"] | None): The question type or None for 'Any Type'
+            endless (bool, optional): Play until too many misses in a row instead of one batch. Defaults to False.
         """
-        try:
-            self.questions = self.api_client.fetch_questions(
-                category=category, difficulty=difficulty, question_type=question_type
-            )
-            self.score = 0
-            self.show_next_question()
-        except Exception as e:
-            msg: str = f"Error loading questions: {e}"
-            self.controller.show_error(msg)
+        if self._start_thread is not None and self._start_thread.is_alive():
+            return
+
+        settings: GameSettings = GameSettings(category, difficulty, question_type)
+        self._start_thread = threading.Thread(
+            target=self._start_game, args=(settings, endless), name="game-start", daemon=True
+        )
+        self._start_thread.start()
+
+    def _start_game(self, settings: GameSettings, endless: bool) -> None:
+        """Start the session, ending the game on the Tk thread if it has no question
+
+        Args:
+            settings (GameSettings): The question filters, with a category ID
+            endless (bool): Play until too many misses in a row instead of one batch
+        """
+        if self.session.start(settings, endless) and self.session.current_question is None:
+            self.controller.after(0, self.end_game)
 
     def show_next_question(self) -> None:
-        """Show next question or end game if no more questions"""
-        if not self.questions:
+        """Show next question or end game if no more questions, see GameSession.next_question"""
+        if self.session.next_question() is None:
             print("No more questions, showing scoreboard")  # TODO: Remove debug print
             self.end_game()
-            return
-
-        self.current_question = self.questions.pop(0)
-        self.controller.show_frame(
-            "TrueFalseQuizFrame" if self.current_question.type == "boolean" else "MultipleChoiceQuizFrame"
-        )
 
     def check_answer(self, selected_answer: str) -> bool:
         """Check if selected answer is correct
@@ -162,14 +413,7 @@ class QuizBrain(TriviaGameProtocol):
         Returns:
             bool: True if correct, False otherwise
         """
-        if not self.current_question:
-            return False
-
-        is_correct: bool = selected_answer == self.current_question.correct_answer
-
-        if is_correct:
-            self.score += self._calculate_score(self.current_question.difficulty)
-        return is_correct
+        return self.session.answer(selected_answer)
 
     def _calculate_score(self, difficulty: str) -> int:
         """Calculate score based on difficulty level
@@ -180,10 +424,43 @@ class QuizBrain(TriviaGameProtocol):
         Returns:
             int: Calculated score
         """
-        return 100 * self.DIFFICULTY_MULTIPLIER[difficulty]
+        return self.engine.score_for(difficulty)
+
+    def _on_event(self, event: GameEvent) -> None:
+        """Show the frame or error message for a game event on the Tk thread
+
+        Games start in a background thread, so the event is handed to Tk with after().
+
+        Args:
+            event (GameEvent): The event sent by the session
+        """
+        self.controller.after(0, self._show_event, event)
+
+    def _show_event(self, event: GameEvent) -> None:
+        """Show the frame or error message for a game event
+
+        Args:
+            event (GameEvent): The event sent by the session
+        """
+        if isinstance(event, QuestionShown):
+            self.controller.show_frame(
+                "TrueFalseQuizFrame" if event.question.type == "boolean" else "MultipleChoiceQuizFrame"
+            )
+        elif isinstance(event, GameError):
+            self.controller.show_error(event.message)
+
+    def close(self) -> None:
+        """Stop the metrics exporters, called when the app exits
+
+        Returns:
+            None
+        """
+        while self.exporters:
+            self.exporters.pop().stop()
 
     def end_game(self) -> None:
         """Handle game completion"""
+        self.session.end()
 
         dialog: ScoreDialog = ScoreDialog(self.controller, self.score)
         if player_name := dialog.get_input():
@@ -196,7 +473,9 @@ class QuizBrain(TriviaGameProtocol):
         """Save score to the scoreboard"""
         entry = ScoreboardEntry(player_name, self.score, date=datetime.now())
         print(entry)  # TODO: Remove debug print
+        started: float = time.perf_counter()
         self._save_to_json(entry)
+        self.metrics.observe("trivia_game_score_save_duration_seconds", time.perf_counter() - started)
 
     def _save_to_json(self, entry: ScoreboardEntry) -> None:
         """Save scoreboard entry to JSON file
@@ -205,24 +484,6 @@ class QuizBrain(TriviaGameProtocol):
             entry (ScoreboardEntry): The scoreboard entry
 
         """
-        scores_file = Path("scores.json")
-        if scores_file.exists():
-            with scores_file.open("r") as f:
-                scores = json.load(f)
-        else:
-            scores = []
-
-        scores.append({
-            "player": entry.player_name,
-            "score": entry.score,
-            "date": entry.date.isoformat(),
-        })
-
-        # Keep only top 10 scores
-        scores.sort(key=lambda x: x["score"], reverse=True)
-        scores = scores[:10]
-
-        with scores_file.open("w") as f:
-            json.dump(scores, f, indent=2)
+        add_score(Path("scores.json"), entry)
 
         print("Score saved")
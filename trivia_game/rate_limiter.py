@@ -0,0 +1,109 @@
+"""Module for client-side rate limiting of API requests."""
+
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import ClassVar
+
+
+@dataclass
+class _Bucket:
+    """State of the token bucket for one host."""
+
+    tokens: float
+    updated_at: float
+
+
+class RateLimiter:
+    """Thread-safe token bucket rate limiter keyed by host
+
+    OpenTDB allows one request every 5 seconds per client. Spacing requests here keeps
+    the server from answering with RATE_LIMIT, so callers queue for a short, predictable
+    time instead of sitting through the retry backoff.
+
+    Attributes:
+        OPENTDB_INTERVAL (ClassVar[float]): Seconds between requests allowed by OpenTDB
+
+    Args:
+        interval (float, optional): Seconds needed to earn one request. Defaults to OPENTDB_INTERVAL.
+        burst (int, optional): Requests that may be sent back to back. Defaults to 1.
+        clock (Callable[[], float], optional): Monotonic clock. Defaults to time.monotonic.
+        sleep (Callable[[float], None], optional): Sleep function. Defaults to time.sleep.
+    """
+
+    OPENTDB_INTERVAL: ClassVar[float] = 5.0
+
+    def __init__(
+        self,
+        interval: float = OPENTDB_INTERVAL,
+        burst: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """Create the rate limiter
+
+        Args:
+            interval (float, optional): Seconds needed to earn one request. Defaults to OPENTDB_INTERVAL.
+            burst (int, optional): Requests that may be sent back to back. Defaults to 1.
+            clock (Callable[[], float], optional): Monotonic clock. Defaults to time.monotonic.
+            sleep (Callable[[float], None], optional): Sleep function. Defaults to time.sleep.
+
+        Returns:
+            None
+        """
+        self.interval = interval
+        self.burst = burst
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._buckets: dict[str, _Bucket] = {}
+
+    def _refill(self, host: str) -> _Bucket:
+        """Get the bucket for a host with the tokens earned since its last update
+
+        Args:
+            host (str): The host the request goes to
+
+        Returns:
+            _Bucket: The refilled bucket
+        """
+        now: float = self._clock()
+        bucket: _Bucket = self._buckets.setdefault(host, _Bucket(tokens=float(self.burst), updated_at=now))
+        earned: float = (now - bucket.updated_at) / self.interval if self.interval else float(self.burst)
+        bucket.tokens = min(float(self.burst), bucket.tokens + earned)
+        bucket.updated_at = now
+        return bucket
+
+    def wait_time(self, host: str) -> float:
+        """Get how long a request to the host would wait if sent now
+
+        Args:
+            host (str): The host the request goes to
+
+        Returns:
+            float: The wait in seconds, 0 if the request can be sent immediately
+        """
+        with self._lock:
+            bucket: _Bucket = self._refill(host)
+            return max(0.0, (1 - bucket.tokens) * self.interval)
+
+    def acquire(self, host: str) -> float:
+        """Reserve the next request slot for the host and wait for it
+
+        The slot is reserved before sleeping, so concurrent callers queue up in order.
+
+        Args:
+            host (str): The host the request goes to
+
+        Returns:
+            float: The time waited in seconds
+        """
+        with self._lock:
+            bucket: _Bucket = self._refill(host)
+            delay: float = max(0.0, (1 - bucket.tokens) * self.interval)
+            bucket.tokens -= 1
+
+        if delay:
+            self._sleep(delay)
+        return delay
@@ -0,0 +1,51 @@
+"""Module for the JSON scoreboard file."""
+
+import json
+from pathlib import Path
+from typing import Any
+
+from trivia_game.models import ScoreboardEntry
+
+SCOREBOARD_SIZE: int = 10
+
+
+def load_scores(path: Path) -> list[dict[str, Any]]:
+    """Read the scoreboard
+
+    Args:
+        path (Path): The scoreboard file
+
+    Returns:
+        list[dict[str, Any]]: The entries with player, score and date, best first, empty if there is no file
+    """
+    if not path.exists():
+        return []
+
+    with path.open("r") as f:
+        scores: list[dict[str, Any]] = json.load(f)
+    return scores
+
+
+def add_score(path: Path, entry: ScoreboardEntry) -> list[dict[str, Any]]:
+    """Add an entry to the scoreboard, keeping the SCOREBOARD_SIZE best scores
+
+    Args:
+        path (Path): The scoreboard file
+        entry (ScoreboardEntry): The scoreboard entry
+
+    Returns:
+        list[dict[str, Any]]: The saved entries, best first
+    """
+    scores: list[dict[str, Any]] = load_scores(path)
+    scores.append({
+        "player": entry.player_name,
+        "score": entry.score,
+        "date": entry.date.isoformat(),
+    })
+
+    scores.sort(key=lambda x: x["score"], reverse=True)
+    scores = scores[:SCOREBOARD_SIZE]
+
+    with path.open("w") as f:
+        json.dump(scores, f, indent=2)
+    return scores
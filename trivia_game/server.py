@@ -0,0 +1,658 @@
+"""Asyncio JSON HTTP server running games of a GameEngine for many players.
+
+Run it with ``python -m trivia_game.server`` and point browser kiosks at it. All
+sessions share the engine's API client, so one question cache, session token and
+rate limiter serve every player. Endpoints, bodies and responses are JSON:
+
+- ``GET /categories``: the category names and the difficulty and type values
+- ``POST /sessions``: create a session, returns its ID
+- ``POST /sessions/{id}/game``: start a game, with optional ``category`` (a name),
+  ``difficulty``, ``type`` and ``endless``
+- ``POST /sessions/{id}/next``: show the next question, or end the game
+- ``POST /sessions/{id}/answer``: answer the current question, with ``answer``
+- ``POST /sessions/{id}/score``: save the score of a finished game, with ``player``
+- ``DELETE /sessions/{id}``: end the game and forget the session
+- ``GET /scores``: the scoreboard
+
+Game responses carry the session state and the events the request caused. Correct
+answers are only sent once the question is answered. Requests of one session are
+handled one at a time. Sessions without a request for ``session_ttl`` seconds are closed.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import random
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from http import HTTPStatus
+from pathlib import Path
+from typing import Any, ClassVar, TypeVar, get_args
+
+from trivia_game.circuit_breaker import CircuitBreaker
+from trivia_game.engine import (
+    AnswerChecked,
+    GameEngine,
+    GameEvent,
+    GameOver,
+    GameSession,
+    QuestionShown,
+)
+from trivia_game.exceptions import CategoryError
+from trivia_game.metrics import MetricsRegistry
+from trivia_game.metrics_export import MetricsServer, TextfileWriter, start_exporters
+from trivia_game.models import DifficultyType, GameSettings, QuestionType, ScoreboardEntry
+from trivia_game.question_cache import QuestionCache
+from trivia_game.question_counts import QuestionCountIndex
+from trivia_game.rate_limiter import RateLimiter
+from trivia_game.scoreboard import add_score, load_scores
+from trivia_game.token_store import TokenStore
+from trivia_game.transport import Transport
+from trivia_game.trivia_api import TriviaAPIClient
+
+T = TypeVar("T")
+Response = tuple[int, dict[str, Any]]
+
+
+@dataclass(slots=True)
+class _SessionState:
+    """Server-side bookkeeping of one session.
+
+    The lock is held while a request of the session is handled, so requests of one
+    session run one after the other even when a start waits for the API.
+    """
+
+    events: list[GameEvent] = field(default_factory=list)
+    last_seen: float = field(default_factory=time.monotonic)
+    started: bool = False
+    score_saved: bool = False
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+class GameServer:
+    """HTTP/1.1 server with keep-alive, running on one asyncio event loop
+
+    Requests are handled on the loop, so one server uses one core. Calls that may wait
+    for the upstream API or the disk, starting a game, drawing a question of an endless
+    game and the scoreboard, run in an executor of the server's own. Its thread count is
+    bounded, so a burst of starts queues up instead of taking every thread of the loop's
+    default executor. Request durations are recorded in
+    `trivia_game_server_request_duration_seconds` by route and status, and requests
+    failing unexpectedly are answered with 500.
+
+    Requests of one session are handled one at a time, in the order they arrive, so an
+    answer sent while the game is still starting waits for its first question.
+    Sessions without a request for `session_ttl` seconds are closed, which stops the
+    refills of an abandoned endless game.
+
+    Attributes:
+        ROUTES (ClassVar[dict[tuple[str, str], str]]): Handler method names by HTTP method and route
+        MAX_BODY_SIZE (ClassVar[int]): Largest accepted request body in bytes
+        DEFAULT_SESSION_TTL (ClassVar[float]): Seconds an idle session is kept
+        DEFAULT_WORKERS (ClassVar[int]): Threads running blocking calls
+        connections (int): Number of client connections accepted
+
+    Args:
+        engine (GameEngine): The engine running the games
+        host (str, optional): Interface to listen on. Defaults to "127.0.0.1".
+        port (int, optional): Port to listen on, 0 picks a free one. Defaults to 0.
+        scores_path (Path | str, optional): The scoreboard file. Defaults to "scores.json".
+        session_ttl (float, optional): Seconds an idle session is kept. Defaults to DEFAULT_SESSION_TTL.
+        workers (int, optional): Threads running blocking calls. Defaults to DEFAULT_WORKERS.
+    """
+
+    ROUTES: ClassVar[dict[tuple[str, str], str]] = {
+        ("GET", "/categories"): "_categories",
+        ("GET", "/scores"): "_scores",
+        ("POST", "/sessions"): "_create_session",
+        ("POST", "/sessions/{id}/game"): "_start_game",
+        ("POST", "/sessions/{id}/next"): "_next_question",
+        ("POST", "/sessions/{id}/answer"): "_answer",
+        ("POST", "/sessions/{id}/score"): "_save_score",
+        ("DELETE", "/sessions/{id}"): "_close_session",
+    }
+    MAX_BODY_SIZE: ClassVar[int] = 64 * 1024
+    DEFAULT_SESSION_TTL: ClassVar[float] = 30 * 60
+    DEFAULT_WORKERS: ClassVar[int] = 8
+
+    def __init__(
+        self,
+        engine: GameEngine,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        scores_path: Path | str = "scores.json",
+        session_ttl: float = DEFAULT_SESSION_TTL,
+        workers: int = DEFAULT_WORKERS,
+    ) -> None:
+        """Create the server, it starts listening on start()
+
+        Args:
+            engine (GameEngine): The engine running the games
+            host (str, optional): Interface to listen on. Defaults to "127.0.0.1".
+            port (int, optional): Port to listen on, 0 picks a free one. Defaults to 0.
+            scores_path (Path | str, optional): The scoreboard file. Defaults to "scores.json".
+            session_ttl (float, optional): Seconds an idle session is kept. Defaults to DEFAULT_SESSION_TTL.
+            workers (int, optional): Threads running blocking calls. Defaults to DEFAULT_WORKERS.
+
+        Returns:
+            None
+        """
+        self.engine = engine
+        self.host = host
+        self.port = port
+        self.scores_path = Path(scores_path)
+        self.session_ttl = session_ttl
+        self.workers = workers
+        self.categories: dict[str, str] = {}
+        self.connections: int = 0
+
+        self._sessions: dict[str, _SessionState] = {}
+        self._scores_lock = asyncio.Lock()
+        self._writers: set[asyncio.StreamWriter] = set()
+        self._server: asyncio.Server | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._evictor: asyncio.Task[None] | None = None
+
+    @property
+    def base_url(self) -> str:
+        """Get the URL clients send requests to
+
+        Returns:
+            str: The base URL, with the bound port once started
+        """
+        port: int = self._server.sockets[0].getsockname()[1] if self._server is not None else self.port
+        return f"http://{self.host}:{port}"
+
+    async def start(self) -> str:
+        """Load the categories and start listening
+
+        Without categories from the API, games can still be played in any category.
+
+        Returns:
+            str: The base URL of the server
+        """
+        self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="game-server")
+        with contextlib.suppress(CategoryError):
+            self.categories = await self._run_blocking(self.engine.api_client.fetch_categories)
+        self._server = await asyncio.start_server(self._serve, self.host, self.port)
+        self._evictor = asyncio.create_task(self._evict_idle_sessions_forever())
+        return self.base_url
+
+    async def stop(self) -> None:
+        """Stop listening, close the connections and end every game"""
+        if self._evictor is not None:
+            self._evictor.cancel()
+            self._evictor = None
+
+        if self._server is not None:
+            self._server.close()
+            for writer in list(self._writers):
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+
+        for session_id in list(self.engine.sessions):
+            self.engine.close_session(session_id)
+        self._sessions.clear()
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def serve_forever(self) -> None:
+        """Start the server and serve requests until cancelled"""
+        await self.start()
+        server: asyncio.Server | None = self._server
+        if server is None:
+            msg: str = "The server stopped while starting"
+            raise RuntimeError(msg)
+        try:
+            await server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def _run_blocking(self, func: Callable[..., T], *args: object) -> T:
+        """Run a call that may block in the server's executor
+
+        Args:
+            func (Callable[..., T]): The call
+            *args (object): Its arguments
+
+        Returns:
+            T: The result of the call
+        """
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    def evict_idle_sessions(self, now: float | None = None) -> int:
+        """Close the sessions without a request for session_ttl seconds
+
+        Sessions handling a request are kept.
+
+        Args:
+            now (float | None, optional): The time.monotonic() value to compare with. Defaults to now.
+
+        Returns:
+            int: The number of closed sessions
+        """
+        deadline: float = (time.monotonic() if now is None else now) - self.session_ttl
+        idle: list[str] = [
+            session_id
+            for session_id, state in self._sessions.items()
+            if state.last_seen < deadline and not state.lock.locked()
+        ]
+        for session_id in idle:
+            self.engine.close_session(session_id)
+            del self._sessions[session_id]
+        return len(idle)
+
+    async def _evict_idle_sessions_forever(self) -> None:
+        """Evict idle sessions every tenth of the session TTL until cancelled"""
+        while True:
+            await asyncio.sleep(self.session_ttl / 10)
+            self.evict_idle_sessions()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Answer the requests of one connection until the client closes it
+
+        Args:
+            reader (asyncio.StreamReader): The incoming stream
+            writer (asyncio.StreamWriter): The outgoing stream
+        """
+        self.connections += 1
+        self._writers.add(writer)
+        try:
+            while request_line := await reader.readline():
+                started: float = time.perf_counter()
+                headers: dict[str, str] = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                    length: int = int(headers.get("content-length", "0"))
+                except ValueError:
+                    writer.write(self._encode_response((400, {"error": "Malformed request"}), keep_alive=False))
+                    break
+
+                if not 0 <= length <= self.MAX_BODY_SIZE:
+                    writer.write(self._encode_response((413, {"error": "Request body too large"}), keep_alive=False))
+                    break
+
+                body: bytes = await reader.readexactly(length) if length else b""
+                keep_alive: bool = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                route, response = await self.handle(method, target.partition("?")[0], body)
+
+                writer.write(self._encode_response(response, keep_alive))
+                await writer.drain()
+                self.engine.metrics.observe(
+                    "trivia_game_server_request_duration_seconds",
+                    time.perf_counter() - started,
+                    route=route,
+                    status=response[0],
+                )
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    @staticmethod
+    def _encode_response(response: Response, keep_alive: bool) -> bytes:
+        """Encode a response with its headers
+
+        Args:
+            response (Response): The HTTP status and the JSON body
+            keep_alive (bool): Whether the connection stays open
+
+        Returns:
+            bytes: The HTTP response
+        """
+        status, payload = response
+        body: bytes = json.dumps(payload).encode()
+        connection: str = "" if keep_alive else "Connection: close\r\n"
+        head: str = (
+            f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n{connection}\r\n"
+        )
+        return head.encode("latin-1") + body
+
+    async def handle(self, method: str, path: str, body: bytes = b"") -> tuple[str, Response]:
+        """Route a request to its handler
+
+        Args:
+            method (str): The HTTP method
+            path (str): The request path, without the query
+            body (bytes, optional): The JSON request body. Defaults to b"".
+
+        Returns:
+            tuple[str, Response]: The matched route, used as metrics label, and the response
+        """
+        parts: list[str] = path.strip("/").split("/")
+        session_id: str | None = None
+        if parts[0] == "sessions" and len(parts) > 1:
+            session_id, parts[1] = parts[1], "{id}"
+        route: str = "/" + "/".join(parts)
+
+        if (handler_name := self.ROUTES.get((method, route))) is None:
+            if any(known == route for _, known in self.ROUTES):
+                return route, (405, {"error": "Method not allowed"})
+            return "unknown", (404, {"error": "Not found"})
+
+        try:
+            data: Any = json.loads(body) if body else {}
+        except ValueError:
+            data = None
+        if not isinstance(data, dict):
+            return route, (400, {"error": "Request body must be a JSON object"})
+
+        session: GameSession | None = None
+        state: _SessionState | None = None
+        if session_id is not None:
+            try:
+                session = self.engine.get_session(session_id)
+            except KeyError:
+                return route, (404, {"error": "Unknown session"})
+            if (state := self._sessions.get(session_id)) is not None:
+                state.last_seen = time.monotonic()
+
+        try:
+            return route, await self._dispatch(handler_name, session, state, data)
+        except Exception:
+            return route, (500, {"error": "Internal server error"})
+
+    async def _dispatch(
+        self, handler_name: str, session: GameSession | None, state: _SessionState | None, data: dict[str, Any]
+    ) -> Response:
+        """Call a handler, holding the lock of its session
+
+        Args:
+            handler_name (str): The name of the handler method
+            session (GameSession | None): The session of the route, None for routes without one
+            state (_SessionState | None): The bookkeeping of the session
+            data (dict[str, Any]): The JSON request body
+
+        Returns:
+            Response: The response of the handler, or 404 if the session was closed while the request waited
+        """
+        handler: Callable[[GameSession | None, dict[str, Any]], Awaitable[Response]] = getattr(self, handler_name)
+        if session is None or state is None:
+            return await handler(session, data)
+        async with state.lock:
+            if self._sessions.get(session.id) is not state:
+                return 404, {"error": "Unknown session"}
+            return await handler(session, data)
+
+    def _state(self, session: GameSession, **extra: Any) -> dict[str, Any]:
+        """Describe a session and the events since the last response
+
+        Args:
+            session (GameSession): The session
+            **extra (Any): Additional fields
+
+        Returns:
+            dict[str, Any]: The session ID, score, whether the game runs, and the events
+        """
+        events: list[GameEvent] = self._sessions[session.id].events
+        payload: dict[str, Any] = {
+            "session": session.id,
+            "score": session.score,
+            "active": session.active,
+            "events": [self._event_data(event) for event in events],
+            **extra,
+        }
+        events.clear()
+        return payload
+
+    @staticmethod
+    def _event_data(event: GameEvent) -> dict[str, Any]:
+        """Turn an event into JSON data, without the answer of a shown question
+
+        Args:
+            event (GameEvent): The event
+
+        Returns:
+            dict[str, Any]: The event name and its fields
+        """
+        if isinstance(event, QuestionShown):
+            question = event.question
+            answers: list[str] = question.all_answers()
+            return {
+                "event": "question_shown",
+                "number": event.number,
+                "type": question.type,
+                "difficulty": question.difficulty,
+                "category": question.category,
+                "question": question.question,
+                "answers": ["True", "False"] if question.type == "boolean" else random.sample(answers, len(answers)),
+            }
+        if isinstance(event, AnswerChecked):
+            return {
+                "event": "answer_checked",
+                "correct": event.correct,
+                "correct_answer": event.correct_answer,
+                "score": event.score,
+            }
+        if isinstance(event, GameOver):
+            return {"event": "game_over", "score": event.score, "answered": event.answered}
+        return {"event": "game_error", "message": event.message}
+
+    async def _categories(self, session: None, data: dict[str, Any]) -> Response:
+        """Answer GET /categories
+
+        Args:
+            session (None): Unused, the route has no session
+            data (dict[str, Any]): Unused
+
+        Returns:
+            Response: The category names, difficulties and question types
+        """
+        return 200, {
+            "categories": sorted(self.categories),
+            "difficulties": list(get_args(DifficultyType)),
+            "types": list(get_args(QuestionType)),
+        }
+
+    async def _scores(self, session: None, data: dict[str, Any]) -> Response:
+        """Answer GET /scores
+
+        Args:
+            session (None): Unused, the route has no session
+            data (dict[str, Any]): Unused
+
+        Returns:
+            Response: The scoreboard entries, best first
+        """
+        async with self._scores_lock:
+            scores: list[dict[str, Any]] = await self._run_blocking(load_scores, self.scores_path)
+        return 200, {"scores": scores}
+
+    async def _create_session(self, session: None, data: dict[str, Any]) -> Response:
+        """Answer POST /sessions
+
+        Args:
+            session (None): Unused, the route has no session
+            data (dict[str, Any]): Unused
+
+        Returns:
+            Response: The new session
+        """
+        state: _SessionState = _SessionState()
+        created: GameSession = self.engine.create_session(state.events.append)
+        self._sessions[created.id] = state
+        return 201, self._state(created)
+
+    async def _start_game(self, session: GameSession, data: dict[str, Any]) -> Response:
+        """Answer POST /sessions/{id}/game
+
+        Args:
+            session (GameSession): The session
+            data (dict[str, Any]): The optional category name, difficulty, type and endless flag
+
+        Returns:
+            Response: The session state with the first question, or 400 for unknown options
+        """
+        category: Any = data.get("category")
+        difficulty: Any = data.get("difficulty")
+        question_type: Any = data.get("type")
+        if (
+            (category is not None and (not isinstance(category, str) or category not in self.categories))
+            or (difficulty is not None and difficulty not in get_args(DifficultyType))
+            or (question_type is not None and question_type not in get_args(QuestionType))
+        ):
+            return 400, {"error": "Unknown category, difficulty or type"}
+
+        settings = GameSettings(self.categories.get(category) if category else None, difficulty, question_type)
+        if await self._run_blocking(session.start, settings, bool(data.get("endless", False))):
+            state: _SessionState = self._sessions[session.id]
+            state.started = True
+            state.score_saved = False
+        return 200, self._state(session)
+
+    async def _next_question(self, session: GameSession, data: dict[str, Any]) -> Response:
+        """Answer POST /sessions/{id}/next
+
+        Only an endless game can wait for its next question, so other games draw it on the loop.
+
+        Args:
+            session (GameSession): The session
+            data (dict[str, Any]): Unused
+
+        Returns:
+            Response: The session state with the next question or the end of the game
+        """
+        if session.endless:
+            await self._run_blocking(session.next_question)
+        else:
+            session.next_question()
+        return 200, self._state(session)
+
+    async def _answer(self, session: GameSession, data: dict[str, Any]) -> Response:
+        """Answer POST /sessions/{id}/answer
+
+        Args:
+            session (GameSession): The session
+            data (dict[str, Any]): The selected answer
+
+        Returns:
+            Response: The session state with the result, 400 without an answer, or 409 if the
+                current question was already answered
+        """
+        if not isinstance(answer := data.get("answer"), str):
+            return 400, {"error": "Missing answer"}
+        if not session.waiting_for_answer:
+            return 409, {"error": "No question waiting for an answer"}
+
+        session.answer(answer)
+        return 200, self._state(session)
+
+    async def _save_score(self, session: GameSession, data: dict[str, Any]) -> Response:
+        """Answer POST /sessions/{id}/score
+
+        The score of a game is saved once, after the game is over.
+
+        Args:
+            session (GameSession): The session
+            data (dict[str, Any]): The player name
+
+        Returns:
+            Response: The saved scoreboard, 400 without a player name, or 409 while the game runs,
+                before a game was played or when its score was already saved
+        """
+        if not isinstance(player := data.get("player"), str) or not player.strip():
+            return 400, {"error": "Missing player name"}
+        if session.active:
+            return 409, {"error": "The game is still running"}
+        state: _SessionState = self._sessions[session.id]
+        if not state.started or state.score_saved:
+            return 409, {"error": "No finished game to save"}
+
+        state.score_saved = True
+        entry = ScoreboardEntry(player.strip(), session.score, date=datetime.now())
+        async with self._scores_lock:
+            scores: list[dict[str, Any]] = await self._run_blocking(add_score, self.scores_path, entry)
+        return 200, self._state(session, scores=scores)
+
+    async def _close_session(self, session: GameSession, data: dict[str, Any]) -> Response:
+        """Answer DELETE /sessions/{id}
+
+        Args:
+            session (GameSession): The session
+            data (dict[str, Any]): Unused
+
+        Returns:
+            Response: The final session state
+        """
+        self.engine.close_session(session.id)
+        payload: dict[str, Any] = self._state(session)
+        del self._sessions[session.id]
+        return 200, payload
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the game server from the command line until interrupted
+
+    The API client is set up like the desktop app's, with the question cache, session
+    token and count index files in the working directory.
+
+    Args:
+        argv (Sequence[str] | None, optional): Command line arguments. Defaults to sys.argv.
+
+    Returns:
+        int: The exit code
+    """
+    parser = argparse.ArgumentParser(description="Serve trivia games over JSON HTTP.")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8080, help="Port to listen on (default: 8080)")
+    parser.add_argument(
+        "--session-ttl",
+        type=float,
+        default=GameServer.DEFAULT_SESSION_TTL,
+        help=f"Seconds an idle session is kept (default: {GameServer.DEFAULT_SESSION_TTL:.0f})",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=GameServer.DEFAULT_WORKERS,
+        help=f"Threads running blocking calls (default: {GameServer.DEFAULT_WORKERS})",
+    )
+    args = parser.parse_args(argv)
+
+    metrics: MetricsRegistry = MetricsRegistry()
+    exporters: list[MetricsServer | TextfileWriter] = start_exporters(metrics)
+    api_client: TriviaAPIClient = TriviaAPIClient(
+        cache=QuestionCache(Path("questions.db")),
+        token_store=TokenStore(Path("session_token.json")),
+        rate_limiter=RateLimiter(),
+        base_url=os.environ.get("TRIVIA_API_BASE_URL"),
+        transport=Transport.shared(),
+        metrics=metrics,
+        circuit_breaker=CircuitBreaker(slow_call_threshold=5.0),
+    )
+    engine: GameEngine = GameEngine(
+        api_client, count_index=QuestionCountIndex(api_client, Path("question_counts.json")), metrics=metrics
+    )
+    server: GameServer = GameServer(engine, args.host, args.port, session_ttl=args.session_ttl, workers=args.workers)
+
+    print(f"Serving trivia games on http://{args.host}:{args.port}, press Ctrl+C to stop")
+    try:
+        with api_client, contextlib.suppress(KeyboardInterrupt):
+            asyncio.run(server.serve_forever())
+    finally:
+        for exporter in exporters:
+            exporter.stop()
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
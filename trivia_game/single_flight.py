@@ -0,0 +1,85 @@
+"""Module for merging identical concurrent calls into one."""
+
+import threading
+from collections.abc import Callable, Hashable
+from typing import Generic, TypeVar, cast
+
+T = TypeVar("T")
+
+
+class _Call(Generic[T]):
+    """A call in flight and the outcome shared with its waiters."""
+
+    def __init__(self) -> None:
+        """Create the pending call
+
+        Returns:
+            None
+        """
+        self.done: threading.Event = threading.Event()
+        self.result: T | None = None
+        self.error: BaseException | None = None
+        self.waiters: int = 0
+
+
+class SingleFlight(Generic[T]):
+    """Runs one call per key at a time and shares its outcome with concurrent callers
+
+    The first caller for a key runs the function. Callers arriving with the same key
+    while it runs wait for it and receive the same result or exception, instead of
+    repeating the work. Once the call finishes the key is free again, so results are
+    never cached beyond the calls they overlapped with.
+
+    Attributes:
+        shared (int): Number of calls answered by another caller's result
+    """
+
+    def __init__(self) -> None:
+        """Create the group of in-flight calls
+
+        Returns:
+            None
+        """
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call[T]] = {}
+        self.shared: int = 0
+
+    def do(self, key: Hashable, func: Callable[[], T]) -> T:
+        """Run func, or wait for the call already running for the same key
+
+        Args:
+            key (Hashable): Identifies calls that can share a result
+            func (Callable[[], T]): The call to run
+
+        Raises:
+            BaseException: Whatever the shared call raised
+
+        Returns:
+            T: The result of the shared call
+        """
+        with self._lock:
+            existing: _Call[T] | None = self._calls.get(key)
+            if existing is None:
+                call: _Call[T] = _Call()
+                self._calls[key] = call
+            else:
+                existing.waiters += 1
+                self.shared += 1
+
+        if existing is not None:
+            existing.done.wait()
+            if existing.error is not None:
+                raise existing.error
+            return cast(T, existing.result)
+
+        try:
+            call.result = func()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        return call.result
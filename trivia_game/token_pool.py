@@ -0,0 +1,299 @@
+"""Module for sharing several session tokens between parallel workers."""
+
+import threading
+from collections.abc import Callable, Hashable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+from trivia_game.exceptions import TokenError
+from trivia_game.models import DifficultyType, Question, QuestionType, TriviaResponseCode
+from trivia_game.trivia_api import TriviaAPIClient
+
+T = TypeVar("T")
+QuestionFilter = tuple[str | None, DifficultyType | None, QuestionType | None]
+
+
+@dataclass
+class PooledToken:
+    """A session token of the pool and the work assigned to it."""
+
+    value: str
+    keys: set[Hashable] = field(default_factory=set)
+    drained: set[QuestionFilter] = field(default_factory=set)
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+
+class TokenPool:
+    """Pool of session tokens handed out by key, e.g. one key per category or worker
+
+    A token only avoids repeats within its own history, so the pool binds every key
+    to one token for as long as the key is in use. Keys covering disjoint questions,
+    such as different categories, can then be fetched in parallel without duplicates.
+    Requests on one token are serialized.
+
+    New keys get a token of their own until the pool holds `size` tokens, after that
+    they share the least used one. Tokens that drained a filter are tracked, and each
+    token is renewed or reset without touching the others.
+
+    Args:
+        api_client (TriviaAPIClient): The client used to request and reset tokens and fetch questions
+        size (int, optional): The number of tokens to request at most. Defaults to 4.
+    """
+
+    def __init__(self, api_client: TriviaAPIClient, size: int = 4) -> None:
+        """Create the pool, tokens are requested on first use
+
+        Args:
+            api_client (TriviaAPIClient): The client used to request and reset tokens and fetch questions
+            size (int, optional): The number of tokens to request at most. Defaults to 4.
+
+        Returns:
+            None
+        """
+        self.api_client = api_client
+        self.size = size
+        self._lock = threading.Lock()
+        self._tokens: list[PooledToken] = []
+        self._assignments: dict[Hashable, PooledToken] = {}
+
+    @property
+    def tokens(self) -> list[str]:
+        """Get the values of the tokens in the pool
+
+        Returns:
+            list[str]: The token values
+        """
+        with self._lock:
+            return [token.value for token in self._tokens]
+
+    def _token_for(self, key: Hashable) -> PooledToken:
+        """Get the token bound to a key, binding one if needed
+
+        A new token is requested without holding the pool lock, so other keys are not
+        blocked by the request. The pool is checked again afterwards, a token that is no
+        longer needed because another thread filled the pool or bound the key is dropped.
+
+        Args:
+            key (Hashable): The key
+
+        Raises:
+            TriviaAPIError: If the token request fails
+
+        Returns:
+            PooledToken: The token of the key
+        """
+        with self._lock:
+            if (token := self._assignments.get(key)) is not None:
+                return token
+            grow: bool = len(self._tokens) < self.size
+
+        value: str | None = self.api_client.request_session_token() if grow else None
+
+        with self._lock:
+            if (token := self._assignments.get(key)) is not None:
+                return token
+
+            if value is not None and len(self._tokens) < self.size:
+                token = PooledToken(value)
+                self._tokens.append(token)
+            else:
+                token = min(self._tokens, key=lambda pooled: len(pooled.keys))
+
+            token.keys.add(key)
+            self._assignments[key] = token
+            return token
+
+    @contextmanager
+    def lease(self, key: Hashable) -> Iterator[str]:
+        """Use the token of a key exclusively for the duration of the block
+
+        Args:
+            key (Hashable): The key
+
+        Yields:
+            str: The token value
+        """
+        token: PooledToken = self._token_for(key)
+        with token.lock:
+            yield token.value
+
+    def release(self, key: Hashable) -> None:
+        """Unbind a key that is done, so its token can serve other keys
+
+        Args:
+            key (Hashable): The key
+
+        Returns:
+            None
+        """
+        with self._lock:
+            if (token := self._assignments.pop(key, None)) is not None:
+                token.keys.discard(key)
+
+    def fetch_questions(
+        self,
+        key: Hashable,
+        amount: int = 10,
+        category: str | None = None,
+        difficulty: DifficultyType | None = None,
+        question_type: QuestionType | None = None,
+    ) -> list[Question]:
+        """Fetch questions from the API with the token of a key
+
+        A token the API no longer knows is renewed once. The API answers TOKEN_EMPTY as
+        soon as fewer questions are left than requested, so a filter is only recorded as
+        drained when a single question was refused, see is_drained.
+
+        Args:
+            key (Hashable): The key whose token is used
+            amount (int, optional): The number of questions to fetch. Defaults to 10.
+            category (str | None, optional): The category ID. Defaults to None.
+            difficulty (DifficultyType | None, optional): The difficulty. Defaults to None.
+            question_type (QuestionType | None, optional): The question type. Defaults to None.
+
+        Raises:
+            TokenError: If the token has returned all questions for the filter, or renewing it failed
+            TriviaAPIError: If the request fails
+
+        Returns:
+            list[Question]: The fetched questions
+        """
+        return self._fetch_with_token(
+            key,
+            amount,
+            (category, difficulty, question_type),
+            lambda token: self.api_client.fetch_questions(
+                amount, category, difficulty, question_type, use_cache=False, token=token
+            ),
+        )
+
+    def fetch_encoded(
+        self,
+        key: Hashable,
+        amount: int = 10,
+        category: str | None = None,
+        difficulty: DifficultyType | None = None,
+        question_type: QuestionType | None = None,
+    ) -> list[dict[str, Any]]:
+        """Fetch questions from the API with the token of a key, without decoding them
+
+        Tokens are renewed and drained filters recorded like in fetch_questions, see
+        TriviaAPIClient.fetch_encoded for the result.
+
+        Args:
+            key (Hashable): The key whose token is used
+            amount (int, optional): The number of questions to fetch. Defaults to 10.
+            category (str | None, optional): The category ID. Defaults to None.
+            difficulty (DifficultyType | None, optional): The difficulty. Defaults to None.
+            question_type (QuestionType | None, optional): The question type. Defaults to None.
+
+        Raises:
+            TokenError: If the token has returned all questions for the filter, or renewing it failed
+            TriviaAPIError: If the request fails
+
+        Returns:
+            list[dict[str, Any]]: The question data as the API encoded it
+        """
+        return self._fetch_with_token(
+            key,
+            amount,
+            (category, difficulty, question_type),
+            lambda token: self.api_client.fetch_encoded(amount, category, difficulty, question_type, token=token),
+        )
+
+    def _fetch_with_token(
+        self, key: Hashable, amount: int, question_filter: QuestionFilter, fetch: Callable[[str], T]
+    ) -> T:
+        """Run a fetch with the token of a key, renewing a token the API no longer knows once
+
+        Args:
+            key (Hashable): The key whose token is used
+            amount (int): The number of questions requested
+            question_filter (QuestionFilter): The category, difficulty and type requested
+            fetch (Callable[[str], T]): Fetches with the given token value
+
+        Raises:
+            TokenError: If the token has returned all questions for the filter, or renewing it failed
+
+        Returns:
+            T: The result of the fetch
+        """
+        token: PooledToken = self._token_for(key)
+
+        with token.lock:
+            for attempt in range(2):
+                try:
+                    return fetch(token.value)
+
+                except TokenError as e:
+                    message: str = str(e)
+                    if self.api_client.ERROR_MESSAGES[TriviaResponseCode.TOKEN_NOT_FOUND] in message and not attempt:
+                        self._renew(token)
+                        continue
+                    if amount == 1 and self.api_client.ERROR_MESSAGES[TriviaResponseCode.TOKEN_EMPTY] in message:
+                        token.drained.add(question_filter)
+                    raise
+
+        msg: str = "Session token not found after renewal"
+        raise TokenError(msg)
+
+    def is_drained(
+        self,
+        key: Hashable,
+        category: str | None = None,
+        difficulty: DifficultyType | None = None,
+        question_type: QuestionType | None = None,
+    ) -> bool:
+        """Check whether the token of a key has returned all questions for a filter
+
+        Args:
+            key (Hashable): The key
+            category (str | None, optional): The category ID. Defaults to None.
+            difficulty (DifficultyType | None, optional): The difficulty. Defaults to None.
+            question_type (QuestionType | None, optional): The question type. Defaults to None.
+
+        Returns:
+            bool: True if the filter is drained for the key's token
+        """
+        with self._lock:
+            token: PooledToken | None = self._assignments.get(key)
+            return token is not None and (category, difficulty, question_type) in token.drained
+
+    def reset(self, key: Hashable) -> None:
+        """Wipe the history of the key's token, other tokens keep theirs
+
+        Keys sharing the token lose their history too.
+
+        Args:
+            key (Hashable): The key
+
+        Raises:
+            TriviaAPIError: If the reset request fails
+
+        Returns:
+            None
+        """
+        token: PooledToken = self._token_for(key)
+        with token.lock:
+            self.api_client.reset_session_token(token.value)
+            token.drained.clear()
+
+    def _renew(self, token: PooledToken) -> None:
+        """Replace a token the API no longer knows, for every key bound to it
+
+        The new token is requested without holding the pool lock and swapped in under it.
+
+        Args:
+            token (PooledToken): The token, locked by the caller
+
+        Raises:
+            TriviaAPIError: If the token request fails
+
+        Returns:
+            None
+        """
+        value: str = self.api_client.request_session_token()
+        with self._lock:
+            token.value = value
+            token.drained.clear()
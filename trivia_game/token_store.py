@@ -0,0 +1,76 @@
+"""Module for persisting the Trivia API session token between runs."""
+
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import ClassVar
+
+from trivia_game.models import SessionToken
+
+
+class TokenStore:
+    """JSON file holding the current session token and its issue time
+
+    The API keeps a token for about six hours, so a token loaded within that window is
+    reused, together with its "no repeats" history, instead of requesting a new one.
+
+    Attributes:
+        TOKEN_LIFETIME (ClassVar[timedelta]): How long a stored token is considered valid
+
+    Args:
+        path (Path | str): The JSON file the token is stored in
+    """
+
+    TOKEN_LIFETIME: ClassVar[timedelta] = timedelta(hours=6)
+
+    def __init__(self, path: Path | str) -> None:
+        """Create the token store
+
+        Args:
+            path (Path | str): The JSON file the token is stored in
+
+        Returns:
+            None
+        """
+        self.path: Path = Path(path)
+
+    def load(self, now: datetime | None = None) -> SessionToken | None:
+        """Load the stored token if it is still valid
+
+        Args:
+            now (datetime | None, optional): The current time. Defaults to datetime.now().
+
+        Returns:
+            SessionToken | None: The stored token, or None if it is missing, unreadable or expired
+        """
+        try:
+            with self.path.open() as f:
+                data = json.load(f)
+            stored = SessionToken(token=data["token"], issued_at=datetime.fromisoformat(data["issued_at"]))
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+        if not stored.token or (now or datetime.now()) - stored.issued_at >= self.TOKEN_LIFETIME:
+            return None
+        return stored
+
+    def save(self, token: str, issued_at: datetime | None = None) -> SessionToken:
+        """Store a token with its issue time
+
+        Args:
+            token (str): The session token value
+            issued_at (datetime | None, optional): When the token was issued. Defaults to datetime.now().
+
+        Returns:
+            SessionToken: The stored token
+        """
+        stored = SessionToken(token=token, issued_at=issued_at or datetime.now())
+
+        with self.path.open("w") as f:
+            json.dump({"token": stored.token, "issued_at": stored.issued_at.isoformat()}, f, indent=2)
+
+        return stored
+
+    def clear(self) -> None:
+        """Remove the stored token"""
+        self.path.unlink(missing_ok=True)
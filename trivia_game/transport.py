@@ -0,0 +1,175 @@
+"""Module for the HTTP transport shared between API clients and threads."""
+
+import threading
+import types
+import weakref
+from collections.abc import Iterable, Sequence
+from typing import Any, ClassVar
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class Transport:
+    """Connection pools shared by any number of clients and threads
+
+    requests.Session keeps mutable state such as cookies, so every thread gets a
+    session of its own. All of them are mounted on the same HTTPAdapter, whose
+    urllib3 pools are thread-safe, so keep-alive and TLS connections opened by one
+    thread are reused by the others.
+
+    Attributes:
+        DEFAULT_POOL_CONNECTIONS (ClassVar[int]): Hosts with a cached connection pool
+        DEFAULT_POOL_MAXSIZE (ClassVar[int]): Connections kept open per host
+        RETRY_STATUS_FORCELIST (ClassVar[tuple[int, ...]]): HTTP status codes that are retried
+        RETRY_BACKOFF_FACTOR (ClassVar[int]): Backoff factor between retries
+
+    Args:
+        retries (int, optional): Number of retries for failed requests. Defaults to 3.
+        pool_connections (int, optional): Hosts with a cached connection pool. Defaults to DEFAULT_POOL_CONNECTIONS.
+        pool_maxsize (int, optional): Connections kept open per host. Defaults to DEFAULT_POOL_MAXSIZE.
+        pool_block (bool, optional): Wait for a free connection instead of opening a throwaway one when a
+            pool is exhausted. Defaults to False.
+    """
+
+    DEFAULT_POOL_CONNECTIONS: ClassVar[int] = 4
+    DEFAULT_POOL_MAXSIZE: ClassVar[int] = 16
+    RETRY_STATUS_FORCELIST: ClassVar[tuple[int, ...]] = (429, 500, 502, 503, 504)
+    RETRY_BACKOFF_FACTOR: ClassVar[int] = 5
+
+    _shared: ClassVar["Transport | None"] = None
+    _shared_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(
+        self,
+        retries: int = 3,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        pool_block: bool = False,
+    ) -> None:
+        """Create the transport, sessions are created per thread on first use
+
+        Args:
+            retries (int, optional): Number of retries for failed requests. Defaults to 3.
+            pool_connections (int, optional): Hosts with a cached connection pool. Defaults to DEFAULT_POOL_CONNECTIONS.
+            pool_maxsize (int, optional): Connections kept open per host. Defaults to DEFAULT_POOL_MAXSIZE.
+            pool_block (bool, optional): Wait for a free connection when a pool is exhausted. Defaults to False.
+
+        Returns:
+            None
+        """
+        retry_strategy: Retry = Retry(
+            total=retries,
+            backoff_factor=self.RETRY_BACKOFF_FACTOR,
+            status_forcelist=self.RETRY_STATUS_FORCELIST,
+            allowed_methods=["GET", "HEAD"],
+        )
+        self.adapter: HTTPAdapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            max_retries=retry_strategy,
+        )
+        self._local = threading.local()
+        self._sessions_lock = threading.Lock()
+        self._sessions: weakref.WeakSet[requests.Session] = weakref.WeakSet()
+
+    @classmethod
+    def shared(cls) -> "Transport":
+        """Get the transport shared by the whole process, creating it on first use
+
+        Returns:
+            Transport: The shared transport
+        """
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    @property
+    def session(self) -> requests.Session:
+        """Get the session of the calling thread
+
+        Returns:
+            requests.Session: The session, mounted on the shared adapter
+        """
+        session: requests.Session | None = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.mount("http://", self.adapter)
+            session.mount("https://", self.adapter)
+            self._local.session = session
+            with self._sessions_lock:
+                self._sessions.add(session)
+        return session
+
+    def get(self, url: str, params: dict[str, Any] | None = None, timeout: float | None = None) -> requests.Response:
+        """Send a GET request on a pooled connection
+
+        Args:
+            url (str): The URL to request
+            params (dict[str, Any] | None, optional): Query parameters. Defaults to None.
+            timeout (float | None, optional): Timeout in seconds. Defaults to None.
+
+        Returns:
+            requests.Response: The response
+        """
+        return self.session.get(url, params=params, timeout=timeout)
+
+    def warmup(self, urls: Iterable[str], timeout: float = 5.0) -> list[str]:
+        """Open a connection to every host of the URLs ahead of the first request
+
+        The TLS handshake then happens before a player waits for it. Hosts that cannot
+        be reached are skipped, the first real request reports the error.
+
+        Args:
+            urls (Iterable[str]): URLs of the hosts to connect to
+            timeout (float, optional): Timeout per host in seconds. Defaults to 5.0.
+
+        Returns:
+            list[str]: The base URLs of the hosts that were connected
+        """
+        hosts: Sequence[str] = list(dict.fromkeys(f"{urlsplit(url).scheme}://{urlsplit(url).netloc}" for url in urls))
+        connected: list[str] = []
+
+        for host in hosts:
+            try:
+                self.session.head(f"{host}/", timeout=timeout)
+            except requests.exceptions.RequestException:
+                continue
+            connected.append(host)
+
+        return connected
+
+    def close(self) -> None:
+        """Close the sessions of all threads and the pooled connections"""
+        with self._sessions_lock:
+            for session in list(self._sessions):
+                session.close()
+            self._sessions = weakref.WeakSet()
+        self.adapter.close()
+
+    def __enter__(self) -> "Transport":
+        """Enter context manager
+
+        Returns:
+            Transport: The transport instance
+        """
+        return self
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc_val: BaseException | None, exc_tb: types.TracebackType | None
+    ) -> None:
+        """Close all connections when exiting the context manager.
+
+        Args:
+            exc_type: The type of the exception that was raised
+            exc_val: The instance of the exception that was raised
+            exc_tb: The traceback of the exception that was raised
+
+        Returns:
+            None
+        """
+        self.close()
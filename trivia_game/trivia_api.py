@@ -1,49 +1,62 @@
 """Module for interacting with the trivia API."""
 
-import html
+import contextlib
+import threading
+import time
 import types
+from collections.abc import Callable
+from http import HTTPStatus
 from typing import Any, ClassVar, cast
-from urllib.parse import unquote
+from urllib.parse import urlsplit
 
 import requests
 from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ResponseError
 from urllib3.util.retry import Retry
 
+from trivia_game.circuit_breaker import CircuitBreaker
 from trivia_game.exceptions import (
     CategoryError,
+    CircuitOpenError,
     InvalidParameterError,
     NoResultsError,
     RateLimitError,
     TokenError,
     TriviaAPIError,
 )
-from trivia_game.models import DifficultyType, Question, QuestionType, TriviaResponseCode
+from trivia_game.metrics import MetricsRegistry
+from trivia_game.models import DifficultyType, EncodingType, Question, QuestionType, TriviaResponseCode
+from trivia_game.question_cache import QuestionCache
+from trivia_game.rate_limiter import RateLimiter
+from trivia_game.single_flight import SingleFlight
+from trivia_game.text_decoding import decode_text, decoder
+from trivia_game.token_store import TokenStore
+from trivia_game.transport import Transport
 
 
-class TriviaAPIClient:
-    """Client for handling Trivia API interactions
+class BaseTriviaAPIClient:
+    """Transport-independent parts of the Trivia API clients
+
+    Holds the endpoints, the error mappings and the response handling shared by the
+    blocking and the asyncio client, so both behave identically for the same payload.
 
     Attributes:
         QUESTIONS_API_URL (ClassVar[str]): The URL for fetching questions
         SESSION_TOKEN_API_URL (ClassVar[str]): The URL for fetching session tokens
         CATEGORIES_API_URL (str): The URL for fetching categories
+        COUNT_API_URL (ClassVar[str]): The URL for fetching question counts of a category
         ERROR_MESSAGES (ClassVar[dict[int, str]]): Error messages for API response codes
-
-    Args:
-        timeout (int, optional): Timeout for requests. Defaults to 10.
-        retries (int, optional): Number of retries for failed requests. Defaults to 3.
-
-    Raises:
-        TriviaAPIError: If an unknown error occurs
-        NoResultsError: If there are not enough questions available
-        InvalidParameterError: If invalid parameters are provided
-        TokenError: If a session token is not found or is empty
-        RateLimitError: If the rate limit is exceeded
+        HTTP_ERROR_MAPPING (ClassVar[dict[int, tuple[type[Exception], str]]]): Exceptions for HTTP status codes
+        RETRY_STATUS_FORCELIST (ClassVar[tuple[int, ...]]): HTTP status codes that are retried, see Transport
+        RETRY_BACKOFF_FACTOR (ClassVar[int]): Backoff factor between retries, see Transport
+        encoding (EncodingType | None): The `encode` mode sent with questions requests, None for the API default
+        base_url (str | None): Scheme and host replacing the OpenTDB one, e.g. a local stand-in server
     """
 
     QUESTIONS_API_URL: ClassVar[str] = "https://opentdb.com/api.php"
     SESSION_TOKEN_API_URL: ClassVar[str] = "https://opentdb.com/api_token.php"
     CATEGORIES_API_URL: ClassVar[str] = "https://opentdb.com/api_category.php"
+    COUNT_API_URL: ClassVar[str] = "https://opentdb.com/api_count.php"
 
     ERROR_MESSAGES: ClassVar[dict[int, str]] = {
         TriviaResponseCode.NO_RESULTS: "Not enough questions available for your query",
@@ -65,29 +78,396 @@ class TriviaAPIClient:
         504: (TriviaAPIError, "Gateway Timeout"),
     }
 
+    RETRY_STATUS_FORCELIST: ClassVar[tuple[int, ...]] = Transport.RETRY_STATUS_FORCELIST
+    RETRY_BACKOFF_FACTOR: ClassVar[int] = Transport.RETRY_BACKOFF_FACTOR
+
+    encoding: EncodingType | None = None
+    base_url: str | None = None
+
+    def _handle_response_code(self, data: dict[str, Any]) -> None:
+        """Handle response code from Trivia API
+
+        Args:
+            data (dict[str, Any]): The JSON response data
+
+        Raises:
+            TriviaAPIError: If an unknown error occurs
+            NoResultsError: If there are not enough questions available
+            InvalidParameterError: If invalid parameters are provided
+            TokenError: If a session token is not found or is empty
+            RateLimitError: If the rate limit is exceeded
+
+        Returns:
+            None
+        """
+        response_code: int | None = data.get("response_code")
+
+        if response_code is None:
+            msg: str = "Response code not found in API response"
+            raise TriviaAPIError(msg)
+
+        if response_code == TriviaResponseCode.SUCCESS:
+            return
+
+        error_message = self.ERROR_MESSAGES.get(response_code, f"Unknown error occurred: {response_code}")
+
+        if response_code == TriviaResponseCode.NO_RESULTS:
+            raise NoResultsError(error_message)
+        elif response_code == TriviaResponseCode.INVALID_PARAMETER:
+            raise InvalidParameterError(error_message)
+        elif response_code in (TriviaResponseCode.TOKEN_NOT_FOUND, TriviaResponseCode.TOKEN_EMPTY):
+            raise TokenError(error_message)
+        elif response_code == TriviaResponseCode.RATE_LIMIT:
+            raise RateLimitError(error_message)
+        else:
+            raise TriviaAPIError(error_message)
+
+    def _validate_response_data(self, data: dict[str, Any]) -> dict[str, Any]:
+        """Validate decoded JSON data from the API
+
+        Args:
+            data (dict[str, Any]): The JSON response data
+
+        Raises:
+            TriviaAPIError: If the response code signals an error
+            TokenError: If the response carries an empty token
+
+        Returns:
+            dict[str, Any]: The validated JSON response data
+        """
+        if "response_code" in data:
+            self._handle_response_code(data)
+
+        # Check for empty token only if token field exists
+        if "token" in data and not data["token"]:
+            token_err_msg: str = "Invalid token received"
+            raise TokenError(token_err_msg)
+
+        return data
+
+    def _validate_token(self, data: dict[str, Any]) -> None:
+        """Validate the session token in the API response
+
+        Args:
+            data (dict[str, Any]): The API response data
+
+        Raises:
+            TokenError: If the token is invalid or empty
+
+        Returns:
+            None
+        """
+        if "token" in data and not data["token"]:
+            msg: str = "Invalid token received"
+            raise TokenError(msg)
+
+    def _resolve_url(self, url: str) -> str:
+        """Point an endpoint URL at base_url if one is configured
+
+        Args:
+            url (str): One of the endpoint URLs
+
+        Returns:
+            str: The URL to send the request to
+        """
+        if not self.base_url:
+            return url
+        return self.base_url.rstrip("/") + urlsplit(url).path
+
+    @staticmethod
+    def _decode_text(text: str) -> str:
+        """Decode URL-encoded text
+
+        Args:
+            text (str): The URL-encoded text
+
+        Returns:
+            str: The decoded text
+        """
+        return decode_text(text)
+
+    def _format_question(self, data: dict[str, Any]) -> Question:
+        """Format and decode question data from API response
+
+        Args:
+            data (dict[str, Any]): The question data from the API
+
+        Returns:
+            Question: The formatted question object
+        """
+        return self._format_questions([data])[0]
+
+    def _format_questions(self, results: list[dict[str, Any]]) -> list[Question]:
+        """Format and decode all questions of an API response
+
+        Args:
+            results (list[dict[str, Any]]): The question data from the API
+
+        Raises:
+            InvalidParameterError: If a question has an invalid difficulty
+
+        Returns:
+            list[Question]: The formatted question objects
+        """
+        encoding: EncodingType | None = self.encoding
+        decode: Callable[[str], str] = decoder(encoding)
+        questions: list[Question] = []
+
+        for data in results:
+            difficulty: str = decode(data["difficulty"])
+
+            if difficulty not in ("easy", "medium", "hard"):
+                difficulty_err_msg: str = f"Invalid difficulty value: {difficulty}"
+                raise InvalidParameterError(difficulty_err_msg)
+
+            questions.append(
+                Question(
+                    type=cast(QuestionType, decode(data["type"])),
+                    difficulty=cast(DifficultyType, difficulty),
+                    category=decode(data["category"]),
+                    question=decode(data["question"]),
+                    correct_answer=decode(data["correct_answer"]),
+                    incorrect_answers=tuple(map(decode, data["incorrect_answers"])),
+                )
+            )
+
+        return questions
+
+    def _parse_categories(self, data: dict[str, Any]) -> dict[str, str]:
+        """Parse the categories response
+
+        Args:
+            data (dict[str, Any]): The categories response data
+
+        Raises:
+            CategoryError: If no categories are found
+
+        Returns:
+            dict[str, str]: The categories as a dict of name: id
+        """
+        if not data.get("trivia_categories"):
+            category_error_msg = "No categories found in API response"
+            raise CategoryError(category_error_msg)
+
+        return {
+            category["name"]: str(category["id"])
+            for category in data["trivia_categories"]
+            if category.get("name") and category.get("id")
+        }
+
+    @staticmethod
+    def _parse_question_count(data: dict[str, Any]) -> dict[str, int]:
+        """Parse the question count response of a category
+
+        Args:
+            data (dict[str, Any]): The question count response data
+
+        Raises:
+            TriviaAPIError: If no question count is found
+
+        Returns:
+            dict[str, int]: The counts keyed by "total", "easy", "medium" and "hard"
+        """
+        counts: dict[str, Any] | None = data.get("category_question_count")
+
+        if not counts:
+            msg: str = "No question count found in API response"
+            raise TriviaAPIError(msg)
+
+        return {
+            "total": int(counts.get("total_question_count", 0)),
+            "easy": int(counts.get("total_easy_question_count", 0)),
+            "medium": int(counts.get("total_medium_question_count", 0)),
+            "hard": int(counts.get("total_hard_question_count", 0)),
+        }
+
+    @staticmethod
+    def _build_question_params(
+        amount: int,
+        token: str | None,
+        category: str | None,
+        difficulty: DifficultyType | None,
+        question_type: QuestionType | None,
+        encoding: EncodingType | None = None,
+    ) -> dict[str, str | None]:
+        """Validate the amount and build the query parameters for a questions request
+
+        Args:
+            amount (int): The number of questions to fetch
+            token (str | None): The session token
+            category (str | None): The category ID or None for any category
+            difficulty (DifficultyType | None): The difficulty or None for any difficulty
+            question_type (QuestionType | None): The question type or None for any type
+            encoding (EncodingType | None, optional): The `encode` mode or None for the API default. Defaults to None.
+
+        Raises:
+            InvalidParameterError: If the amount is out of range
+
+        Returns:
+            dict[str, str | None]: The query parameters
+        """
+        if amount < 1 or amount > 50:
+            msg: str = "Amount must be between 1 and 50"
+            raise InvalidParameterError(msg)
+
+        params: dict[str, str | None] = {
+            "amount": str(amount),
+            "token": token,
+        }
+
+        if category:
+            params["category"] = category
+        if difficulty:
+            params["difficulty"] = difficulty
+        if question_type:
+            params["type"] = question_type
+        if encoding:
+            params["encode"] = encoding
+
+        return params
+
+
+class TriviaAPIClient(BaseTriviaAPIClient):
+    """Client for handling Trivia API interactions
+
+    The session token is not requested when the client is created. It is fetched on the
+    first fetch_questions call, or in the background after prefetch_session_token().
+    With a token store, a still valid token from a previous run is reused instead.
+
+    Attributes:
+        REQUEST_ERROR_MAPPING (ClassVar[dict[type[Exception], tuple[type[Exception], str]]]): Exceptions for
+            requests errors
+        RATE_LIMITED_URLS (ClassVar[tuple[str, ...]]): Endpoints that go through the rate limiter
+        COALESCED_URLS (ClassVar[tuple[str, ...]]): Endpoints whose identical concurrent requests share one
+            network call. Questions requests are left out, concurrent games must not get the same questions.
+        ENDPOINT_NAMES (ClassVar[dict[str, str]]): The `endpoint` label of each URL in the metrics
+        DEFAULT_RETRIES (ClassVar[int]): Retries of the client's own session when none are given
+        CIRCUIT_FAILURE_STATUSES (ClassVar[tuple[int, ...]]): HTTP status codes counted as failures by the
+            circuit breaker. Rate limiting is left to the rate limiter, it does not mean the API is down.
+
+    Args:
+        timeout (int, optional): Timeout for requests. Defaults to 10.
+        retries (int | None, optional): Number of retries for failed requests. Defaults to DEFAULT_RETRIES
+            without a transport. A transport brings its own retries, giving both raises ValueError.
+        cache (QuestionCache | None, optional): Local question store games are served from, topped up from the
+            API in the background. Defaults to None.
+        token_store (TokenStore | None, optional): Persists the session token between runs. Defaults to None.
+        rate_limiter (RateLimiter | None, optional): Spaces out questions requests per host. Defaults to None.
+        encoding (EncodingType | None, optional): The `encode` mode for questions requests. "url3986" makes
+            decoding a plain unquote. Defaults to None.
+        base_url (str | None, optional): Scheme and host to send requests to instead of opentdb.com. Defaults to None.
+        transport (Transport | None, optional): Connection pools shared with other clients and threads. Without
+            one the client opens its own session. Defaults to None.
+        metrics (MetricsRegistry | None, optional): Receives request counts, latencies, retries and response
+            codes. Defaults to a registry of the client's own, see `metrics.snapshot()`.
+        circuit_breaker (CircuitBreaker | None, optional): Refuses requests after repeated network failures.
+            While it is open, fetch_questions serves whatever the cache holds. Without a probe of its own, the
+            breaker probes the categories endpoint in the background. Defaults to None.
+
+    Raises:
+        TriviaAPIError: If an unknown error occurs
+        NoResultsError: If there are not enough questions available
+        InvalidParameterError: If invalid parameters are provided
+        TokenError: If a session token is not found or is empty
+        RateLimitError: If the rate limit is exceeded
+        CircuitOpenError: If the circuit breaker refuses the request
+    """
+
     REQUEST_ERROR_MAPPING: ClassVar[dict[type[Exception], tuple[type[Exception], str]]] = {
         requests.exceptions.ConnectionError: (TriviaAPIError, "Connection error"),
         requests.exceptions.Timeout: (TriviaAPIError, "Request timed out"),
         requests.exceptions.JSONDecodeError: (TriviaAPIError, "Invalid JSON response"),
+        requests.exceptions.RetryError: (TriviaAPIError, "Too many failed attempts"),
         requests.exceptions.RequestException: (TriviaAPIError, "Generic error"),
     }
 
-    def __init__(self, timeout: int = 10, retries: int = 3) -> None:
+    RATE_LIMITED_URLS: ClassVar[tuple[str, ...]] = (BaseTriviaAPIClient.QUESTIONS_API_URL,)
+    COALESCED_URLS: ClassVar[tuple[str, ...]] = (
+        BaseTriviaAPIClient.CATEGORIES_API_URL,
+        BaseTriviaAPIClient.COUNT_API_URL,
+    )
+    CIRCUIT_FAILURE_STATUSES: ClassVar[tuple[int, ...]] = (500, 502, 503, 504)
+    ENDPOINT_NAMES: ClassVar[dict[str, str]] = {
+        BaseTriviaAPIClient.QUESTIONS_API_URL: "questions",
+        BaseTriviaAPIClient.SESSION_TOKEN_API_URL: "token",
+        BaseTriviaAPIClient.CATEGORIES_API_URL: "categories",
+        BaseTriviaAPIClient.COUNT_API_URL: "count",
+    }
+    DEFAULT_RETRIES: ClassVar[int] = 3
+
+    def __init__(
+        self,
+        timeout: int = 10,
+        retries: int | None = None,
+        cache: QuestionCache | None = None,
+        token_store: TokenStore | None = None,
+        rate_limiter: RateLimiter | None = None,
+        encoding: EncodingType | None = None,
+        base_url: str | None = None,
+        transport: Transport | None = None,
+        metrics: MetricsRegistry | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+    ) -> None:
         """Initialize the TriviaAPIClient
 
         Args:
             timeout (int, optional): Timeout for requests. Defaults to 10.
-            retries (int, optional): Number of retries for failed requests. Defaults to 3.
+            retries (int | None, optional): Number of retries for failed requests. Defaults to DEFAULT_RETRIES
+                without a transport, which brings its own retries.
+            cache (QuestionCache | None, optional): Local question store games are served from, topped up from
+                the API in the background. Defaults to None.
+            token_store (TokenStore | None, optional): Persists the session token between runs. Defaults to None.
+            rate_limiter (RateLimiter | None, optional): Spaces out questions requests per host. Defaults to None.
+            encoding (EncodingType | None, optional): The `encode` mode for questions requests. Defaults to None.
+            base_url (str | None, optional): Scheme and host to send requests to instead of opentdb.com.
+                Defaults to None.
+            transport (Transport | None, optional): Connection pools shared with other clients and threads.
+                Defaults to None.
+            metrics (MetricsRegistry | None, optional): Receives request metrics. Defaults to a new registry.
+            circuit_breaker (CircuitBreaker | None, optional): Refuses requests after repeated network failures.
+                Defaults to None.
+
+        Raises:
+            ValueError: If both retries and a transport are given
 
         Returns:
             None
         """
+        if transport is not None and retries is not None:
+            msg: str = "Set the retries on the transport, a client cannot change them for its requests"
+            raise ValueError(msg)
 
         self.timeout = timeout
         self._session_token: str | None = None
-        self.session = self._create_session(retries)
-        self._session_token = self.request_session_token()
+        self._token_lock: threading.Lock = threading.Lock()
+        self.transport: Transport | None = transport
+        self._session: requests.Session | None = (
+            self._create_session(self.DEFAULT_RETRIES if retries is None else retries) if transport is None else None
+        )
         self.categories: dict[str, str] = {}
+        self.cache: QuestionCache | None = cache
+        self.token_store: TokenStore | None = token_store
+        self.rate_limiter: RateLimiter | None = rate_limiter
+        self.encoding = encoding
+        self.base_url = base_url
+        self._in_flight: SingleFlight[dict[str, Any]] = SingleFlight()
+        self._top_ups: set[tuple[str | None, ...]] = set()
+        self._top_up_lock: threading.Lock = threading.Lock()
+        self.metrics: MetricsRegistry = metrics if metrics is not None else MetricsRegistry()
+        self.circuit_breaker: CircuitBreaker | None = circuit_breaker
+        if circuit_breaker is not None and circuit_breaker.probe is None:
+            circuit_breaker.probe = self._probe
+
+    @property
+    def session(self) -> requests.Session:
+        """Get the session for the calling thread
+
+        Returns:
+            requests.Session: The client's own session, or the thread's session of the shared transport
+        """
+        if self.transport is not None:
+            return self.transport.session
+        return cast(requests.Session, self._session)
 
     def _create_session(self, retries: int) -> requests.Session:
         """Create and configure requests session
@@ -102,8 +482,8 @@ class TriviaAPIClient:
 
         retry_strategy: Retry = Retry(
             total=retries,
-            backoff_factor=5,
-            status_forcelist=[429, 500, 502, 503, 504],
+            backoff_factor=self.RETRY_BACKOFF_FACTOR,
+            status_forcelist=self.RETRY_STATUS_FORCELIST,
             allowed_methods=["GET"],
         )
         adapter: HTTPAdapter = HTTPAdapter(max_retries=retry_strategy)
@@ -111,93 +491,239 @@ class TriviaAPIClient:
         session.mount("https://", adapter)
         return session
 
-    def _handle_response_code(self, data: dict[str, Any]) -> None:
-        """Handle response code from Trivia API
+    def _parse_and_validate_response(self, response: requests.Response, endpoint: str | None = None) -> dict[str, Any]:
+        """Parse and validate JSON response from API
 
         Args:
-            data (dict[str, Any]): The JSON response data
+            response (requests.Response): The HTTP response object
+            endpoint (str | None, optional): The endpoint label to count the response code under. Defaults to None.
 
         Raises:
-            TriviaAPIError: If an unknown error occurs
-            NoResultsError: If there are not enough questions available
-            InvalidParameterError: If invalid parameters are provided
-            TokenError: If a session token is not found or is empty
-            RateLimitError: If the rate limit is exceeded
+            TriviaAPIError: If the JSON response is invalid
 
         Returns:
-            None
+            dict[str, Any]: The JSON response data
         """
-        response_code: int | None = data.get("response_code")
+        try:
+            data: dict[str, Any] = response.json()
 
-        if response_code is None:
-            msg: str = "Response code not found in API response"
-            raise TriviaAPIError(msg)
+        except requests.exceptions.JSONDecodeError as e:
+            error_msg: str = f"Invalid JSON response: {e!s}"
+            raise TriviaAPIError(error_msg) from e
 
-        if response_code == TriviaResponseCode.SUCCESS:
-            return
+        if endpoint is not None:
+            self._record_response_code(endpoint, data)
+        return self._validate_response_data(data)
 
-        error_message = self.ERROR_MESSAGES.get(response_code, f"Unknown error occurred: {response_code}")
+    def _record_response_code(self, endpoint: str, data: dict[str, Any]) -> None:
+        """Count the response code of a parsed response
 
-        if response_code == TriviaResponseCode.NO_RESULTS:
-            raise NoResultsError(error_message)
-        elif response_code == TriviaResponseCode.INVALID_PARAMETER:
-            raise InvalidParameterError(error_message)
-        elif response_code in (TriviaResponseCode.TOKEN_NOT_FOUND, TriviaResponseCode.TOKEN_EMPTY):
-            raise TokenError(error_message)
-        elif response_code == TriviaResponseCode.RATE_LIMIT:
-            raise RateLimitError(error_message)
-        else:
-            raise TriviaAPIError(error_message)
+        Args:
+            endpoint (str): The endpoint label
+            data (dict[str, Any]): The JSON response data
 
-    def _parse_and_validate_response(self, response: requests.Response) -> dict[str, Any]:
-        """Parse and validate JSON response from API
+        Returns:
+            None
+        """
+        response_code: Any = data.get("response_code") if isinstance(data, dict) else None
+        try:
+            code: str = TriviaResponseCode(response_code).name
+        except ValueError:
+            code = str(response_code)
+        self.metrics.increment("trivia_api_response_codes_total", endpoint=endpoint, code=code)
+
+    def _record_retries(self, endpoint: str, retries: int) -> None:
+        """Count the retries urllib3 made before a request completed
+
+        Args:
+            endpoint (str): The endpoint label
+            retries (int): The number of retries
+
+        Returns:
+            None
+        """
+        if retries:
+            self.metrics.increment("trivia_api_retries_total", retries, endpoint=endpoint)
+
+    @staticmethod
+    def _retries_of(response: requests.Response) -> int:
+        """Get the number of retries urllib3 made for a response
 
         Args:
             response (requests.Response): The HTTP response object
 
-        Raises:
-            TriviaAPIError: If the JSON response is invalid
+        Returns:
+            int: The number of retries, 0 if unknown
+        """
+        retries: object = getattr(response.raw, "retries", None)
+        return len(retries.history) if isinstance(retries, Retry) else 0
+
+    @staticmethod
+    def _rate_limited_retries(error: Exception) -> bool:
+        """Check whether urllib3 gave up retrying because the API kept answering 429
+
+        Args:
+            error (Exception): The error raised by the session
 
         Returns:
-            dict[str, Any]: The JSON response data
+            bool: True if the retries were used up by rate limit responses
+        """
+        if not isinstance(error, requests.exceptions.RetryError) or not error.args:
+            return False
+        reason: object = getattr(error.args[0], "reason", None)
+        rate_limited: str = ResponseError.SPECIFIC_ERROR.format(status_code=HTTPStatus.TOO_MANY_REQUESTS)
+        return isinstance(reason, ResponseError) and str(reason) == rate_limited
+
+    def _make_request(self, url: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+        """Make HTTP request, sharing the response of an identical request already in flight
+
+        Args:
+            url (str): One of the endpoint URLs
+            params (dict[str, Any] | None, optional): Query parameters, None values are dropped. Defaults to None.
+
+        Returns:
+            dict[str, Any]: The validated JSON response data
         """
+        if url not in self.COALESCED_URLS:
+            return self._send_request(url, params)
+
+        key: tuple[str, tuple[tuple[str, str], ...]] = (
+            url,
+            tuple(sorted((name, str(value)) for name, value in (params or {}).items() if value is not None)),
+        )
+        return self._in_flight.do(key, lambda: self._send_request(url, params))
+
+    def _send_request(self, url: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+        """Make HTTP request with rate limiting, error handling and metrics
+
+        Every request is counted under `trivia_api_requests_total` with its outcome, "ok"
+        or the name of the raised exception, and timed in `trivia_api_request_duration_seconds`.
+        Failures are also counted in `trivia_api_errors_total` with the HTTP status, the
+        requests exception or the API response code that caused them.
+        """
+
+        request_url: str = self._resolve_url(url)
+        endpoint: str = self.ENDPOINT_NAMES.get(url, "other")
+
+        if self.circuit_breaker is not None and not self.circuit_breaker.allow_request():
+            self.metrics.increment("trivia_api_requests_total", endpoint=endpoint, outcome="CircuitOpenError")
+            msg: str = f"Trivia API unavailable, next check in {self.circuit_breaker.retry_after():.0f}s"
+            raise CircuitOpenError(msg)
+
+        if self.rate_limiter is not None and url in self.RATE_LIMITED_URLS:
+            waited: float = self.rate_limiter.acquire(urlsplit(request_url).netloc)
+            self.metrics.observe("trivia_api_rate_limit_wait_seconds", waited, endpoint=endpoint)
+
+        start: float = time.perf_counter()
+        outcome: str = "ok"
         try:
-            data: dict[str, Any] = response.json()
+            return self._request_and_parse(request_url, params, endpoint)
 
-        except requests.exceptions.JSONDecodeError as e:
-            error_msg: str = f"Invalid JSON response: {e!s}"
-            raise TriviaAPIError(error_msg) from e
+        except Exception as e:
+            outcome = type(e).__name__
+            self.metrics.increment("trivia_api_errors_total", endpoint=endpoint, error=outcome, cause=self._cause_of(e))
+            raise
 
-        if "response_code" in data:
-            self._handle_response_code(data)
+        finally:
+            self.metrics.observe("trivia_api_request_duration_seconds", time.perf_counter() - start, endpoint=endpoint)
+            self.metrics.increment("trivia_api_requests_total", endpoint=endpoint, outcome=outcome)
 
-        # Check for empty token only if token field exists
-        if "token" in data and not data["token"]:
-            token_err_msg: str = "Invalid token received"
-            raise TokenError(token_err_msg)
+    def _request_and_parse(self, request_url: str, params: dict[str, Any] | None, endpoint: str) -> dict[str, Any]:
+        """Send the GET request and map transport errors to API errors
 
-        return data
+        Args:
+            request_url (str): The resolved URL
+            params (dict[str, Any] | None): Query parameters
+            endpoint (str): The endpoint label for metrics
 
-    def _make_request(self, url: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
-        """Make HTTP request with error handling"""
+        Raises:
+            TriviaAPIError: If the request fails or the response is invalid
 
+        Returns:
+            dict[str, Any]: The validated JSON response data
+        """
+        started: float = time.perf_counter()
         try:
-            response: requests.Response = self.session.get(url, params=params, timeout=self.timeout)
+            response: requests.Response = self.session.get(request_url, params=params, timeout=self.timeout)
+            self._record_retries(endpoint, self._retries_of(response))
             response.raise_for_status()
 
         except requests.exceptions.HTTPError as e:
             status_code: int = e.response.status_code
+            self._record_circuit(status_code in self.CIRCUIT_FAILURE_STATUSES)
             error_class, error_msg = self.HTTP_ERROR_MAPPING.get(status_code, (TriviaAPIError, f"HTTP {status_code}"))
             http_err_msg: str = f"Request failed: {error_msg}"
             raise error_class(http_err_msg) from e
 
         except tuple(self.REQUEST_ERROR_MAPPING.keys()) as e:
+            self._record_circuit(failed=not self._rate_limited_retries(e))
+            if isinstance(e, requests.exceptions.RetryError):
+                adapter: Any = self.session.get_adapter(request_url)
+                self._record_retries(endpoint, adapter.max_retries.total or 0)
             error_class, error_msg = self.REQUEST_ERROR_MAPPING[type(e)]
             request_err_msg: str = f"Request failed: {error_msg}"
             raise error_class(request_err_msg) from e
 
         else:
-            return self._parse_and_validate_response(response)
+            self._record_circuit(failed=False, duration=time.perf_counter() - started)
+            return self._parse_and_validate_response(response, endpoint)
+
+    def _record_circuit(self, failed: bool, duration: float = 0.0) -> None:
+        """Report the outcome of a request to the circuit breaker
+
+        Args:
+            failed (bool): Whether the API was unreachable or answered with a server error
+            duration (float, optional): How long a successful request took in seconds. Defaults to 0.0.
+
+        Returns:
+            None
+        """
+        if self.circuit_breaker is None:
+            return
+        if failed:
+            self.circuit_breaker.record_failure()
+        else:
+            self.circuit_breaker.record_success(duration)
+
+    def _probe(self) -> None:
+        """Check that the API answers, used by the circuit breaker while it is open
+
+        Raises:
+            requests.exceptions.RequestException: If the API cannot be reached or answers with an error
+
+        Returns:
+            None
+        """
+        self.session.get(self._resolve_url(self.CATEGORIES_API_URL), timeout=self.timeout).raise_for_status()
+
+    def _cause_of(self, error: Exception) -> str:
+        """Get the metrics label of what caused a request to fail
+
+        Args:
+            error (Exception): The exception raised by the request
+
+        Returns:
+            str: "HTTP <status>", the requests exception name, or the message of an API response code
+        """
+        cause: BaseException | None = error.__cause__
+        if isinstance(cause, requests.exceptions.HTTPError) and cause.response is not None:
+            return f"HTTP {cause.response.status_code}"
+        if cause is not None:
+            return type(cause).__name__
+        for code, message in self.ERROR_MESSAGES.items():
+            if str(error) == message:
+                return TriviaResponseCode(code).name
+        return type(error).__name__
+
+    def next_request_delay(self) -> float:
+        """Get how long the next questions request would wait for the rate limiter
+
+        Returns:
+            float: The wait in seconds, 0 if there is no rate limiter or no wait
+        """
+        if self.rate_limiter is None:
+            return 0.0
+        return self.rate_limiter.wait_time(urlsplit(self._resolve_url(self.QUESTIONS_API_URL)).netloc)
 
     def request_session_token(self) -> str:
         """Request a session token from the API
@@ -212,79 +738,94 @@ class TriviaAPIClient:
         data: dict[str, Any] = self._make_request(self.SESSION_TOKEN_API_URL, params=params)
         return cast(str, data["token"])
 
-    def reset_session_token(self) -> str:
-        """Reset the current session token.
+    def _ensure_session_token(self) -> str:
+        """Load a stored session token or request one on first use
 
-        This will wipe all progress/question history for the current token
-        but return the same token value. Use this when you've exhausted
-        all questions for a given category/difficulty combination.
+        Concurrent callers, including a background prefetch, share a single request.
 
         Raises:
-            TokenError: If no active session token exists
-            TriviaAPIError: If the reset request fails
+            TriviaAPIError: If the token request fails
 
         Returns:
-            str: The same token value, but with progress wiped
+            str: The session token value
         """
-        if not self._session_token:
-            msg: str = "Cannot reset: No active session token"
-            raise TokenError(msg)
+        with self._token_lock:
+            if self._session_token is None:
+                stored = self.token_store.load() if self.token_store is not None else None
+                self._session_token = stored.token if stored is not None else self._request_and_store_token()
+            return self._session_token
 
-        params: dict[str, str] = {"command": "reset", "token": self._session_token}
-        data: dict[str, Any] = self._make_request(self.SESSION_TOKEN_API_URL, params=params)
-        return cast(str, data["token"])
+    def _request_and_store_token(self) -> str:
+        """Request a new session token and persist it in the token store
 
-    def _validate_token(self, data: dict[str, Any]) -> None:
-        """Validate the session token in the API response
+        Raises:
+            TriviaAPIError: If the token request fails
 
-        Args:
-            data (dict[str, Any]): The API response data
+        Returns:
+            str: The session token value
+        """
+        token: str = self.request_session_token()
+        if self.token_store is not None:
+            self.token_store.save(token)
+        return token
+
+    def renew_session_token(self) -> str:
+        """Replace the current session token with a new one
+
+        Use this when the API no longer knows the token, e.g. after it expired.
 
         Raises:
-            TokenError: If the token is invalid or empty
+            TriviaAPIError: If the token request fails
 
         Returns:
-            None
+            str: The new session token value
         """
-        if "token" in data and not data["token"]:
-            msg: str = "Invalid token received"
-            raise TokenError(msg)
+        with self._token_lock:
+            self._session_token = self._request_and_store_token()
+            return self._session_token
 
-    @staticmethod
-    def _decode_text(text: str) -> str:
-        """Decode URL-encoded text
+    def prefetch_session_token(self) -> threading.Thread:
+        """Start requesting the session token in a background thread
 
-        Args:
-            text (str): The URL-encoded text
+        Failures are ignored here, fetch_questions retries the request when it needs the token.
 
         Returns:
-            str: The decoded text
+            threading.Thread: The started daemon thread
         """
-        return html.unescape(unquote(text))
 
-    def _format_question(self, data: dict[str, Any]) -> Question:
-        """Format and decode question data from API response
+        def prefetch() -> None:
+            with contextlib.suppress(TriviaAPIError):
+                self._ensure_session_token()
+
+        thread: threading.Thread = threading.Thread(target=prefetch, name="session-token-prefetch", daemon=True)
+        thread.start()
+        return thread
+
+    def reset_session_token(self, token: str | None = None) -> str:
+        """Reset the current session token.
+
+        This will wipe all progress/question history for the current token
+        but return the same token value. Use this when you've exhausted
+        all questions for a given category/difficulty combination.
 
         Args:
-            data (dict[str, Any]): The question data from the API
+            token (str | None, optional): Another token to reset, e.g. one of a TokenPool. Defaults to None.
+
+        Raises:
+            TokenError: If no active session token exists
+            TriviaAPIError: If the reset request fails
 
         Returns:
-            Question: The formatted question object
+            str: The same token value, but with progress wiped
         """
-        difficulty: str = self._decode_text(data["difficulty"])
-
-        if difficulty not in ("easy", "medium", "hard"):
-            difficulty_err_msg: str = f"Invalid difficulty value: {difficulty}"
-            raise InvalidParameterError(difficulty_err_msg)
+        token = token or self._session_token
+        if not token:
+            msg: str = "Cannot reset: No active session token"
+            raise TokenError(msg)
 
-        return Question(
-            type=cast(QuestionType, self._decode_text(data["type"])),
-            difficulty=cast(DifficultyType, difficulty),
-            category=self._decode_text(data["category"]),
-            question=self._decode_text(data["question"]),
-            correct_answer=self._decode_text(data["correct_answer"]),
-            incorrect_answers=[self._decode_text(answer) for answer in data["incorrect_answers"]],
-        )
+        params: dict[str, str] = {"command": "reset", "token": token}
+        data: dict[str, Any] = self._make_request(self.SESSION_TOKEN_API_URL, params=params)
+        return cast(str, data["token"])
 
     def fetch_categories(self) -> dict[str, str]:
         """Fetch trivia categories from the API
@@ -298,16 +839,7 @@ class TriviaAPIClient:
 
         try:
             data = self._make_request(self.CATEGORIES_API_URL)
-
-            if not data.get("trivia_categories"):
-                category_error_msg = "No categories found in API response"
-                raise CategoryError(category_error_msg)
-
-            self.categories = {
-                category["name"]: str(category["id"])
-                for category in data["trivia_categories"]
-                if category.get("name") and category.get("id")
-            }
+            self.categories = self._parse_categories(data)
 
         except TriviaAPIError as e:
             error_msg: str = f"Failed to fetch categories: {e!s}"
@@ -316,6 +848,32 @@ class TriviaAPIClient:
         else:
             return self.categories
 
+    def fetch_question_count(self, category: str) -> dict[str, int]:
+        """Fetch the number of questions available in a category
+
+        Args:
+            category (str): The category ID
+
+        Raises:
+            TriviaAPIError: If the request fails or no count is found
+
+        Returns:
+            dict[str, int]: The counts keyed by "total", "easy", "medium" and "hard"
+        """
+        data: dict[str, Any] = self._make_request(self.COUNT_API_URL, params={"category": category})
+        return self._parse_question_count(data)
+
+    def get_category_name(self, category: str | None) -> str | None:
+        """Get the category name for a category ID using the loaded categories
+
+        Args:
+            category (str | None): The category ID
+
+        Returns:
+            str | None: The category name, or None if the ID is not known
+        """
+        return next((name for name, category_id in self.categories.items() if category_id == category), None)
+
     def fetch_questions(
         self,
         amount: int = 10,
@@ -323,40 +881,275 @@ class TriviaAPIClient:
         difficulty: DifficultyType | None = None,
         question_type: QuestionType | None = None,
         max_retries: int = 3,
+        use_cache: bool = True,
+        token: str | None = None,
     ) -> list[Question]:
-        """Fetch trivia questions from the API.
+        """Fetch trivia questions from the local cache, or the API when it holds too few.
+
+        A game is served from the cache when it holds `amount` matching questions that were
+        not served recently, see QuestionCache.take_questions. Otherwise the questions come
+        from the API, with the session token so they do not repeat, and are stored in the
+        cache. Either way, a cache left with fewer fresh questions than `amount` is topped
+        up in the background, so the next game is served locally.
+
+        When the API cannot be reached, rate limits the client or its circuit breaker is
+        open, the least recently served matching questions are served instead, even if
+        there are fewer than requested.
 
         Args:
             amount (int, optional): The number of questions to fetch. Defaults to 10.
             category (str, optional): The category to fetch questions from. Defaults to None.
             difficulty (str, optional): The difficulty level of the questions. Defaults to None.
             question_type (str, optional): The type of questions to fetch. Defaults to None.
-            max_retries (int, optional): The maximum number of retries for token reset. Defaults to 3.
+            max_retries (int, optional): The maximum number of retries for token reset or renewal. Defaults to 3.
+            use_cache (bool, optional): Whether cached questions may be served. Without it, questions
+                always come from the API. Defaults to True.
+            token (str | None, optional): Fetch with this session token instead of the client's. Token errors
+                are then raised as is instead of renewing or resetting. Defaults to None.
         Raises:
             InvalidParameterError: If invalid parameters are provided
             TokenError: If the session token is not found or is empty
             NoResultsError: If there are not enough questions available
             RateLimitError: If the rate limit is exceeded
+            CircuitOpenError: If the circuit breaker is open and the cache holds no matching questions
+            TriviaAPIError: If the request fails and the cache cannot serve it
 
         Returns:
             list[Question]: The list of formatted question objects
         """
 
-        if amount < 1 or amount > 50:
-            msg: str = "Amount must be between 1 and 50"
-            raise InvalidParameterError(msg)
+        params: dict[str, str | None] = self._build_question_params(
+            amount, self._session_token, category, difficulty, question_type, self.encoding
+        )
+        use_cache = use_cache and token is None and self.cache is not None
 
-        params: dict[str, str | None] = {
-            "amount": str(amount),
-            "token": self._session_token,
-        }
+        if use_cache and (cached := self._get_cached_questions(amount, category, difficulty, question_type)):
+            self.top_up_cache(amount, category, difficulty, question_type)
+            return cached
 
-        if category:
-            params["category"] = category
-        if difficulty:
-            params["difficulty"] = difficulty
-        if question_type:
-            params["type"] = question_type
+        try:
+            questions: list[Question] = self._fetch_from_api(params, max_retries, token)
+        except TriviaAPIError as e:
+            if not use_cache or not self._api_unavailable(e):
+                raise
+            if not (fallback := self._get_fallback_questions(amount, category, difficulty, question_type)):
+                raise
+            self.metrics.increment("trivia_api_fallbacks_total")
+            return fallback
+
+        if use_cache:
+            self.top_up_cache(amount, category, difficulty, question_type)
+        return questions
+
+    def fetch_encoded(
+        self,
+        amount: int = 10,
+        category: str | None = None,
+        difficulty: DifficultyType | None = None,
+        question_type: QuestionType | None = None,
+        max_retries: int = 3,
+        token: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Fetch questions from the API as it encoded them, without decoding or caching them
+
+        Bulk ingest stores the result with QuestionCache.add_encoded, so only the questions
+        that are read later are ever decoded.
+
+        Args:
+            amount (int, optional): The number of questions to fetch. Defaults to 10.
+            category (str | None, optional): The category to fetch questions from. Defaults to None.
+            difficulty (DifficultyType | None, optional): The difficulty level of the questions. Defaults to None.
+            question_type (QuestionType | None, optional): The type of questions to fetch. Defaults to None.
+            max_retries (int, optional): The maximum number of retries for token reset or renewal. Defaults to 3.
+            token (str | None, optional): Fetch with this session token instead of the client's. Token errors
+                are then raised as is instead of renewing or resetting. Defaults to None.
+
+        Raises:
+            InvalidParameterError: If invalid parameters are provided
+            TokenError: If the session token is not found or is empty
+            NoResultsError: If there are not enough questions available
+            RateLimitError: If the rate limit is exceeded
+            TriviaAPIError: If the request fails
+
+        Returns:
+            list[dict[str, Any]]: The question data, with its texts in the client's `encoding`
+        """
+        params: dict[str, str | None] = self._build_question_params(
+            amount, self._session_token, category, difficulty, question_type, self.encoding
+        )
+        return self._request_questions(params, max_retries, token)
+
+    def top_up_cache(
+        self,
+        amount: int,
+        category: str | None = None,
+        difficulty: DifficultyType | None = None,
+        question_type: QuestionType | None = None,
+    ) -> threading.Thread | None:
+        """Fetch questions into the cache in a background thread if it holds fewer than `amount` fresh ones
+
+        One top-up per set of filters runs at a time. Like the prefetcher, it waits for a free
+        rate limiter slot before its request, so it does not hold one a game start waits for.
+        Failures are ignored, the next game served from the cache tries again.
+
+        Args:
+            amount (int): The number of fresh questions to keep, and to fetch
+            category (str | None, optional): The category ID. Defaults to None.
+            difficulty (DifficultyType | None, optional): The difficulty. Defaults to None.
+            question_type (QuestionType | None, optional): The question type. Defaults to None.
+
+        Returns:
+            threading.Thread | None: The started daemon thread, None if no top-up is needed
+        """
+        category_name: str | None = self.get_category_name(category) if category else None
+        if self.cache is None or (category and category_name is None):
+            return None
+        if self.cache.count(category_name, difficulty, question_type, fresh_only=True, limit=amount) >= amount:
+            return None
+
+        key: tuple[str | None, ...] = (category, difficulty, question_type)
+        with self._top_up_lock:
+            if key in self._top_ups:
+                return None
+            self._top_ups.add(key)
+
+        def top_up() -> None:
+            try:
+                while (delay := self.next_request_delay()) > 0:
+                    time.sleep(delay)
+                params: dict[str, str | None] = self._build_question_params(
+                    amount, self._session_token, category, difficulty, question_type, self.encoding
+                )
+                with contextlib.suppress(TriviaAPIError, ValueError):
+                    self._fetch_from_api(params, max_retries=3, served=False)
+            finally:
+                with self._top_up_lock:
+                    self._top_ups.discard(key)
+
+        thread: threading.Thread = threading.Thread(target=top_up, name="cache-top-up", daemon=True)
+        thread.start()
+        return thread
+
+    def _get_cached_questions(
+        self,
+        amount: int,
+        category: str | None,
+        difficulty: DifficultyType | None,
+        question_type: QuestionType | None,
+    ) -> list[Question]:
+        """Take `amount` fresh matching questions from the cache
+
+        Every lookup is counted in `trivia_cache_lookups_total` as a hit or a miss.
+
+        Args:
+            amount (int): The number of questions wanted
+            category (str | None): The category ID or None for any category
+            difficulty (DifficultyType | None): The difficulty or None for any difficulty
+            question_type (QuestionType | None): The question type or None for any type
+
+        Returns:
+            list[Question]: The questions, empty if the cache holds fewer or the category is unknown
+        """
+        category_name: str | None = self.get_category_name(category) if category else None
+        questions: list[Question] = []
+        if self.cache is not None and (category_name is not None or not category):
+            questions = self.cache.take_questions(amount, category_name, difficulty, question_type, fresh_only=True)
+        self.metrics.increment("trivia_cache_lookups_total", result="hit" if questions else "miss")
+        return questions
+
+    def _api_unavailable(self, error: TriviaAPIError) -> bool:
+        """Tell whether a failed request means the API cannot serve questions right now
+
+        Unreachable servers, server errors, rate limiting and an open circuit breaker make
+        the API unavailable. Answers about the request itself, like too few questions or an
+        invalid parameter, do not.
+
+        Args:
+            error (TriviaAPIError): The error raised by the request
+
+        Returns:
+            bool: True if cached questions should be served instead
+        """
+        if isinstance(error, RateLimitError | CircuitOpenError):
+            return True
+        if self.circuit_breaker is not None and self.circuit_breaker.state != "closed":
+            return True
+
+        cause: BaseException | None = error.__cause__
+        if isinstance(cause, requests.exceptions.HTTPError):
+            return cause.response is not None and cause.response.status_code >= 500
+        return isinstance(cause, requests.exceptions.RequestException)
+
+    def _get_fallback_questions(
+        self,
+        amount: int,
+        category: str | None,
+        difficulty: DifficultyType | None,
+        question_type: QuestionType | None,
+    ) -> list[Question]:
+        """Take the least recently served matching questions, for when the API is unavailable
+
+        Args:
+            amount (int): The number of questions wanted
+            category (str | None): The category ID or None for any category
+            difficulty (DifficultyType | None): The difficulty or None for any difficulty
+            question_type (QuestionType | None): The question type or None for any type
+
+        Returns:
+            list[Question]: Up to `amount` cached questions, empty without a cache or an unknown category
+        """
+        category_name: str | None = self.get_category_name(category) if category else None
+        if self.cache is None:
+            return []
+
+        if category and category_name is None:
+            return []
+        return self.cache.take_questions(amount, category_name, difficulty, question_type)
+
+    def _fetch_from_api(
+        self, params: dict[str, str | None], max_retries: int, token: str | None = None, served: bool = True
+    ) -> list[Question]:
+        """Fetch questions from the API and store them in the cache as the API encoded them
+
+        Args:
+            params (dict[str, str | None]): The questions request parameters
+            max_retries (int): The maximum number of retries for token reset or renewal
+            token (str | None, optional): A session token whose errors are raised as is. Defaults to None.
+            served (bool, optional): Whether the questions are served now, or only stored in the cache
+                and left encoded. Defaults to True.
+
+        Raises:
+            TokenError: If the session token is not found or is empty
+            TriviaAPIError: If the request fails
+            ValueError: If a question that is only stored has an invalid difficulty
+
+        Returns:
+            list[Question]: The list of formatted question objects, empty if they are not served
+        """
+        results: list[dict[str, Any]] = self._request_questions(params, max_retries, token)
+        questions: list[Question] = self._format_questions(results) if served else []
+        if self.cache is not None:
+            self.cache.add_encoded(results, self.encoding, served=served)
+        return questions
+
+    def _request_questions(
+        self, params: dict[str, str | None], max_retries: int, token: str | None = None
+    ) -> list[dict[str, Any]]:
+        """Request questions from the API, renewing or resetting the session token as needed
+
+        Args:
+            params (dict[str, str | None]): The questions request parameters
+            max_retries (int): The maximum number of retries for token reset or renewal
+            token (str | None, optional): A session token whose errors are raised as is. Defaults to None.
+
+        Raises:
+            TokenError: If the session token is not found or is empty
+            TriviaAPIError: If the request fails
+
+        Returns:
+            list[dict[str, Any]]: The question data as the API sent it
+        """
+        params["token"] = token or self._ensure_session_token()
 
         retry_count: int = 0
         retry_count_err_msg: str = "Maximum retry attempts reached for token reset"
@@ -366,14 +1159,16 @@ class TriviaAPIClient:
                 data: dict[str, Any] = self._make_request(self.QUESTIONS_API_URL, params=params)
 
             except TokenError as e:
-                if "Token has returned all possible questions" not in str(e):
+                token_not_found: bool = self.ERROR_MESSAGES[TriviaResponseCode.TOKEN_NOT_FOUND] in str(e)
+                if token or (not token_not_found and "Token has returned all possible questions" not in str(e)):
                     raise
                 if retry_count >= max_retries:
                     raise TokenError(retry_count_err_msg) from e
-                self._session_token = self.reset_session_token()
+                self._session_token = self.renew_session_token() if token_not_found else self.reset_session_token()
+                params["token"] = self._session_token
                 retry_count += 1
             else:
-                return [self._format_question(question) for question in data["results"]]
+                return cast(list[dict[str, Any]], data["results"])
 
         raise TokenError(retry_count_err_msg)
 
@@ -390,6 +1185,8 @@ class TriviaAPIClient:
     ) -> None:
         """Close the session when exiting the context manager.
 
+        A shared transport is left open for the other clients using it.
+
         Args:
             exc_type: The type of the exception that was raised
             exc_val: The instance of the exception that was raised
@@ -398,4 +1195,5 @@ class TriviaAPIClient:
         Returns:
             None
         """
-        self.session.close()
+        if self._session is not None:
+            self._session.close()
@@ -21,6 +21,7 @@ class BaseQuizFrame(BaseFrame):
         self._create_score_label()
         self._create_question_frame()
         self._create_question_label()
+        self._create_end_button()
         self.display_question()
 
     def _create_question_frame(self) -> None:
@@ -35,6 +36,21 @@ class BaseQuizFrame(BaseFrame):
         )
         self.question_label.grid(row=0, column=0, sticky="nsew")
 
+    def _create_end_button(self) -> None:
+        """Create and place the button ending the game early, the way out of an endless game"""
+        self._pending_continue: str | None = None
+        ctk.CTkButton(self, text="End Game", command=self._end_game, width=200).grid(
+            row=4, column=1, pady=20, sticky="n"
+        )
+
+    def _end_game(self) -> None:
+        """End the game, dropping the pending switch to the next question"""
+        if self._pending_continue is not None:
+            self.after_cancel(self._pending_continue)
+            self._pending_continue = None
+        self.question_frame.configure(fg_color=("gray85", "gray25"))
+        self.controller.quiz_brain.end_game()
+
     def _create_answer_buttons(self) -> None:
         """Create answer buttons - to be implemented by child classes"""
         raise NotImplementedError("Child classes must implement _create_answer_buttons")
@@ -53,10 +69,11 @@ class BaseQuizFrame(BaseFrame):
         # Show visual feedback
         self.question_frame.configure(fg_color="green" if is_correct else "red")
         # Wait and continue
-        self.after(1000, lambda _=None: self._reset_and_continue())
+        self._pending_continue = self.after(1000, lambda _=None: self._reset_and_continue())
 
     def _reset_and_continue(self) -> None:
         """Reset frame color and show next question"""
+        self._pending_continue = None
         self.question_frame.configure(fg_color=("gray85", "gray25"))
         self.controller.quiz_brain.show_next_question()
 
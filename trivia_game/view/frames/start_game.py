@@ -11,8 +11,8 @@ class StartGameFrame(BaseFrame):
     def _setup_grid(self) -> None:
         """Configure grid layout"""
         self.grid_rowconfigure(0, weight=2)  # Top spacing
-        self.grid_rowconfigure((1, 2, 3, 4), weight=0)  # Content rows
-        self.grid_rowconfigure(5, weight=3)  # Bottom spacing
+        self.grid_rowconfigure((1, 2, 3, 4, 5), weight=0)  # Content rows
+        self.grid_rowconfigure(6, weight=3)  # Bottom spacing
         self.grid_columnconfigure((0, 2), weight=1)  # Left and right spacing
         self.grid_columnconfigure(1, weight=0)  # Center column
 
@@ -20,6 +20,7 @@ class StartGameFrame(BaseFrame):
         """Create and place widgets"""
         self._init_variables()
         self._create_option_menus()
+        self._create_endless_switch()
         self._create_buttons()
 
     def _init_variables(self) -> None:
@@ -27,6 +28,7 @@ class StartGameFrame(BaseFrame):
         self.category_var = ctk.StringVar(value="Any Category")
         self.difficulty_var = ctk.StringVar(value="Any Difficulty")
         self.type_var = ctk.StringVar(value="Any Type")
+        self.endless_var = ctk.BooleanVar(value=False)
 
     def _create_option_menus(self) -> None:
         """Create and place option menus"""
@@ -41,16 +43,34 @@ class StartGameFrame(BaseFrame):
     def _create_option_menu(self, label: str, variable: ctk.StringVar, values: list[str], row: int) -> None:
         """Create and place an option menu with label"""
         ctk.CTkLabel(self, text=label).grid(row=row, column=1, pady=(20 if row == 2 else 5), sticky="w")
-        ctk.CTkOptionMenu(self, variable=variable, values=values, width=200).grid(
+        ctk.CTkOptionMenu(self, variable=variable, values=values, width=200, command=self._on_option_selected).grid(
             row=row, column=1, pady=(20 if row == 2 else 5)
         )
 
+    def _create_endless_switch(self) -> None:
+        """Create and place the switch selecting endless mode"""
+        ctk.CTkSwitch(self, text="Endless mode", variable=self.endless_var).grid(row=5, column=1, pady=(20, 0))
+
+    def _on_option_selected(self, _value: str) -> None:
+        """Update the start button, and again once unknown question counts were fetched"""
+        category_id, _, _ = self.get_selected_values()
+        self.controller.quiz_brain.request_question_counts(
+            category_id, lambda: self.after(0, self._update_start_button)
+        )
+        self._update_start_button()
+
+    def _update_start_button(self) -> None:
+        """Disable the start button when the selected options have no questions"""
+        limit = self.controller.quiz_brain.get_question_limit(*self.get_selected_values())
+        self.start_button.configure(state="disabled" if limit == 0 else "normal")
+
     def _create_buttons(self) -> None:
         """Create and place buttons"""
-        ctk.CTkButton(self, text="Start Game", command=self._start_game, width=200).grid(row=5, column=1, pady=30)
+        self.start_button = ctk.CTkButton(self, text="Start Game", command=self._start_game, width=200)
+        self.start_button.grid(row=6, column=1, pady=30)
         ctk.CTkButton(
             self, text="Back to Menu", command=lambda: self.controller.show_frame("MainMenuFrame"), width=200
-        ).grid(row=6, column=1, pady=(0, 30))
+        ).grid(row=7, column=1, pady=(0, 30))
 
     def get_selected_values(
         self,
@@ -72,4 +92,6 @@ class StartGameFrame(BaseFrame):
     def _start_game(self) -> None:
         """Start the game with selected options"""
         category_id, difficulty_value, question_type = self.get_selected_values()
-        self.controller.quiz_brain.load_questions(category_id, difficulty_value, question_type)
+        self.controller.quiz_brain.load_questions(
+            category_id, difficulty_value, question_type, endless=self.endless_var.get()
+        )